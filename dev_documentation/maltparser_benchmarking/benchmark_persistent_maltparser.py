@@ -0,0 +1,68 @@
+#
+#  Compares MaltParserTagger's modes on many small documents:
+#   * persistent=False: a new MaltParser process (JVM start-up and loading
+#     of the model) for each document, input and output go through
+#     temporary files;
+#   * persistent=True: a long-lived MaltParser process, which loads the
+#     model once, and sentences are streamed through its standard
+#     input/output (see MaltParserProcess);
+#
+#  Requires java and the package conllu.
+#
+#  Note: the persistent mode is experimental, and this benchmark has not
+#  yet been run against a real JVM: no results are recorded yet.
+#
+#  Usage:
+#     python benchmark_persistent_maltparser.py [number_of_documents]
+#
+#  Documents are short (1-2 sentences), and are made from sample sentences
+#  repeated. Default number of documents: 100.
+#
+
+import sys
+import time
+
+from estnltk import Text
+from estnltk.taggers import ConllMorphTagger
+from estnltk.taggers.standard.syntax.maltparser_tagger.maltparser_tagger import MaltParserTagger
+
+SENTENCES = ['Autojuhi lapitekk pälvis linna koduleheküljel palju tähelepanu.',
+             'Ilus suur karvane kass nurrus punasel diivanil.',
+             'Kui sa tahad Eestis kõrgema hariduse omandada, siis sa pead sisseastumisel sooritama eksami.',
+             'Tulemused avaldatakse nädala jooksul pärast eksami toimumist.',
+             'Eksam koosneb kahest osast.']
+
+
+def make_documents(number_of_documents):
+    conll_morph_tagger = ConllMorphTagger( no_visl=True, morph_extended_layer='morph_analysis' )
+    docs = []
+    for i in range(number_of_documents):
+        raw_text = ' '.join( SENTENCES[(i + j) % len(SENTENCES)] for j in range(1 + i % 2) )
+        text = Text( raw_text ).tag_layer('morph_analysis')
+        conll_morph_tagger.tag( text )
+        docs.append( text )
+    return docs
+
+
+def benchmark(docs, persistent):
+    tagger = MaltParserTagger( persistent=persistent )
+    start = time.perf_counter()
+    layers = [tagger.make_layer(doc) for doc in docs]
+    elapsed = time.perf_counter() - start
+    tagger.close()
+    return elapsed, layers
+
+
+if __name__ == '__main__':
+    number_of_documents = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    docs = make_documents( number_of_documents )
+    words = sum(len(doc['words']) for doc in docs)
+    print('{} documents, {} words'.format(len(docs), words))
+    per_call_time, per_call_layers = benchmark(docs, persistent=False)
+    persistent_time, persistent_layers = benchmark(docs, persistent=True)
+    # Sanity check: results must be the same
+    assert per_call_layers == persistent_layers
+    print('{:>20} | {:>10} | {:>12}'.format('mode', 'time (s)', 'docs / s'))
+    for name, elapsed in [('JVM per document', per_call_time), ('persistent process', persistent_time)]:
+        print('{:>20} | {:>10.2f} | {:>12.1f}'.format(name, elapsed, len(docs) / elapsed))
+    print('speedup: {:.1f}x'.format(per_call_time / persistent_time))
@@ -0,0 +1,87 @@
+#
+#  Compares RegexTagger's default matching (a separate scan of the text
+#  with each pattern) and the combined matching (combined_matching=True:
+#  a single scan with a combined pattern, see CombinedRegexMatcher).
+#
+#  Rulesets:
+#   * tokenization hints of CompoundTokenTagger (patterns mostly begin
+#     with literal strings or specific character classes);
+#   * synthetic rulesets of expressions r'\d+\s*<prefix>', where prefixes
+#     are taken from the words of the text (patterns begin with a character
+#     class, and their literal parts occur frequently in the text, but
+#     matches are infrequent);
+#
+#  Usage:
+#     python benchmark_combined_regex_matching.py [text_file1.txt text_file2.txt ...]
+#
+#  If no input files are given, uses two sample texts repeated multiple
+#  times: a prose text without digits and a text rich in numbers, dates
+#  and other compound tokens.
+#
+
+import sys
+import timeit
+
+import regex
+
+from estnltk.taggers import CompoundTokenTagger
+from estnltk.taggers.system.rule_taggers import RegexTagger, Ruleset, StaticExtractionRule
+
+PROSE_TEXT = \
+'''Kui sa tahad Eestis kõrgema hariduse omandada, siis sa pead sisseastumisel
+sooritama eksami. Eksam koosneb kahest osast. Esimene osa on kirjalik ja teine
+suuline. Kirjalikus osas tuleb lahendada ülesandeid ja kirjutada lühike essee.
+Suulises osas tuleb vastata komisjoni küsimustele. Tulemused avaldatakse nädala
+jooksul pärast eksami toimumist. Edu!'''
+
+NUMBERS_TEXT = \
+'''Kui sa tahad Eestis kõrgema hariduse omandada, siis sa pead 1. juuliks
+sooritama eksami. Eksam koosneb kahest osast: kirjalik osa (kestab 2,5 h) ja
+suuline osa. Lisainfo: http://www.ut.ee ja info@ut.ee. Registreerimistasu on
+25 eurot, tasuda tuleb hiljemalt 15.06.2019. T. Tamm ja A. Saar vastavad
+küsimustele tel. 5123 4567. Eksam toimub ruumis nr 12 kell 10.00.'''
+
+REPETITIONS = 5
+
+
+def number_prefix_ruleset(text, size):
+    words = regex.findall(r'[^\W\d]{3,}', text)
+    prefixes = sorted({word[:length] for word in words for length in range(3, len(word) + 1)})[:size]
+    ruleset = Ruleset()
+    ruleset.add_rules([StaticExtractionRule(pattern=regex.compile(r'\d+\s*' + regex.escape(prefix)),
+                                            attributes={'prefix': prefix}) for prefix in prefixes])
+    return ruleset
+
+
+def benchmark(name, text):
+    hints_tagger = CompoundTokenTagger()._tokenization_hints_tagger_1
+    rulesets = [('compound token hints', hints_tagger.ruleset, hints_tagger.overlapped)]
+    for size in [10, 100, 300]:
+        rulesets.append(('number+prefix', number_prefix_ruleset(text, size), False))
+    print()
+    print('{}: {} chars'.format(name, len(text)))
+    print('{:>22} | {:>6} | {:>10} {:>10} {:>8}'.format('ruleset', 'rules', 'separate', 'combined', 'speedup'))
+    for name, ruleset, overlapped in rulesets:
+        separate_tagger = RegexTagger(ruleset=ruleset, overlapped=overlapped)
+        combined_tagger = RegexTagger(ruleset=ruleset, overlapped=overlapped, combined_matching=True)
+        # Sanity check: results must be the same
+        separate_matches = separate_tagger.extract_annotations(text)
+        combined_matches = combined_tagger.extract_annotations(text)
+        assert [(m[0], m[1].span(), m[2]) for m in separate_matches] == \
+               [(m[0], m[1].span(), m[2]) for m in combined_matches]
+        separate_time = min(timeit.repeat(lambda: separate_tagger.extract_annotations(text),
+                                          number=1, repeat=REPETITIONS))
+        combined_time = min(timeit.repeat(lambda: combined_tagger.extract_annotations(text),
+                                          number=1, repeat=REPETITIONS))
+        print('{:>22} | {:>6} | {:>10.4f} {:>10.4f} {:>7.2f}x'.format(name, len(ruleset.static_rules),
+              separate_time, combined_time, separate_time / combined_time))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        for file_name in sys.argv[1:]:
+            with open(file_name, 'r', encoding='utf-8') as in_f:
+                benchmark(file_name, in_f.read())
+    else:
+        benchmark('prose text', '\n'.join([PROSE_TEXT] * 200))
+        benchmark('numbers text', '\n'.join([NUMBERS_TEXT] * 200))
@@ -0,0 +1,68 @@
+#
+#  Compares the JSON format and the binary compact format of Text
+#  objects: sizes of the exported data, and times of the export and
+#  the import.
+#
+#  Usage:
+#     python benchmark_binary_format.py [text_file1.txt text_file2.txt ...]
+#
+#  If no input files are given, uses a sample text repeated multiple times.
+#  Texts are annotated with the morph_analysis layer (and its dependencies)
+#  before the benchmarking.
+#
+
+import sys
+import zlib
+import timeit
+
+from estnltk import Text
+from estnltk.converters import text_to_json, json_to_text
+from estnltk.converters import text_to_binary, binary_to_text
+
+SAMPLE_TEXT = \
+'''Kui sa tahad Eestis kõrgema hariduse omandada, siis sa pead sisseastumisel
+sooritama eksami. Eksam koosneb kahest osast. Esimene osa on kirjalik ja teine
+suuline. Kirjalikus osas tuleb lahendada ülesandeid ja kirjutada lühike essee.
+Suulises osas tuleb vastata komisjoni küsimustele. Tulemused avaldatakse nädala
+jooksul pärast eksami toimumist. Edu!'''
+
+REPETITIONS = 5
+
+
+def load_texts(file_names):
+    texts = []
+    if file_names:
+        for file_name in file_names:
+            with open(file_name, 'r', encoding='utf-8') as in_f:
+                texts.append( Text(in_f.read()) )
+    else:
+        for repeat in [1, 10, 100, 1000]:
+            texts.append( Text('\n'.join([SAMPLE_TEXT] * repeat)) )
+    for text in texts:
+        text.tag_layer('morph_analysis')
+    return texts
+
+
+def benchmark(texts):
+    print('{:>8} | {:>10} {:>10} {:>6} | {:>10} {:>10} | {:>10} {:>10} | {:>10} {:>10}'.format('words',
+          'json size', 'bin size', 'ratio', 'json zlib', 'bin zlib',
+          'json out', 'bin out', 'json in', 'bin in'))
+    for text in texts:
+        json_data = text_to_json(text)
+        binary_data = text_to_binary(text)
+        # Sanity check: results must be the same
+        assert binary_to_text(binary_data) == json_to_text(json_data)
+        json_size = len(json_data.encode('utf-8'))
+        binary_size = len(binary_data)
+        json_export = min( timeit.repeat(lambda: text_to_json(text), number=1, repeat=REPETITIONS) )
+        binary_export = min( timeit.repeat(lambda: text_to_binary(text), number=1, repeat=REPETITIONS) )
+        json_import = min( timeit.repeat(lambda: json_to_text(json_data), number=1, repeat=REPETITIONS) )
+        binary_import = min( timeit.repeat(lambda: binary_to_text(binary_data), number=1, repeat=REPETITIONS) )
+        print('{:>8} | {:>10} {:>10} {:>5.2f}x | {:>10} {:>10} | {:>9.4f}s {:>9.4f}s | {:>9.4f}s {:>9.4f}s'.format(
+              len(text['words']), json_size, binary_size, json_size / binary_size,
+              len(zlib.compress(json_data.encode('utf-8'))), len(zlib.compress(binary_data)),
+              json_export, binary_export, json_import, binary_import))
+
+
+if __name__ == '__main__':
+    benchmark( load_texts(sys.argv[1:]) )
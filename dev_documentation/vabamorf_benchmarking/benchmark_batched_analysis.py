@@ -0,0 +1,67 @@
+#
+#  Compares the speed of VabamorfAnalyzer's sentence by sentence
+#  analysis (default) and the analysis of multiple sentences with
+#  a single call to Vabamorf (batch_sentences=True).
+#
+#  Usage:
+#     python benchmark_batched_analysis.py [text_file1.txt text_file2.txt ...]
+#
+#  If no input files are given, uses a sample text repeated multiple times.
+#  Reports average processing times and speeds (words per second) for
+#  analysing each document.
+#
+
+import sys
+import timeit
+
+from estnltk import Text
+from estnltk.converters import layer_to_dict
+from estnltk.taggers.standard.morph_analysis.morf import VabamorfAnalyzer
+
+SAMPLE_TEXT = \
+'''Kui sa tahad Eestis kõrgema hariduse omandada, siis sa pead sisseastumisel
+sooritama eksami. Eksam koosneb kahest osast. Esimene osa on kirjalik ja teine
+suuline. Kirjalikus osas tuleb lahendada ülesandeid ja kirjutada lühike essee.
+Suulises osas tuleb vastata komisjoni küsimustele. Tulemused avaldatakse nädala
+jooksul pärast eksami toimumist. Edu!'''
+
+REPETITIONS = 5
+
+
+def load_texts(file_names):
+    texts = []
+    if file_names:
+        for file_name in file_names:
+            with open(file_name, 'r', encoding='utf-8') as in_f:
+                texts.append( Text(in_f.read()) )
+    else:
+        for repeat in [1, 10, 100, 1000]:
+            texts.append( Text('\n'.join([SAMPLE_TEXT] * repeat)) )
+    for text in texts:
+        text.tag_layer(['words', 'sentences'])
+    return texts
+
+
+def benchmark(texts):
+    sentence_analyzer = VabamorfAnalyzer()
+    batch_analyzer = VabamorfAnalyzer(batch_sentences=True)
+    print('{:>10} {:>10} | {:>12} {:>12} | {:>12} {:>12} | {:>8}'.format('sentences', 'words',
+          'by sentence', 'words/s', 'batched', 'words/s', 'speedup'))
+    for text in texts:
+        # Sanity check: results must be the same
+        assert layer_to_dict( sentence_analyzer.make_layer(text) ) == \
+               layer_to_dict( batch_analyzer.make_layer(text) )
+        words = len(text['words'])
+        sentence_time = min( timeit.repeat(lambda: sentence_analyzer.make_layer(text),
+                                           number=1, repeat=REPETITIONS) )
+        batch_time = min( timeit.repeat(lambda: batch_analyzer.make_layer(text),
+                                        number=1, repeat=REPETITIONS) )
+        print('{:>10} {:>10} | {:>11.4f}s {:>12.0f} | {:>11.4f}s {:>12.0f} | {:>7.2f}x'.format(
+              len(text['sentences']), words,
+              sentence_time, words / sentence_time,
+              batch_time, words / batch_time,
+              sentence_time / batch_time))
+
+
+if __name__ == '__main__':
+    benchmark( load_texts(sys.argv[1:]) )
@@ -2,8 +2,9 @@ from estnltk.collocation_net.base_collocation_net import BaseCollocationNet
 
 
 class AdverbVerbCollocationNet(BaseCollocationNet):
-    def __init__(self):
-        super(AdverbVerbCollocationNet, self).__init__(collocation_type='adverb_verb')
+    def __init__(self, mmap: bool = False, mmap_tables_path: str = None):
+        super(AdverbVerbCollocationNet, self).__init__(collocation_type='adverb_verb', mmap=mmap,
+                                                       mmap_tables_path=mmap_tables_path)
 
     def adverbs_used_with_verb(self, word: str, number_of_words: int = 10):
         return super().rows_used_with(word, number_of_words)
@@ -1,5 +1,6 @@
 import os
 import sqlite3
+import warnings
 import pandas as pd
 import numpy as np
 from typing import List
@@ -8,13 +9,72 @@ from importlib.util import find_spec
 
 from estnltk import get_resource_paths
 
+# Files of non-pickled tables that can be loaded with memory mapping
+MMAP_TABLE_FILES = {'rows': 'rows_str.npy',
+                    'columns': 'columns_str.npy',
+                    'topic_words': 'lda_topics_str.npy',
+                    'topic_offsets': 'lda_topic_offsets.npy',
+                    'column_dist_probs': 'lda_column_probabilities.npy'}
+
+
+def save_mmap_tables(path: str, output_path: str = None) -> None:
+    """
+    Converts CollocationNet's tables in the given data directory (e.g. 
+    '{base_path}/data/noun_adjective') into a form that can be loaded with 
+    memory mapping (see BaseCollocationNet's parameters mmap and mmap_tables_path), 
+    and saves them into output_path (defaults to the data directory):
+    * rows and columns are saved as fixed-width unicode arrays instead of 
+      pickled object arrays;
+    * topics are saved as a single unicode array of words and an array of 
+      offsets of the topics in it;
+    * column probabilities (column distribution normalized by columns) are 
+      precomputed.
+    """
+    rows = np.load(f"{path}/rows.npy", allow_pickle=True)
+    columns = np.load(f"{path}/columns.npy", allow_pickle=True)
+    topics = np.load(f"{path}/lda_topics.npy", allow_pickle=True)
+    column_dist = np.load(f"{path}/lda_column_distribution.npy")
+    topic_words = [str(word) for words in topics for word in words]
+    topic_offsets = np.cumsum([0] + [len(words) for words in topics])
+    tables = {'rows': np.array([str(word) for word in rows], dtype=str),
+              'columns': np.array([str(word) for word in columns], dtype=str),
+              'topic_words': np.array(topic_words, dtype=str),
+              'topic_offsets': topic_offsets.astype(np.int64),
+              'column_dist_probs': column_dist / column_dist.sum(axis=0)}
+    if output_path is None:
+        output_path = path
+    os.makedirs(output_path, exist_ok=True)
+    for name, table in tables.items():
+        # Write into a temporary file first, so that concurrent loaders never see a partial file
+        file_name = f"{output_path}/{MMAP_TABLE_FILES[name]}"
+        tmp_file_name = f"{file_name}.{os.getpid()}.tmp"
+        with open(tmp_file_name, 'wb') as out_f:
+            np.save(out_f, table)
+        os.replace(tmp_file_name, file_name)
+
+
 class BaseCollocationNet:
     """
     BaseCollocationNet class, serves as a base for CollocationNets
     with different collocation types.
     """
 
-    def __init__(self, collocation_type: str = 'noun_adjective', base_path: str = None, examples_file: str = None):
+    def __init__(self, collocation_type: str = 'noun_adjective', base_path: str = None, examples_file: str = None,
+                 mmap: bool = False, mmap_tables_path: str = None):
+        """
+        If mmap is True, then matrices and word tables are loaded with memory mapping 
+        (read-only): the data is read from the disk on demand, and the pages are shared 
+        by all processes (and CollocationNets) that use the same files. Memory mapping 
+        requires non-pickled tables created by the function save_mmap_tables. These 
+        tables are loaded from the subdirectory collocation_type of mmap_tables_path 
+        (e.g. a directory in the user's cache directory), or, if mmap_tables_path is None, 
+        from the data directory. If mmap_tables_path is given and the tables are missing, 
+        then the tables are created there upon the first load. The data directory itself 
+        is never modified upon loading: if mmap_tables_path is None and the tables are 
+        missing from the data directory, then CollocationNet is loaded without memory 
+        mapping. Note: delete the tables in mmap_tables_path after updating the resources 
+        of CollocationNet.
+        """
         if base_path is None:
             base_path = get_resource_paths("collocation_net", only_latest=True, download_missing=True)
             if base_path is None:
@@ -25,13 +85,58 @@ class BaseCollocationNet:
         self.examples_path = f"{base_path}/examples/{examples_file}.db"
         path = f"{base_path}/data/{collocation_type}"
         self.path = path
-        self.row_dist = np.load(f"{path}/lda_row_distribution.npy")
-        self.column_dist = np.load(f"{path}/lda_column_distribution.npy")
-        self.rows = np.load(f"{path}/rows.npy", allow_pickle=True)
-        self.columns = np.load(f"{path}/columns.npy", allow_pickle=True)
-        self.topics = np.load(f"{path}/lda_topics.npy", allow_pickle=True)
-
-        self.column_dist_probs = self.column_dist / self.column_dist.sum(axis=0)
+        self.mmap = mmap
+        self.mmap_tables_path = mmap_tables_path
+        tables_path = path if mmap_tables_path is None else f"{mmap_tables_path}/{collocation_type}"
+        if mmap and not all(os.path.exists(f"{tables_path}/{file}") for file in MMAP_TABLE_FILES.values()):
+            if mmap_tables_path is None:
+                warnings.warn(f"Tables for memory mapping are missing from {path!r}. Use mmap_tables_path "
+                              "to specify a directory for the tables, or create the tables with the function "
+                              "save_mmap_tables. Loading CollocationNet without memory mapping.")
+                self.mmap = False
+            else:
+                try:
+                    save_mmap_tables(path, tables_path)
+                except OSError as e:
+                    warnings.warn(f"Unable to create tables for memory mapping in {tables_path!r}: {e}. "
+                                  "Loading CollocationNet without memory mapping.")
+                    self.mmap = False
+        if self.mmap:
+            self.row_dist = np.load(f"{path}/lda_row_distribution.npy", mmap_mode='r')
+            self.column_dist = np.load(f"{path}/lda_column_distribution.npy", mmap_mode='r')
+            self.rows = np.load(f"{tables_path}/{MMAP_TABLE_FILES['rows']}", mmap_mode='r')
+            self.columns = np.load(f"{tables_path}/{MMAP_TABLE_FILES['columns']}", mmap_mode='r')
+            topic_words = np.load(f"{tables_path}/{MMAP_TABLE_FILES['topic_words']}", mmap_mode='r')
+            topic_offsets = np.load(f"{tables_path}/{MMAP_TABLE_FILES['topic_offsets']}")
+            self.topics = [topic_words[start:end] for start, end in zip(topic_offsets[:-1], topic_offsets[1:])]
+            self.column_dist_probs = np.load(f"{tables_path}/{MMAP_TABLE_FILES['column_dist_probs']}", mmap_mode='r')
+        else:
+            self.row_dist = np.load(f"{path}/lda_row_distribution.npy")
+            self.column_dist = np.load(f"{path}/lda_column_distribution.npy")
+            self.rows = np.load(f"{path}/rows.npy", allow_pickle=True)
+            self.columns = np.load(f"{path}/columns.npy", allow_pickle=True)
+            self.topics = np.load(f"{path}/lda_topics.npy", allow_pickle=True)
+
+            self.column_dist_probs = self.column_dist / self.column_dist.sum(axis=0)
+
+        # word -> index maps (the first index, if a word occurs several times)
+        self._row_indexes = self._build_index(self.rows)
+        self._column_indexes = self._build_index(self.columns)
+        # word -> index of the first topic containing the word
+        self._topic_indexes = dict()
+        for topic, words in enumerate(self.topics):
+            for word in words.tolist():
+                self._topic_indexes.setdefault(word, topic)
+        # nearest neighbour indexes (fitted on the first use)
+        self._row_neighbours = None
+        self._column_neighbours = None
+
+    @staticmethod
+    def _build_index(words) -> dict:
+        index = dict()
+        for i, word in enumerate(words.tolist()):
+            index.setdefault(word, i)
+        return index
 
     def is_package_installed(self, module: str) -> bool:
         """
@@ -45,19 +150,57 @@ class BaseCollocationNet:
         Returns the index of the word in a row. Words in the dataset rows were
         used as documents when training the LDA model.
         """
-        for i, noun in enumerate(self.rows):
-            if noun == word:
-                return i
-        raise ValueError(f"Word '{word}' not in the dataset.")
+        index = self._row_indexes.get(word)
+        if index is None:
+            raise ValueError(f"Word '{word}' not in the dataset.")
+        return index
 
     def column_index(self, word: str) -> int:
         """
         Returns the index of the word in a column.
         """
-        for i, adj in enumerate(self.columns):
-            if adj == word:
-                return i
-        raise ValueError(f"Word '{word}' not in the dataset.")
+        index = self._column_indexes.get(word)
+        if index is None:
+            raise ValueError(f"Word '{word}' not in the dataset.")
+        return index
+
+    def row_indexes(self, words: List[str]) -> np.ndarray:
+        """
+        Returns an array of row indexes of the given words.
+        """
+        return np.array([self.row_index(word) for word in words], dtype=int)
+
+    def column_indexes(self, words: List[str]) -> np.ndarray:
+        """
+        Returns an array of column indexes of the given words.
+        """
+        return np.array([self.column_index(word) for word in words], dtype=int)
+
+    def _check_sklearn(self):
+        if not self.is_package_installed("sklearn"):
+            raise ModuleNotFoundError('Missing sklearn module that is ' + \
+                                      'required for the functions finding similar words. Please install the ' + \
+                                      'module via conda or pip, e.g.\n pip install -U scikit-learn')
+
+    def _row_neighbour_index(self):
+        """
+        Returns the nearest neighbour index of rows. The index is fitted on the first call.
+        """
+        if self._row_neighbours is None:
+            self._check_sklearn()
+            from sklearn.neighbors import NearestNeighbors
+            self._row_neighbours = NearestNeighbors().fit(self.row_dist)
+        return self._row_neighbours
+
+    def _column_neighbour_index(self):
+        """
+        Returns the nearest neighbour index of columns. The index is fitted on the first call.
+        """
+        if self._column_neighbours is None:
+            self._check_sklearn()
+            from sklearn.neighbors import NearestNeighbors
+            self._column_neighbours = NearestNeighbors().fit(self.column_dist.T)
+        return self._column_neighbours
 
     def rows_used_with(self, word: str, number_of_words: int = 10) -> list:
         """
@@ -88,20 +231,21 @@ class BaseCollocationNet:
         Finds the most similar words to the given word using KNN based on
         the word distribution obtained from the LDA model.
         """
-        if not self.is_package_installed("sklearn"):
-            raise ModuleNotFoundError('Missing sklearn module that is ' + \
-                                      'required for the functions finding similar words. Please install the ' + \
-                                      'module via conda or pip, e.g.\n pip install -U scikit-learn')
-
-        from sklearn.neighbors import NearestNeighbors
+        return self.similar_rows_matrix([word], number_of_words)[0].tolist()
 
-        knn = NearestNeighbors(n_neighbors=number_of_words + 1).fit(self.row_dist)
-        idx_of_word = self.row_index(word)
+    def similar_rows_matrix(self, words: List[str], number_of_words: int = 10) -> np.ndarray:
+        """
+        Finds the most similar words for each of the given words at once. Returns an
+        array of shape (len(words), number_of_words), where the i-th row contains the
+        words most similar to words[i] (the same words as returned by similar_rows).
+        """
+        knn = self._row_neighbour_index()
+        word_ids = self.row_indexes(words)
 
-        neighbour_ids = knn.kneighbors(self.row_dist[idx_of_word].reshape(1, -1), return_distance=False)
-        neighbours = self.rows[neighbour_ids]
+        neighbour_ids = knn.kneighbors(self.row_dist[word_ids], n_neighbors=number_of_words + 1,
+                                       return_distance=False)
 
-        return list(neighbours[0])[1:]
+        return self.rows[neighbour_ids[:, 1:]]
 
     def similar_rows_for_list(self, words: list, number_of_words: int = 10) -> List[str]:
         """
@@ -109,10 +253,12 @@ class BaseCollocationNet:
         based on the word distribution obtained with the LDA model.
         """
         similar_for_each = {}
+        rank_for_each = {}
 
-        for word in words:
-            word_similar = self.similar_rows(word, self.rows.shape[0] - 1)
-            similar_for_each[word] = word_similar
+        similar_matrix = self.similar_rows_matrix(words, self.rows.shape[0] - 1)
+        for word, word_similar in zip(words, similar_matrix):
+            similar_for_each[word] = word_similar.tolist()
+            rank_for_each[word] = self._build_index(word_similar)
 
         common = []
 
@@ -120,14 +266,14 @@ class BaseCollocationNet:
             if row_words in words:
                 continue
 
-            is_in_all = sum([1 for l in words[1:] if row_words in similar_for_each[l]])
+            is_in_all = sum([1 for l in words[1:] if row_words in rank_for_each[l]])
             if is_in_all != len(words) - 1:
                 continue
 
             c = [row_words, i]
 
             for l in words[1:]:
-                c.append(similar_for_each[l].index(row_words))
+                c.append(rank_for_each[l][row_words])
 
             common.append(c)
 
@@ -145,21 +291,21 @@ class BaseCollocationNet:
         Finds the most similar words to the given word using KNN based on
         the word distribution obtained from the LDA model.
         """
-        if not self.is_package_installed("sklearn"):
-            raise ModuleNotFoundError('Missing sklearn module that is ' + \
-                                      'required for the functions finding similar words. Please install the ' + \
-                                      'module via conda or pip, e.g.\n pip install -U scikit-learn')
+        return self.similar_columns_matrix([word], number_of_words)[0].tolist()
 
-        from sklearn.neighbors import NearestNeighbors
-
-        column_vals = self.column_dist.T
-        knn = NearestNeighbors(n_neighbors=number_of_words + 1).fit(column_vals)
-        idx_of_word = self.column_index(word)
+    def similar_columns_matrix(self, words: List[str], number_of_words: int = 10) -> np.ndarray:
+        """
+        Finds the most similar words for each of the given words at once. Returns an
+        array of shape (len(words), number_of_words), where the i-th row contains the
+        words most similar to words[i] (the same words as returned by similar_columns).
+        """
+        knn = self._column_neighbour_index()
+        word_ids = self.column_indexes(words)
 
-        neighbour_ids = knn.kneighbors(column_vals[idx_of_word].reshape(1, -1), return_distance=False)
-        neighbours = self.columns[neighbour_ids]
+        neighbour_ids = knn.kneighbors(self.column_dist.T[word_ids], n_neighbors=number_of_words + 1,
+                                       return_distance=False)
 
-        return list(neighbours[0])[1:]
+        return self.columns[neighbour_ids[:, 1:]]
 
     def similar_columns_for_list(self, words: list, number_of_words: int = 10) -> List[str]:
         """
@@ -167,10 +313,12 @@ class BaseCollocationNet:
         based on the word distribution obtained with the LDA model.
         """
         similar_for_each = {}
+        rank_for_each = {}
 
-        for word in words:
-            word_similar = self.similar_columns(word, self.columns.shape[0] - 1)
-            similar_for_each[word] = word_similar
+        similar_matrix = self.similar_columns_matrix(words, self.columns.shape[0] - 1)
+        for word, word_similar in zip(words, similar_matrix):
+            similar_for_each[word] = word_similar.tolist()
+            rank_for_each[word] = self._build_index(word_similar)
 
         common = []
 
@@ -178,14 +326,14 @@ class BaseCollocationNet:
             if column_word in words:
                 continue
 
-            is_in_all = sum([1 for l in words[1:] if column_word in similar_for_each[l]])
+            is_in_all = sum([1 for l in words[1:] if column_word in rank_for_each[l]])
             if is_in_all != len(words) - 1:
                 continue
 
             c = [column_word, i]
 
             for l in words[1:]:
-                c.append(similar_for_each[l].index(column_word))
+                c.append(rank_for_each[l][column_word])
 
             common.append(c)
 
@@ -204,11 +352,11 @@ class BaseCollocationNet:
         returned shows all words assigned to this topic. Each word in
         the dataset was assigned to the topic with the highest probability.
         """
-        for topic, words in enumerate(self.topics):
-            if word in words:
-                return list(words)
+        topic_idx = self._topic_indexes.get(word)
+        if topic_idx is None:
+            raise ValueError(f"Word '{word}' not in dataset")
 
-        raise ValueError(f"Word '{word}' not in dataset")
+        return self.topics[topic_idx].tolist()
 
     def topic_words(self, word: str, number_of_words: int = 100):
         """
@@ -226,12 +374,7 @@ class BaseCollocationNet:
         from wordcloud import WordCloud
         import matplotlib.pyplot as plt
 
-        topic_idx = None
-
-        for topic, words in enumerate(self.topics):
-            if word in words.tolist():
-                topic_idx = topic
-                break
+        topic_idx = self._topic_indexes.get(word)
 
         if topic_idx is None:
             raise ValueError(f"Word '{word}' not in dataset")
@@ -285,7 +428,7 @@ class BaseCollocationNet:
             top_column_ind = np.argpartition(avg_per_column, -number_of_columns)[-number_of_columns:]
             top_column_ind = top_column_ind[np.argsort(avg_per_column[top_column_ind])][::-1]
             top_probs = avg_per_column[top_column_ind]
-            top_column_words = self.columns[top_column_ind]
+            top_column_words = self.columns[top_column_ind].tolist()
             return list(zip(*(top_column_words, top_probs)))
 
         results = []
@@ -313,7 +456,7 @@ class BaseCollocationNet:
             top_row_ind = np.argpartition(avg_per_row, -number_of_rows)[-number_of_rows:]
             top_row_ind = top_row_ind[np.argsort(avg_per_row[top_row_ind])][::-1]
             top_probs = avg_per_row[top_row_ind]
-            top_row_words = self.rows[top_row_ind]
+            top_row_words = self.rows[top_row_ind].tolist()
             return list(zip(*(top_row_words, top_probs)))
 
         results = []
@@ -324,6 +467,36 @@ class BaseCollocationNet:
 
         return sorted(results, key=lambda x: x[1], reverse=True)
 
+    def column_probability_matrix(self, rows: List[str], columns: List[str] = None) -> np.ndarray:
+        """
+        Calculates collocation probabilities for each pair of the given rows and columns
+        at once. Returns an array of shape (len(rows), len(columns)), where the element
+        [i, j] is the probability of the collocation of rows[i] and columns[j] (the same
+        probability as given by predict_column_probabilities). If columns are not provided,
+        all columns of the dataset are used.
+        """
+        row_topics = self.row_dist[self.row_indexes(rows)]
+        column_dist_probs = self.column_dist_probs
+        if columns is not None:
+            column_dist_probs = column_dist_probs[:, self.column_indexes(columns)]
+
+        return np.matmul(row_topics, column_dist_probs)
+
+    def row_probability_matrix(self, columns: List[str], rows: List[str] = None) -> np.ndarray:
+        """
+        Calculates collocation probabilities for each pair of the given columns and rows
+        at once. Returns an array of shape (len(columns), len(rows)), where the element
+        [i, j] is the probability of the collocation of columns[i] and rows[j] (the same
+        probability as given by predict_row_probabilities). If rows are not provided,
+        all rows of the dataset are used.
+        """
+        column_topics = self.column_dist_probs.T[self.column_indexes(columns)]
+        row_dist = self.row_dist
+        if rows is not None:
+            row_dist = row_dist[self.row_indexes(rows)]
+
+        return np.matmul(column_topics, row_dist.T)
+
     def predict_for_several_rows(self, words: list, number_of_columns: int = 10) -> List[tuple]:
         """
         Uses the function predict_column_probabilities to find most probable collocates with
@@ -364,7 +537,7 @@ class BaseCollocationNet:
             topic_columns = self.column_dist[topic_id]
             top_column_ind = np.argpartition(topic_columns, -number_of_columns)[-number_of_columns:]
             top_column_ind = top_column_ind[np.argsort(topic_columns[top_column_ind])][::-1]
-            predicted_topics.append((list(self.columns[top_column_ind]), topic_prob))
+            predicted_topics.append((self.columns[top_column_ind].tolist(), topic_prob))
 
         return predicted_topics
 
@@ -376,15 +549,11 @@ class BaseCollocationNet:
 
         topic_vector = self.row_dist[word_index]
         sorted_index = topic_vector.argsort()[::-1][:number_of_topics]
-        column_words_in_topics = pd.DataFrame(self.column_dist, columns=self.columns)
-
-        for i in sorted_index:
-            adjs = column_words_in_topics.loc[i][column_words_in_topics.loc[i] > 10].sort_values(ascending=False).index.tolist()
-            for a in adjs:
-                if a == column:
-                    return True
+        column_index = self._column_indexes.get(column)
+        if column_index is None:
+            return False
 
-        return False
+        return bool((self.column_dist[sorted_index, column_index] > 10).any())
 
     def examples(self, row: str, column: str, table_name: str) -> List[str]:
         conn = sqlite3.connect(self.examples_path)
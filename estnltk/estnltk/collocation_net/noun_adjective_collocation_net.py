@@ -2,8 +2,9 @@ from estnltk.collocation_net.base_collocation_net import BaseCollocationNet
 
 
 class NounAdjectiveCollocationNet(BaseCollocationNet):
-    def __init__(self):
-        super(NounAdjectiveCollocationNet, self).__init__(collocation_type='noun_adjective', examples_file='adjective_noun')
+    def __init__(self, mmap: bool = False, mmap_tables_path: str = None):
+        super(NounAdjectiveCollocationNet, self).__init__(collocation_type='noun_adjective', examples_file='adjective_noun', mmap=mmap,
+                                                          mmap_tables_path=mmap_tables_path)
 
     def nouns_used_with_adjective(self, word: str, number_of_words: int = 10):
         return super().rows_used_with(word, number_of_words)
@@ -2,8 +2,9 @@ from estnltk.collocation_net.base_collocation_net import BaseCollocationNet
 
 
 class VerbAdverbCollocationNet(BaseCollocationNet):
-    def __init__(self):
-        super(VerbAdverbCollocationNet, self).__init__(collocation_type='verb_adverb', examples_file='adverb_verb')
+    def __init__(self, mmap: bool = False, mmap_tables_path: str = None):
+        super(VerbAdverbCollocationNet, self).__init__(collocation_type='verb_adverb', examples_file='adverb_verb', mmap=mmap,
+                                                       mmap_tables_path=mmap_tables_path)
 
     def verbs_used_with_adverb(self, word: str, number_of_words: int = 10):
         return super().rows_used_with(word, number_of_words)
@@ -2,8 +2,9 @@ from estnltk.collocation_net.base_collocation_net import BaseCollocationNet
 
 
 class VerbObjectCollocationNet(BaseCollocationNet):
-    def __init__(self):
-        super(VerbObjectCollocationNet, self).__init__(collocation_type='verb_object', examples_file='object_verb')
+    def __init__(self, mmap: bool = False, mmap_tables_path: str = None):
+        super(VerbObjectCollocationNet, self).__init__(collocation_type='verb_object', examples_file='object_verb', mmap=mmap,
+                                                       mmap_tables_path=mmap_tables_path)
 
     def verbs_used_with_object(self, word: str, number_of_words: int = 10):
         return super().rows_used_with(word, number_of_words)
@@ -2,12 +2,16 @@ from estnltk.collocation_net.base_collocation_net import BaseCollocationNet
 
 
 class VerbPairRelationCollocationNet(BaseCollocationNet):
-    def __init__(self, rel_type: str = "case_deprel"):
+    def __init__(self, rel_type: str = "case_deprel", mmap: bool = False, mmap_tables_path: str = None):
         """
         :param rel_type: Type of relation to use for the Collocation Net. Currently possible
         options are 'case_deprel', 'numbered_case' and 'case_only'.
+        :param mmap: Whether matrices and word tables are loaded with memory mapping
+        (see BaseCollocationNet).
+        :param mmap_tables_path: Directory of the tables for memory mapping (see BaseCollocationNet).
         """
-        super(VerbPairRelationCollocationNet, self).__init__(collocation_type=rel_type)
+        super(VerbPairRelationCollocationNet, self).__init__(collocation_type=rel_type, mmap=mmap,
+                                                             mmap_tables_path=mmap_tables_path)
 
     def pairs_used_with_relation(self, word: str, number_of_words: int = 10):
         return super().rows_used_with(word, number_of_words)
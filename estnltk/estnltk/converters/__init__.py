@@ -24,6 +24,15 @@ from estnltk_core.converters.json_importer import json_to_text
 from estnltk_core.converters.json_importer import json_to_layer
 from estnltk_core.converters.json_importer import json_to_layers
 
+from estnltk_core.converters.jsonl_converter import write_texts_to_jsonl
+from estnltk_core.converters.jsonl_converter import iter_texts_from_jsonl
+
+from estnltk_core.converters.binary_exporter import text_to_binary
+from estnltk_core.converters.binary_exporter import layer_to_binary
+
+from estnltk_core.converters.binary_importer import binary_to_text
+from estnltk_core.converters.binary_importer import binary_to_layer
+
 from estnltk.converters.cg3.CG3_exporter import export_CG3
 from estnltk.converters.cg3.CG3_importer import import_CG3
 
@@ -4,6 +4,7 @@
 from estnltk_core.taggers import TaggerLoader
 from estnltk_core.taggers_registry import TaggersRegistry
 from estnltk_core.layer_resolver import LayerResolver
+from estnltk_core.layer_resolver import tag_layers_parallel as _tag_layers_parallel
 
 # Load default configuration for morph analyser
 from estnltk.common import DEFAULT_PARAM_DISAMBIGUATE, DEFAULT_PARAM_GUESS
@@ -224,4 +225,31 @@ def make_resolver(
 DEFAULT_RESOLVER = make_resolver()
 """
 LayerResolver with EstNLTK's default NLP pipeline.
-"""
\ No newline at end of file
+"""
+
+
+def tag_layers_parallel(texts, layers=None, resolver_factory=make_resolver, workers=None, 
+                        chunksize=1, lazy=False, mp_context=None):
+    """
+    Tags given layers (along with their prerequisite layers) on multiple Text 
+    objects in parallel, using a pool of worker processes. Returns tagged Text 
+    objects in the same order as they were in the input. 
+    
+    By default, each worker process creates its own resolver via make_resolver(). 
+    For customizing the pipeline, pass a picklable function creating the resolver 
+    as resolver_factory, e.g. functools.partial(make_resolver, guess=False). 
+    Vabamorf is re-initialised in each worker process (see Vabamorf.instance()). 
+    
+    Example:
+    
+        from estnltk.default_resolver import tag_layers_parallel
+        
+        texts = [Text(raw_text) for raw_text in raw_texts]
+        for text in tag_layers_parallel(texts, ['morph_analysis'], workers=4, lazy=True):
+            ...
+    
+    For details on parameters, see tag_layers_parallel in estnltk_core.layer_resolver.
+    """
+    return _tag_layers_parallel(texts, layers=layers, resolver_factory=resolver_factory, 
+                                workers=workers, chunksize=chunksize, lazy=lazy, 
+                                mp_context=mp_context)
@@ -6,9 +6,13 @@
 #
 
 import subprocess
+import threading
 import atexit
+import math
 import os
 
+from concurrent.futures import ThreadPoolExecutor
+
 from estnltk_core.converters import as_unicode, as_binary
 
 # keep track of started java processes
@@ -35,11 +39,18 @@ class JavaProcess( object ):
     To implement a Java component, inherit from this class and use
     `process_line` method to interact with the process.
     
+    For processing many lines, use `process_lines` method, which 
+    streams lines into the process without waiting for the result 
+    of each line: results are read by a separate reader thread, and 
+    at most `max_lines_in_flight` lines are waiting for their results 
+    at any time. This avoids paying the round-trip latency of the 
+    pipes for each line.
+    
     It deals with input/output and errors.
     """
 
     def __init__(self, runnable_jar, jar_path=None, check_java=True, \
-                       lazy_initialize=True, args=[]):
+                       lazy_initialize=True, args=[], max_lines_in_flight=100):
         """Initialize a Java VM.
         
         Parameters
@@ -69,6 +80,10 @@ class JavaProcess( object ):
             (default: True)
         args: list of str
             The list of arguments given to the Java program.
+        max_lines_in_flight: int
+            The maximum number of lines that process_lines() sends 
+            to the Java process ahead of reading their results.
+            (default: 100)
         """
         if jar_path:
             runnable_jar = os.path.join(jar_path, runnable_jar)
@@ -76,6 +91,9 @@ class JavaProcess( object ):
         self._process      = None
         self._java_args    = args
         self._runnable_jar = runnable_jar
+        if max_lines_in_flight < 1:
+            raise ValueError('(!) max_lines_in_flight should be a positive integer, not {!r}'.format(max_lines_in_flight))
+        self._max_lines_in_flight = max_lines_in_flight
         if not lazy_initialize:
             self.initialize_java_subprocess()
 
@@ -134,29 +152,326 @@ class JavaProcess( object ):
         IoError
             In case it was impossible to read or write from the subprocess standard input / output.
         """
-        # Lazy initialization:
-        if self._process is None:
-            self.initialize_java_subprocess()
-        else:
-            assert self._process.poll() is None, \
-               '(!) The tagger cannot be used anymore, '+\
-               'because its Java process has been terminated.'
-        
+        self._check_java_subprocess()
         assert isinstance(line, str)
         try:
             self._process.stdin.write(as_binary(line))
             self._process.stdin.write(as_binary('\n'))
             self._process.stdin.flush()
-            result = as_unicode(self._process.stdout.readline())
-            if result == '':
-                stderr = as_unicode(self._process.stderr.read())
-                raise Exception('EOF encountered while reading stream. Stderr is {0}.'.format(stderr))
-            return result
+            return self._read_result(self._process)
         except Exception:
             self._process.terminate()
             raise
 
 
+    def process_lines(self, lines):
+        """Process multiple lines of data.
+        
+        Streams the lines through the pipe to the process without waiting for 
+        the result of each line. Results are read by a separate reader thread. 
+        At most max_lines_in_flight lines are sent ahead of their results, so 
+        the pipes are not overfilled. Returns resulting lines in the order of 
+        the input lines.
+        
+        Note: self._process is None (lazy initialization), then calls initialize_java_subprocess() 
+        before processing the lines.
+        
+        Parameters
+        ----------
+        
+        lines: Iterable[str]
+            The data sent to process. Make sure that lines do not contain any newline characters.
+        
+        Returns
+        -------
+        List[str]: The lines returned by the Java process
+        
+        Raises
+        ------
+        Exception
+            In case of EOF is encountered.
+        IoError
+            In case it was impossible to read or write from the subprocess standard input / output.
+        """
+        lines = list(lines)
+        if not lines:
+            return []
+        self._check_java_subprocess()
+        for line in lines:
+            assert isinstance(line, str)
+        process = self._process
+        results = []
+        errors = []
+        # Released each time a result has been read (or reading has failed)
+        window = threading.Semaphore( self._max_lines_in_flight )
+        def read_results():
+            try:
+                for i in range(len(lines)):
+                    results.append(self._read_result(process))
+                    window.release()
+            except Exception as error:
+                errors.append(error)
+                window.release()
+        reader = threading.Thread(target=read_results, daemon=True)
+        reader.start()
+        try:
+            for line in lines:
+                if not window.acquire(blocking=False):
+                    # The window is full: make sure that the Java process 
+                    # has got all the pending lines before waiting
+                    process.stdin.flush()
+                    window.acquire()
+                if errors:
+                    break
+                process.stdin.write(as_binary(line))
+                process.stdin.write(as_binary('\n'))
+            if not errors:
+                process.stdin.flush()
+        except Exception:
+            process.terminate()
+            reader.join()
+            raise
+        reader.join()
+        if errors:
+            process.terminate()
+            raise errors[0]
+        return results
+
+
+    def _read_result(self, process):
+        """Reads the result of a single input line from the standard output of the process. 
+           Override this method if the Java component outputs multiple lines per input."""
+        result = as_unicode(process.stdout.readline())
+        if result == '':
+            stderr = as_unicode(process.stderr.read())
+            raise Exception('EOF encountered while reading stream. Stderr is {0}.'.format(stderr))
+        return result
+
+
+    def _check_java_subprocess(self):
+        """Initializes java subprocess if it has not been initialized yet (lazy initialization). 
+           Otherwise, checks that the subprocess is still running."""
+        if self._process is None:
+            self.initialize_java_subprocess()
+        else:
+            assert self._process.poll() is None, \
+               '(!) The tagger cannot be used anymore, '+\
+               'because its Java process has been terminated.'
+
+
+    @property
+    def is_initialized(self):
+        """Whether the java subprocess has been initialized."""
+        return self._process is not None
+
+
+    def is_alive(self):
+        """Checks whether the java subprocess has been initialized and is still running."""
+        return self._process is not None and self._process.poll() is None
+
+
+    def terminate_java_subprocess(self):
+        """Terminates the java subprocess (if it has been initialized)."""
+        if self._process is not None: # if the process was initialized
+            # The proper way to terminate the process:
+            # 1) Send out the terminate signal
+            self._process.terminate()
+            # 2) Interact with the process. Read data from stdout and stderr, 
+            #    until end-of-file is reached. Wait for process to terminate.
+            self._process.communicate()
+            # 3) Assert that the process terminated
+            assert self._process.poll() is not None
+            # 4) Forget the terminated process
+            if self._process in _STARTED_JAVA_PROCESSES:
+                _STARTED_JAVA_PROCESSES.remove( self._process )
+
+
+# ==============================================================================
+#   Pool of Java processes running the same component
+# ==============================================================================
+
+class JavaProcessPool( object ):
+    """A pool of Java VMs running the same Java-based component.
+    
+    Has the same interface as JavaProcess, but dispatches lines to 
+    multiple Java processes (workers), so that processing scales with 
+    the number of cores. process_lines() splits lines into contiguous 
+    chunks, one per worker, processes the chunks in parallel (each 
+    worker is fed by its own thread) and returns results in the order 
+    of the input lines. process_line() sends lines to the workers in 
+    turns. The pool can be used by multiple threads at once: a worker 
+    processes only one chunk at a time, and chunks of other threads 
+    wait until the worker is free. 
+    
+    Workers are started lazily, when they are used first time. Before 
+    each use, the worker is checked, and if its process has crashed, 
+    the worker is restarted. If processing of a chunk fails, the worker 
+    is restarted and the chunk is processed once more. 
+    Note: this assumes that the component processes each line 
+    independently of the previous lines.
+    """
+
+    def __init__(self, runnable_jar, jar_path=None, check_java=True, \
+                       lazy_initialize=True, args=[], max_lines_in_flight=100, \
+                       workers=None):
+        """Initialize a pool of Java VMs.
+        
+        Parameters
+        ----------
+        runnable_jar, jar_path, check_java, args, max_lines_in_flight
+            Parameters of each worker. See JavaProcess for details.
+        lazy_initialize: boolean
+            If set, then java subprocesses will not be initialized at 
+            the constructor, but each worker will be initialized when 
+            it is used first time. Otherwise, all java subprocesses 
+            will be initialized right away.
+            (default: True)
+        workers: int
+            The number of Java processes in the pool. If not specified, 
+            uses os.cpu_count() processes.
+            (default: None)
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError('(!) Number of workers should be a positive integer, not {!r}'.format(workers))
+        self._check_java = check_java
+        self._workers = [self._make_worker(runnable_jar, jar_path, args, max_lines_in_flight) \
+                         for i in range(workers)]
+        # Each worker is locked while it processes a chunk
+        self._worker_locks = {id(worker): threading.Lock() for worker in self._workers}
+        self._next_worker = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._terminated = False
+        if not lazy_initialize:
+            self.initialize_java_subprocess()
+
+
+    def _make_worker(self, runnable_jar, jar_path, args, max_lines_in_flight):
+        """Creates a worker (with lazy initialization). Java's accessibility is 
+           checked by the pool, so workers do not check it."""
+        return JavaProcess(runnable_jar, jar_path=jar_path, check_java=False, \
+                           lazy_initialize=True, args=args, \
+                           max_lines_in_flight=max_lines_in_flight)
+
+
+    @property
+    def workers(self):
+        """The number of Java processes in the pool."""
+        return len(self._workers)
+
+
+    def initialize_java_subprocess(self):
+        """Checks for java's accessibility (if _check_java==True), and initializes 
+           java subprocesses of all workers that are not running."""
+        self._check_pool()
+        for worker in self._workers:
+            with self._worker_locks[id(worker)]:
+                self._check_worker(worker)
+                if not worker.is_initialized:
+                    worker.initialize_java_subprocess()
+
+
+    def process_line(self, line):
+        """Process a line of data with the next worker. 
+           See JavaProcess.process_line for details."""
+        return self.process_lines([line])[0]
+
+
+    def process_lines(self, lines):
+        """Process multiple lines of data. Lines are split into contiguous chunks, 
+           and the chunks are processed by different workers in parallel. 
+           Returns resulting lines in the order of the input lines. 
+           See JavaProcess.process_lines for details."""
+        lines = list(lines)
+        if not lines:
+            return []
+        self._check_pool()
+        chunks_count = min(len(self._workers), len(lines))
+        chunk_size = math.ceil(len(lines) / chunks_count)
+        chunks = [lines[i:i+chunk_size] for i in range(0, len(lines), chunk_size)]
+        with self._lock:
+            first_worker = self._next_worker
+            self._next_worker = (first_worker + len(chunks)) % len(self._workers)
+            if len(chunks) > 1 and self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=len(self._workers))
+        workers = [self._workers[(first_worker + i) % len(self._workers)] for i in range(len(chunks))]
+        if len(chunks) == 1:
+            return self._process_chunk(workers[0], chunks[0])
+        futures = [self._executor.submit(self._process_chunk, worker, chunk) \
+                   for worker, chunk in zip(workers, chunks)]
+        results = []
+        for future in futures:
+            results.extend( future.result() )
+        return results
+
+
+    def _process_chunk(self, worker, lines):
+        """Processes lines with the worker. If processing fails, restarts the 
+           worker and processes the lines once more. The worker is locked for 
+           the whole time, so that lines of other chunks are not mixed in."""
+        with self._worker_locks[id(worker)]:
+            self._check_worker(worker)
+            try:
+                return worker.process_lines(lines)
+            except Exception:
+                if self._terminated:
+                    raise
+            self._restart_worker(worker)
+            return worker.process_lines(lines)
+
+
+    def _check_pool(self):
+        """Checks that the pool has not been terminated, and checks for java's 
+           accessibility when the pool is used first time (if _check_java==True)."""
+        assert not self._terminated, \
+               '(!) The tagger cannot be used anymore, '+\
+               'because its Java processes have been terminated.'
+        if self._check_java:
+            JavaProcess.check_for_java_accessibility()
+            self._check_java = False
+
+
+    def _check_worker(self, worker):
+        """If the process of the worker has crashed, restarts the worker."""
+        if worker.is_initialized and not worker.is_alive():
+            self._restart_worker(worker)
+
+
+    def _restart_worker(self, worker):
+        """Terminates the process of the worker. A new process will be 
+           initialized when the worker is used next time."""
+        worker.terminate_java_subprocess()
+        worker._process = None
+
+
+    @property
+    def is_initialized(self):
+        """Whether java subprocess of any worker has been initialized."""
+        return any(worker.is_initialized for worker in self._workers)
+
+
+    def is_alive(self):
+        """Checks whether the pool has not been terminated and java subprocess 
+           of any worker is running."""
+        return not self._terminated and any(worker.is_alive() for worker in self._workers)
+
+
+    def terminate_java_subprocess(self):
+        """Terminates java subprocesses of all workers (if the pool has been 
+           used). The pool cannot be used after the termination."""
+        if not self.is_initialized and self._executor is None:
+            # Nothing has been started yet (as in JavaProcess)
+            return
+        self._terminated = True
+        for worker in self._workers:
+            worker.terminate_java_subprocess()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
 # ==============================================================================
 #   Clean-up : terminate all started java processes
 # ==============================================================================
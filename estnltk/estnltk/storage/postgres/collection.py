@@ -1,5 +1,6 @@
 import collections
 import json
+import multiprocessing
 import re
 import time
 from contextlib import contextmanager
@@ -44,6 +45,78 @@ class PgCollectionException(Exception):
 
 RowMapperRecord = collections.namedtuple("RowMapperRecord", ["layer", "meta"])
 
+
+class _TaggerRowMapper:
+    """Default row mapper of PgCollection.create_layer: creates the layer with the tagger.
+       (Unlike a closure, this can be passed to a worker process.)"""
+
+    def __init__(self, tagger):
+        self.tagger = tagger
+
+    def __call__(self, row):
+        text_id, text = row[0], row[1]
+        status = {}
+        layer = self.tagger.make_layer(text=text, status=status)
+        return RowMapperRecord(layer=layer, meta=status)
+
+
+# row_mapper of the create_layer worker process
+_worker_row_mapper = None
+
+
+def _init_row_mapper_worker(row_mapper):
+    global _worker_row_mapper
+    _worker_row_mapper = row_mapper
+
+
+def _map_rows_in_worker(rows):
+    """Applies row mapper on a chunk of rows. Returns list of (text_id, record) pairs.
+       If mapping fails, the exception is returned in place of the record, so that 
+       the writer process can re-raise it and report the id of the failed document."""
+    results = []
+    for row in rows:
+        try:
+            results.append((row[0], _worker_row_mapper(row)))
+        except Exception as error:
+            results.append((row[0], error))
+            break
+    return results
+
+
+def _iterate_mapped_rows(data_iterator, row_mapper, workers, chunksize):
+    """Yields (text_id, record) pairs in the order of data_iterator. 
+       If workers > 1, row_mapper is applied in a pool of worker processes. 
+       Only a limited number of chunks are sent to the workers at once, 
+       so data_iterator is not read ahead of the writer too far.
+    """
+    if workers is None or workers == 1:
+        for row in data_iterator:
+            try:
+                record = row_mapper(row)
+            except Exception as error:
+                record = error
+            yield row[0], record
+        return
+    # Note: with the 'fork' start method (default on Linux), worker processes
+    # inherit row_mapper (and the tagger) without pickling. With other start
+    # methods, row_mapper must be picklable
+    max_pending_chunks = 2 * workers
+    with multiprocessing.Pool(processes=workers, initializer=_init_row_mapper_worker,
+                              initargs=(row_mapper,)) as pool:
+        pending = collections.deque()
+        chunk = []
+        for row in data_iterator:
+            chunk.append(row)
+            if len(chunk) == chunksize:
+                pending.append(pool.apply_async(_map_rows_in_worker, (chunk,)))
+                chunk = []
+                if len(pending) >= max_pending_chunks:
+                    yield from pending.popleft().get()
+        if chunk:
+            pending.append(pool.apply_async(_map_rows_in_worker, (chunk,)))
+        while pending:
+            yield from pending.popleft().get()
+
 class PgCollection:
     """
     Collection of Text objects and their metadata in the database.
@@ -626,7 +699,8 @@ class PgCollection:
                progressbar: str = None,
                return_index: bool = True,
                itersize: int= 10,
-               keep_all_texts: bool = True):
+               keep_all_texts: bool = True,
+               lazy: bool = False):
         """
         Creates a query / selection over text objects of the collection. 
 
@@ -657,6 +731,11 @@ class PgCollection:
             quieried sparse layer tables will be excluded from the results. 
             this can speed up the query. 
             this parameter affects both selected layers and layers specified in query.  
+        :param lazy: bool
+            whether layers of the returned text objects are deserialised only on 
+            the first access (e.g. text['words']). this makes selecting many layers 
+            cheap if only some of them are actually used. 
+            default: False
         :return: PgSubCollection
             a read-only subset of this collection, which can be iterated and further 
             sub-selected
@@ -671,7 +750,8 @@ class PgCollection:
                                   progressbar=progressbar,
                                   return_index=return_index,
                                   itersize=itersize,
-                                  keep_all_texts=keep_all_texts
+                                  keep_all_texts=keep_all_texts,
+                                  lazy=lazy
                                   )
 
     def __len__(self):
@@ -1162,7 +1242,7 @@ class PgCollection:
 
     def create_layer(self, layer_template=None, data_iterator=None, row_mapper=None, tagger=None,
                      create_index=False, ngram_index=None, overwrite=False, meta=None, progressbar=None,
-                     query_length_limit=5000000, mode=None, sparse=False):
+                     query_length_limit=5000000, mode=None, sparse=False, workers=None, chunksize=10):
         """
         Creates a new detached layer to this collection.
 
@@ -1225,10 +1305,23 @@ class PgCollection:
                 Whether the layer table is created as a sparse tabel which means that empty layers are not stored in
                 the table. The layer search and iteration process is faster on sparse tables.
                 Note that collection version 3.0 is required for sparse tables.
+            workers: int
+                Number of worker processes used for creating layers (applying the tagger 
+                or row_mapper). If None (default) or 1, layers are created in the current 
+                process. Otherwise, documents are distributed among a pool of worker 
+                processes, while the current process reads documents and inserts created 
+                layers (in the order of data_iterator) within a single transaction. 
+                With the 'fork' start method (default on Linux), workers inherit the 
+                tagger / row_mapper; on other platforms, these must be picklable.
+            chunksize: int
+                Number of documents sent to a worker process at once (if workers > 1).
         """
         if not self.exists():
             raise PgCollectionException("collection {!r} does not exist, can't create layer".format(self.name))
 
+        if workers is not None and workers < 1:
+            raise ValueError('(!) Number of workers should be a positive integer, not {!r}'.format(workers))
+
         if sparse and self.version < '3.0':
             raise PgCollectionException("Sparse tables are not supported in collection version {!r}.".format(self.version))
 
@@ -1249,14 +1342,8 @@ class PgCollection:
             mode = 'overwrite'
         mode = mode or 'new'
 
-        def default_row_mapper(row):
-            text_id, text = row[0], row[1]
-            status = {}
-            layer = tagger.make_layer(text=text, status=status)
-            return RowMapperRecord(layer=layer, meta=status)
-
         layer_name = tagger.output_layer if tagger is not None else layer_template.name
-        row_mapper = row_mapper or default_row_mapper
+        row_mapper = row_mapper or _TaggerRowMapper(tagger)
 
         missing_layer = layer_name if mode == 'append' else None
         if data_iterator is None:
@@ -1318,10 +1405,12 @@ class PgCollection:
                                                       query_length_limit=query_length_limit,
                                                       sparse=sparse ) as buffered_inserter:
 
-                    for row in data_iterator:
-                        collection_text_id, text = row[0], row[1]
-
-                        record = row_mapper(row)
+                    for collection_text_id, record in _iterate_mapped_rows(data_iterator, row_mapper,
+                                                                           workers, chunksize):
+                        if isinstance(record, Exception):
+                            # Re-raise the original exception of the row_mapper (the 
+                            # id of the failed document is logged below)
+                            raise record
                         layer = record.layer
 
                         extra_values = []
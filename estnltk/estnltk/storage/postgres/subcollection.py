@@ -56,7 +56,8 @@ class PgSubCollection:
     def __init__(self, collection: pg.PgCollection, selection_criterion: pg.WhereClause = None,
                  selected_layers: Sequence[str] = None, meta_attributes: Sequence[str] = None,
                  progressbar: str = None, return_index: bool = True, itersize: int = 50,
-                 skip_rows: int = None, limit_rows: int = None, keep_all_texts: bool = True ):
+                 skip_rows: int = None, limit_rows: int = None, keep_all_texts: bool = True,
+                 lazy: bool = False ):
         """
         :param collection: PgCollection
         :param selection_criterion: WhereClause
@@ -88,6 +89,10 @@ class PgSubCollection:
             (under the hood, this means using inner join for all layer tables, including 
             sparse ones). 
             this parameter affects both selected layers and selection_criterion layers. 
+        :param lazy: bool
+            whether layers of the text objects are deserialised only on the first
+            access (e.g. text['words']), instead of deserialising all selected
+            layers at once. default: False
         """
 
         #TODO: Make sure that all objects used by the class are independent copies and cannot be 
@@ -135,6 +140,8 @@ class PgSubCollection:
         # use left outer join for all required sparse layers
         # if False, then inner join is used instead
         self._left_join_sparse_layers = keep_all_texts
+        # deserialise layers of text objects on the first access
+        self.lazy = lazy
         
 
 
@@ -504,7 +511,8 @@ class PgSubCollection:
                                return_index=self.return_index,
                                limit_rows=self.limit_rows,
                                skip_rows=self.skip_rows,
-                               keep_all_texts=self._left_join_sparse_layers
+                               keep_all_texts=self._left_join_sparse_layers,
+                               lazy=self.lazy
                                )
 
     __read_cursor_counter = 0
@@ -652,7 +660,8 @@ class PgSubCollection:
                     meta_stop = 2 + len(self.meta_attributes)
                     meta = {attr: value for attr, value in zip(self.meta_attributes, row[2:meta_stop])}
                     layer_dicts = row[meta_stop:] if construction != 'JOIN' else row[meta_stop:-1]
-                    text = self.assemble_text_object(row[1], layer_dicts, self.selected_layers, structure)
+                    text = self.assemble_text_object(row[1], layer_dicts, self.selected_layers, structure,
+                                                     lazy=self.lazy)
                     yield row[0], text, meta
 
             elif self.meta_attributes:
@@ -661,20 +670,23 @@ class PgSubCollection:
                     meta_stop = 2 + len(self.meta_attributes)
                     meta = {attr: value for attr, value in zip(self.meta_attributes, row[2:meta_stop])}
                     layer_dicts = row[meta_stop:] if construction != 'JOIN' else row[meta_stop:-1]
-                    text = self.assemble_text_object(row[1], layer_dicts, self.selected_layers, structure)
+                    text = self.assemble_text_object(row[1], layer_dicts, self.selected_layers, structure,
+                                                     lazy=self.lazy)
                     yield text, meta
 
             elif self.return_index:
                 for row in data_iterator:
                     data_iterator.set_description('collection_id: {}'.format(row[0]), refresh=False)
                     layer_dicts = row[2:] if construction != 'JOIN' else row[2:-1]
-                    yield row[0], self.assemble_text_object(row[1], layer_dicts, self.selected_layers, structure)
+                    yield row[0], self.assemble_text_object(row[1], layer_dicts, self.selected_layers, structure,
+                                                            lazy=self.lazy)
 
             else:
                 for row in data_iterator:
                     data_iterator.set_description('collection_id: {}'.format(row[0]), refresh=False)
                     layer_dicts = row[2:] if construction != 'JOIN' else row[2:-1]
-                    yield self.assemble_text_object(row[1], row[2:-1], self.selected_layers, structure)
+                    yield self.assemble_text_object(row[1], row[2:-1], self.selected_layers, structure,
+                                                    lazy=self.lazy)
 
 
     def sample_from_layer(self, layer, amount, amount_type:str='PERCENTAGE', seed=None):
@@ -800,7 +812,8 @@ class PgSubCollection:
                         text_obj_dict['layers'] = [layer_with_rnd if layer['name']==layer_with_rnd['name'] else layer for layer in text_obj_dict['layers']]
                     else:
                         layer_dicts = [layer_with_rnd if layer['name']==layer_with_rnd['name'] else layer for layer in layer_dicts]
-                    text = self.assemble_text_object(text_obj_dict, layer_dicts, self.selected_layers, structure)
+                    text = self.assemble_text_object(text_obj_dict, layer_dicts, self.selected_layers, structure,
+                                                     lazy=self.lazy)
                     yield row[0], text, meta
 
             elif self.meta_attributes:
@@ -816,7 +829,8 @@ class PgSubCollection:
                         text_obj_dict['layers'] = [layer_with_rnd if layer['name']==layer_with_rnd['name'] else layer for layer in text_obj_dict['layers']]
                     else:
                         layer_dicts = [layer_with_rnd if layer['name']==layer_with_rnd['name'] else layer for layer in layer_dicts]
-                    text = self.assemble_text_object(text_obj_dict, layer_dicts, self.selected_layers, structure)
+                    text = self.assemble_text_object(text_obj_dict, layer_dicts, self.selected_layers, structure,
+                                                     lazy=self.lazy)
                     yield text, meta
 
             elif self.return_index:
@@ -830,7 +844,8 @@ class PgSubCollection:
                         text_obj_dict['layers'] = [layer_with_rnd if layer['name']==layer_with_rnd['name'] else layer for layer in text_obj_dict['layers']]
                     else:
                         layer_dicts = [layer_with_rnd if layer['name']==layer_with_rnd['name'] else layer for layer in layer_dicts]
-                    yield row[0], self.assemble_text_object(text_obj_dict, layer_dicts, self.selected_layers, structure)
+                    yield row[0], self.assemble_text_object(text_obj_dict, layer_dicts, self.selected_layers, structure,
+                                                            lazy=self.lazy)
 
             else:
                 for row in data_iterator:
@@ -843,7 +858,8 @@ class PgSubCollection:
                         text_obj_dict['layers'] = [layer_with_rnd if layer['name']==layer_with_rnd['name'] else layer for layer in text_obj_dict['layers']]
                     else:
                         layer_dicts = [layer_with_rnd if layer['name']==layer_with_rnd['name'] else layer for layer in layer_dicts]
-                    yield self.assemble_text_object(text_obj_dict, layer_dicts, self.selected_layers, structure)
+                    yield self.assemble_text_object(text_obj_dict, layer_dicts, self.selected_layers, structure,
+                                                    lazy=self.lazy)
 
 
     def permutate(self, seed=None):
@@ -906,7 +922,8 @@ class PgSubCollection:
                     data_iterator.set_description('collection_id: {}'.format(row[0]), refresh=False)
                     meta_stop = 2 + len(self.meta_attributes)
                     meta = {attr: value for attr, value in zip(self.meta_attributes, row[2:meta_stop])}
-                    text = self.assemble_text_object(row[1], row[meta_stop:], self.selected_layers, structure)
+                    text = self.assemble_text_object(row[1], row[meta_stop:], self.selected_layers, structure,
+                                                     lazy=self.lazy)
                     yield row[0], text, meta
 
             elif self.meta_attributes:
@@ -914,18 +931,21 @@ class PgSubCollection:
                     data_iterator.set_description('collection_id: {}'.format(row[0]), refresh=False)
                     meta_stop = 2 + len(self.meta_attributes)
                     meta = {attr: value for attr, value in zip(self.meta_attributes, row[2:meta_stop])}
-                    text = self.assemble_text_object(row[1], row[meta_stop:], self.selected_layers, structure)
+                    text = self.assemble_text_object(row[1], row[meta_stop:], self.selected_layers, structure,
+                                                     lazy=self.lazy)
                     yield text, meta
 
             elif self.return_index:
                 for row in data_iterator:
                     data_iterator.set_description('collection_id: {}'.format(row[0]), refresh=False)
-                    yield row[0], self.assemble_text_object(row[1], row[2:], self.selected_layers, structure)
+                    yield row[0], self.assemble_text_object(row[1], row[2:], self.selected_layers, structure,
+                                                            lazy=self.lazy)
 
             else:
                 for row in data_iterator:
                     data_iterator.set_description('collection_id: {}'.format(row[0]), refresh=False)
-                    yield self.assemble_text_object(row[1], row[2:], self.selected_layers, structure)
+                    yield self.assemble_text_object(row[1], row[2:], self.selected_layers, structure,
+                                                    lazy=self.lazy)
 
 
     def __iter__(self):
@@ -971,7 +991,8 @@ class PgSubCollection:
                     data_iterator.set_description('collection_id: {}'.format(row[0]), refresh=False)
                     meta_stop = 2 + len(self.meta_attributes)
                     meta = {attr: value for attr, value in zip(self.meta_attributes, row[2:meta_stop])}
-                    text = self.assemble_text_object(row[1], row[meta_stop:], self.selected_layers, structure)
+                    text = self.assemble_text_object(row[1], row[meta_stop:], self.selected_layers, structure,
+                                                     lazy=self.lazy)
                     yield row[0], text, meta
 
             elif self.meta_attributes:
@@ -979,18 +1000,21 @@ class PgSubCollection:
                     data_iterator.set_description('collection_id: {}'.format(row[0]), refresh=False)
                     meta_stop = 2 + len(self.meta_attributes)
                     meta = {attr: value for attr, value in zip(self.meta_attributes, row[2:meta_stop])}
-                    text = self.assemble_text_object(row[1], row[meta_stop:], self.selected_layers, structure)
+                    text = self.assemble_text_object(row[1], row[meta_stop:], self.selected_layers, structure,
+                                                     lazy=self.lazy)
                     yield text, meta
 
             elif self.return_index:
                 for row in data_iterator:
                     data_iterator.set_description('collection_id: {}'.format(row[0]), refresh=False)
-                    yield row[0], self.assemble_text_object(row[1], row[2:], self.selected_layers, structure)
+                    yield row[0], self.assemble_text_object(row[1], row[2:], self.selected_layers, structure,
+                                                            lazy=self.lazy)
 
             else:
                 for row in data_iterator:
                     data_iterator.set_description('collection_id: {}'.format(row[0]), refresh=False)
-                    yield self.assemble_text_object(row[1], row[2:], self.selected_layers, structure)
+                    yield self.assemble_text_object(row[1], row[2:], self.selected_layers, structure,
+                                                    lazy=self.lazy)
 
 
     def head(self, n: int = 5) -> List[Text]:
@@ -1006,7 +1030,8 @@ class PgSubCollection:
                return_index=self.return_index,
                limit_rows=limit_rows,
                skip_rows=self.skip_rows,
-               keep_all_texts=self._left_join_sparse_layers
+               keep_all_texts=self._left_join_sparse_layers,
+               lazy=self.lazy
         )
 
     def tail(self, n: int = 5) -> List[Text]:
@@ -1029,13 +1054,15 @@ class PgSubCollection:
                    return_index=self.return_index,
                    limit_rows=self.limit_rows,
                    skip_rows=skip_rows,
-                   keep_all_texts=self._left_join_sparse_layers
+                   keep_all_texts=self._left_join_sparse_layers,
+                   lazy=self.lazy
             )
         else:
             return self
 
     def create_layer(self, tagger, create_index=False, ngram_index=None, meta=None, 
-                     progressbar=None, query_length_limit=5000000, mode=None):
+                     progressbar=None, query_length_limit=5000000, mode=None, workers=None, 
+                     chunksize=10):
         """
         Creates a sparse layer based on this subcollection.
 
@@ -1071,6 +1098,12 @@ class PgSubCollection:
             * 'append'     - appends to an existing layer; annotates only those documents 
                              that are missing the layer.
                              raises an exception if the collection does not have the layer;
+        :param workers: int
+            Number of worker processes used for applying the tagger. If None (default) 
+            or 1, the tagger is applied in the current process. 
+            See PgCollection.create_layer for details.
+        :param chunksize: int
+            Number of documents sent to a worker process at once (if workers > 1).
         """
         # Check collection's version
         if self.collection.version < '3.0':
@@ -1118,7 +1151,8 @@ class PgSubCollection:
             return pg.RowMapperRecord(layer=layer, meta=status)
         self.collection.create_layer(layer_template=tagger.get_layer_template(), data_iterator=data_iterator, 
                                      row_mapper=default_row_mapper, meta=meta, progressbar=progressbar, 
-                                     query_length_limit=query_length_limit, mode=mode, sparse=True)
+                                     query_length_limit=query_length_limit, mode=mode, sparse=True, 
+                                     workers=workers, chunksize=chunksize)
 
     def create_layer_block(self, tagger, block, meta=None, query_length_limit=5000000, mode=None):
         """
@@ -1197,12 +1231,14 @@ class PgSubCollection:
 
     @staticmethod
     def assemble_text_object(text_dict: dict, layer_dicts: List[dict], selected_layers: List[str],
-                             structure: pg.CollectionStructureBase = None) -> Text:
+                             structure: pg.CollectionStructureBase = None, lazy: bool = False) -> Text:
         """
         Assembles Text object from json specification of texts and json specifications of detached layers.
 
         The list of layer names determines which layers are selected. The collection structure determines how these
         layers are reconstructed. Default reconstruction method is used when serialisation module is unspecified.
+        If lazy=True, layers are added in the serialised form and reconstructed on the first access (not
+        supported for collections with structure versions < 2.0).
 
         All json specifications must be in recursive dict format.
         All serialisation modules must be registered in a serialisation map.
@@ -1277,11 +1313,17 @@ class PgSubCollection:
 
                 # Use default serialisation if specification is missing
                 if serialisation_module is None:
-                    text.add_layer(dict_to_layer(layer_element, text))
+                    layer_dict_to_layer = dict_to_layer
                 elif serialisation_module in SERIALISATION_REGISTRY:
-                    text.add_layer( SERIALISATION_REGISTRY[serialisation_module].dict_to_layer(layer_element, text) )
+                    layer_dict_to_layer = SERIALISATION_REGISTRY[serialisation_module].dict_to_layer
                 else:
                     raise ValueError(('serialisation module {!r} not registered in serialisation map: '.format(serialisation_module))+SERIALISATION_REGISTRY.keys())
+                if lazy:
+                    # Layer will be deserialised on the first access
+                    text.add_serialised_layer(layer_element, layer_dict_to_layer,
+                                              relation_layer=layer_name in selected_relation_layers)
+                else:
+                    text.add_layer(layer_dict_to_layer(layer_element, text))
                 layer_index += 1
                 # Take the next selected layer
                 cur_selected_layer = \
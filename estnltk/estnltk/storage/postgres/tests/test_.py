@@ -526,6 +526,27 @@ class TestPgCollection(unittest.TestCase):
 
         self.storage.delete_collection(collection.name)
 
+    def test_select_lazy(self):
+        collection = self.storage.add_collection(get_random_collection_name())
+        with collection.insert() as collection_insert:
+            text1 = Text('Ööbik laulab.').tag_layer('words')
+            collection_insert(text1, key=1)
+            text2 = Text('Mis kell on?').tag_layer('words')
+            collection_insert(text2, key=2)
+
+        res = list(collection.select(layers=['words'], lazy=True))
+        self.assertEqual(len(res), 2)
+        for (id_, text), expected_text in zip(res, [text1, text2]):
+            self.assertEqual(text.layers, expected_text.layers)
+            # layers are deserialised on the first access
+            self.assertFalse(text._layers.is_deserialised('words'))
+            self.assertEqual(text['words'], expected_text['words'])
+            self.assertTrue(text._layers.is_deserialised('words'))
+            self.assertFalse(text._layers.is_deserialised('tokens'))
+            self.assertEqual(text, expected_text)
+
+        self.storage.delete_collection(collection.name)
+
 
     def test_insert_fails(self):
         # Test that collection operations do not work if someone 
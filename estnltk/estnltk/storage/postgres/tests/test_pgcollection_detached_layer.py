@@ -231,6 +231,43 @@ class TestDetachedLayer(unittest.TestCase):
         
         self.storage.delete_collection(collection.name)
 
+    def test_create_layer_with_workers(self):
+        collection_name = get_random_collection_name()
+        collection = self.storage.add_collection(collection_name)
+
+        with collection.insert() as collection_insert:
+            for raw_text in ['see on esimene lause', 'see on teine lause', 'ja see paistab olevat kolmas',
+                             'üks lause veel siia lõppu', 'ja veel üks']:
+                collection_insert( Text(raw_text).tag_layer(["sentences"]) )
+
+        # Create layers sequentially and in parallel
+        tagger1 = VabamorfTagger(disambiguate=False, output_layer='layer1')
+        collection.create_layer(tagger=tagger1)
+        tagger2 = VabamorfTagger(disambiguate=False, output_layer='layer2')
+        collection.create_layer(tagger=tagger2, workers=2, chunksize=2)
+
+        self.assertTrue(collection.has_layer('layer2', 'detached'))
+        self.assertEqual( count_rows(self.storage, table=layer_table_name(collection.name, 'layer2')), 5 )
+        for key, text in collection.select(layers=['layer1', 'layer2']):
+            self.assertEqual(text['layer1'].lemma, text['layer2'].lemma)
+
+        # Errors of the row_mapper are propagated unchanged (both sequentially 
+        # and from workers) and the transaction is rolled back
+        first_text_id = next(iter(collection.select()))[0]
+        def failing_row_mapper(row):
+            raise ValueError('failed at {}'.format(row[0]))
+        for workers in [None, 1, 2]:
+            with self.assertRaises(ValueError) as error_context:
+                collection.create_layer(layer_template=tagger1.get_layer_template(),
+                                        data_iterator=collection.select(layers=['sentences']),
+                                        row_mapper=failing_row_mapper, mode='overwrite', workers=workers)
+            self.assertEqual(str(error_context.exception), 'failed at {}'.format(first_text_id))
+
+        with self.assertRaises(ValueError):
+            collection.create_layer(tagger=tagger2, mode='append', workers=0)
+
+        self.storage.delete_collection(collection.name)
+
     def test_layer_meta(self):
         collection_name = get_random_collection_name()
         collection = self.storage.add_collection(collection_name)
@@ -8,10 +8,13 @@
 #  Python's implementation:   Siim Orasmaa
 #
 
-from typing import Set
+from typing import Iterable, Set
 
 import re
+import json
+import multiprocessing
 from collections import defaultdict
+from collections import namedtuple
 
 from estnltk import Text, Layer
 from estnltk.taggers import Tagger, Retagger
@@ -22,6 +25,15 @@ from estnltk.taggers.standard.morph_analysis.morf_common import ESTNLTK_MORPH_AT
 from estnltk.taggers.standard.morph_analysis.morf_common import NORMALIZED_TEXT
 from estnltk.taggers.standard.morph_analysis.morf_common import _is_empty_annotation
 
+# Name of the temporary layer of ambiguities ignored by the post-disambiguation
+HIDDEN_MORPH_ANALYSIS_LAYER = '_hidden_morph_analysis'
+
+# Patterns for detecting sentence-initial positions
+_COMMA_OR_SEMICOLON = re.compile('^[,;]+$')
+_DIGITS = re.compile('^[1234567890]*$')
+_DATE = re.compile('^[1234567890]{1,2}.[1234567890]{1,2}.[1234567890]{4}$')
+_ENUMERATION = re.compile("^[1234567890.()]*$")
+
 
 class CorpusBasedMorphDisambiguator( object ):
     """Provides corpus-based pre-disambiguation and post-disambiguation for morphological analysis.
@@ -121,6 +133,12 @@ class CorpusBasedMorphDisambiguator( object ):
             self._ignore_lemmas_in_compounds = ignore_lemmas_in_compounds
         self._validate_inputs  = validate_inputs
         self.output_attributes = (NORMALIZED_TEXT,) + ESTNLTK_MORPH_ATTRIBUTES
+        # Document level sub step taggers of post-disambiguation
+        self._duplicate_remover = RemoveDuplicateAndProblematicAnalysesRetagger(
+                                      morph_analysis_layer=self.output_layer )
+        self._hidden_words_tagger = IgnoredByPostDisambiguationTagger(
+                                      input_morph_analysis_layer=self.output_layer,
+                                      output_layer=HIDDEN_MORPH_ANALYSIS_LAYER )
 
 
     # =========================================================
@@ -129,175 +147,177 @@ class CorpusBasedMorphDisambiguator( object ):
     # =========================================================
     # =========================================================
 
-
-    def _create_proper_names_lexicon(self, docs, docs_detached_layers):
-        """ Creates a proper name frequency dictionary based on the 
-            collection of documents.
-            Each entry in the dictionary describes how many times
-            given (proper name) lemma appears in the corpus 
+    # Pre-disambiguation consists of 3 steps. Each step needs statistics 
+    # that are collected from the whole corpus (after the previous step 
+    # has been applied), and is then applied document by document:
+    #  1) find frequencies of proper name lemmas; if a word has multiple 
+    #     proper name analyses with different frequencies, keep only the 
+    #     analysis with the highest corpus frequency;
+    #  2) find certain proper names, sentence-initial proper names, and 
+    #     sentence-central proper names; remove sentence-initial proper 
+    #     names that are not sentence-central nor certain proper names, 
+    #     as these are most likely false positives;
+    #  3) find frequencies of proper name lemmas once again (taking account 
+    #     that frequencies may have been changed); remove redundant proper 
+    #     name analyses from words that are ambiguous between proper name 
+    #     analyses and regular analyses:
+    #     -- in case of sentence-central ambiguous proper names, keep only 
+    #        proper name analyses;
+    #     -- in case of sentence-initial ambiguous proper names: if the 
+    #        proper name has corpus frequency greater than 1, then keep 
+    #        only proper name analyses. Otherwise, leave analyses intact;
+    PREDISAMBIGUATION_STEPS = 3
+
+
+    def _count_proper_names(self, layers, statistics):
+        """ Updates the proper name frequency dictionary based on the 
+            document. Each entry in the dictionary describes how many 
+            times given (proper name) lemma appears in the corpus 
             (including ambiguous appearances).
         """
-        lemmaFreq = defaultdict(int)
-        for doc_id, doc in enumerate(docs):
-            for word_morph in docs_detached_layers[doc_id][self.output_layer]:
-                # 1) Find all unique proper name lemmas of
-                #    this word 
-                uniqLemmas = set()
-                for analysis in word_morph.annotations:
-                    if analysis.partofspeech == 'H':
-                        uniqLemmas.add( analysis.root )
-                # 2) Record lemma frequencies
-                for lemma in uniqLemmas:
-                    lemmaFreq[lemma] += 1
-        return lemmaFreq
-
-
-    def _disambiguate_proper_names_1(self, docs, docs_detached_layers, lexicon):
-        """ Step 1 in removal of redundant proper names analyses: 
-            if a word has multiple proper name analyses with different 
-            frequencies, keep only the analysis that has the highest
-            frequency.
+        lemmaFreq = statistics.lemma_frequencies
+        for word_morph in layers[self.output_layer]:
+            # 1) Find all unique proper name lemmas of
+            #    this word 
+            uniqLemmas = set()
+            for analysis in word_morph.annotations:
+                if analysis.partofspeech == 'H':
+                    uniqLemmas.add( analysis.root )
+            # 2) Record lemma frequencies
+            for lemma in uniqLemmas:
+                lemmaFreq[lemma] = lemmaFreq.get(lemma, 0) + 1
+
+
+    def _find_proper_names_by_position(self, layers, statistics):
+        """ Updates lists of proper names based on the document:
+            *) certain proper names: words that only have proper name 
+               analyses;
+            *) sentence-initial proper names: words that have ambiguities 
+               between proper name and regular analyses, and that are in 
+               the beginning of sentence, or of an enumeration;
+            *) sentence-central proper names: words that have proper name 
+               analyses, and that are not in a sentence-initial position;
+            Records proper name lemmas of such words.
         """
-        disamb_retagger = ProperNamesDisambiguationStep1Retagger(lexicon,\
-                          morph_analysis_layer=self.output_layer)
-        for doc_id, doc in enumerate( docs ):
-            disamb_retagger.change_layer( doc, docs_detached_layers[doc_id] )
+        certain_names = statistics.certain_names
+        sentInitialNames = statistics.sentence_initial_names
+        sentCentralNames = statistics.sentence_central_names
+        sentences = layers[self._input_sentences_layer]
+        sentence_id = 0
+        nextSentenceInitialPosition = -1
+        for wid, word_morph in enumerate( layers[self.output_layer] ):
+            annotations = word_morph.annotations
+            h_postags = [a.partofspeech == 'H' for a in annotations]
+            # Check if word only has proper name analyses
+            if all(h_postags):
+                # If so, record its lemmas as "certain proper name lemmas"
+                for analysis in annotations:
+                    certain_names.add(analysis.root)
+            current_sentence = sentences[sentence_id]
+            # Check if the word is in sentence-initial position:
+            # 1) word in the beginning of annotated sentence
+            if current_sentence.start == word_morph.start:
+                nextSentenceInitialPosition = wid
+            # 2) punctuation that is not comma neither semicolon, 
+            #    is before a sentence-initial position
+            if all([a.partofspeech == 'Z' for a in annotations]) \
+                 and not _COMMA_OR_SEMICOLON.match(word_morph.text):
+                nextSentenceInitialPosition = wid + 1
+            # 3) beginning of an enumeration (a number that does not look 
+            #    like a date, and is followed by a period or a parenthesis),
+            if not _DIGITS.match( word_morph.text ) and \
+               not _DATE.match( word_morph.text ) and \
+               _ENUMERATION.match( word_morph.text ):
+                nextSentenceInitialPosition = wid + 1
+            if wid == nextSentenceInitialPosition:
+                # If we are in an sentence-initial position:
+                # consider sentence-initial words that have both proper name 
+                # analyses, and also regular (not proper name) analyses
+                if any(h_postags) and not all(h_postags):
+                    for analysis in annotations:
+                        # Memorize all unique proper name lemmas
+                        if analysis.partofspeech == 'H':
+                            sentInitialNames.add( analysis.root )
+            else:
+                # Assume: if the word is not on a sentence-initial position,
+                #         it must be on a sentence-central position;
+                for analysis in annotations:
+                    # Memorize all unique proper name lemmas
+                    if analysis.partofspeech == 'H':
+                        sentCentralNames.add( analysis.root )
+            # Take the next sentence
+            if current_sentence.end == word_morph.end:
+                sentence_id += 1
+        assert sentence_id == len(sentences)
 
-    def _find_certain_proper_names(self, docs, docs_detached_layers):
-        """ Creates the list of certain proper names: finds words that 
-            only have proper name analyses and, gathers all unique proper 
-            name lemmas from there;
-        """
-        certain_names = set()
-        for doc_id, doc in enumerate( docs ):
-            for word_morph in docs_detached_layers[doc_id][self.output_layer]:
-                # Check if word only has proper name analyses
-                if all([a.partofspeech == 'H' for a in word_morph.annotations]):
-                    # If so, record its lemmas as "certain proper name lemmas"
-                    for analysis in word_morph.annotations:
-                        certain_names.add(analysis.root)
-        return certain_names
-
-    def _find_sentence_initial_proper_names(self, docs, docs_detached_layers):
-        """ Creates the list of sentence-initial proper names.
-            Finds words that have ambiguities between proper name and 
-            regular analyses, and that are in the beginning of sentence, 
-            or of an enumeration. Records and returns proper name lemmas 
-            of such words;
+
+    def _collect_proper_name_statistics(self, layers, step, statistics):
+        """ Collects statistics required by the given step of pre-disambiguation
+            from the document (given as detached layers).
         """
-        sentInitialNames = set()
-        for doc_id, doc in enumerate( docs ):
-            sentences = docs_detached_layers[doc_id][self._input_sentences_layer]
-            sentence_id = 0
-            nextSentenceInitialPosition = -1
-            morph_analysis = docs_detached_layers[doc_id][self.output_layer]
-            for wid, word_morph in enumerate( morph_analysis ):
-                current_sentence = sentences[sentence_id]
-                # Check if the word is in sentence-initial position:
-                # 1) word in the beginning of annotated sentence
-                if current_sentence.start == word_morph.start:
-                    nextSentenceInitialPosition = wid
-                # 2) punctuation that is not comma neither semicolon, 
-                #    is before a sentence-initial position
-                if all([a.partofspeech == 'Z' for a in word_morph.annotations]) \
-                     and not re.match('^[,;]+$', word_morph.text):
-                    nextSentenceInitialPosition = wid + 1
-                # 3) beginning of an enumeration (a number that does not look 
-                #    like a date, and is followed by a period or a parenthesis),
-                if not re.match('^[1234567890]*$', word_morph.text ) and \
-                   not re.match('^[1234567890]{1,2}.[1234567890]{1,2}.[1234567890]{4}$', word_morph.text ) and \
-                   re.match("^[1234567890.()]*$", word_morph.text ):
-                    nextSentenceInitialPosition = wid + 1
-                # If we are in an sentence-initial position
-                if wid == nextSentenceInitialPosition:
-                    # Consider sentence-initial words that have both proper name 
-                    # analyses, and also regular (not proper name) analyses
-                    h_postags = [a.partofspeech == 'H' for a in word_morph.annotations]
-                    if any(h_postags) and not all(h_postags):
-                        for analysis in word_morph.annotations:
-                            # Memorize all unique proper name lemmas
-                            if analysis.partofspeech == 'H':
-                                sentInitialNames.add( analysis.root )
-                # Take the next sentence
-                if current_sentence.end == word_morph.end:
-                    sentence_id += 1
-            assert sentence_id == len(sentences)
-        return sentInitialNames
-
-
-    def _find_sentence_central_proper_names(self, docs, docs_detached_layers):
-        """ Creates the list of sentence-central proper names.
-            Finds words that have ambiguities between proper name and 
-            regular analyses, and that in central position of the 
-            sentence. Records and returns proper name lemmas of 
-            such words;
+        if step == 2:
+            self._find_proper_names_by_position(layers, statistics)
+        else:
+            self._count_proper_names(layers, statistics)
+        statistics._clear_cache()
+
+
+    def _make_predisambiguation_retagger(self, step, statistics):
+        """ Creates the Retagger that applies the given step of pre-disambiguation
+            based on the statistics collected for this step.
         """
-        sentCentralNames = set()
-        for doc_id, doc in enumerate( docs ):
-            sentences = docs_detached_layers[doc_id][self._input_sentences_layer]
-            sentence_id = 0
-            nextSentenceInitialPosition = -1
-            morph_analysis = docs_detached_layers[doc_id][self.output_layer]
-            for wid, word_morph in enumerate( morph_analysis ):
-                current_sentence = sentences[sentence_id]
-                # Check if the word is in sentence-initial position:
-                # 1) word in the beginning of annotated sentence
-                if current_sentence.start == word_morph.start:
-                    nextSentenceInitialPosition = wid
-                # 2) punctuation that is not comma neither semicolon, 
-                #    is before a sentence-initial position
-                if all([a.partofspeech == 'Z' for a in word_morph.annotations]) and \
-                   not re.match('^[,;]+$', word_morph.text):
-                    nextSentenceInitialPosition = wid + 1
-                # 3) beginning of an enumeration (a number that does not look 
-                #    like a date, and is followed by a period or a parenthesis),
-                if not re.match('^[1234567890]*$', word_morph.text ) and \
-                   not re.match('^[1234567890]{1,2}.[1234567890]{1,2}.[1234567890]{4}$', word_morph.text ) and \
-                   re.match("^[1234567890.()]*$", word_morph.text ):
-                    nextSentenceInitialPosition = wid + 1
-                # Assume: if the word is not on a sentence-initial position,
-                #         it must be on a sentence-central position;
-                if wid != nextSentenceInitialPosition:
-                    # Consider sentence-central words that have proper name 
-                    # analyses
-                    for analysis in word_morph.annotations:
-                        # Memorize all unique proper name lemmas
-                        if analysis.partofspeech == 'H':
-                            sentCentralNames.add( analysis.root )
-                # Take the next sentence
-                if current_sentence.end == word_morph.end:
-                    sentence_id += 1
-            assert sentence_id == len(sentences)
-        return sentCentralNames
-
-
-    def _remove_redundant_proper_names(self, docs, docs_detached_layers, notProperNames):
-        """ Step 2 in removal of redundant proper names analyses: 
-            if a word has  multiple  analyses, and  some  of  these 
-            are in the lexicon notProperNames, then delete analyses 
-            appearing in the lexicon.
-         """
-        disamb_retagger = ProperNamesDisambiguationStep2Retagger(notProperNames,\
+        if step == 1:
+            return ProperNamesDisambiguationStep1Retagger(statistics.lemma_frequencies,\
                           morph_analysis_layer=self.output_layer)
-        for doc_id, doc in enumerate( docs ):
-            disamb_retagger.change_layer( doc, docs_detached_layers[doc_id] )
-
-
-    def _disambiguate_proper_names_2(self, docs, docs_detached_layers, lexicon):
-        """ Step 3 in removal of redundant proper names analyses: 
-            -- in case of sentence-central ambiguous proper names, keep 
-               only proper name analyses;
-            -- in case of sentence-initial ambiguous proper names: if the 
-               proper name has corpus frequency greater than 1, then keep 
-               only proper name analyses. 
-               Otherwise, leave analyses intact;
-         """
-        disamb_retagger = ProperNamesDisambiguationStep3Retagger(lexicon,\
+        elif step == 2:
+            return ProperNamesDisambiguationStep2Retagger(statistics.not_proper_names(),\
+                          morph_analysis_layer=self.output_layer)
+        else:
+            return ProperNamesDisambiguationStep3Retagger(statistics.lemma_frequencies,\
                           morph_analysis_layer=self.output_layer,\
                           input_words_layer=self._input_words_layer,\
                           input_sentences_layer=self._input_sentences_layer )
-        for doc_id, doc in enumerate( docs ):
-            disamb_retagger.change_layer( doc, docs_detached_layers[doc_id] )
+
+
+    def collect_proper_name_statistics(self, doc: Text, step: int, statistics: 'ProperNameStatistics'=None,
+                                             detached_layers: dict=None) -> 'ProperNameStatistics':
+        """ Collects statistics required by the given step (1, 2 or 3) of the 
+            pre-disambiguation from a single document, and adds these to the 
+            given statistics (or to new statistics, if statistics is None). 
+            Returns the statistics. 
+            
+            Together with the method predisambiguate_document, this allows to 
+            pre-disambiguate a corpus that does not fit into memory: documents 
+            can be processed one by one (and saved after processing), and 
+            statistics collected from different parts of the corpus (e.g. in 
+            different processes) can be combined with the method merge(). 
+            Steps need to be applied in order, and statistics of a step must 
+            be collected after the previous step has been applied. Thus, the 
+            corpus needs to be processed in 4 passes:
+              1) collect statistics of step 1;
+              2) apply step 1 & collect statistics of step 2;
+              3) apply step 2 & collect statistics of step 3;
+              4) apply step 3;
+            This gives the same results as the method predisambiguate(docs). 
+        """
+        _check_predisambiguation_step(step)
+        if statistics is None:
+            statistics = ProperNameStatistics()
+        layers = self._detach_layers(doc, detached_layers)
+        self._collect_proper_name_statistics(layers, step, statistics)
+        return statistics
+
+
+    def predisambiguate_document(self, doc: Text, step: int, statistics: 'ProperNameStatistics',
+                                       detached_layers: dict=None):
+        """ Applies the given step (1, 2 or 3) of the pre-disambiguation on a 
+            single document, using statistics collected from the whole corpus 
+            with the method collect_proper_name_statistics. 
+            See collect_proper_name_statistics for details.
+        """
+        _check_predisambiguation_step(step)
+        layers = self._detach_layers(doc, detached_layers)
+        self._make_predisambiguation_retagger(step, statistics).change_layer(doc, layers)
 
 
     def predisambiguate(self, docs):
@@ -308,6 +328,8 @@ class CorpusBasedMorphDisambiguator( object ):
             The input corpus should be either:
               a) a list of Text objects;
               b) a list of lists of Text objects;
+            For corpora that do not fit into memory, see the 
+            method collect_proper_name_statistics.
         """
         # Determine input structure
         input_format = determine_input_corpus_structure(docs)
@@ -315,20 +337,12 @@ class CorpusBasedMorphDisambiguator( object ):
         detached_layers = []
         if input_format in ['I', '0']:
             for doc in docs:
-                layers = {}
-                for layer in self.input_layers:
-                    if layer in doc.layers:
-                        layers[layer] = doc[layer]
-                detached_layers.append(layers)
+                detached_layers.append( self._detach_layers(doc, validate=False) )
         elif input_format == 'II':
             for docs_list in docs:
                 detached_layers.append([])
                 for doc in docs_list:
-                    layers = {}
-                    for layer in self.input_layers:
-                        if layer in doc.layers:
-                            layers[layer] = doc[layer]
-                    detached_layers[-1].append(layers)
+                    detached_layers[-1].append( self._detach_layers(doc, validate=False) )
         # Predisambiguate on docs and detached layers
         self._predisambiguate_detached_layers( docs, detached_layers, input_format_hint=input_format )
 
@@ -365,43 +379,20 @@ class CorpusBasedMorphDisambiguator( object ):
         # Sanity check
         assert len(flat_detached_layers) == len(flat_docs), \
              ' (!) Inconsistent input: the size of detached_layers is not equal to size of flat_docs.'
-        # 1) Find frequencies of proper name lemmas
-        lexicon = self._create_proper_names_lexicon( flat_docs, flat_detached_layers )
-        # 2) First disambiguation: if a word has multiple proper name
-        #    analyses with different frequencies, keep only the analysis
-        #    with the highest corpus frequency ...
-        self._disambiguate_proper_names_1( flat_docs, flat_detached_layers, lexicon )
-        # 3) Find certain proper names, sentence-initial proper names,
-        #    and sentence-central proper names 
-        certainNames     = self._find_certain_proper_names(flat_docs, flat_detached_layers)
-        sentInitialNames = self._find_sentence_initial_proper_names(flat_docs, flat_detached_layers)
-        sentCentralNames = self._find_sentence_central_proper_names(flat_docs, flat_detached_layers)
-        
-        # 3.1) Find names only sentence initial, not sentence central
-        onlySentenceInitial = sentInitialNames.difference(sentCentralNames)
-        # 3.2) From names that are exclusively sentence initial, extract
-        #      names that are not certain names (by lexicon);
-        #      The remaining names are moste unlikely candidates for 
-        #      proper names;
-        notProperNames = onlySentenceInitial.difference(certainNames)
-        # 3.3) Second disambiguation: remove sentence initial proper names
-        #      that are most likely false positives
-        self._remove_redundant_proper_names(flat_docs, flat_detached_layers, notProperNames)
-
-        # 4) Find frequencies of proper name lemmas once again
-        #    ( taking account that frequencies may have been changed )
-        lexicon = self._create_proper_names_lexicon( flat_docs, flat_detached_layers )
-
-        # 5) Remove redundant proper name analyses from words 
-        #    that are ambiguous between proper name analyses 
-        #    and regular analyses:
-        #    -- in case of sentence-central ambiguous proper names, 
-        #       keep only proper name analyses;
-        #    -- in case of sentence-initial ambiguous proper names: 
-        #       if the proper name has corpus frequency greater than
-        #       1, then keep only proper name analyses. 
-        #       Otherwise, leave analyses intact;
-        self._disambiguate_proper_names_2(flat_docs, flat_detached_layers, lexicon)
+        # 1) Collect statistics for the first step
+        statistics = ProperNameStatistics()
+        for layers in flat_detached_layers:
+            self._collect_proper_name_statistics( layers, 1, statistics )
+        # 2) Apply steps one by one. Statistics for the next step are 
+        #    collected in the same pass as the current step is applied
+        for step in range(1, self.PREDISAMBIGUATION_STEPS + 1):
+            retagger = self._make_predisambiguation_retagger( step, statistics )
+            next_statistics = ProperNameStatistics()
+            for doc, layers in zip( flat_docs, flat_detached_layers ):
+                retagger.change_layer( doc, layers )
+                if step < self.PREDISAMBIGUATION_STEPS:
+                    self._collect_proper_name_statistics( layers, step + 1, next_statistics )
+            statistics = next_statistics
 
 
     # =========================================================
@@ -410,156 +401,261 @@ class CorpusBasedMorphDisambiguator( object ):
     # =========================================================
     # =========================================================
 
-    def _remove_duplicate_and_problematic_analyses(self, docs, docs_detached_layers):
-        """ Removes duplicate and problematic analyses from the 
-            document collection. 
-            See RemoveDuplicateAndProblematicAnalysesRetagger for 
-            details.
-         """
-        duplicate_remover = RemoveDuplicateAndProblematicAnalysesRetagger(
-                                morph_analysis_layer=self.output_layer )
-        for doc_id, doc in enumerate( docs ):
-            duplicate_remover.change_layer( doc, docs_detached_layers[doc_id] )
-
-
-    def _add_hidden_analyses_layers(self, 
-              docs, 
-              docs_detached_layers, 
-              hidden_words_layer:str='_hidden_morph_analysis',
-              remove_old_hidden_words_layer:bool=False):
-        """ Finds morphological ambiguities that should be ignored 
-            by the post-disambiguator. Adds findings as a temporary 
-            hidden_morph_analysis layer.
-            See IgnoredByPostDisambiguationTagger for details.
+    def _count_lemmas(self, layers, statistics, hidden_words_layer:str=HIDDEN_MORPH_ANALYSIS_LAYER):
+        """ Counts lemma frequencies in the document, and updates statistics:
+            *) lemma_frequencies -- frequencies of all lemmas in the corpus, 
+               except lemmas in the hidden_words_layer; 
+            *) ambiguous_lemmas -- lemmas of ambiguous words, except the 
+               lemmas in the hidden_words_layer; 
         """
-        hidden_words_tagger = IgnoredByPostDisambiguationTagger(
-                                     input_morph_analysis_layer = self.output_layer,\
-                                     output_layer = hidden_words_layer )
-        if remove_old_hidden_words_layer:
-            # Clean-up old layers (if required)
-            self._remove_hidden_analyses_layers( docs, 
-                         docs_detached_layers, 
-                         hidden_words_layer = hidden_words_layer )
-        for doc_id, doc in enumerate( docs ):
-            # Create temporary hidden words layer
-            new_layer = hidden_words_tagger.make_layer( doc, docs_detached_layers[doc_id] )
-            docs_detached_layers[doc_id][hidden_words_layer] = new_layer
-
-
-    @staticmethod
-    def _remove_hidden_analyses_layers(docs, docs_detached_layers, hidden_words_layer: str = '_hidden_morph_analysis'):
-        """ Removes temporary hidden_words_layer-s that were 
-            created with the method _add_hidden_analyses_layers().
-        """
-        for doc_id, doc in enumerate( docs ):
-            if hidden_words_layer in docs_detached_layers[doc_id]:
-                # Delete existing layer
-                del docs_detached_layers[doc_id][hidden_words_layer]
-
-
-    def _supplement_lemma_frequency_lexicon(self, docs, docs_detached_layers, lexicon, amb_lexicon,
-                                                  hidden_words_layer:str='_hidden_morph_analysis' ):
-        """ Counts lemma frequencies in docs, and amends given lexicon and amb_lexicon.
-            *) lexicon -- frequencies of all lemmas in the corpus, except lemmas 
-               in the hidden_words_layer; 
-               If a lemma already exist in the lexicon, the old frequency will be
-               increased by the new one;
-            *) amb_lexicon -- frequencies of lemmas of ambiguous words, except the lemmas
-               in the hidden_words_layer; 
-               If a lemma already exist in the lexicon, the old frequency will be
-               increased by the new one;
+        morph_analysis = layers[ self.output_layer ]
+        assert hidden_words_layer in layers, \
+               '(!) Text is missing layer {!r}'.format( hidden_words_layer )
+        hidden_words = layers[ hidden_words_layer ]
+        hidden_words_id = 0
+        for w, word_morph in enumerate( morph_analysis ):
+            # Skip so-called hidden word / hidden ambiguities
+            # ( these are not related to content words, and thus are 
+            #   less likely to be (correctly) resolved by the corpus- 
+            #   based disambiguation )
+            hidden_word = hidden_words[hidden_words_id] if hidden_words_id < len(hidden_words) else []
+            if len(hidden_word) > 0 and word_morph.base_span in hidden_word.base_span:
+                # Take the next hidden word id
+                hidden_words_id += 1
+                # Skip the word
+                continue
+           # Skip an unknown word
+            if is_unknown_word(word_morph):
+                continue
+            self._count_word_lemmas( word_morph.annotations, statistics )
+        # Sanity check: all hidden words should be exhausted by now 
+        assert hidden_words_id == len(hidden_words)
+
+
+    def _count_word_lemmas(self, analyses, statistics):
+        """ Counts lemmas of the morphological analyses of a single word 
+            and updates statistics (see _count_lemmas for details). 
+            Analyses can be Annotation objects or _MorphAnalysis tuples.
         """
-        for d in range( len(docs) ):
-            layers = docs_detached_layers[d]
-            morph_analysis = layers[ self.output_layer ]
-            assert hidden_words_layer in layers, \
-                   '(!) Text is missing layer {!r}'.format( hidden_words_layer )
-            hidden_words = layers[ hidden_words_layer ]
-            hidden_words_id = 0
-            for w, word_morph in enumerate( morph_analysis ):
-                # Skip so-called hidden word / hidden ambiguities
-                # ( these are not related to content words, and thus are 
-                #   less likely to be (correctly) resolved by the corpus- 
-                #   based disambiguation )
-                hidden_word = hidden_words[hidden_words_id] if hidden_words_id < len(hidden_words) else []
-                if len(hidden_word) > 0 and word_morph.base_span in hidden_word.base_span:
-                    # Take the next hidden word id
-                    hidden_words_id += 1
-                    # Skip the word
-                    continue
-               # Skip an unknown word
-                if is_unknown_word(word_morph):
-                    continue
-                # find out whether the word is ambiguous
-                isAmbiguous = len(word_morph.annotations) > 1
-                # keep track of lemmas already seen at this position:
-                encounteredLemmas = set() 
-                # Record lemma frequencies
-                for a in word_morph.annotations:
-                    # Use -ma ending to distinguish verb lemmas from other lemmas
-                    lemma = a.root+'ma' if a.partofspeech=='V' else a.root
-                    if self._count_position_duplicates_once and lemma in encounteredLemmas:
-                        # Skip the lemma, if it has already appeared in this 
-                        # position
-                        # For instance, if we have:
-                        #     põhja -> [ ('põhi', 'S', 'adt'), ('põhi', 'S', 'sg g'), 
-                        #                ('põhi', 'S', 'sg p'), ('põhja', 'V', 'o') ]
-                        # then counts will be: {'põhi': 1, 'põhjama': 1}
-                        # [ an experimental feature ]
-                        continue
-                    encounteredLemmas.add( lemma )
-                    # 1) Record the general frequency
-                    if lemma not in lexicon:
-                        lexicon[lemma] = 1
-                    else:
-                        lexicon[lemma] += 1
-                    # 2) Mark the existence of the ambiguous lemma
-                    #    (do not mark the frequency yet)
+        lexicon = statistics.lemma_frequencies
+        amb_lemmas = statistics.ambiguous_lemmas
+        # find out whether the word is ambiguous
+        isAmbiguous = len(analyses) > 1
+        # keep track of lemmas already seen at this position:
+        encounteredLemmas = set() 
+        # Record lemma frequencies
+        for a in analyses:
+            # Use -ma ending to distinguish verb lemmas from other lemmas
+            lemma = a.root+'ma' if a.partofspeech=='V' else a.root
+            if self._count_position_duplicates_once and lemma in encounteredLemmas:
+                # Skip the lemma, if it has already appeared in this 
+                # position
+                # For instance, if we have:
+                #     põhja -> [ ('põhi', 'S', 'adt'), ('põhi', 'S', 'sg g'), 
+                #                ('põhi', 'S', 'sg p'), ('põhja', 'V', 'o') ]
+                # then counts will be: {'põhi': 1, 'põhjama': 1}
+                # [ an experimental feature ]
+                continue
+            encounteredLemmas.add( lemma )
+            # 1) Record the general frequency
+            lexicon[lemma] = lexicon.get(lemma, 0) + 1
+            # 2) Mark the existence of the ambiguous lemma
+            #    (frequencies are taken from the general lexicon)
+            if isAmbiguous:
+                amb_lemmas.add(lemma)
+            # 3) Try to include information from compounds (if required)
+            # For instance: if we have a compound word, such as 
+            # 'edasi_pääs', it can help to disambiguate non-compound 
+            # word like 'pääsu', which is ambiguous between lemmas 
+            # 'pääs' and 'pääsu';
+            # [ an experimental feature ]
+            if self._disamb_compound_words and '_' in lemma:
+                lemma_parts = lemma.split('_')
+                last_word   = lemma_parts[-1]
+                if len(last_word) > 0 and \
+                   last_word not in self._ignore_lemmas_in_compounds:
+                    encounteredLemmas.add( last_word )
+                    lexicon[last_word] = lexicon.get(last_word, 0) + 1
                     if isAmbiguous:
-                        amb_lexicon[lemma] = 1
-                    # 3) Try to include information from compounds (if required)
-                    # For instance: if we have a compound word, such as 
-                    # 'edasi_pääs', it can help to disambiguate non-compound 
-                    # word like 'pääsu', which is ambiguous between lemmas 
-                    # 'pääs' and 'pääsu';
-                    # [ an experimental feature ]
-                    if self._disamb_compound_words and '_' in lemma:
-                        lemma_parts = lemma.split('_')
-                        last_word   = lemma_parts[-1]
-                        if len(last_word) > 0 and \
-                           last_word not in self._ignore_lemmas_in_compounds:
-                            encounteredLemmas.add( last_word )
-                            if last_word not in lexicon:
-                                lexicon[last_word] = 1
-                            else:
-                                lexicon[last_word] += 1
-                            if isAmbiguous:
-                                amb_lexicon[last_word] = 1
-            # Sanity check: all hidden words should be exhausted by now 
-            assert hidden_words_id == len(hidden_words)
-        # Use the general frequency lexicon to populate the lexicon of ambiguous 
-        # lemmas with frequencies
-        for lemma in amb_lexicon.keys():
-            amb_lexicon[lemma] = lexicon[lemma]
-
-
-    def _disambiguate_with_lexicon(self, docs, docs_detached_layers, lexicon, \
-                                   hidden_words_layer:str='_hidden_morph_analysis' ):
-        """ Performs lemma-based post-disambiguation. 
+                        amb_lemmas.add(last_word)
+
+
+    def _collect_lemma_statistics(self, text, layers, statistics, remove_duplicates:bool):
+        """ Collects lemma statistics from the document (given as detached layers). 
+            Adds a temporary layer of morphological ambiguities that should be 
+            ignored by the post-disambiguator to layers (see 
+            IgnoredByPostDisambiguationTagger for details).
+            If remove_duplicates is set, then removes duplicate and problematic 
+            analyses before counting (see RemoveDuplicateAndProblematicAnalysesRetagger 
+            for details).
+        """
+        if remove_duplicates:
+            self._duplicate_remover.change_layer( text, layers )
+        layers[HIDDEN_MORPH_ANALYSIS_LAYER] = self._hidden_words_tagger.make_layer( text, layers )
+        self._count_lemmas( layers, statistics )
+        statistics._clear_cache()
+
+
+    def _word_analyses(self, doc: Text, detached_layers: dict=None) -> list:
+        """ Returns morphological analyses of the document as a list of words, 
+            where each word is a list of tuples of analysis attribute values 
+            (in the order of _MorphAnalysis fields). This compact form of the 
+            document is sent to the worker processes of build_lemma_statistics.
+        """
+        layers = self._detach_layers(doc, detached_layers)
+        attributes = _MorphAnalysis._fields
+        return [[tuple([getattr(a, attr) for attr in attributes]) for a in word_morph.annotations]
+                for word_morph in layers[ self.output_layer ]]
+
+
+    def _collect_lemma_statistics_from_word_analyses(self, words: list, statistics):
+        """ Collects lemma statistics from the document given as word analyses 
+            (see _word_analyses). Gives the same statistics as 
+            _collect_lemma_statistics with remove_duplicates=True, but does not 
+            change the document.
+        """
+        attributes = _MorphAnalysis._fields
+        for word in words:
+            analyses = [_MorphAnalysis._make(values) for values in word]
+            analyses = [analyses[i] for i in _remaining_analyses_ids(analyses, attributes)]
+            # Skip unknown words and hidden ambiguities
+            if any(_is_empty_annotation(a) for a in analyses) or _is_ignored_ambiguity(analyses):
+                continue
+            self._count_word_lemmas( analyses, statistics )
+        statistics._clear_cache()
+
+
+    def _make_postdisambiguation_retagger(self, statistics):
+        """ Creates the Retagger that performs lemma-based post-disambiguation
+            based on the statistics.
             Very roughly uses the idea "one sense per discourse" for lemmas.
             See LemmaBasedPostDisambiguationRetagger for details.
         """
-        lemma_based_disambiguator = \
-              LemmaBasedPostDisambiguationRetagger(lexicon=lexicon,
+        return LemmaBasedPostDisambiguationRetagger(lexicon=statistics.ambiguous_lemma_frequencies(),
                             morph_analysis_layer=self.output_layer,\
-                            input_hidden_morph_analysis_layer=hidden_words_layer, \
+                            input_hidden_morph_analysis_layer=HIDDEN_MORPH_ANALYSIS_LAYER, \
                             disambiguate_last_words_of_compounds=self._disamb_compound_words, \
                             ignore_last_words=self._ignore_lemmas_in_compounds )
-        for doc_id, doc in enumerate( docs ):
-            lemma_based_disambiguator.change_layer( doc, docs_detached_layers[doc_id] )
 
 
-    def postdisambiguate(self, in_collections):
+    def _postdisambiguate_layers(self, text, layers, retagger):
+        """ Performs lemma-based post-disambiguation on the document (given as 
+            detached layers) with the given retagger. Uses the temporary layer of 
+            ignored ambiguities if it exists in layers, otherwise creates it. 
+            Removes the temporary layer afterwards.
+        """
+        if HIDDEN_MORPH_ANALYSIS_LAYER not in layers:
+            layers[HIDDEN_MORPH_ANALYSIS_LAYER] = self._hidden_words_tagger.make_layer( text, layers )
+        retagger.change_layer( text, layers )
+        del layers[HIDDEN_MORPH_ANALYSIS_LAYER]
+
+
+    def collect_lemma_statistics(self, doc: Text, statistics: 'LemmaStatistics'=None, detached_layers: dict=None,
+                                       remove_duplicates: bool=True) -> 'LemmaStatistics':
+        """ Collects lemma statistics required by the post-disambiguation from 
+            a single document, and adds these to the given statistics (or to new 
+            statistics, if statistics is None). Returns the statistics. 
+            If remove_duplicates is set (default), then duplicate and problematic 
+            analyses are removed from the document before counting (see 
+            RemoveDuplicateAndProblematicAnalysesRetagger for details).
+            
+            Together with the method postdisambiguate_document, this allows to 
+            post-disambiguate a corpus that does not fit into memory: documents 
+            can be processed one by one (and saved after processing), and 
+            statistics collected from different parts of the corpus (e.g. in 
+            different processes) can be combined with the method merge(). 
+            One level post-disambiguation needs 2 passes over the corpus: 
+              1) collect statistics;
+              2) apply postdisambiguate_document;
+            Two level post-disambiguation (first inside each sub collection, 
+            and then over all sub collections) needs 3 passes:
+              1) collect statistics of each sub collection;
+              2) apply postdisambiguate_document with statistics of the sub 
+                 collection & collect statistics of the whole corpus (with 
+                 remove_duplicates=False);
+              3) apply postdisambiguate_document with statistics of the whole 
+                 corpus;
+            This gives the same results as the method postdisambiguate(in_collections). 
+        """
+        if statistics is None:
+            statistics = LemmaStatistics()
+        layers = self._detach_layers(doc, detached_layers)
+        self._collect_lemma_statistics( doc, layers, statistics, remove_duplicates )
+        del layers[HIDDEN_MORPH_ANALYSIS_LAYER]
+        return statistics
+
+
+    def build_lemma_statistics(self, docs: Iterable[Text], workers: int=None, shard_size: int=100,
+                                     mp_context: str=None) -> 'LemmaStatistics':
+        """ Collects lemma statistics required by the post-disambiguation from
+            all documents of docs (as collect_lemma_statistics with
+            remove_duplicates=True does), using a pool of worker processes.
+            Documents are split into shards of shard_size documents, statistics
+            of each shard are collected in a worker process, and statistics of
+            shards are merged into the returned statistics.
+
+            Only morphological analyses of words (tuples of attribute values)
+            are sent to the workers, so duplicate and problematic analyses are
+            not removed from the input documents (unless workers == 1). Thus,
+            apply the statistics with postdisambiguate_document(doc, statistics,
+            remove_duplicates=True).
+            Statistics can be saved with the method save() and loaded with
+            LemmaStatistics.load() for reusing in later disambiguation runs.
+
+            Parameters
+            ----------
+            docs: Iterable[Text]
+                Documents with the input layers of the disambiguator. Can be
+                a generator: documents are streamed through the pool.
+            workers: int (default: None)
+                Number of worker processes. If not specified, uses
+                os.cpu_count() processes. If workers == 1, then statistics
+                are collected in the calling process without a pool.
+            shard_size: int (default: 100)
+                Number of documents sent to a worker process at once.
+            mp_context: str (default: None)
+                Start method of the worker processes ('fork', 'spawn' or
+                'forkserver'). If not specified, uses the default start
+                method of the platform.
+        """
+        if workers is not None and workers < 1:
+            raise ValueError('(!) Number of workers should be a positive integer, not {!r}'.format(workers))
+        if shard_size < 1:
+            raise ValueError('(!) shard_size should be a positive integer, not {!r}'.format(shard_size))
+        statistics = LemmaStatistics()
+        if workers == 1:
+            for doc in docs:
+                self.collect_lemma_statistics( doc, statistics )
+            return statistics
+        context = multiprocessing.get_context(mp_context)
+        with context.Pool(processes=workers,
+                          initializer=_init_lemma_statistics_worker,
+                          initargs=(self,)) as pool:
+            shards = _split_into_shards((self._word_analyses(doc) for doc in docs), shard_size)
+            for shard_statistics in pool.imap(_collect_lemma_statistics_in_worker, shards):
+                statistics.merge( shard_statistics )
+        return statistics
+
+
+    def postdisambiguate_document(self, doc: Text, statistics: 'LemmaStatistics', detached_layers: dict=None,
+                                        remove_duplicates: bool=False):
+        """ Post-disambiguates a single document, using lemma statistics collected
+            from the corpus with the method collect_lemma_statistics. 
+            If remove_duplicates is set, then duplicate and problematic analyses
+            are removed from the document before the post-disambiguation. This is
+            required if the document was not changed while collecting statistics,
+            e.g. if statistics were built with build_lemma_statistics in worker
+            processes, or loaded from a file.
+            See collect_lemma_statistics for details.
+        """
+        layers = self._detach_layers(doc, detached_layers)
+        if remove_duplicates:
+            self._duplicate_remover.change_layer( doc, layers )
+        retagger = self._make_postdisambiguation_retagger( statistics )
+        self._postdisambiguate_layers( doc, layers, retagger )
+
+
+    def postdisambiguate(self, in_collections, workers: int=1, shard_size: int=100):
         """ Post-disambiguates ambiguous analyses based on lemma counts 
             obtained from the input corpus.
             In a nutshell: uses the idea "one sense per discourse" for 
@@ -573,37 +669,39 @@ class CorpusBasedMorphDisambiguator( object ):
             disambiguation will be performed: first disambiguation is 
             performed within each sub list of Texts, and then performed
             within the whole collection.
-        """ 
+            For corpora that do not fit into memory, see the method 
+            collect_lemma_statistics.
+            If workers != 1, then lemma statistics of each sub list of Texts
+            are collected in a pool of worker processes (see the method
+            build_lemma_statistics for details on workers and shard_size).
+        """
         # 1) Determine input structure
         input_format = determine_input_corpus_structure(in_collections)
         # 2) Make detached_layers
         detached_layers = []
         if input_format == 'I':
             for doc in in_collections:
-                layers = {}
-                for layer in self.input_layers:
-                    if layer in doc.layers:
-                        layers[layer] = doc[layer]
-                detached_layers.append(layers)
+                detached_layers.append( self._detach_layers(doc, validate=False) )
         elif input_format == 'II':
             for docs_list in in_collections:
                 detached_layers.append( [] )
                 for doc in docs_list:
-                    layers = {}
-                    for layer in self.input_layers:
-                        if layer in doc.layers:
-                            layers[layer] = doc[layer]
-                    detached_layers[-1].append(layers)
+                    detached_layers[-1].append( self._detach_layers(doc, validate=False) )
         # 3) Post-disambiguate
         self._postdisambiguate_detached_layers( in_collections, detached_layers, \
-                                                input_format_hint=input_format)
+                                                input_format_hint=input_format, \
+                                                workers=workers, shard_size=shard_size )
 
 
-    def _postdisambiguate_detached_layers(self, in_collections, detached_layers, input_format_hint=None):
+    def _postdisambiguate_detached_layers(self, in_collections, detached_layers, input_format_hint=None,
+                                                workers: int=1, shard_size: int=100):
         """ Post-disambiguates ambiguous analyses based on lemma counts 
             obtained from the input corpus.
             The algorithm is applied on a collection of docs with detached_layers.
             Note: this interface mimics the _change_layer interface of Retagger;
+            If workers != 1, then the detached layers must be attached to docs,
+            as word analyses of documents are sent to worker processes for 
+            collecting statistics.
         """
         # Determine input structure (if not already determined)
         if input_format_hint is None:
@@ -628,71 +726,68 @@ class CorpusBasedMorphDisambiguator( object ):
         # Sanity checks on input
         assert len(_in_collections) == len(in_detached_layers)
         assert [len(docs) for docs in _in_collections] == [len(lyrs) for lyrs in in_detached_layers]
+        # Lemma statistics over the whole corpus (for the 2nd phase)
+        corpus_statistics = LemmaStatistics() if len(_in_collections) > 1 else None
         #
         #  1st phase:  post-disambiguate inside a single document collection
         #     (e.g. disambiguate all news articles published on the same day)
         #
         for collection_id, docs in enumerate(_in_collections):
             detached_layers = in_detached_layers[collection_id]
-            # 1) Remove duplicate and problematic analyses
-            self._remove_duplicate_and_problematic_analyses( docs, detached_layers )
-            # 2) Find ambiguities that should be ignored by the post-disambiguator
-            #    add results as a new (temporary) layer
-            self._add_hidden_analyses_layers( docs, detached_layers )
-            # 3) Collect two types of lemma frequencies:
+            # 1) Remove duplicate and problematic analyses, find ambiguities 
+            #    that should be ignored by the post-disambiguator, and collect 
+            #    two types of lemma frequencies:
             #    *) general lemma frequencies over all words (except words marked
             #       as ignored words);
             #    *) lemma frequencies of ambiguous words (except words marked
             #       as ignored words);
-            genLemmaLex = dict()
-            ambLemmaLex = dict()
-            self._supplement_lemma_frequency_lexicon(docs, detached_layers, \
-                                                     genLemmaLex, ambLemmaLex)
-            # 4) Perform lemma-based post-disambiguation;
+            if workers == 1:
+                statistics = LemmaStatistics()
+                for doc, layers in zip( docs, detached_layers ):
+                    self._collect_lemma_statistics( doc, layers, statistics, remove_duplicates=True )
+            else:
+                # Statistics are collected from word analyses of docs:
+                # duplicates are removed from docs right before the disambiguation
+                statistics = self.build_lemma_statistics( docs, workers=workers, shard_size=shard_size )
+            # 2) Perform lemma-based post-disambiguation;
             #    In case of ambiguous words, keep analyses with the highest lemma 
             #    frequency. An exception: if all lemma frequencies are equal, then 
             #    keep all the analyses;
-            self._disambiguate_with_lexicon( docs, detached_layers, ambLemmaLex )
-            # 5) Clean-up: remove hidden analyses layers
-            self._remove_hidden_analyses_layers( docs, detached_layers )
+            retagger = self._make_postdisambiguation_retagger( statistics )
+            for doc, layers in zip( docs, detached_layers ):
+                if workers != 1:
+                    self._duplicate_remover.change_layer( doc, layers )
+                self._postdisambiguate_layers( doc, layers, retagger )
+                if corpus_statistics is not None:
+                    # 3) Collect lemma frequencies for the 2nd phase
+                    self._collect_lemma_statistics( doc, layers, corpus_statistics, remove_duplicates=False )
         #
         #  2nd phase:  post-disambiguate over all document collections
         #              (for instance, disambiguate over all news editions published
         #               in a single year, each edition consists of articles published
         #               on a single day)
         #
-        if len(_in_collections) > 1:
-            # lexicons over the whole corpus
-            genLemmaLex = dict()
-            ambLemmaLex = dict()
+        if corpus_statistics is not None:
+            retagger = self._make_postdisambiguation_retagger( corpus_statistics )
             for collection_id, docs in enumerate(_in_collections):
-                detached_layers = in_detached_layers[collection_id]
-                # 1) Find ambiguities that should be ignored by the post-
-                #    disambiguator; add results as a new (temporary) layer
-                self._add_hidden_analyses_layers( docs, detached_layers )
-                # 2) Collect two types of lemma frequencies:
-                #    *) general lemma frequencies over all words (except words 
-                #       marked as ignored words);
-                #    *) lemma frequencies of ambiguous words (except words 
-                #       marked as ignored words);
-                self._supplement_lemma_frequency_lexicon(docs, detached_layers, \
-                                                         genLemmaLex, ambLemmaLex)
-            # perform the second phase of post-disambiguation
-            for collection_id, docs in enumerate(_in_collections):
-                detached_layers = in_detached_layers[collection_id]
-                # 1) Find ambiguities that should be ignored by the post-
-                #    disambiguator; add results as a new (temporary) layer
-                #    TODO: why it is necessary to add the layer 2nd time?
-                self._add_hidden_analyses_layers( docs, detached_layers,
-                                                  remove_old_hidden_words_layer=True )
-                # 2) Perform lemma-based post-disambiguation;
-                #    In case of ambiguous words, keep analyses with the highest lemma 
-                #    frequency. An exception: if all lemma frequencies are equal, then 
-                #    keep all the analyses;
-                self._disambiguate_with_lexicon( docs, detached_layers, ambLemmaLex )
-                # 3) Clean-up: remove hidden analyses layers
-                self._remove_hidden_analyses_layers( docs, detached_layers )
-            # And we're done! (for now)
+                for doc, layers in zip( docs, in_detached_layers[collection_id] ):
+                    self._postdisambiguate_layers( doc, layers, retagger )
+
+
+    def _detach_layers(self, doc: Text, detached_layers: dict=None, validate: bool=True):
+        """ Returns detached input layers of the document. If detached_layers 
+            are not given, takes input layers from the document. 
+            If validate is set, validates the layers (only if validate_inputs 
+            has been set on the initialization).
+        """
+        if detached_layers is None:
+            detached_layers = {}
+            for layer in self.input_layers:
+                if layer in doc.layers:
+                    detached_layers[layer] = doc[layer]
+        if validate and self._validate_inputs:
+            self._validate_docs_for_required_layers( [doc], [detached_layers], input_format_hint='I' )
+        return detached_layers
 
 
     # =========================================================
@@ -858,6 +953,189 @@ def is_list_of_lists_of_texts( docs:list ):
                                          all([all([isinstance(d, Text) for d in ds]) for ds in docs])) )
 
 
+def _check_predisambiguation_step( step:int ):
+    if step not in range(1, CorpusBasedMorphDisambiguator.PREDISAMBIGUATION_STEPS + 1):
+        raise ValueError('(!) Unexpected pre-disambiguation step {!r}. '.format(step)+\
+                         'The step should be 1, 2 or 3.')
+
+
+class ProperNameStatistics:
+    """ Corpus statistics used by the pre-disambiguation of proper names 
+        (see CorpusBasedMorphDisambiguator.collect_proper_name_statistics).
+        Statistics collected from different parts of the corpus can be 
+        combined with the method merge(). Statistics can be pickled, e.g. 
+        for sending them between processes, or saved into a JSON file with 
+        the method save() and loaded with the method load().
+        
+        Attributes:
+        *) lemma_frequencies -- numbers of words that have given proper name 
+           lemma (steps 1 and 3);
+        *) certain_names -- lemmas of words that only have proper name 
+           analyses (step 2);
+        *) sentence_initial_names -- proper name lemmas of sentence-initial 
+           words that also have regular analyses (step 2);
+        *) sentence_central_names -- proper name lemmas of words that are 
+           not in a sentence-initial position (step 2);
+    """
+    def __init__(self):
+        self.lemma_frequencies = dict()
+        self.certain_names = set()
+        self.sentence_initial_names = set()
+        self.sentence_central_names = set()
+        self._not_proper_names = None
+
+    def merge(self, other: 'ProperNameStatistics') -> 'ProperNameStatistics':
+        """ Adds statistics from other to this object. Returns this object. """
+        for lemma, freq in other.lemma_frequencies.items():
+            self.lemma_frequencies[lemma] = self.lemma_frequencies.get(lemma, 0) + freq
+        self.certain_names.update( other.certain_names )
+        self.sentence_initial_names.update( other.sentence_initial_names )
+        self.sentence_central_names.update( other.sentence_central_names )
+        self._clear_cache()
+        return self
+
+    def not_proper_names(self) -> set:
+        """ Returns proper name lemmas which are most unlikely proper names: 
+            names that are only sentence-initial (not sentence-central), 
+            and that are not certain names.
+        """
+        if self._not_proper_names is None:
+            only_sentence_initial = self.sentence_initial_names.difference(self.sentence_central_names)
+            self._not_proper_names = only_sentence_initial.difference(self.certain_names)
+        return self._not_proper_names
+
+    def _clear_cache(self):
+        self._not_proper_names = None
+
+    def to_dict(self) -> dict:
+        """ Returns statistics as a JSON serializable dict. """
+        return {'lemma_frequencies': self.lemma_frequencies,
+                'certain_names': sorted(self.certain_names),
+                'sentence_initial_names': sorted(self.sentence_initial_names),
+                'sentence_central_names': sorted(self.sentence_central_names)}
+
+    @classmethod
+    def from_dict(cls, statistics_dict: dict) -> 'ProperNameStatistics':
+        """ Creates statistics from a dict returned by the method to_dict(). """
+        statistics = cls()
+        statistics.lemma_frequencies = dict(statistics_dict['lemma_frequencies'])
+        statistics.certain_names = set(statistics_dict['certain_names'])
+        statistics.sentence_initial_names = set(statistics_dict['sentence_initial_names'])
+        statistics.sentence_central_names = set(statistics_dict['sentence_central_names'])
+        return statistics
+
+    def save(self, file: str):
+        """ Saves statistics into a JSON file. """
+        _save_statistics(self, file)
+
+    @classmethod
+    def load(cls, file: str) -> 'ProperNameStatistics':
+        """ Loads statistics from a JSON file created by the method save(). """
+        return cls.from_dict( _load_statistics(file) )
+
+
+class LemmaStatistics:
+    """ Corpus statistics used by the post-disambiguation 
+        (see CorpusBasedMorphDisambiguator.collect_lemma_statistics).
+        Statistics collected from different parts of the corpus can be 
+        combined with the method merge(). Statistics can be pickled, e.g. 
+        for sending them between processes, or saved into a JSON file with 
+        the method save() and loaded with the method load().
+        
+        Attributes:
+        *) lemma_frequencies -- frequencies of all lemmas (except lemmas of 
+           ignored ambiguities);
+        *) ambiguous_lemmas -- lemmas that appear in ambiguous words (except 
+           lemmas of ignored ambiguities);
+    """
+    def __init__(self):
+        self.lemma_frequencies = dict()
+        self.ambiguous_lemmas = set()
+        self._ambiguous_lemma_frequencies = None
+
+    def merge(self, other: 'LemmaStatistics') -> 'LemmaStatistics':
+        """ Adds statistics from other to this object. Returns this object. """
+        for lemma, freq in other.lemma_frequencies.items():
+            self.lemma_frequencies[lemma] = self.lemma_frequencies.get(lemma, 0) + freq
+        self.ambiguous_lemmas.update( other.ambiguous_lemmas )
+        self._clear_cache()
+        return self
+
+    def ambiguous_lemma_frequencies(self) -> dict:
+        """ Returns the lexicon used in the post-disambiguation: frequencies 
+            of lemmas of ambiguous words.
+        """
+        if self._ambiguous_lemma_frequencies is None:
+            self._ambiguous_lemma_frequencies = \
+                {lemma: self.lemma_frequencies[lemma] for lemma in self.ambiguous_lemmas}
+        return self._ambiguous_lemma_frequencies
+
+    def _clear_cache(self):
+        self._ambiguous_lemma_frequencies = None
+
+    def to_dict(self) -> dict:
+        """ Returns statistics as a JSON serializable dict. """
+        return {'lemma_frequencies': self.lemma_frequencies,
+                'ambiguous_lemmas': sorted(self.ambiguous_lemmas)}
+
+    @classmethod
+    def from_dict(cls, statistics_dict: dict) -> 'LemmaStatistics':
+        """ Creates statistics from a dict returned by the method to_dict(). """
+        statistics = cls()
+        statistics.lemma_frequencies = dict(statistics_dict['lemma_frequencies'])
+        statistics.ambiguous_lemmas = set(statistics_dict['ambiguous_lemmas'])
+        return statistics
+
+    def save(self, file: str):
+        """ Saves statistics into a JSON file. The statistics can be 
+            built once and reused in later post-disambiguation runs.
+        """
+        _save_statistics(self, file)
+
+    @classmethod
+    def load(cls, file: str) -> 'LemmaStatistics':
+        """ Loads statistics from a JSON file created by the method save(). """
+        return cls.from_dict( _load_statistics(file) )
+
+
+def _save_statistics(statistics, file: str):
+    with open(file, 'w', encoding='utf-8') as out_f:
+        json.dump(statistics.to_dict(), out_f, ensure_ascii=False)
+
+
+def _load_statistics(file: str) -> dict:
+    with open(file, 'r', encoding='utf-8') as in_f:
+        return json.load(in_f)
+
+
+# Worker process state of build_lemma_statistics: the disambiguator
+_worker_disambiguator = None
+
+
+def _init_lemma_statistics_worker(disambiguator: CorpusBasedMorphDisambiguator):
+    """ Sets the disambiguator of the worker process. Called once per worker. """
+    global _worker_disambiguator
+    _worker_disambiguator = disambiguator
+
+
+def _collect_lemma_statistics_in_worker(docs: list) -> LemmaStatistics:
+    statistics = LemmaStatistics()
+    for words in docs:
+        _worker_disambiguator._collect_lemma_statistics_from_word_analyses( words, statistics )
+    return statistics
+
+
+def _split_into_shards(docs: Iterable, shard_size: int):
+    shard = []
+    for doc in docs:
+        shard.append( doc )
+        if len(shard) == shard_size:
+            yield shard
+            shard = []
+    if shard:
+        yield shard
+
+
 def is_unknown_word(word_morph_analyses):
     """ Detects whether word's morphological analyses indicate 
         that this is an unknown word.
@@ -867,6 +1145,88 @@ def is_unknown_word(word_morph_analyses):
            or any([_is_empty_annotation(a) for a in word_morph_analyses.annotations])
 
 
+# Morphological analysis of a word (in the worker processes of build_lemma_statistics)
+_MorphAnalysis = namedtuple('_MorphAnalysis', (NORMALIZED_TEXT,) + ESTNLTK_MORPH_ATTRIBUTES)
+
+
+def _remaining_analyses_ids(analyses, attributes) -> list:
+    """ Returns indexes of the word's analyses that remain after the removal of
+        duplicate and problematic analyses (see 
+        RemoveDuplicateAndProblematicAnalysesRetagger for details). 
+        Analyses are compared by the given attributes.
+    """
+    # 1) Keep only the first one of duplicate analyses
+    remaining_ids = []
+    seen_values = []
+    for i, analysis in enumerate(analyses):
+        values = [getattr(analysis, attr) for attr in attributes]
+        if values not in seen_values:
+            seen_values.append( values )
+            remaining_ids.append( i )
+    # 2) If verb analyses contain forms '-tama' and '-ma', 
+    #    then keep only '-ma' analyses;
+    verb_forms = set(analyses[i].form for i in remaining_ids if analyses[i].partofspeech == 'V')
+    if 'ma' in verb_forms and 'tama' in verb_forms:
+        remaining_ids = [i for i in remaining_ids if analyses[i].partofspeech != 'V' or \
+                                                      analyses[i].form != 'tama']
+    return remaining_ids
+
+
+_NUD_TUD_ENDINGS = re.compile('^.*[ntd]ud$')
+
+
+def _is_ignored_ambiguity(analyses) -> bool:
+    """ Detects whether the ambiguity of the word's analyses should be ignored 
+        by the post-disambiguator (see IgnoredByPostDisambiguationTagger for 
+        details). Assumes that the word is not an unknown word.
+    """
+    if len(analyses) < 2:
+        return False
+    #
+    # 1) If most of the analyses indicate nud/tud/dud forms, then hide the ambiguity:
+    #    E.g.    kõla+nud //_V_ nud, //    kõla=nud+0 //_A_ //    kõla=nud+0 //_A_ sg n, //    kõla=nud+d //_A_ pl n, //
+    nudTud = [_NUD_TUD_ENDINGS.match(a.root) is not None or
+              _NUD_TUD_ENDINGS.match(a.ending) is not None
+              for a in analyses]
+    if nudTud.count( True ) > 1:
+        return True
+    #
+    # 2) If analyses have same lemma and no form, then hide the ambiguity:
+    #    E.g.    kui+0 //_D_ //    kui+0 //_J_ //
+    #            nagu+0 //_D_ //    nagu+0 //_J_ //
+    lemmas = set(a.root for a in analyses)
+    forms  = set(a.form for a in analyses)
+    if len(lemmas) == 1 and len(forms) == 1 and (list(forms))[0] == '':
+        return True
+    #
+    # 3) If 'olema' analyses have the same lemma and the same ending, then hide 
+    #    the ambiguity:
+    #    E.g.    'nad on' vs 'ta on' -- both get the same 'olema'-analysis, 
+    #                                   which will remain ambiguous;
+    endings = set(a.ending for a in analyses)
+    if len(lemmas) == 1 and (list(lemmas))[0] == 'ole' and len(endings) == 1 \
+       and (list(endings))[0] == '0':
+        return True
+    #
+    # 4) If pronouns have the the same lemma and the same ending, then hide the 
+    #    singular/plural ambiguity:
+    #    E.g.     kõik+0 //_P_ sg n //    kõik+0 //_P_ pl n //
+    #             kes+0 //_P_ sg n //    kes+0 //_P_ pl n //
+    postags = set(a.partofspeech for a in analyses)
+    if len(lemmas) == 1 and len(postags) == 1 and 'P' in postags and \
+       len(endings) == 1:
+        return True
+    #
+    # 5) If lemmas and endings are exactly the same, then hide the ambiguity 
+    #    between numerals and pronouns:
+    #    E.g.     teine+0 //_O_ pl n, //    teine+0 //_P_ pl n, //
+    #             üks+l //_N_ sg ad, //    üks+l //_P_ sg ad, //
+    if len(lemmas) == 1 and 'P' in postags and ('O' in postags or
+       'N' in postags) and len(endings) == 1:
+        return True
+    return False
+
+
 # ----------------------------------------
 
 class CorpusBasedMorphDisambiguationSubstepRetagger(Retagger):
@@ -934,10 +1294,11 @@ class ProperNamesDisambiguationStep1Retagger(CorpusBasedMorphDisambiguationSubst
         frequencies, keeps only the analysis that has the highest
         frequency.
     """
+    conf_param = CorpusBasedMorphDisambiguationSubstepRetagger.conf_param + ['_lexicon']
+
     def __init__(self, lexicon:dict, \
                        morph_analysis_layer:str='morph_analysis'):
         super().__init__( morph_analysis_layer=morph_analysis_layer )
-        self.conf_param.append('_lexicon')
         self._lexicon = lexicon
 
     def _change_layer(self, text, layers, status: dict):
@@ -976,10 +1337,11 @@ class ProperNamesDisambiguationStep2Retagger(CorpusBasedMorphDisambiguationSubst
         names listed in the given lexicon, then proper names appearing in 
         the lexicon will be removed.
     """
+    conf_param = CorpusBasedMorphDisambiguationSubstepRetagger.conf_param + ['_lexicon']
+
     def __init__(self, lexicon:dict, \
                        morph_analysis_layer:str='morph_analysis'):
         super().__init__( morph_analysis_layer=morph_analysis_layer )
-        self.conf_param.append('_lexicon')
         self._lexicon = lexicon
 
     def _change_layer(self, text, layers, status: dict):
@@ -1004,6 +1366,8 @@ class ProperNamesDisambiguationStep3Retagger(CorpusBasedMorphDisambiguationSubst
            proper name has corpus frequency greater than 1, then keep only 
            proper name analyses. Otherwise, leave analyses intact;
     """
+    conf_param = CorpusBasedMorphDisambiguationSubstepRetagger.conf_param + ['_lexicon']
+
     def __init__(self, lexicon:dict, \
                        morph_analysis_layer:str='morph_analysis',\
                        input_words_layer:str='words',\
@@ -1013,7 +1377,6 @@ class ProperNamesDisambiguationStep3Retagger(CorpusBasedMorphDisambiguationSubst
                           input_sentences_layer=input_sentences_layer,\
                           requires_words_layer=True, \
                           requires_sentences_layer=True )
-        self.conf_param.append('_lexicon')
         self._lexicon = lexicon
 
     def _change_layer(self, text, layers, status: dict):
@@ -1110,42 +1473,11 @@ class RemoveDuplicateAndProblematicAnalysesRetagger( CorpusBasedMorphDisambiguat
     def _change_layer(self, text, layers, status: dict):
         morph_analysis_layer = layers[ self._input_morph_analysis_layer ]
         for morph_analyses in morph_analysis_layer:
-            #
-            # 1) Find and remove duplicate analyses
-            #
-            toDeleteAnalysisIDs = []
-            for i1, analysis1 in enumerate(morph_analyses.annotations):
-                duplicateFound = False
-                for i2 in range(i1+1, len(morph_analyses.annotations)):
-                    analysis2 = morph_analyses.annotations[i2]
-                    # Check for complete attribute match
-                    attr_matches = []
-                    for attr in self.output_attributes:
-                        attr_match = \
-                           getattr(analysis1,attr)==getattr(analysis2,attr)
-                        attr_matches.append( attr_match )
-                    if all( attr_matches ):
-                        duplicateFound = True
-                        toDeleteAnalysisIDs.append( i2 )
-                        break
-            if toDeleteAnalysisIDs:
-                for aid in sorted(toDeleteAnalysisIDs, reverse=True):
-                    morph_analyses.annotations.pop(aid)
-            #
-            # 2) If verb analyses contain forms '-tama' and '-ma', 
-            #    then keep only '-ma' analyses;
-            #
-            tamaIDs = []
-            maIDs   = []
-            for i, analysis in enumerate(morph_analyses.annotations):
-                if analysis.partofspeech == 'V':
-                    if analysis.form == 'ma':
-                        maIDs.append(i)
-                    elif analysis.form == 'tama':
-                        tamaIDs.append(i)
-            if len(maIDs)>0 and len(tamaIDs)>0:
-                for aid in sorted(tamaIDs, reverse=True):
-                    morph_analyses.annotations.pop( aid )
+            remaining_ids = _remaining_analyses_ids( morph_analyses.annotations, self.output_attributes )
+            if len(remaining_ids) < len(morph_analyses.annotations):
+                for aid in reversed(range(len(morph_analyses.annotations))):
+                    if aid not in remaining_ids:
+                        morph_analyses.annotations.pop( aid )
 
 
 
@@ -1178,52 +1510,10 @@ class IgnoredByPostDisambiguationTagger( Tagger ):
                       enveloping=self._input_morph_analysis_layer,
                       attributes=self.output_attributes,
                       ambiguous=False)
-        nudTudEndings = re.compile('^.*[ntd]ud$')
         morph_analysis = layers[ self._input_morph_analysis_layer ]
         for w, word_morph in enumerate( morph_analysis ):
-            if not is_unknown_word(word_morph) and len(word_morph.annotations) > 1:
-                #
-                # 1) If most of the analyses indicate nud/tud/dud forms, then hide the ambiguity:
-                #    E.g.    kõla+nud //_V_ nud, //    kõla=nud+0 //_A_ //    kõla=nud+0 //_A_ sg n, //    kõla=nud+d //_A_ pl n, //
-                nudTud = [nudTudEndings.match(a.root) is not None or
-                          nudTudEndings.match(a.ending) is not None
-                          for a in word_morph.annotations]
-                if nudTud.count( True ) > 1:
-                    hidden_words.add_annotation(morph_analysis[w:w+1])
-                #
-                # 2) If analyses have same lemma and no form, then hide the ambiguity:
-                #    E.g.    kui+0 //_D_ //    kui+0 //_J_ //
-                #            nagu+0 //_D_ //    nagu+0 //_J_ //
-                lemmas = set(a.root for a in word_morph.annotations)
-                forms  = set(a.form for a in word_morph.annotations)
-                if len(lemmas) == 1 and len(forms) == 1 and (list(forms))[0] == '':
-                    hidden_words.add_annotation(morph_analysis[w:w+1])
-                #
-                # 3) If 'olema' analyses have the same lemma and the same ending, then hide 
-                #    the ambiguity:
-                #    E.g.    'nad on' vs 'ta on' -- both get the same 'olema'-analysis, 
-                #                                   which will remain ambiguous;
-                endings = set(a.ending for a in word_morph.annotations)
-                if len(lemmas) == 1 and (list(lemmas))[0] == 'ole' and len(endings) == 1 \
-                   and (list(endings))[0] == '0':
-                    hidden_words.add_annotation(morph_analysis[w:w+1])
-                #
-                # 4) If pronouns have the the same lemma and the same ending, then hide the 
-                #    singular/plural ambiguity:
-                #    E.g.     kõik+0 //_P_ sg n //    kõik+0 //_P_ pl n //
-                #             kes+0 //_P_ sg n //    kes+0 //_P_ pl n //
-                postags = set(a.partofspeech for a in word_morph.annotations)
-                if len(lemmas) == 1 and len(postags) == 1 and 'P' in postags and \
-                   len(endings) == 1:
-                    hidden_words.add_annotation(morph_analysis[w:w+1])
-                #
-                # 5) If lemmas and endings are exactly the same, then hide the ambiguity 
-                #    between numerals and pronouns:
-                #    E.g.     teine+0 //_O_ pl n, //    teine+0 //_P_ pl n, //
-                #             üks+l //_N_ sg ad, //    üks+l //_P_ sg ad, //
-                if len(lemmas) == 1 and 'P' in postags and ('O' in postags or
-                   'N' in postags) and len(endings) == 1:
-                    hidden_words.add_annotation(morph_analysis[w:w+1])
+            if not is_unknown_word(word_morph) and _is_ignored_ambiguity(word_morph.annotations):
+                hidden_words.add_annotation(morph_analysis[w:w+1])
         return hidden_words
 
 
@@ -1237,16 +1527,16 @@ class LemmaBasedPostDisambiguationRetagger(CorpusBasedMorphDisambiguationSubstep
        lemmas will remain as they are.
     """
 
+    conf_param = CorpusBasedMorphDisambiguationSubstepRetagger.conf_param + \
+                 ['_lexicon', '_hidden_morph_analysis_layer', 
+                  '_disambiguate_last_words_of_compounds', '_ignore_last_words']
+
     def __init__(self, lexicon:dict, 
                        morph_analysis_layer:str='morph_analysis',
                        input_hidden_morph_analysis_layer:str='_hidden_morph_analysis',
                        disambiguate_last_words_of_compounds:bool=False,
                        ignore_last_words:Set=None ):
         super().__init__( morph_analysis_layer=morph_analysis_layer )
-        self.conf_param.append('_lexicon')
-        self.conf_param.append('_hidden_morph_analysis_layer')
-        self.conf_param.append('_disambiguate_last_words_of_compounds')
-        self.conf_param.append('_ignore_last_words')
         self._lexicon = lexicon
         self._hidden_morph_analysis_layer = input_hidden_morph_analysis_layer
         self._disambiguate_last_words_of_compounds = disambiguate_last_words_of_compounds
@@ -29,6 +29,7 @@ from estnltk.common import _get_word_texts
 
 from estnltk.taggers import Tagger
 from estnltk.vabamorf.morf import Vabamorf
+from estnltk.vabamorf.morf import AnalysisCache
 from estnltk.taggers import Retagger
 from estnltk.taggers.standard.morph_analysis.postanalysis_tagger import PostMorphAnalysisTagger
 from estnltk.taggers.standard.morph_analysis.vm_analysis_reorderer import MorphAnalysisReorderer
@@ -101,7 +102,9 @@ class VabamorfTagger(Tagger):
                  compound=DEFAULT_PARAM_COMPOUND,
                  phonetic=DEFAULT_PARAM_PHONETIC,
                  stem=DEFAULT_PARAM_STEM,
-                 slang_lex=False ):
+                 slang_lex=False,
+                 cache_size=None,
+                 batch_sentences=False ):
         """Initialize VabamorfTagger class.
 
         Note: Keyword arguments 'disambiguate', 'guess', 'propername',
@@ -186,6 +189,15 @@ class VabamorfTagger(Tagger):
             that "the slang lexicon" is not switched on by default;
             Note: this only works if you leave the parameter vm_instance 
             unspecified;
+        cache_size: int (default: None)
+            If set, then VabamorfAnalyzer uses a LRU cache of the given 
+            size for storing analyses of word forms (see VabamorfAnalyzer 
+            for details). By default, the cache is not used.
+        batch_sentences: boolean (default: False)
+            If True, then VabamorfAnalyzer analyses words of multiple 
+            sentences with a single call to Vabamorf (see VabamorfAnalyzer 
+            for details). Note: disambiguation is still performed sentence 
+            by sentence.
         use_postanalysis: boolean (default: True)
             Whether postanalysis_tagger will be applied for post-correcting 
             morph layer. Post-corrections will be applied after morph analysis 
@@ -338,7 +350,9 @@ class VabamorfTagger(Tagger):
                                                          propername=self.propername,
                                                          compound=self.compound,
                                                          phonetic=self.phonetic,
-                                                         stem=self.stem)
+                                                         stem=self.stem,
+                                                         cache_size=cache_size,
+                                                         batch_sentences=batch_sentences)
         self._vabamorf_disambiguator = VabamorfDisambiguator( vm_instance=_vm_instance,
                                                               output_layer=output_layer,
                                                               input_words_layer=self._input_words_layer,
@@ -498,6 +512,13 @@ def _is_ignore_span(span):
 #    VabamorfAnalyzer
 # ===============================
 
+# Maximum number of words that can be safely analysed with a single call to Vabamorf:
+#   if 149129 < len(wordlist) on Linux,
+#   if  15000 < len(wordlist) < 17500 on Windows,
+#   then Vabamorf.analyze(words=wordlist, ...) raises
+#   RuntimeError: CFSException: internal error with vabamorf
+VM_ANALYSIS_MAX_WORDS = 15000
+
 class VabamorfAnalyzer(Tagger):
     """Performs morphological analysis with Vabamorf's analyzer.
        Note: resulting analyses will be ambiguous."""
@@ -517,6 +538,10 @@ class VabamorfAnalyzer(Tagger):
                   '_input_sentences_layer',
                   # Extra configuration flags:
                   'extra_attributes',
+                  # Cache of word analyses:
+                  'analysis_cache',
+                  # Analyse multiple sentences with a single call:
+                  'batch_sentences',
                  ]
 
     def __init__(self,
@@ -529,7 +554,9 @@ class VabamorfAnalyzer(Tagger):
                  propername = DEFAULT_PARAM_PROPERNAME,
                  compound = DEFAULT_PARAM_COMPOUND,
                  phonetic = DEFAULT_PARAM_PHONETIC,
-                 stem=DEFAULT_PARAM_STEM):
+                 stem=DEFAULT_PARAM_STEM,
+                 cache_size=None,
+                 batch_sentences=False):
         """Initialize VabamorfAnalyzer class.
 
         Parameters
@@ -569,6 +596,22 @@ class VabamorfAnalyzer(Tagger):
             gets root='läk' (with ending='s' and no lemma). 
             Note that with stem-based analysis, there will be no 
             lemmas in the output.
+        cache_size: int (default: None)
+            If set, then analyses of (normalized) word forms are stored 
+            in a LRU cache (estnltk.vabamorf.morf.AnalysisCache) of the 
+            given size, and repeated word forms will be taken from the 
+            cache instead of analysing them with Vabamorf again. 
+            The cache can be accessed via the attribute analysis_cache 
+            (e.g. for checking hits and misses). 
+            By default, the cache is not used.
+        batch_sentences: boolean (default: False)
+            If True, then words of consecutive sentences are packed 
+            together and analysed with a single call to Vabamorf 
+            (up to VM_ANALYSIS_MAX_WORDS words per call). This reduces 
+            the overhead of calling Vabamorf, and gives the same results 
+            as the sentence by sentence analysis, because analysis 
+            without disambiguation does not depend on the context.
+            By default, each sentence is analysed with a separate call.
         """
         # Set input/output layer names
         self.output_layer = output_layer
@@ -599,6 +642,9 @@ class VabamorfAnalyzer(Tagger):
         self.compound = compound
         self.phonetic = phonetic
         self.stem = stem
+        # Set cache of word analyses
+        self.analysis_cache = AnalysisCache(maxsize=cache_size) if cache_size else None
+        self.batch_sentences = batch_sentences
         
 
 
@@ -642,48 +688,35 @@ class VabamorfAnalyzer(Tagger):
         # --------------------------------------------
         #   Use Vabamorf for morphological analysis
         # --------------------------------------------
-        # Perform morphological analysis sentence by sentence
+        # Perform morphological analysis sentence by sentence, or,
+        # if batch_sentences is set, multiple sentences at once
         word_layer = layers[self._input_words_layer]
-        word_span_id = 0
         analysis_results = []
+        batch_words = []
+        batch_words_count = 0
         for sentence in layers[self._input_sentences_layer]:
             # A) Collect all words inside the sentence
-            sentence_words = []
-            sentence_words_count = 0
-            while word_span_id < len(word_layer):
-                span = word_layer[word_span_id]
-                if sentence.start <= span.start and \
-                    span.end <= sentence.end:
-                    # > Word is inside the sentence
-                    # Get the normalized variants
-                    _words = _get_word_texts( span )
-                    assert isinstance( _words, list )
-                    sentence_words.append( _words )
-                    sentence_words_count += len( _words )
-                    word_span_id += 1
-                    # B) Use Vabamorf for analysis
-                    #    (but check length limitations first)
-                    if len(sentence_words) >= 15000:
-                        # if 149129 < len(wordlist) on Linux,
-                        # if  15000 < len(wordlist) < 17500 on Windows,
-                        # then self.instance.analyze(words=wordlist, **self.current_kwargs) raises
-                        # RuntimeError: CFSException: internal error with vabamorf
-                        res = self._perform_vm_analysis(sentence_words, current_kwargs)
-                        packed_res = self._pack_expanded_analysis_results(res, sentence_words,
-                                                         sort_analyses=False )
-                        analysis_results.extend(packed_res)
-                        sentence_words = []
-                        sentence_words_count = 0
-                elif sentence.end <= span.start:
-                    break
-            # B) Analyse what's left
-            if sentence_words_count > 0:
-                assert sentence_words_count < 15000, \
-                    '(!) Unexpected amount of unanalysed words left: {}'.format(len(sentence_words_count))
-                res = self._perform_vm_analysis( sentence_words, current_kwargs )
-                packed_res = self._pack_expanded_analysis_results( res, sentence_words,
-                                                  sort_analyses=False )
-                analysis_results.extend( packed_res )
+            #    (words are found via the interval index of the layer)
+            for span in word_layer.spans_within(sentence.start, sentence.end):
+                # Get the normalized variants
+                _words = _get_word_texts( span )
+                assert isinstance( _words, list )
+                # B) Use Vabamorf for analysis
+                #    (if the length limitation would be exceeded otherwise)
+                if batch_words and batch_words_count + len(_words) > VM_ANALYSIS_MAX_WORDS:
+                    analysis_results.extend( self._analyse_words( batch_words, current_kwargs ) )
+                    batch_words = []
+                    batch_words_count = 0
+                batch_words.append( _words )
+                batch_words_count += len( _words )
+            # C) Analyse words of the sentence
+            if batch_words and not self.batch_sentences:
+                analysis_results.extend( self._analyse_words( batch_words, current_kwargs ) )
+                batch_words = []
+                batch_words_count = 0
+        # D) Analyse what's left
+        if batch_words:
+            analysis_results.extend( self._analyse_words( batch_words, current_kwargs ) )
 
         # Assert that all words obtained an analysis 
         # ( Note: there must be empty analyses for unknown 
@@ -755,7 +788,8 @@ class VabamorfAnalyzer(Tagger):
         analysis_kwargs["compound"]   = self.compound
         analysis_kwargs["phonetic"]   = self.phonetic
         analysis_kwargs["stem"]       = self.stem
-        res = self._vm_instance.analyze(words=[input_token], **analysis_kwargs)
+        res = self._vm_instance.analyze(words=[input_token], cache=self.analysis_cache, 
+                                        **analysis_kwargs)
         if len(res) > 0 and sort_analyses:
             res[0]['analysis'] = sorted(res[0]['analysis'],
                     key=lambda x: x['root']+x['ending']+x['clitic']+x['partofspeech']+x['form'],
@@ -763,12 +797,23 @@ class VabamorfAnalyzer(Tagger):
         return res[0]['analysis'] if len(res) > 0 else []
 
 
+    def _analyse_words( self, sentence_words, analysis_kwargs ):
+        """Analyses given list of words with Vabamorf, and packs the results. 
+           Returns a list of analysis records, one record per each word. 
+           (Only for internal usage) """
+        assert sum( len(word_variants) for word_variants in sentence_words ) <= VM_ANALYSIS_MAX_WORDS, \
+            '(!) Unexpected amount of words for a single analysis: {}'.format( len(sentence_words) )
+        res = self._perform_vm_analysis( sentence_words, analysis_kwargs )
+        return self._pack_expanded_analysis_results( res, sentence_words, sort_analyses=False )
+
+
     def _perform_vm_analysis( self, sentence_words, analysis_kwargs ):
         """Analyses given list of words with Vabamorf. (Only for internal usage) """
         # Flatten the input list
         flat_words = [w for word_variants in sentence_words for w in word_variants]
         # Analyse words
-        return self._vm_instance.analyze(words=flat_words, **analysis_kwargs)
+        return self._vm_instance.analyze(words=flat_words, cache=self.analysis_cache, 
+                                         **analysis_kwargs)
 
 
     def _pack_expanded_analysis_results( self, analysis_results, initial_sentence_words, sort_analyses=True ):
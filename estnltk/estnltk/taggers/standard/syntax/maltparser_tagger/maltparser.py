@@ -12,6 +12,7 @@ import subprocess
 
 from estnltk.converters.conll.conll_exporter import layer_to_conll
 from estnltk.downloader import get_resource_paths
+from estnltk.java.javaprocess import JavaProcess
 
 MALTPARSER_PATH = os.path.join(PACKAGE_PATH, 'taggers', 'standard', 'syntax', 'maltparser_tagger', 'java-res', 'maltparser')
 MALTPARSER_MODEL = 'model1'  # Note: this model is not distributed with EstNLTK by default and needs to be downloaded
@@ -33,6 +34,16 @@ class MaltParser(object):
             results1 = parser.parse_text( text, return_type = 'conllu_lines' )
             for line in results1:
                 print(line)
+
+        By default, a new Java process is launched for parsing each text, 
+        which means that JVM start-up and loading of the model is repeated 
+        for each text. If persistent=True, then a long-lived MaltParser 
+        process is used instead: the model is loaded once, and sentences are 
+        streamed through the standard input/output of the process (see 
+        MaltParserProcess). Use close() to terminate the process.
+        
+        Note: the persistent mode is experimental: it has not yet been 
+        tested nor benchmarked with a real MaltParser process (JVM). 
     '''
 
     maltparser_dir = MALTPARSER_PATH
@@ -54,7 +65,12 @@ class MaltParser(object):
 
             maltparser_jar : str
                 Name of the Maltparser jar file (e.g. 'maltparser-1.8.jar');
+
+            persistent : bool
+                If set, then a long-lived MaltParser process is used for parsing 
+                all the texts (default: False). Experimental;
         '''
+        persistent = False
         for argName, argVal in kwargs.items():
             if argName == 'maltparser_dir':
                 self.maltparser_dir = argVal
@@ -62,6 +78,8 @@ class MaltParser(object):
                 self.model_name = argVal
             elif argName == 'maltparser_jar':
                 self.maltparser_jar = argVal
+            elif argName == 'persistent':
+                persistent = argVal
             else:
                 raise Exception(' Unsupported argument given: ' + argName)
         if not self.maltparser_dir:
@@ -89,6 +107,18 @@ class MaltParser(object):
                                       "").format(self.model_name, resources_path) )
                 self.maltparser_dir = resources_path
         self.java_check_completed = False
+        self._java_process = None
+        if persistent:
+            self._java_process = MaltParserProcess(self.maltparser_dir, self.maltparser_jar, self.model_name)
+
+    @property
+    def persistent(self):
+        return self._java_process is not None
+
+    def close(self):
+        ''' Terminates the long-lived MaltParser process (if it is running). '''
+        if self._java_process is not None and self._java_process.is_alive():
+            self._java_process.terminate_java_subprocess()
 
     @staticmethod
     def check_for_java_accessibility():
@@ -134,11 +164,7 @@ class MaltParser(object):
                                        add_ending_tab=True )
         # Execute MaltParser and get results 
         # (either as a CONLL formatted string or as name of the temp conllu file 
-        result = \
-            _executeMaltparser(textConllStr, self.maltparser_dir, \
-                               self.maltparser_jar, \
-                               self.model_name, \
-                               return_type = return_type)
+        result = self._parse_conll(textConllStr, return_type=return_type)
         return result
 
     def parse_detached_layers(self, text_obj, sentences_layer,
@@ -196,14 +222,82 @@ class MaltParser(object):
         assert word_id == len(words_layer)
         # Execute MaltParser and get results 
         # (either as a CONLL formatted string or as name of the temp conllu file 
-        result = \
-            _executeMaltparser(textConllStr, self.maltparser_dir, \
-                               self.maltparser_jar, \
-                               self.model_name, \
-                               return_type = return_type)
+        result = self._parse_conll(textConllStr, return_type=return_type)
         return result
 
 
+    def _parse_conll(self, input_string, return_type='conllu_lines'):
+        ''' Parses given CONLL input string either with the long-lived MaltParser 
+            process (if persistent), or with a new MaltParser process. 
+            See _executeMaltparser for details on return_type. '''
+        if self._java_process is None:
+            return _executeMaltparser(input_string, self.maltparser_dir, \
+                                      self.maltparser_jar, \
+                                      self.model_name, \
+                                      return_type = return_type)
+        assert return_type and return_type.lower() in ['conllu_lines', 'temp_output_file']
+        results = self._java_process.parse_conll(input_string)
+        if return_type.lower() == 'conllu_lines':
+            return results
+        with tempfile.NamedTemporaryFile(prefix='malt_out.', mode='w', encoding='utf-8', delete=False) as out_f:
+            for line in results:
+                out_f.write(line+'\n')
+        return out_f.name
+
+
+class MaltParserProcess(JavaProcess):
+    ''' A long-lived MaltParser process. Loads MaltParser's model once, and 
+        parses sentences streamed through the standard input/output of the 
+        process, so that no temporary files are needed. 
+        
+        MaltParser reads a sentence in CONLL format (one word per line) until 
+        an empty line, and writes out the parsed sentence followed by an empty 
+        line. Thus, each sentence is sent to the process as a single "line" 
+        (see JavaProcess.process_lines), and the result of each sentence is 
+        read until an empty line. 
+        
+        Experimental: the process protocol has not yet been tested with a 
+        real MaltParser process (JVM). 
+    '''
+
+    def __init__(self, maltparser_dir, maltparser_jar, model_name, lazy_initialize=True):
+        # Note: java's accessibility is checked by MaltParser
+        args = ['-c', model_name, '-m', 'parse', '-w', maltparser_dir, '-v', 'off']
+        super().__init__(maltparser_jar, jar_path=maltparser_dir, check_java=False, \
+                         lazy_initialize=lazy_initialize, args=args)
+
+    def _read_result(self, process):
+        ''' Reads lines of a parsed sentence until an empty line. '''
+        lines = []
+        while True:
+            line = super()._read_result(process)
+            if line.strip():
+                lines.append(line)
+            elif lines:
+                return ''.join(lines)
+
+    def parse_conll(self, input_string):
+        ''' Parses sentences of the given CONLL input string (sentences are 
+            separated by empty lines). Returns the list of output lines 
+            (an empty line follows each sentence), as _executeMaltparser does. 
+        '''
+        sentences = []
+        sentence_lines = []
+        for line in input_string.split('\n'):
+            if line.strip():
+                sentence_lines.append(line)
+            elif sentence_lines:
+                sentences.append('\n'.join(sentence_lines)+'\n')
+                sentence_lines = []
+        if sentence_lines:
+            sentences.append('\n'.join(sentence_lines)+'\n')
+        results = []
+        for parsed_sentence in self.process_lines(sentences):
+            results.extend( [line.rstrip() for line in parsed_sentence.splitlines()] )
+            results.append( '' )
+        return results
+
+
 def _executeMaltparser(input_string, maltparser_dir, maltparser_jar, model_name,
                        return_type='conllu_lines'):
     ''' Executes Maltparser on given (CONLL-style) input string, and 
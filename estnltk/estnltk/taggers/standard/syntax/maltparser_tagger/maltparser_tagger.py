@@ -2,6 +2,7 @@
 
 from typing import MutableMapping
 import os, os.path
+import io
 
 from estnltk import Text
 from estnltk import Layer
@@ -13,9 +14,21 @@ from estnltk.taggers.standard.syntax.maltparser_tagger.maltparser import MaltPar
 
 from estnltk.downloader import get_resource_paths
 
+CONLL_FIELDS = ('id', 'form', 'lemma', 'upostag', 'xpostag', 'feats', 'head', 'deprel', 'deps', 'misc')
+
 class MaltParserTagger(Tagger):
-    """Tags dependency syntactic analysis with MaltParser."""
-    conf_param = ['_maltparser_inst', 'add_parent_and_children', 'syntax_dependency_retagger', 'resources_path']
+    """Tags dependency syntactic analysis with MaltParser.
+    
+       By default (persistent=False), a new MaltParser process is launched 
+       for each text. If persistent=True, then a long-lived MaltParser process 
+       is used: the model is loaded once, and sentences are streamed to the 
+       process without temporary files. Use the persistent tagger as a context 
+       manager, or call close() to terminate the process.
+       Note: the persistent mode is experimental, it has not yet been 
+       tested nor benchmarked with a real MaltParser process (JVM).
+    """
+    conf_param = ['_maltparser_inst', 'add_parent_and_children', 'syntax_dependency_retagger', 'resources_path',
+                  'persistent']
 
     def __init__(self, input_words_layer='words',
                  input_sentences_layer='sentences',
@@ -24,9 +37,11 @@ class MaltParserTagger(Tagger):
                  add_parent_and_children=True,
                  input_type='morph_analysis',  # can be morph_analysis, morph_extended, visl_morph
                  resources_path=None,          # location of Maltparser's models (must also contain maltparser jar)
-                 version='conllu'):            # conllu or conllx
+                 version='conllu',             # conllu or conllx
+                 persistent=False):            # use a long-lived MaltParser process
 
-        maltparser_kwargs = {}
+        self.persistent = persistent
+        maltparser_kwargs = {'persistent': persistent}
         if resources_path is None:
             if not (input_type == 'morph_analysis' and version == 'conllu'):
                 # If we are not using the default model, then resources_path is needed.
@@ -84,6 +99,17 @@ class MaltParserTagger(Tagger):
             layer.serialisation_module = syntax_v0.__version__
         return layer
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        """ Terminates MaltParser's process. """
+        self._maltparser_inst.close()
+        return False
+
+    def close(self):
+        self._maltparser_inst.close()
+
     def _make_layer(self, text: Text, layers: MutableMapping[str, Layer], status: dict):
         # Import from conllu only if we know for sure that MaltParser is going to be applied
         from conllu import parse_incr
@@ -91,37 +117,32 @@ class MaltParserTagger(Tagger):
         words_layer       = layers[self.input_layers[0]]
         sentences_layer   = layers[self.input_layers[1]]
         conll_morph_layer = layers[self.input_layers[2]]
-        len_words = len(words_layer)
-        temp_file_name = self._maltparser_inst.parse_detached_layers(text,
-                                                                     sentences_layer,
-                                                                     words_layer,
-                                                                     conll_morph_layer,
-                                                                     return_type='temp_output_file' )
         # Construct syntax layer
         syntax_layer = self._make_layer_template()
         syntax_layer.text_object=text
-        
-        assert os.path.exists( temp_file_name )
-        with open(temp_file_name, "r", encoding="utf-8") as data_file:
-            word_index = 0
-            for conll_sentence in parse_incr(data_file, fields=('id', 'form', 'lemma', 'upostag', 'xpostag', 'feats', 'head', 'deprel', 'deps', 'misc')):
-                for conll_word in conll_sentence:
-                    token = conll_word['form']
-                    if word_index >= len_words:
-                        raise Exception("can't match file with words layer")
-                    while token != words_layer[word_index].text:
-                        word_index += 1
-                        if word_index >= len_words:
-                            raise Exception("can't match file with words layer")
-                    w_span = words_layer[word_index]
-                    # add values for 'id', 'lemma', 'upostag', 'xpostag', 'feats', 'head', 'deprel', 'deps', 'misc'
-                    syntax_layer.add_annotation((w_span.start, w_span.end), **conll_word)
-                    word_index += 1
-            assert len_words == len( syntax_layer )
 
-        # Clean up: remove temporary file
-        os.remove( temp_file_name )
-        assert not os.path.exists( temp_file_name )
+        if self.persistent:
+            # Get results directly from MaltParser's process
+            conll_lines = self._maltparser_inst.parse_detached_layers(text,
+                                                                      sentences_layer,
+                                                                      words_layer,
+                                                                      conll_morph_layer,
+                                                                      return_type='conllu_lines' )
+            with io.StringIO( '\n'.join(conll_lines)+'\n' ) as data_file:
+                self._add_conll_annotations(syntax_layer, words_layer, parse_incr(data_file, fields=CONLL_FIELDS))
+        else:
+            temp_file_name = self._maltparser_inst.parse_detached_layers(text,
+                                                                         sentences_layer,
+                                                                         words_layer,
+                                                                         conll_morph_layer,
+                                                                         return_type='temp_output_file' )
+            assert os.path.exists( temp_file_name )
+            with open(temp_file_name, "r", encoding="utf-8") as data_file:
+                self._add_conll_annotations(syntax_layer, words_layer, parse_incr(data_file, fields=CONLL_FIELDS))
+
+            # Clean up: remove temporary file
+            os.remove( temp_file_name )
+            assert not os.path.exists( temp_file_name )
 
         if self.add_parent_and_children:
             # Add 'parent_span' & 'children' to the syntax layer
@@ -130,5 +151,25 @@ class MaltParserTagger(Tagger):
         # Return the resulting layer
         return syntax_layer
 
+    @staticmethod
+    def _add_conll_annotations(syntax_layer: Layer, words_layer: Layer, conll_sentences):
+        """Adds annotations of parsed conll sentences to the syntax layer (matching conll words with words_layer)."""
+        len_words = len(words_layer)
+        word_index = 0
+        for conll_sentence in conll_sentences:
+            for conll_word in conll_sentence:
+                token = conll_word['form']
+                if word_index >= len_words:
+                    raise Exception("can't match file with words layer")
+                while token != words_layer[word_index].text:
+                    word_index += 1
+                    if word_index >= len_words:
+                        raise Exception("can't match file with words layer")
+                w_span = words_layer[word_index]
+                # add values for 'id', 'lemma', 'upostag', 'xpostag', 'feats', 'head', 'deprel', 'deps', 'misc'
+                syntax_layer.add_annotation((w_span.start, w_span.end), **conll_word)
+                word_index += 1
+        assert len_words == len( syntax_layer )
+
 
 
@@ -18,10 +18,13 @@ class TimeLocDecorator:
     def __init__(self, time_lemmas_path=None, loc_lemmas_path=None, 
                        syntax_layer="stanza_syntax", 
                        morph_layer="morph_analysis",
-                       discard_unclassified=False):
+                       discard_unclassified=False,
+                       wordnet=None):
         # Use internal import to avoid circular import
         from estnltk.wordnet import Wordnet
-        self.wn = Wordnet()
+        # A Wordnet instance can be passed in to share it between decorators 
+        # (e.g. an in-memory Wordnet from estnltk.wordnet.shared_wordnet())
+        self.wn = wordnet if wordnet is not None else Wordnet()
         
         self.time_lemmas = set()
         if time_lemmas_path is None:
@@ -12,13 +12,23 @@ from collections import defaultdict
 class VislTagger(Tagger):
     """Visl tagger"""
 
-    conf_param = ['_visl_line_processor', '_parser', 'fix_selfreferences']
+    conf_param = ['_vislcg3_pipeline', '_visl_line_processor', '_parser', 'fix_selfreferences']
 
     def __init__(self, output_layer: str = 'visl',
                  morph_extended_layer: str = 'morph_extended',
                  vislcg3_pipeline: VISLCG3Pipeline = None,
                  annotation_parser: CG3AnnotationParser = None,
-                 fix_selfreferences: bool = True):
+                 fix_selfreferences: bool = True,
+                 persistent_pipeline: bool = False):
+        """Initializes VislTagger.
+
+        If vislcg3_pipeline is not given, the default VISLCG3Pipeline is used.
+        By default (persistent_pipeline=False), the pipeline launches new vislcg3
+        processes for each document. If persistent_pipeline is True, the default
+        pipeline keeps its vislcg3 processes alive between documents (rules are
+        compiled only once), and documents are streamed through the processes.
+        Use close() (or the tagger as a context manager) to stop the processes.
+        """
         self.input_layers = [morph_extended_layer]
         self.output_layer = output_layer
         self.output_attributes = ('id', 'lemma', 'ending', 'partofspeech', 'subtype', 'mood', 'tense', 'voice',
@@ -28,13 +38,15 @@ class VislTagger(Tagger):
         if vislcg3_pipeline is not None:
             # Use a custom vislcg3_pipeline
             if isinstance(vislcg3_pipeline, VISLCG3Pipeline):
-                self._visl_line_processor = vislcg3_pipeline.process_lines
+                self._vislcg3_pipeline = vislcg3_pipeline
             else:
                 raise TypeError('(!) vislcg3_pipeline must be an instance of VISLCG3Pipeline')
         else:
             # Use default vislcg3_pipeline
             vislcgRulesDir = abs_path('taggers/standard/syntax/files')
-            self._visl_line_processor = VISLCG3Pipeline(rules_dir=vislcgRulesDir).process_lines
+            self._vislcg3_pipeline = VISLCG3Pipeline(rules_dir=vislcgRulesDir,
+                                                     persistent=persistent_pipeline)
+        self._visl_line_processor = self._vislcg3_pipeline.process_lines
         if annotation_parser is not None:
             # Use a custom annotation_parser
             if isinstance(annotation_parser, CG3AnnotationParser):
@@ -45,6 +57,16 @@ class VislTagger(Tagger):
             # Use default annotation_parser
             self._parser = CG3AnnotationParser().parse
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Stops vislcg3 processes of the persistent pipeline."""
+        self._vislcg3_pipeline.close()
+
     def _make_layer_template(self):
         """Creates and returns a template of the layer."""
         return Layer(name=self.output_layer, 
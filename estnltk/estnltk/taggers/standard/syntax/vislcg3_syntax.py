@@ -62,7 +62,9 @@ import re
 import os, os.path, sys
 import codecs
 import tempfile
+from collections import deque
 from subprocess import Popen, PIPE
+from threading import Lock, Thread
 
 SYNTAX_PATH = abs_path('taggers/standard/syntax/files')
 SYNTAX_PIPELINE_1_4 = \
@@ -70,6 +72,11 @@ SYNTAX_PIPELINE_1_4 = \
 SYNTAX_PIPELINE_ESTCG = \
     ['clo.rul', 'morfyhe.rul', 'PhVerbs.rul', 'pindsyn.rul', 'strukt_parand.rul']
 
+# VISLCG3 stream command that makes the process analyse all buffered windows,
+# write out the results followed by the command itself, and flush the output.
+# Used for delimiting batches in the persistent pipeline
+STREAMCMD_FLUSH = '<STREAMCMD:FLUSH>'
+
 
 # ==================================================================================
 #   Helper function
@@ -103,6 +110,7 @@ class VISLCG3Pipeline:
     rules_pipeline = SYNTAX_PIPELINE_1_4
     rules_dir      = SYNTAX_PATH
     vislcg_cmd     = 'vislcg3'
+    persistent     = False
 
     def __init__( self, **kwargs):
         ''' Initializes VISL CG3 based syntax pipeline. 
@@ -128,6 +136,16 @@ class VISLCG3Pipeline:
                 resides in the directory *rules_dir*; Otherwise, a full path to the rule
                 file must be provided within the name;
 
+            persistent : bool
+                If True, then processes of the pipeline are started once (upon the first
+                call of process_lines) and kept alive: subsequent inputs are streamed
+                through the same processes, and each input is ended with the stream
+                command '<STREAMCMD:FLUSH>', which makes VISLCG3 output the results of
+                the input. This saves the process start-up and the compilation of rules
+                for each input. Use close() to stop the processes.
+                Otherwise, a new pipeline of processes is started for each input.
+                Default: False
+
         '''
         cmd_changed = False
         for argName, argVal in kwargs.items():
@@ -138,6 +156,8 @@ class VISLCG3Pipeline:
             elif argName in ['vislcg_cmd', 'vislcg']:
                 self.vislcg_cmd = argVal
                 cmd_changed = True
+            elif argName == 'persistent':
+                self.persistent = argVal
             else:
                 raise Exception(' Unsupported argument given: '+argName)
         # Validate input arguments
@@ -171,9 +191,104 @@ class VISLCG3Pipeline:
                     " provide the location of VISLCG3 executable via the input\n"+\
                     " argument 'vislcg_cmd'. ";
               raise Exception( msg )
+        # Processes of the persistent pipeline (started lazily)
+        self._processes = None
+        self._stderr_tails = None
+        self._lock = Lock()
+
 
+    def __enter__(self):
+        return self
 
 
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+    def close(self):
+        ''' Stops processes of the persistent pipeline (if they have been started).
+            The pipeline can still be used after closing: processes will be 
+            restarted upon the next call of process_lines.
+        '''
+        with self._lock:
+            self._stop_persistent_pipeline()
+
+
+    def _start_persistent_pipeline(self):
+        ''' Starts the processes of the persistent pipeline. The first process takes
+            input from the stdin, and each subsequent process takes the output of the
+            previous process as an input. Error outputs of processes are collected in
+            background threads (the last lines are kept for error messages).
+        '''
+        processes = []
+        stderr_tails = []
+        for rule_file in self.rules_pipeline:
+            process_cmd = [self.vislcg_cmd, '-o', '-g', os.path.join(self.rules_dir, rule_file)]
+            stdin = PIPE if not processes else processes[-1].stdout
+            process = Popen(process_cmd, stdin=stdin, stdout=PIPE, stderr=PIPE)
+            if processes:
+                # The output of the previous process now belongs to the current process
+                processes[-1].stdout.close()
+            stderr_tail = deque(maxlen=20)
+            Thread(target=_collect_lines, args=(process.stderr, stderr_tail), daemon=True).start()
+            processes.append( process )
+            stderr_tails.append( stderr_tail )
+        self._processes = processes
+        self._stderr_tails = stderr_tails
+
+
+    def _stop_persistent_pipeline(self):
+        if self._processes is None:
+            return
+        processes = self._processes
+        self._processes = None
+        try:
+            # Closing the input ends the first process, and the end of each
+            # process ends the input of the next process
+            processes[0].stdin.close()
+        except OSError:
+            pass
+        for process in processes:
+            try:
+                process.wait( timeout=10 )
+            except Exception:
+                process.kill()
+                process.wait()
+        processes[-1].stdout.close()
+
+
+    def _process_lines_persistent(self, input_lines):
+        ''' Streams input_lines through the processes of the persistent pipeline, 
+            and returns the output of the last process as a string. '''
+        with self._lock:
+            if self._processes is None:
+                self._start_persistent_pipeline()
+            first_process = self._processes[0]
+            last_process  = self._processes[-1]
+            input_data = [line.rstrip()+'\n' for line in input_lines]
+            input_data.append( STREAMCMD_FLUSH+'\n' )
+            # Write in a separate thread: otherwise, the pipeline could get stuck
+            # with a large input, if we do not read its output at the same time
+            writer = Thread(target=_write_lines, args=(first_process.stdin, input_data))
+            writer.start()
+            output_lines = []
+            while True:
+                line = last_process.stdout.readline()
+                if not line:
+                    # The pipeline has ended unexpectedly
+                    writer.join()
+                    stderr_tails = self._stderr_tails
+                    self._stop_persistent_pipeline()
+                    errors = [error for tail in stderr_tails for error in tail]
+                    raise Exception('(!) VISLCG3 pipeline ended unexpectedly. Error output:\n{}'.format(
+                                    '\n'.join(errors)))
+                line = as_unicode( line )
+                if line.rstrip() == STREAMCMD_FLUSH:
+                    break
+                output_lines.append( line )
+            writer.join()
+            return ''.join( output_lines )
+
 
     def process_lines( self, input_lines, **kwargs ):
         ''' Executes the pipeline of subsequent VISL_CG3 commands. The first process
@@ -206,6 +321,9 @@ class VISLCG3Pipeline:
                  and all the parameters passed to this method will be also forwarded to 
                  the cleanup method;
 
+            If the pipeline is persistent, input_lines are streamed through the 
+            running processes instead of starting a new pipeline.
+
         '''
         split_result_lines = False
         remove_info = True
@@ -215,6 +333,12 @@ class VISLCG3Pipeline:
             if argName in ['remove_info', 'info_remover', 'clean_up'] and argVal in [True, False]:
                remove_info = argVal
 
+        if self.persistent:
+            result = self._process_lines_persistent( input_lines )
+            if remove_info:
+                result = '\n'.join( cleanup_lines( result.split('\n'), **kwargs ))
+            return result if not split_result_lines else result.split('\n')
+
         # 1) Construct the input file for the first process in the pipeline
         temp_input_file = \
             tempfile.NamedTemporaryFile(prefix='vislcg3_in.', mode='w', delete=False)
@@ -266,3 +390,20 @@ class VISLCG3Pipeline:
 
         return result if not split_result_lines else result.split('\n')
 
+
+def _collect_lines(stream, lines):
+    ''' Reads stream until its end and appends decoded lines to the given deque. '''
+    for line in iter(stream.readline, b''):
+        lines.append( as_unicode( line ).rstrip() )
+    stream.close()
+
+
+def _write_lines(stream, lines):
+    ''' Writes lines to the input stream of a process in 'utf-8' and flushes. '''
+    try:
+        for line in lines:
+            stream.write( line.encode('utf-8') )
+        stream.flush()
+    except (BrokenPipeError, ValueError):
+        # The process has ended (the reader reports the error)
+        pass
@@ -16,6 +16,7 @@ from estnltk.taggers.standard.morph_analysis.morf_common import _convert_morph_a
 from estnltk.taggers.standard.morph_analysis.morf_common import _is_empty_annotation
 
 from estnltk.java.javaprocess import JavaProcess
+from estnltk.java.javaprocess import JavaProcessPool
 from estnltk.common import JAVARES_PATH
 
 
@@ -27,6 +28,7 @@ class ClauseSegmenter(Tagger):
     input_layers      = ['words', 'sentences', 'morph_analysis']
     conf_param = ['ignore_missing_commas',
                   'use_normalized_word_form',
+                  'java_workers',
                   # Names of specific input layers
                   '_input_words_layer',
                   '_input_sentences_layer',
@@ -41,7 +43,8 @@ class ClauseSegmenter(Tagger):
                   input_sentences_layer:str='sentences',
                   input_morph_analysis_layer:str='morph_analysis',
                   ignore_missing_commas:bool=False,
-                  use_normalized_word_form:bool=True):
+                  use_normalized_word_form:bool=True,
+                  java_workers:int=1):
         """Initializes Java-based ClauseSegmenter.
         
         Parameters
@@ -70,6 +73,11 @@ class ClauseSegmenter(Tagger):
              word.normalized_form (if word.normalized_form is not None). 
              Otherwise, ClauseSegmenter uses only the surface word forms (word.text),
              and no attention is paid on word normalizations;
+        
+        java_workers: int (default: 1)
+             The number of Java processes used for the tagging. If java_workers > 1 
+             (or None, which stands for os.cpu_count()), then the sentences of each 
+             document are dispatched across a pool of Java processes (JavaProcessPool);
         """
         # Set input/output layer names
         self.output_layer = output_layer
@@ -87,32 +95,29 @@ class ClauseSegmenter(Tagger):
         if self.ignore_missing_commas:
             args.append('-ins_comma_mis')
         # Initiate Java process
-        self._java_process = \
-            JavaProcess( 'Osalau.jar', jar_path=JAVARES_PATH, check_java=True, lazy_initialize=True, args=args )
+        self.java_workers = java_workers
+        if java_workers == 1:
+            self._java_process = \
+                JavaProcess( 'Osalau.jar', jar_path=JAVARES_PATH, check_java=True, lazy_initialize=True, args=args )
+        else:
+            self._java_process = \
+                JavaProcessPool( 'Osalau.jar', jar_path=JAVARES_PATH, check_java=True, lazy_initialize=True, args=args,
+                                 workers=java_workers )
 
     def __enter__(self):
         # Initialize java process (only if we are inside the with context manager)
-        if self._java_process and self._java_process._process is None:
+        if self._java_process and not self._java_process.is_initialized:
             self._java_process.initialize_java_subprocess()
         return self
 
     def __exit__(self, *args):
         """ Terminates Java process. """
-        if self._java_process._process is not None: # if the process was initialized
-            # The proper way to terminate the process:
-            # 1) Send out the terminate signal
-            self._java_process._process.terminate()
-            # 2) Interact with the process. Read data from stdout and stderr, 
-            #    until end-of-file is reached. Wait for process to terminate.
-            self._java_process._process.communicate()
-            # 3) Assert that the process terminated
-            assert self._java_process._process.poll() is not None
+        self._java_process.terminate_java_subprocess()
         return False
 
     def close(self):
-        if self._java_process._process is not None: # if the process was initialized
-            if self._java_process._process.poll() is None:
-                self.__exit__()
+        if self._java_process.is_alive():
+            self.__exit__()
 
     def _make_layer_template(self):
         """Creates and returns a template of the layer."""
@@ -143,8 +148,9 @@ class ClauseSegmenter(Tagger):
         layer = self._make_layer_template()
         layer.text_object = text
 
-        clause_spanlists = []
-        # Iterate over sentences and words, tag clause boundaries
+        # Collect sentences in the Vabamorf's JSON format
+        sentence_vm_jsons = []
+        sentences_words   = []
         morph_layer = layers[self._input_morph_analysis_layer]
         word_layer = layers[self._input_words_layer]
         assert len(morph_layer) == len(word_layer)
@@ -192,39 +198,42 @@ class ClauseSegmenter(Tagger):
                     break
                 word_span_id += 1
             if sentence_morph_dicts:
-                # Analyse collected sentence with the Java-based Clause Segmenter
-                sentence_vm_json = json.dumps({'words': sentence_morph_dicts})
-                result_vm_str    = \
-                    self._java_process.process_line(sentence_vm_json)
-                result_vm_json = json.loads( result_vm_str )
-                # Sanity check: 'words' must be present and the number of words in 
-                # the output must match the number of words in the input;
-                # If not, then we likely have problems with the Java subprocess;
-                assert 'words' in result_vm_json, \
-                       "(!) Unexpected mismatch between ClauseSegmenter's input and output. "+\
-                       "Probably there are problems with the Java subprocess. "
-                assert len(result_vm_json['words']) == len(sentence_words), \
-                       "(!) Unexpected mismatch between ClauseSegmenter's input and output. "+\
-                       "Probably there are problems with the Java subprocess. "
-                # Rewrite clause annotations to clause indices
-                result_vm_json = \
-                    self.annotate_clause_indices( result_vm_json['words'] )
-                # Collect words belongs to each specific clause
-                # And record clause types
-                clause_index      = {}
-                clause_type_index = {}
-                for word_id, word in enumerate( result_vm_json ):
-                    assert 'clause_id' in word
-                    if word['clause_id'] not in clause_index:
-                        clause_index[word['clause_id']] = []
-                    # Get corresponding word span
-                    word_span = sentence_words[word_id]
-                    # Record the word span & clause type
-                    clause_index[word['clause_id']].append( word_span )
-                    clause_type_index[word['clause_id']] = \
-                        word['clause_type']
-                for clause_id, clause in clause_index.items():
-                    layer.add_annotation(clause, clause_type=clause_type_index[clause_id])
+                sentence_vm_jsons.append( json.dumps({'words': sentence_morph_dicts}) )
+                sentences_words.append( sentence_words )
+        # Analyse collected sentences with the Java-based Clause Segmenter
+        # ( sentences are streamed into the Java process in one batch )
+        result_vm_strs = self._java_process.process_lines(sentence_vm_jsons)
+        assert len(result_vm_strs) == len(sentences_words)
+        for sentence_words, result_vm_str in zip(sentences_words, result_vm_strs):
+            result_vm_json = json.loads( result_vm_str )
+            # Sanity check: 'words' must be present and the number of words in 
+            # the output must match the number of words in the input;
+            # If not, then we likely have problems with the Java subprocess;
+            assert 'words' in result_vm_json, \
+                   "(!) Unexpected mismatch between ClauseSegmenter's input and output. "+\
+                   "Probably there are problems with the Java subprocess. "
+            assert len(result_vm_json['words']) == len(sentence_words), \
+                   "(!) Unexpected mismatch between ClauseSegmenter's input and output. "+\
+                   "Probably there are problems with the Java subprocess. "
+            # Rewrite clause annotations to clause indices
+            result_vm_json = \
+                self.annotate_clause_indices( result_vm_json['words'] )
+            # Collect words belongs to each specific clause
+            # And record clause types
+            clause_index      = {}
+            clause_type_index = {}
+            for word_id, word in enumerate( result_vm_json ):
+                assert 'clause_id' in word
+                if word['clause_id'] not in clause_index:
+                    clause_index[word['clause_id']] = []
+                # Get corresponding word span
+                word_span = sentence_words[word_id]
+                # Record the word span & clause type
+                clause_index[word['clause_id']].append( word_span )
+                clause_type_index[word['clause_id']] = \
+                    word['clause_type']
+            for clause_id, clause in clause_index.items():
+                layer.add_annotation(clause, clause_type=clause_type_index[clause_id])
         return layer
 
     @staticmethod
@@ -15,6 +15,8 @@ import json
 import os.path
 import datetime
 
+from typing import List, Sequence, Tuple
+
 from collections import OrderedDict
 
 from estnltk import Text, Layer
@@ -27,6 +29,7 @@ from estnltk.taggers.standard.morph_analysis.morf_common import _convert_morph_a
 from estnltk.taggers.standard.morph_analysis.morf_common import _is_empty_annotation
 
 from estnltk.java.javaprocess import JavaProcess
+from estnltk.java.javaprocess import JavaProcessPool
 from estnltk.common import JAVARES_PATH
 
 
@@ -49,7 +52,7 @@ class CoreTimexTagger( Tagger ):
     input_layers = ['words', 'sentences', 'morph_analysis']
     conf_param = [ 'rules_file', 'pick_first_in_overlap', 
                    'mark_part_of_interval', 'output_ordered_dicts', 
-                   'use_normalized_word_form',
+                   'use_normalized_word_form', 'java_workers',
                    # Names of the specific input layers
                    '_input_words_layer', '_input_sentences_layer',
                    '_input_morph_analysis_layer',
@@ -66,7 +69,8 @@ class CoreTimexTagger( Tagger ):
                        pick_first_in_overlap:bool=True, \
                        mark_part_of_interval:bool=True, \
                        output_ordered_dicts:bool=True, \
-                       use_normalized_word_form:bool=True ):
+                       use_normalized_word_form:bool=True, \
+                       java_workers:int=1 ):
         """Initializes Java-based temporal expression tagger.
         
         Parameters
@@ -117,6 +121,12 @@ class CoreTimexTagger( Tagger ):
              value of) word.normalized_form (if word.normalized_form is not None). 
              Otherwise, timex tagger uses only the surface word forms (word.text),
              and no attention is paid on word normalizations;
+        
+        java_workers: int (default: 1)
+             The number of Java processes used for the tagging. If java_workers > 1 
+             (or None, which stands for os.cpu_count()), then a pool of Java processes 
+             (JavaProcessPool) is used, and the method tag_texts() dispatches texts 
+             across the Java processes;
         """
         # Set input/output layer names
         self.output_layer = output_layer
@@ -143,36 +153,33 @@ class CoreTimexTagger( Tagger ):
         args = ['-pyvabamorf']
         args.append('-r')
         args.append(use_rules_file)
-        self._java_process = \
-            JavaProcess( 'Ajavt.jar', jar_path=JAVARES_PATH, check_java=True, lazy_initialize=True, args=args )
+        self.java_workers = java_workers
+        if java_workers == 1:
+            self._java_process = \
+                JavaProcess( 'Ajavt.jar', jar_path=JAVARES_PATH, check_java=True, lazy_initialize=True, args=args )
+        else:
+            self._java_process = \
+                JavaProcessPool( 'Ajavt.jar', jar_path=JAVARES_PATH, check_java=True, lazy_initialize=True, args=args,
+                                 workers=java_workers )
 
 
 
     def __enter__(self):
         # Initialize java process (only if we are inside the with context manager)
-        if self._java_process and self._java_process._process is None:
+        if self._java_process and not self._java_process.is_initialized:
             self._java_process.initialize_java_subprocess()
         return self
 
 
     def __exit__(self, *args):
         """ Terminates Java process. """
-        if self._java_process._process is not None: # if the process was initialized
-            # The proper way to terminate the process:
-            # 1) Send out the terminate signal
-            self._java_process._process.terminate()
-            # 2) Interact with the process. Read data from stdout and stderr, 
-            #    until end-of-file is reached. Wait for process to terminate.
-            self._java_process._process.communicate()
-            # 3) Assert that the process terminated
-            assert self._java_process._process.poll() is not None
+        self._java_process.terminate_java_subprocess()
         return False
 
 
     def close(self):
-        if self._java_process._process is not None: # if the process was initialized
-            if self._java_process._process.poll() is None:
-                self.__exit__()
+        if self._java_process.is_alive():
+            self.__exit__()
 
 
     def _find_creation_date(self, text: Text):
@@ -393,7 +400,54 @@ class CoreTimexTagger( Tagger ):
         status: dict
            This can be used to store metadata on layer tagging.
         """
-        # A) Find document creation time from the metadata, and
+        # A) Convert morphologically analysed text into VM format
+        text_vm_json, input_words_count = self._convert_text_to_vm_json(text, layers)
+        # B) Analyse the text with the Java-based Timex Tagger
+        result_vm_str = self._java_process.process_line(text_vm_json)
+        # C) Convert results to the timexes layer
+        return self._convert_vm_result_to_layer(text, layers, result_vm_str, input_words_count)
+
+    def tag_texts(self, texts: Sequence[Text]) -> List[Text]:
+        """Tags timexes layer on multiple texts, and returns the texts.
+        
+        Unlike calling tag() on each text separately, sends all the texts 
+        to the Java-based Timex Tagger in one batch: texts are streamed 
+        into the Java process without waiting for the results of each 
+        text (see JavaProcess.process_lines for details). 
+        Texts must have the input layers of the tagger (otherwise, the same 
+        error is raised as in tag()), and the created layers are validated 
+        in the same way as in tag().
+        """
+        texts = list(texts)
+        all_layers = []
+        input_lines = []
+        input_words_counts = []
+        for text in texts:
+            if self.output_layer in text.layers:
+                raise ValueError('(!) The layer {!r} already exists in the text.'.format(self.output_layer))
+            for layer in self.input_layers:
+                if layer not in text.layers:
+                    # As in tag()
+                    raise ValueError('missing input layer: {!r}'.format(layer))
+            layers = {layer: text[layer] for layer in self.input_layers}
+            text_vm_json, input_words_count = self._convert_text_to_vm_json(text, layers)
+            all_layers.append( layers )
+            input_lines.append( text_vm_json )
+            input_words_counts.append( input_words_count )
+        result_vm_strs = self._java_process.process_lines(input_lines)
+        for text, layers, result_vm_str, input_words_count in \
+                zip(texts, all_layers, result_vm_strs, input_words_counts):
+            layer = self._convert_vm_result_to_layer(text, layers, result_vm_str, input_words_count)
+            # Apply the same output checks as tag()
+            self._check_output_layer(text, layer)
+            text.add_layer( layer )
+        return texts
+
+    def _convert_text_to_vm_json(self, text: Text, layers) -> Tuple[str, int]:
+        """Converts morphologically analysed text into the input of the Java-based 
+           Timex Tagger (a line in VM JSON format). Returns the input line and the 
+           number of words in the input."""
+        # Find document creation time from the metadata, and
         #    convert morphologically analysed text into VM format:
         input_data = {
             'dct': self._find_creation_date(text),
@@ -447,11 +501,11 @@ class CoreTimexTagger( Tagger ):
                 word_span_id += 1
             # Record the current sentence in VM format
             input_data['sentences'].append( {'words': sentence_morph_dicts })
-        # B) Analyse the text with the Java-based Timex Tagger
         #pprint(input_data)
-        text_vm_json = json.dumps(input_data)
-        result_vm_str  = \
-            self._java_process.process_line(text_vm_json)
+        return json.dumps(input_data), word_span_id
+
+    def _convert_vm_result_to_layer(self, text: Text, layers, result_vm_str: str, input_words_count: int) -> Layer:
+        """Converts the output of the Java-based Timex Tagger into the timexes layer."""
         result_vm_json = json.loads( result_vm_str )
         # Sanity check: 'sentences' and 'words' must be available in the 
         # output; 
@@ -462,18 +516,19 @@ class CoreTimexTagger( Tagger ):
                "Probably there are problems with the Java subprocess."
         output_words = \
             [w for s in result_vm_json['sentences'] for w in s['words'] ]
-        assert word_span_id == len(output_words), \
+        assert input_words_count == len(output_words), \
                "(!) Unexpected mismatch between TimexTagger's input and output. "+\
                "Probably there are problems with the Java subprocess. "
         #pprint(result_vm_json)
         #
-        # C) Convert results from VM format (used by EstNLTK 1.4) to
+        # Convert results from VM format (used by EstNLTK 1.4) to
         #    the format used by EstNLTK 1.6+
         #
-        # C.1) Collect timexes and their locations (word spans)
+        # 1) Collect timexes and their locations (word spans)
         #
         timexes_dict = OrderedDict() # TIMEX-es with textual content
         empty_timexes_dict = {}      # TIMEX-es without textual content
+        word_spans   = layers[ self._input_words_layer ]
         word_span_id = 0
         vm_word_id = 0
         vm_sent_id = 0
@@ -521,7 +576,7 @@ class CoreTimexTagger( Tagger ):
         #pprint(timexes_dict)
         #pprint(empty_timexes_dict)
         #
-        # C.2) Create a new layer and populated with collected timexes
+        # 2) Create a new layer and populated with collected timexes
         #
         layer = self._make_layer_template()
         layer.text_object = text
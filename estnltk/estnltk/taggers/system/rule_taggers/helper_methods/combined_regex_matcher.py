@@ -0,0 +1,124 @@
+from typing import List, Sequence, Tuple
+from typing import Match
+
+import regex
+
+# Patterns that refer to groups of the pattern by numbers or names cannot be
+# joined into a combined pattern (groups are renumbered in the combined pattern)
+_GROUP_REFERENCE = regex.compile(r'\\[1-9]|\\g<|\(\?P[=>]|\(\?[0-9R&+-]')
+
+# Flags which change the way how alternatives are chosen
+_UNSUPPORTED_FLAGS = regex.REVERSE | regex.POSIX | regex.BESTMATCH | regex.ENHANCEMATCH
+
+
+class CombinedRegexMatcher:
+    """
+    Finds matches of multiple regular expressions by scanning the text with a
+    combined pattern (an alternation of all the patterns) instead of scanning
+    the text separately with each pattern.
+
+    The matching is done in two phases:
+    1) the text is scanned once with the combined pattern (in the overlapped
+       mode), which yields all positions where at least one of the patterns
+       matches. At each such position, the combined pattern also tells the
+       first pattern (in the order of alternatives) that matches, and thus
+       all preceding patterns are known to fail at the position;
+    2) for each pattern, matches are collected by trying the pattern only
+       at the candidate positions found in phase 1, following the semantics
+       of `pattern.finditer(text, overlapped=...)`.
+
+    As a result, matches (and match objects) are the same as with separate
+    `finditer` calls. The combined scan is fast if patterns do not begin with
+    literal strings and matches are infrequent. Patterns beginning with
+    literal strings are usually faster to find with separate scans, because
+    the regex engine can search for the literal prefix of a single pattern.
+
+    Patterns are combined only if they have the same flags, have no named
+    groups, do not refer to their own groups (back-references, recursion),
+    and do not use flags that change the choice between alternatives (POSIX,
+    BESTMATCH, ENHANCEMATCH, REVERSE).
+    Other patterns are matched with separate `finditer` calls.
+    """
+
+    __slots__ = ['patterns', '_combined', '_separate', '_max_alternatives']
+
+    def __init__(self, patterns: Sequence['regex.Pattern'], max_alternatives: int = 100):
+        """
+        patterns: Sequence[regex.Pattern]
+            Compiled patterns (of the regex package) to be matched.
+        max_alternatives: int (Default: 100)
+            The maximum number of patterns in a single combined pattern.
+            Patterns are split into multiple combined patterns in order
+            to bound the number of candidate positions checked in phase 2.
+        """
+        self.patterns = list(patterns)
+        self._max_alternatives = max_alternatives
+        # list of (combined pattern, {group number: pattern index}, [pattern indexes])
+        self._combined = []
+        # indexes of patterns that are matched separately
+        self._separate = []
+        groups_by_flags = dict()
+        for i, pattern in enumerate(self.patterns):
+            if not isinstance(pattern, regex.Pattern) or pattern.groupindex or \
+                    pattern.flags & _UNSUPPORTED_FLAGS or _GROUP_REFERENCE.search(pattern.pattern):
+                self._separate.append(i)
+            else:
+                groups_by_flags.setdefault(pattern.flags, []).append(i)
+        for flags, pattern_indexes in groups_by_flags.items():
+            for start in range(0, len(pattern_indexes), max_alternatives):
+                self._add_combined_pattern(flags, pattern_indexes[start:start + max_alternatives])
+
+    def _add_combined_pattern(self, flags: int, pattern_indexes: List[int]):
+        alternatives = []
+        group_to_pattern = dict()
+        group = 1
+        for i in pattern_indexes:
+            pattern = self.patterns[i]
+            # A newline ends a possible comment in the verbose mode
+            ending = '\n)' if flags & regex.VERBOSE else ')'
+            alternatives.append('(' + pattern.pattern + ending)
+            group_to_pattern[group] = i
+            group += 1 + pattern.groups
+        try:
+            combined = regex.compile('|'.join(alternatives), flags=flags)
+        except regex.error:
+            self._separate.extend(pattern_indexes)
+            return
+        self._combined.append((combined, group_to_pattern, pattern_indexes))
+
+    def finditer_all(self, text: str, overlapped: bool = False) -> List[List[Match]]:
+        """
+        Returns a list of matches for each pattern (in the order of patterns).
+        Matches of each pattern are in the same order as given by
+        `pattern.finditer(text, overlapped=overlapped)`.
+        """
+        matches = [None] * len(self.patterns)
+        for i in self._separate:
+            matches[i] = list(self.patterns[i].finditer(text, overlapped=overlapped))
+        for combined, group_to_pattern, pattern_indexes in self._combined:
+            # Phase 1: candidate positions and the first matching pattern at each position
+            candidates = [(m.start(), group_to_pattern[m.lastindex])
+                          for m in combined.finditer(text, overlapped=True)]
+            # Phase 2: try patterns at candidate positions
+            for i in pattern_indexes:
+                matches[i] = self._match_at_candidates(i, text, candidates, overlapped)
+        return matches
+
+    def _match_at_candidates(self, i: int, text: str, candidates: List[Tuple[int, int]],
+                             overlapped: bool) -> List[Match]:
+        pattern = self.patterns[i]
+        pattern_matches = []
+        next_start = 0
+        for start, first_pattern in candidates:
+            if start < next_start or first_pattern > i:
+                continue
+            matchobj = pattern.match(text, start)
+            if matchobj is None:
+                continue
+            if matchobj.end() == start:
+                # Empty matches are handled differently by finditer:
+                # fall back to the regular scan to be on the safe side
+                return list(pattern.finditer(text, overlapped=overlapped))
+            pattern_matches.append(matchobj)
+            next_start = start + 1 if overlapped else matchobj.end()
+        return pattern_matches
@@ -1,9 +1,63 @@
-from typing import List, Tuple, Generator
+from typing import Any, Callable, Dict, Generator, Hashable, Iterable, List, Tuple
 
 from estnltk_core import ElementaryBaseSpan
 from estnltk.vabamorf.morf import synthesize
 
 
+def index_rules(ruleset: 'AmbiguousRuleset',
+                normalize_pattern: Callable[[Hashable], Hashable] = None,
+                expand_pattern: Callable[[Hashable], Iterable[Hashable]] = None,
+                static_ruleset_map: Dict[Hashable, List[Tuple[int, int, Dict[str, Any]]]] = None) \
+        -> Tuple[Dict[Hashable, List[Tuple[int, int, Dict[str, Any]]]],
+                 Dict[Hashable, Dict[Tuple[int, int], Callable]],
+                 Dict[Tuple[Hashable, int, int], Callable]]:
+    """
+    Indexes the rules of a ruleset by their patterns.
+
+    Returns a triple (static_ruleset_map, dynamic_ruleset_map, decorator_map), where
+    * static_ruleset_map maps a pattern to the list of (group, priority, attributes)
+      of static rules. For each dynamic rule that has no static counterpart with the
+      same pattern, group and priority, a static rule without attributes is added;
+    * dynamic_ruleset_map maps a pattern to {(group, priority): decorator};
+    * decorator_map maps (pattern, group, priority) to the decorator of the dynamic rule,
+      so that the decorator of a match can be found with a single lookup.
+
+    Patterns of all rules are normalized with normalize_pattern (e.g. lowercased).
+    If expand_pattern is given, the normalized pattern of a static rule is replaced
+    by all the patterns returned by expand_pattern.
+    If static_ruleset_map is given (e.g. a previously built map loaded from a cache),
+    static rules are not indexed again, and only dynamic rules are added to the map.
+    Raises AttributeError if there are multiple dynamic rules with the same pattern,
+    group and priority.
+    """
+    if static_ruleset_map is None:
+        static_ruleset_map = dict()
+        static_keys = set()
+        for rule in ruleset.static_rules:
+            pattern = rule.pattern if normalize_pattern is None else normalize_pattern(rule.pattern)
+            patterns = [pattern] if expand_pattern is None else expand_pattern(pattern)
+            for pattern in patterns:
+                static_ruleset_map.setdefault(pattern, []).append((rule.group, rule.priority, rule.attributes))
+                static_keys.add((pattern, rule.group, rule.priority))
+    else:
+        static_keys = {(pattern, group, priority) for pattern, rules in static_ruleset_map.items()
+                       for group, priority, _ in rules}
+
+    dynamic_ruleset_map = dict()
+    decorator_map = dict()
+    for rule in ruleset.dynamic_rules:
+        pattern = rule.pattern if normalize_pattern is None else normalize_pattern(rule.pattern)
+        key = (pattern, rule.group, rule.priority)
+        if key in decorator_map:
+            raise AttributeError('There are multiple rules with the same pattern, group and priority')
+        dynamic_ruleset_map.setdefault(pattern, dict())[rule.group, rule.priority] = rule.decorator
+        decorator_map[key] = rule.decorator
+        # create corresponding static rule if it does not exist yet
+        if key not in static_keys:
+            static_ruleset_map.setdefault(pattern, []).append((rule.group, rule.priority, dict()))
+            static_keys.add(key)
+
+    return static_ruleset_map, dynamic_ruleset_map, decorator_map
 
 
 def conflict_priority_resolver(sorted_tuples: List[Tuple[ElementaryBaseSpan, str]], priority_matches: List) \
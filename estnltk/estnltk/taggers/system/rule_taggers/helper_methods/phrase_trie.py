@@ -0,0 +1,73 @@
+from typing import Hashable, Iterable, List, Sequence, Set, Tuple
+
+
+class PhraseTrie:
+    """
+    Token-level trie of phrases (tuples of attribute values).
+
+    Each node of the trie corresponds to a prefix of some phrase. Children
+    of a node are indexed by the next value of the phrase, and a node that
+    ends a phrase holds the phrase itself.
+
+    Finding phrases in a sequence of value sets walks the trie from each
+    position of the sequence. The walk ends as soon as none of the values
+    at the next position continues a phrase, so the running time depends on
+    the length of the sequence and the length of the phrases, but not on the
+    number of phrases in the trie. Each position may have multiple values
+    (ambiguous annotations): in this case, all continuations are followed.
+    """
+
+    __slots__ = ['_root']
+
+    def __init__(self, phrases: Iterable[Tuple[Hashable, ...]] = ()):
+        # node: [{value: child node}, phrase or None]
+        self._root = [{}, None]
+        for phrase in phrases:
+            self.add(phrase)
+
+    def add(self, phrase: Tuple[Hashable, ...]):
+        node = self._root
+        for value in phrase:
+            children = node[0]
+            child = children.get(value)
+            if child is None:
+                child = [{}, None]
+                children[value] = child
+            node = child
+        node[1] = phrase
+
+    def find_all(self, value_sets: Sequence[Set[Hashable]]) -> List[Tuple[int, int, Tuple[Hashable, ...]]]:
+        """
+        Returns all occurrences of phrases in the sequence of value sets as
+        triples (start, end, phrase), where `value_sets[start:end]` matches
+        the phrase: the i-th value of the phrase is in `value_sets[start+i]`.
+
+        Triples are ordered by start; triples with the same start are ordered
+        by end.
+        """
+        root_children = self._root[0]
+        matches = []
+        for start, values in enumerate(value_sets):
+            nodes = None
+            for value in values:
+                node = root_children.get(value)
+                if node is not None:
+                    if nodes is None:
+                        nodes = [node]
+                    else:
+                        nodes.append(node)
+            end = start + 1
+            while nodes:
+                next_nodes = []
+                next_values = value_sets[end] if end < len(value_sets) else ()
+                for children, phrase in nodes:
+                    if phrase is not None:
+                        matches.append((start, end, phrase))
+                    if children:
+                        for value in next_values:
+                            node = children.get(value)
+                            if node is not None:
+                                next_nodes.append(node)
+                nodes = next_nodes
+                end += 1
+        return matches
@@ -8,6 +8,8 @@ from estnltk.taggers import Tagger
 from estnltk.taggers.system.rule_taggers.extraction_rules.ambiguous_ruleset import AmbiguousRuleset
 from estnltk.taggers.system.rule_taggers.extraction_rules.ruleset import Ruleset
 from estnltk.taggers.system.rule_taggers.helper_methods.helper_methods import keep_maximal_matches, keep_minimal_matches, conflict_priority_resolver
+from estnltk.taggers.system.rule_taggers.helper_methods.helper_methods import index_rules
+from estnltk.taggers.system.rule_taggers.helper_methods.phrase_trie import PhraseTrie
 from estnltk_core import ElementaryBaseSpan
 
 
@@ -80,9 +82,9 @@ class PhraseTagger(Tagger):
         # TODO: It is impossible to determine the layer type based on the ruleset as input layer can be anbigious
         # Thus, we should specify this explicitly during the initialisation
 
-        self.conf_param = ('input_attribute', 'ruleset', 'decorator', '_heads','ignore_case',
+        self.conf_param = ('input_attribute', 'ruleset', 'decorator', '_trie', 'ignore_case',
                            'conflict_resolver', 'phrase_attribute', 'group_attribute', 'priority_attribute',
-                           'pattern_attribute', 'static_ruleset_map', 'dynamic_ruleset_map')
+                           'pattern_attribute', 'static_ruleset_map', 'dynamic_ruleset_map', '_decorator_map')
 
         self.output_layer = output_layer
         self.input_layers = [input_layer]
@@ -102,61 +104,19 @@ class PhraseTagger(Tagger):
 
         self.ruleset = copy.copy(ruleset)
 
-        self.static_ruleset_map: Dict[str, List[Tuple[int, int, Dict[str, any]]]]
-
-        static_ruleset_map = dict()
-
         self.ignore_case = ignore_case
 
-        for rule in ruleset.static_rules:
-            if self.ignore_case:
-                lower_pattern = []
-                for word in rule.pattern:
-                    lower_pattern.append(word.lower())
-                lower_pattern = tuple(lower_pattern)
-                subindex = static_ruleset_map.get(lower_pattern, [])
-                subindex.append((rule.group, rule.priority, rule.attributes))
-                static_ruleset_map[lower_pattern] = subindex
-            else:
-                subindex = static_ruleset_map.get(rule.pattern, [])
-                subindex.append((rule.group, rule.priority, rule.attributes))
-                static_ruleset_map[rule.pattern] = subindex
-
-        self.static_ruleset_map = static_ruleset_map
-
-        # Lets index dynamic rulesets in optimal way
+        # Rules are indexed once by patterns, and dynamic decorators by (pattern, group, priority)
+        self.static_ruleset_map: Dict[str, List[Tuple[int, int, Dict[str, any]]]]
         self.dynamic_ruleset_map: Dict[str, Dict[Tuple[int, int], Callable]]
-
-        dynamic_ruleset_map = dict()
-        for rule in ruleset.dynamic_rules:
-            if self.ignore_case:
-                lower_pattern = []
-                for word in rule.pattern:
-                    lower_pattern.append(word.lower())
-                lower_pattern = tuple(lower_pattern)
-                subindex = dynamic_ruleset_map.get(lower_pattern, dict())
-                if (rule.group, rule.priority) in subindex:
-                    raise AttributeError('There are multiple rules with the same pattern, group and priority')
-                subindex[rule.group, rule.priority] = rule.decorator
-                dynamic_ruleset_map[lower_pattern] = subindex
-                # create corresponding static rule if it does not exist yet
-                if static_ruleset_map.get(lower_pattern, None) is None:
-                    self.static_ruleset_map[lower_pattern] = [(rule.group, rule.priority, dict())]
-                elif len([item for item in static_ruleset_map.get(lower_pattern)
-                          if item[0] == rule.group and item[1] == rule.priority]) == 0:
-                    self.static_ruleset_map[lower_pattern] = [(rule.group, rule.priority, dict())]
-            else:
-                subindex = dynamic_ruleset_map.get(rule.pattern, dict())
-                if (rule.group, rule.priority) in subindex:
-                    raise AttributeError('There are multiple rules with the same pattern, group and priority')
-                subindex[rule.group, rule.priority] = rule.decorator
-                dynamic_ruleset_map[rule.pattern] = subindex
-                # create corresponding static rule if it does not exist yet
-                if static_ruleset_map.get(rule.pattern, None) is None:
-                    static_ruleset_map[rule.pattern] = [(rule.group, rule.priority, dict())]
-                elif len([item for item in static_ruleset_map.get(rule.pattern)
-                          if item[0] == rule.group and item[1] == rule.priority]) == 0:
-                    static_ruleset_map[rule.pattern.lower()] = [(rule.group, rule.priority, dict())]
+        if self.ignore_case:
+            normalize_pattern = lambda pattern: tuple(word.lower() for word in pattern)
+        else:
+            normalize_pattern = None
+        static_ruleset_map, dynamic_ruleset_map, decorator_map = \
+            index_rules(ruleset, normalize_pattern=normalize_pattern)
+        self.static_ruleset_map = static_ruleset_map
+        self._decorator_map = decorator_map
 
         self.dynamic_ruleset_map = dynamic_ruleset_map
 
@@ -169,11 +129,7 @@ class PhraseTagger(Tagger):
         self.priority_attribute = priority_attribute
         self.pattern_attribute = pattern_attribute
 
-        self._heads = {}
-        for phrase in self.static_ruleset_map.keys():
-            current_phrase = self._heads.get(phrase[0], set())
-            current_phrase.add(phrase[1:])
-            self._heads[phrase[0]] = current_phrase
+        self._trie = PhraseTrie(self.static_ruleset_map.keys())
 
     def _make_layer_template(self):
         # TODO: It is impossible to determine the layer type based on the ruleset as input layer can be anbigious
@@ -244,21 +200,9 @@ class PhraseTagger(Tagger):
 
         value_list = [{get_value(annotation) for annotation in span.annotations} for span in input_layer]
 
-        heads = self._heads #TODO this logic could be replaced by trie
-        for i, values in enumerate(value_list):
-            for value in values:
-                if value not in heads:
-                    continue
-                for tail in heads[value]:
-                    if i + len(tail) < len(value_list):
-                        for a, b in zip(tail, value_list[i + 1:i + len(tail) + 1]):
-                            if a not in b:
-                                break
-                        else:  # no break
-                            base_span = EnvelopingBaseSpan(s.base_span
-                                                           for s in input_layer[i:i + len(tail) + 1])
-                            phrase = (value, *tail)
-                            match_tuples.append((base_span, text[base_span.start:base_span.end], phrase))
+        for start, end, phrase in self._trie.find_all(value_list):
+            base_span = EnvelopingBaseSpan(s.base_span for s in input_layer[start:end])
+            match_tuples.append((base_span, text[base_span.start:base_span.end], phrase))
 
         return sorted(match_tuples, key=lambda x: (x[0].start, x[0].end))
 
@@ -322,8 +266,7 @@ class PhraseTagger(Tagger):
                     continue
             # apply dynamic_decorator --- it must be unique or have matching 
             # priority and group
-            subindex = self.dynamic_ruleset_map.get(phrase, None)
-            dynamic_decorator = subindex[(group, priority)] if subindex is not None else None
+            dynamic_decorator = self._decorator_map.get((phrase, group, priority), None)
             if dynamic_decorator is not None:
                 annotation = dynamic_decorator(text, base_span, annotation)
             if annotation is not None:
@@ -366,8 +309,7 @@ class PhraseTagger(Tagger):
                     continue
             # apply dynamic_decorator --- it must be unique or have matching 
             # priority and group
-            subindex = self.dynamic_ruleset_map.get(phrase, None)
-            dynamic_decorator = subindex[(group, priority)] if subindex is not None else None
+            dynamic_decorator = self._decorator_map.get((phrase, group, priority), None)
             if dynamic_decorator is not None:
                 annotation = dynamic_decorator(text, base_span, annotation)
             if annotation is not None:
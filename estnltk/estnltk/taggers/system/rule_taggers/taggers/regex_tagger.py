@@ -4,6 +4,8 @@ from typing import Sequence, Union, Generator, Tuple, Iterator, List, Callable,
 from estnltk.taggers import Tagger
 from estnltk import Layer, Text, Span
 from estnltk.taggers.system.rule_taggers.helper_methods.helper_methods import keep_maximal_matches, keep_minimal_matches,conflict_priority_resolver
+from estnltk.taggers.system.rule_taggers.helper_methods.helper_methods import index_rules
+from estnltk.taggers.system.rule_taggers.helper_methods.combined_regex_matcher import CombinedRegexMatcher
 from estnltk_core import Annotation, ElementaryBaseSpan, Span
 from estnltk.taggers.system.rule_taggers import Ruleset, StaticExtractionRule
 from typing import Match
@@ -35,7 +37,11 @@ class RegexTagger(Tagger):
                  'pattern_attribute',
                  'static_ruleset_map',
                  'dynamic_ruleset_map',
-                 'lowercase_text']
+                 'lowercase_text',
+                 '_decorator_map',
+                 'combined_matching',
+                 '_combined_matcher',
+                 '_rule_pattern_indexes']
 
     def __init__(self,
                  ruleset: Ruleset,
@@ -49,7 +55,8 @@ class RegexTagger(Tagger):
                  match_attribute: str = 'match',
                  group_attribute: str = None,
                  priority_attribute: str = None,
-                 pattern_attribute: str = None
+                 pattern_attribute: str = None,
+                 combined_matching: bool = False
                  ):
         """Initialize a new RegexTagger instance. Note that previously it was possible to
         have callables as attributes in the ruleset. This functionality is now replaced by
@@ -93,6 +100,13 @@ class RegexTagger(Tagger):
             If not None, the final annotation contains the priority attribute of the rule with the given name
         pattern_attribute: str (Default: None)
             If not None, the final annotation contains the pattern attribute of the rule with the given name
+        combined_matching: bool (Default: False)
+            If True, the text is first scanned once with a combined pattern of all
+            the rules, and each pattern is then only tried at positions where the
+            combined pattern matched (see CombinedRegexMatcher). The results are the
+            same as with separate scans. This speeds up tagging with large rulesets
+            of patterns that do not begin with literal strings (e.g. r'\\d+\\s*kg'),
+            but slows down tagging with patterns that begin with literal strings.
         """
         self.conf_param = ['conflict_resolver',
                            'overlapped',
@@ -106,7 +120,11 @@ class RegexTagger(Tagger):
                            'pattern_attribute',
                            'static_ruleset_map',
                            'dynamic_ruleset_map',
-                           'lowercase_text']
+                           'lowercase_text',
+                           '_decorator_map',
+                           'combined_matching',
+                           '_combined_matcher',
+                           '_rule_pattern_indexes']
         self.input_layers = ()
         self.output_layer = output_layer
         if output_attributes is None:
@@ -116,36 +134,10 @@ class RegexTagger(Tagger):
 
         self.global_decorator = decorator
 
+        # Rules are indexed once by patterns, and dynamic decorators by (pattern, group, priority)
         self.static_ruleset_map: Dict[str, List[Tuple[int, int, Dict[str, any]]]]
-
-        static_ruleset_map = dict()
-
-        for rule in ruleset.static_rules:
-            subindex = static_ruleset_map.get(rule.pattern, [])
-            subindex.append((rule.group, rule.priority, rule.attributes))
-            static_ruleset_map[rule.pattern] = subindex
-
-        self.static_ruleset_map = static_ruleset_map
-
-        # Lets index dynamic rulesets in optimal way
         self.dynamic_ruleset_map: Dict[str, Dict[Tuple[int, int], Callable]]
-
-        dynamic_ruleset_map = dict()
-        for rule in ruleset.dynamic_rules:
-            subindex = dynamic_ruleset_map.get(rule.pattern, dict())
-            if (rule.group, rule.priority) in subindex:
-                raise AttributeError('There are multiple rules with the same pattern, group and priority')
-            subindex[rule.group, rule.priority] = rule.decorator
-            dynamic_ruleset_map[rule.pattern] = subindex
-            # create corresponding static rule if it does not exist yet
-            if static_ruleset_map.get(rule.pattern, None) is None:
-                self.static_ruleset_map[rule.pattern] = [(rule.group, rule.priority, dict())]
-            elif len([item for item in static_ruleset_map.get(rule.pattern)
-                      if item[0] == rule.group and item[1] == rule.priority]) == 0:
-                self.static_ruleset_map[rule.pattern] = [(rule.group, rule.priority, dict())]
-
-        # No errors were detected
-        self.dynamic_ruleset_map = dynamic_ruleset_map
+        self.static_ruleset_map, self.dynamic_ruleset_map, self._decorator_map = index_rules(ruleset)
 
         self.match_attribute = match_attribute
         if not isinstance(match_attribute, str):
@@ -161,6 +153,17 @@ class RegexTagger(Tagger):
         self.overlapped = overlapped
         self.conflict_resolver = conflict_resolver
 
+        self.combined_matching = combined_matching
+        self._combined_matcher = None
+        self._rule_pattern_indexes = None
+        if combined_matching:
+            # Rules with the same pattern share the matches of the pattern
+            pattern_indexes = dict()
+            for rule in self.ruleset.static_rules:
+                pattern_indexes.setdefault(rule.pattern, len(pattern_indexes))
+            self._combined_matcher = CombinedRegexMatcher(list(pattern_indexes))
+            self._rule_pattern_indexes = [pattern_indexes[rule.pattern] for rule in self.ruleset.static_rules]
+
     def _make_layer_template(self):
         return Layer(name=self.output_layer,
                      attributes=self.output_attributes,
@@ -216,10 +219,15 @@ class RegexTagger(Tagger):
 
         The matches are given as a tuple of base span, match object and the rule based on which the match was found.
         """
+        if self.combined_matching:
+            pattern_matches = self._combined_matcher.finditer_all(text, overlapped=self.overlapped)
+            rule_matches = [pattern_matches[i] for i in self._rule_pattern_indexes]
+        else:
+            rule_matches = [rule.pattern.finditer(text, overlapped=self.overlapped)
+                            for rule in self.ruleset.static_rules]
         match_tuples = []
-        for rule in self.ruleset.static_rules:
-            reg = rule.pattern
-            for matchobj in reg.finditer(text, overlapped=self.overlapped):
+        for rule, matches in zip(self.ruleset.static_rules, rule_matches):
+            for matchobj in matches:
                 start, end = matchobj.span(rule.group)
                 if start == end:
                     continue
@@ -285,10 +293,9 @@ class RegexTagger(Tagger):
                 if not isinstance(annotation_dict, dict):
                     continue
             # apply dynamic_decorator 
-            if rule.pattern in self.dynamic_ruleset_map:
-                dynamic_decorator = self.dynamic_ruleset_map[rule.pattern].get((group, priority), None)
-                if dynamic_decorator is not None:
-                    annotation_dict = dynamic_decorator(text_obj, base_span, annotation_dict)
+            dynamic_decorator = self._decorator_map.get((rule.pattern, group, priority), None)
+            if dynamic_decorator is not None:
+                annotation_dict = dynamic_decorator(text_obj, base_span, annotation_dict)
             if annotation_dict is not None:
                 layer.add_annotation(base_span, annotation_dict)
         return layer
@@ -328,10 +335,9 @@ class RegexTagger(Tagger):
                 if not isinstance(annotation_dict, dict):
                     continue
             # apply dynamic_decorator 
-            if rule.pattern in self.dynamic_ruleset_map:
-                dynamic_decorator = self.dynamic_ruleset_map[rule.pattern].get((group, priority), None)
-                if dynamic_decorator is not None:
-                    annotation_dict = dynamic_decorator(text_obj, base_span, annotation_dict)
+            dynamic_decorator = self._decorator_map.get((rule.pattern, group, priority), None)
+            if dynamic_decorator is not None:
+                annotation_dict = dynamic_decorator(text_obj, base_span, annotation_dict)
             if annotation_dict is not None:
                 annotation_obj = Annotation(cur_span, annotation_dict)
                 yield annotation_obj, group, priority   
@@ -5,6 +5,7 @@ from estnltk.taggers import Tagger
 from estnltk.taggers.system.rule_taggers.extraction_rules.ruleset import Ruleset
 from estnltk.taggers.system.rule_taggers.extraction_rules.ambiguous_ruleset import AmbiguousRuleset
 from estnltk.taggers.system.rule_taggers.helper_methods.helper_methods import keep_minimal_matches, keep_maximal_matches,conflict_priority_resolver
+from estnltk.taggers.system.rule_taggers.helper_methods.helper_methods import index_rules
 from estnltk import Span, Text
 from estnltk import Layer
 from estnltk import Annotation
@@ -77,7 +78,7 @@ class SpanTagger(Tagger):
         """
         self.conf_param = ('input_attribute', '_vocabulary', 'global_decorator', 'pattern_attribute',
                            'ignore_case', '_ruleset', 'dynamic_ruleset_map', 'group_attribute','priority_attribute',
-                           'conflict_resolver', 'static_ruleset_map')
+                           'conflict_resolver', 'static_ruleset_map', '_decorator_map')
         self.output_layer = output_layer
         self.input_attribute = input_attribute
 
@@ -89,40 +90,15 @@ class SpanTagger(Tagger):
 
         self.input_layers = [input_layer]
 
-        self.static_ruleset_map: Dict[str, List[Tuple[int, int, Dict[str, any]]]]
-
-        static_ruleset_map = dict()
-
         self.ignore_case = ignore_case
 
-        for rule in ruleset.static_rules:
-            if self.ignore_case:
-                subindex = static_ruleset_map.get(rule.pattern.lower(), [])
-                subindex.append((rule.group, rule.priority, rule.attributes))
-                static_ruleset_map[rule.pattern.lower()] = subindex
-            else:
-                subindex = static_ruleset_map.get(rule.pattern, [])
-                subindex.append((rule.group, rule.priority, rule.attributes))
-                static_ruleset_map[rule.pattern] = subindex
-
-        self.static_ruleset_map = static_ruleset_map
-
-        # Lets index dynamic rulesets in optimal way
+        # Rules are indexed once by patterns, and dynamic decorators by (pattern, group, priority)
+        self.static_ruleset_map: Dict[str, List[Tuple[int, int, Dict[str, any]]]]
         self.dynamic_ruleset_map: Dict[str, Dict[Tuple[int, int], Callable]]
-
-        dynamic_ruleset_map = dict()
-        for rule in ruleset.dynamic_rules:
-            subindex = dynamic_ruleset_map.get(rule.pattern, dict())
-            if (rule.group, rule.priority) in subindex:
-                raise AttributeError('There are multiple rules with the same pattern, group and priority')
-            subindex[rule.group, rule.priority] = rule.decorator
-            dynamic_ruleset_map[rule.pattern] = subindex
-            # create corresponding static rule if it does not exist yet
-            if static_ruleset_map.get(rule.pattern.lower(), None) is None:
-                self.static_ruleset_map[rule.pattern.lower()] = [(rule.group, rule.priority, dict())]
-            elif len([item for item in static_ruleset_map.get(rule.pattern.lower())
-                      if item[0] == rule.group and item[1] == rule.priority]) == 0:
-                self.static_ruleset_map[rule.pattern.lower()] = [(rule.group, rule.priority, dict())]
+        static_ruleset_map, dynamic_ruleset_map, decorator_map = \
+            index_rules(ruleset, normalize_pattern=str.lower if ignore_case else None)
+        self.static_ruleset_map = static_ruleset_map
+        self._decorator_map = decorator_map
 
         # No errors were detected
         self.dynamic_ruleset_map = dynamic_ruleset_map
@@ -151,17 +127,30 @@ class SpanTagger(Tagger):
         layer.text_object = text
 
         input_attribute = self.input_attribute
+        ignore_case = self.ignore_case
+        static_ruleset_map = self.static_ruleset_map
 
         input_layer = layers[self.input_layers[0]]
         match_tuples = []
 
         for parent_span in input_layer:
-            for annotation in parent_span.annotations:
-                value = getattr(annotation,input_attribute)
-                if self.ignore_case:
+            annotations = parent_span.annotations
+            if len(annotations) == 1:
+                value = getattr(annotations[0], input_attribute)
+                if ignore_case:
                     value = value.lower()
-                if value in self.static_ruleset_map.keys():
+                if value in static_ruleset_map:
                     match_tuples.append((parent_span.base_span, value))
+                continue
+            # Ambiguous span: each distinct value is matched only once
+            values = []
+            for annotation in annotations:
+                value = getattr(annotation, input_attribute)
+                if ignore_case:
+                    value = value.lower()
+                if value in static_ruleset_map and value not in values:
+                    values.append(value)
+            match_tuples.extend((parent_span.base_span, value) for value in values)
 
         return sorted(match_tuples, key=lambda x: (x[0].start, x[0].end))
 
@@ -229,8 +218,7 @@ class SpanTagger(Tagger):
                     continue
             # apply dynamic_decorator --- it must be unique or have matching 
             # priority and group
-            subindex = self.dynamic_ruleset_map.get(pattern, None)
-            dynamic_decorator = subindex[(group, priority)] if subindex is not None else None
+            dynamic_decorator = self._decorator_map.get((pattern, group, priority), None)
             if dynamic_decorator is not None:
                 annotation = dynamic_decorator(text, base_span, annotation)
             if annotation is not None:
@@ -278,8 +266,7 @@ class SpanTagger(Tagger):
                     continue
             # apply dynamic_decorator --- it must be unique or have matching 
             # priority and group
-            subindex = self.dynamic_ruleset_map.get(pattern, None)
-            dynamic_decorator = subindex[(group, priority)] if subindex is not None else None
+            dynamic_decorator = self._decorator_map.get((pattern, group, priority), None)
             if dynamic_decorator is not None:
                 annotation = dynamic_decorator(text, base_span, annotation)
             if annotation is not None:
@@ -1,4 +1,12 @@
+import hashlib
+import json
+import os
+import pickle
+import stat
+import tempfile
+import warnings
 from copy import copy
+from types import CodeType
 from ahocorasick import Automaton
 
 from estnltk import Text, Layer, Tagger
@@ -8,6 +16,117 @@ from typing import Tuple, List, Dict, Sequence, Union, Any, Callable, Iterator,
 from estnltk.taggers.system.rule_taggers import Ruleset
 from estnltk.taggers.system.rule_taggers.extraction_rules.ambiguous_ruleset import AmbiguousRuleset
 from estnltk.taggers.system.rule_taggers.helper_methods.helper_methods import keep_maximal_matches, keep_minimal_matches,conflict_priority_resolver
+from estnltk.taggers.system.rule_taggers.helper_methods.helper_methods import index_rules
+
+
+# Version of the automaton cache file format
+AUTOMATON_CACHE_VERSION = 1
+
+
+def _canonical_form(value: Any) -> Any:
+    """
+    Converts a value into a JSON-serializable form that depends only on the content of the value
+    (e.g. not on the order of dict items or on object identities). Containers are tagged with their
+    type, so that, for instance, a list and a tuple with the same items get different forms.
+    Raises TypeError if the value (or any of its items) is of an unsupported type.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, bytes):
+        return ['bytes', value.hex()]
+    if isinstance(value, (list, tuple)):
+        return [type(value).__name__, [_canonical_form(item) for item in value]]
+    if isinstance(value, (set, frozenset)):
+        return ['set', sorted((_canonical_form(item) for item in value), key=_canonical_json)]
+    if isinstance(value, dict):
+        return ['dict', sorted(([_canonical_form(k), _canonical_form(v)] for (k, v) in value.items()),
+                               key=_canonical_json)]
+    if isinstance(value, CodeType):
+        return ['code', value.co_code.hex(), _canonical_form(value.co_consts), list(value.co_names)]
+    raise TypeError('cannot make a canonical form of {!r}'.format(type(value)))
+
+
+def _canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+
+
+def _automaton_cache_key(ruleset: AmbiguousRuleset, ignore_case: bool, expander: Optional[Callable]) -> Optional[str]:
+    """
+    Returns a hash of the ruleset and the settings that determine the static rule map and the automaton.
+    Decorators of dynamic rules are not part of the cached data, so only their patterns, groups and
+    priorities are hashed. Returns None if the rules cannot be serialized canonically (e.g. attribute
+    values are arbitrary objects); such rulesets are not cached.
+    """
+    if expander is None:
+        expander_id = None
+    else:
+        code = getattr(expander, '__code__', None)
+        if code is None:
+            # Without code, an expander cannot be identified by its content
+            return None
+        expander_id = (getattr(expander, '__module__', None), getattr(expander, '__qualname__', None), code)
+    key_data = (AUTOMATON_CACHE_VERSION, ignore_case, expander_id,
+                [(rule.pattern, rule.group, rule.priority, rule.attributes) for rule in ruleset.static_rules],
+                [(rule.pattern, rule.group, rule.priority) for rule in ruleset.dynamic_rules])
+    try:
+        key_json = _canonical_json(_canonical_form(key_data))
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(key_json.encode('utf-8')).hexdigest()
+
+
+def _is_private_path(path: str) -> bool:
+    """
+    Checks that the file (or directory) is owned by the current user and is not writable by others.
+    The check is only done on POSIX systems; on other systems, returns True.
+    """
+    if os.name != 'posix':
+        return True
+    path_stat = os.stat(path)
+    return path_stat.st_uid == os.getuid() and not path_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _load_automaton_cache(cache_file: str, cache_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Loads cached static rule map and automaton. Returns None if the cache file
+    is missing, unreadable or belongs to a different ruleset.
+    The cache is a pickle file, so it is only loaded if both the file and its
+    directory are owned by the current user and not writable by others.
+    """
+    if not os.path.isfile(cache_file):
+        return None
+    try:
+        if not (_is_private_path(os.path.dirname(cache_file)) and _is_private_path(cache_file)):
+            warnings.warn('(!) Ignoring automaton cache file {!r}: the file or its directory is not owned by '
+                          'the current user or is writable by others.'.format(cache_file))
+            return None
+        with open(cache_file, 'rb') as in_f:
+            cached = pickle.load(in_f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get('key') != cache_key:
+        return None
+    return cached
+
+
+def _save_automaton_cache(cache_file: str, cache_key: str, static_ruleset_map: dict, automaton: Automaton):
+    """
+    Saves the static rule map and the automaton. The file is written under a temporary name
+    and renamed afterwards, so that concurrent processes never read a partially written file.
+    """
+    cache_dir = os.path.dirname(cache_file)
+    # The cache directory is created as private to the user (see _load_automaton_cache)
+    os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    fd, tmp_file = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as out_f:
+            pickle.dump({'key': cache_key, 'static_ruleset_map': static_ruleset_map, 'automaton': automaton},
+                        out_f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
 
 
 class SubstringTagger(Tagger):
@@ -60,7 +179,8 @@ class SubstringTagger(Tagger):
                  group_attribute: str = None,
                  priority_attribute: str = None,
                  pattern_attribute: str = None,
-                 expander: Callable[[str], List[str]] = None
+                 expander: Callable[[str], List[str]] = None,
+                 automaton_cache: str = None
                  ):
         """
         Initialize a new SubstringTagger instance.
@@ -113,6 +233,20 @@ class SubstringTagger(Tagger):
         expander:
             Function used to expand the rules in the ruleset. Takes in a rule pattern as a string and outputs a list
             of strings to be used in rules.
+        automaton_cache:
+            Directory for caching the compiled automaton together with the map of static rules.
+            If set, the cache file is named by a hash of the ruleset and the settings that affect the
+            automaton (ignore_case, expander), and it is loaded instead of rebuilding the automaton
+            whenever a tagger is initialised with the same ruleset and settings. This avoids the costs
+            of pattern expansion and automaton construction for large rulesets (e.g. at worker startup).
+            Note that an expander is identified by its name and code, not by the code of the functions
+            it calls: clear the cache if the behaviour of these functions changes.
+            Rulesets with attribute values other than None, bool, int, float, str, bytes or containers
+            of these (list, tuple, set, dict) are not cached.
+            Cache files are pickles, and loading a pickle can execute arbitrary code. Therefore, use a
+            directory that is not writable by other users (e.g. a directory in the user's home or cache
+            directory). The directory is created with permissions 0o700 if it does not exist, and on POSIX
+            systems, cache files in directories that are writable by others (e.g. /tmp) are ignored.
 
         Extraction rules are in the form string --> dict where the dict contains the annotation for the match, e.g.
             Washington    --> {type: capital, country: US},
@@ -138,11 +272,13 @@ class SubstringTagger(Tagger):
             'ignore_case',
             'dynamic_ruleset_map',
             'static_ruleset_map',
+            '_decorator_map',
             'ambiguous_output_layer',
             'group_attribute',
             'priority_attribute',
             'pattern_attribute',
-            'expander']
+            'expander',
+            'automaton_cache']
 
         self.input_layers = ()
         self.output_layer = output_layer
@@ -154,67 +290,31 @@ class SubstringTagger(Tagger):
         if not (set(ruleset.output_attributes) <= set(self.output_attributes)):
             raise ValueError('Output attributes of a ruleset must match the output attributes of a tagger')
 
-        self.static_ruleset_map: Dict[str, List[Tuple[int, int, Dict[str, any]]]]
         self.expander = expander
 
-        static_ruleset_map = dict()
-
         self.ignore_case = ignore_case
 
-        for rule in ruleset.static_rules:
-            if self.expander:
-                if self.ignore_case:
-                    expanded = self.expander(rule.pattern.lower())
-                else:
-                    expanded = self.expander(rule.pattern)
-                for new_rule in expanded:
-                    subindex = static_ruleset_map.get(new_rule, [])
-                    subindex.append((rule.group, rule.priority, rule.attributes))
-                    static_ruleset_map[new_rule] = subindex
-            else:
-                if self.ignore_case:
-                    subindex = static_ruleset_map.get(rule.pattern.lower(), [])
-                    subindex.append((rule.group, rule.priority, rule.attributes))
-                    static_ruleset_map[rule.pattern.lower()] = subindex
-                else:
-                    subindex = static_ruleset_map.get(rule.pattern, [])
-                    subindex.append((rule.group, rule.priority, rule.attributes))
-                    static_ruleset_map[rule.pattern] = subindex
-
-        self.static_ruleset_map = static_ruleset_map
-
-        # Lets index dynamic rulesets in optimal way
+        self.automaton_cache = automaton_cache
+        cache_key = None
+        cache_file = None
+        cached = None
+        if automaton_cache is not None:
+            cache_key = _automaton_cache_key(ruleset, ignore_case, expander)
+        if cache_key is not None:
+            cache_file = os.path.join(automaton_cache, 'substring_tagger_{}.pickle'.format(cache_key))
+            cached = _load_automaton_cache(cache_file, cache_key)
+
+        # Rules are indexed once by patterns, and dynamic decorators by (pattern, group, priority)
+        self.static_ruleset_map: Dict[str, List[Tuple[int, int, Dict[str, any]]]]
         self.dynamic_ruleset_map: Dict[str, Dict[Tuple[int, int], Callable]]
-
-        dynamic_ruleset_map = dict()
-        for rule in ruleset.dynamic_rules:
-            if self.ignore_case:
-                subindex = dynamic_ruleset_map.get(rule.pattern.lower(), dict())
-                if (rule.group, rule.priority) in subindex:
-                    raise AttributeError('There are multiple rules with the same pattern, group and priority')
-                subindex[rule.group, rule.priority] = rule.decorator
-                dynamic_ruleset_map[rule.pattern.lower()] = subindex
-                # create corresponding static rule if it does not exist yet
-                if static_ruleset_map.get(rule.pattern.lower(), None) is None:
-                    self.static_ruleset_map[rule.pattern.lower()] = [(rule.group, rule.priority, dict())]
-                elif len([item for item in static_ruleset_map.get(rule.pattern.lower())
-                          if item[0] == rule.group and item[1] == rule.priority]) == 0:
-                    self.static_ruleset_map[rule.pattern.lower()] = [(rule.group, rule.priority, dict())]
-            else:
-                subindex = dynamic_ruleset_map.get(rule.pattern, dict())
-                if (rule.group, rule.priority) in subindex:
-                    raise AttributeError('There are multiple rules with the same pattern, group and priority')
-                subindex[rule.group, rule.priority] = rule.decorator
-                dynamic_ruleset_map[rule.pattern] = subindex
-                # create corresponding static rule if it does not exist yet
-                if static_ruleset_map.get(rule.pattern, None) is None:
-                    static_ruleset_map[rule.pattern] = [(rule.group, rule.priority, dict())]
-                elif len([item for item in static_ruleset_map.get(rule.pattern)
-                          if item[0] == rule.group and item[1] == rule.priority]) == 0:
-                    static_ruleset_map[rule.pattern.lower()] = [(rule.group, rule.priority, dict())]
-
-        # No errors were detected
+        static_ruleset_map, dynamic_ruleset_map, decorator_map = \
+            index_rules(ruleset,
+                        normalize_pattern=str.lower if self.ignore_case else None,
+                        expand_pattern=self.expander,
+                        static_ruleset_map=cached['static_ruleset_map'] if cached is not None else None)
+        self.static_ruleset_map = static_ruleset_map
         self.dynamic_ruleset_map = dynamic_ruleset_map
+        self._decorator_map = decorator_map
 
         self.ruleset = copy(ruleset)
         self.token_separators = token_separators
@@ -225,19 +325,25 @@ class SubstringTagger(Tagger):
         self.priority_attribute = priority_attribute
         self.pattern_attribute = pattern_attribute
 
-        # We bypass restrictions of Tagger class to set some private attributes
-        super(Tagger, self).__setattr__('_automaton', Automaton())
-
-        # Configures automaton to match the patters in the ruleset
-        # Each pattern is here exactly once
-        if self.ignore_case:
-            for pattern in self.static_ruleset_map:
-                self._automaton.add_word(pattern.lower(), len(pattern))
+        if cached is not None:
+            automaton = cached['automaton']
         else:
-            for pattern in self.static_ruleset_map:
-                self._automaton.add_word(pattern, len(pattern))
+            # Configures automaton to match the patters in the ruleset
+            # Each pattern is here exactly once
+            automaton = Automaton()
+            if self.ignore_case:
+                for pattern in self.static_ruleset_map:
+                    automaton.add_word(pattern.lower(), len(pattern))
+            else:
+                for pattern in self.static_ruleset_map:
+                    automaton.add_word(pattern, len(pattern))
 
-        self._automaton.make_automaton()
+            automaton.make_automaton()
+            if cache_file is not None:
+                _save_automaton_cache(cache_file, cache_key, self.static_ruleset_map, automaton)
+
+        # We bypass restrictions of Tagger class to set some private attributes
+        super(Tagger, self).__setattr__('_automaton', automaton)
 
     def _make_layer(self, text: Text, layers=None, status=None):
 
@@ -387,8 +493,7 @@ class SubstringTagger(Tagger):
                     continue
             # apply dynamic_decorator --- it must be unique or have matching 
             # priority and group
-            subindex = self.dynamic_ruleset_map.get(pattern, None)
-            dynamic_decorator = subindex[(group, priority)] if subindex is not None else None
+            dynamic_decorator = self._decorator_map.get((pattern, group, priority), None)
             if dynamic_decorator is not None:
                 # Use dynamic rules to change the annotation
                 annotation = dynamic_decorator(text, base_span, annotation)
@@ -437,8 +542,7 @@ class SubstringTagger(Tagger):
                 if not isinstance(annotation_dict, dict):
                     continue
             # apply dynamic_decorator
-            subindex = self.dynamic_ruleset_map.get(pattern, None)
-            dynamic_decorator = subindex[(group, priority)] if subindex is not None else None
+            dynamic_decorator = self._decorator_map.get((pattern, group, priority), None)
             if dynamic_decorator is not None:
                 # Use dynamic rules to change the annotation
                 annotation_dict = dynamic_decorator(text, base_span, annotation_dict)
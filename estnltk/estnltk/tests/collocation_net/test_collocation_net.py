@@ -94,3 +94,107 @@ def test_predict_topic_for_several():
     pred = pred[0]
     assert isinstance(pred[0], list)
     assert isinstance(pred[1], float)
+
+
+def _create_collocation_net_data(base_path):
+    import numpy as np
+    data_path = base_path / 'data' / 'test_collocations'
+    data_path.mkdir(parents=True)
+    np.save(str(data_path / 'rows.npy'), np.array(['kohv', 'tee', 'leib', 'sai'], dtype=object))
+    np.save(str(data_path / 'columns.npy'), np.array(['kange', 'tugev', 'värske', 'pehme'], dtype=object))
+    np.save(str(data_path / 'lda_row_distribution.npy'), np.array([[0.9, 0.1], [0.8, 0.2], [0.1, 0.9], [0.3, 0.7]]))
+    np.save(str(data_path / 'lda_column_distribution.npy'), np.array([[20.0, 12.0, 1.0, 2.0], [1.0, 3.0, 15.0, 11.0]]))
+    topics = np.empty(2, dtype=object)
+    topics[0] = np.array(['kohv', 'tee'], dtype=object)
+    topics[1] = np.array(['leib', 'sai'], dtype=object)
+    np.save(str(data_path / 'lda_topics.npy'), topics, allow_pickle=True)
+
+
+def test_index_lookups_and_probability_matrices(tmp_path):
+    _create_collocation_net_data(tmp_path)
+    cn = BaseCollocationNet(collocation_type='test_collocations', base_path=str(tmp_path))
+    assert cn.row_index('leib') == 2
+    assert cn.column_index('pehme') == 3
+    assert cn.row_indexes(['sai', 'kohv']).tolist() == [3, 0]
+    with pytest.raises(ValueError):
+        cn.column_index('testsõna')
+    with pytest.raises(ValueError):
+        cn.row_indexes(['kohv', 'testsõna'])
+    assert cn.topic('sai') == ['leib', 'sai']
+    assert cn.usable_phrase('kohv', 'kange')
+    assert not cn.usable_phrase('kohv', 'pehme', number_of_topics=1)
+    assert not cn.usable_phrase('kohv', 'testsõna')
+
+    matrix = cn.column_probability_matrix(['kohv', 'leib'], ['tugev', 'kange'])
+    assert matrix.shape == (2, 2)
+    for i, row in enumerate(['kohv', 'leib']):
+        probabilities = dict(cn.predict_column_probabilities(row, ['tugev', 'kange']))
+        assert matrix[i].tolist() == pytest.approx([probabilities['tugev'], probabilities['kange']])
+    assert cn.column_probability_matrix(['tee']).shape == (1, 4)
+
+    matrix = cn.row_probability_matrix(['värske'], ['sai', 'kohv', 'tee'])
+    probabilities = dict(cn.predict_row_probabilities('värske', ['sai', 'kohv', 'tee']))
+    assert matrix[0].tolist() == pytest.approx([probabilities['sai'], probabilities['kohv'], probabilities['tee']])
+    assert cn.row_probability_matrix(['värske', 'kange']).shape == (2, 4)
+
+
+def test_similar_words_matrices(tmp_path):
+    pytest.importorskip('sklearn')
+    _create_collocation_net_data(tmp_path)
+    cn = BaseCollocationNet(collocation_type='test_collocations', base_path=str(tmp_path))
+    assert cn.similar_rows('kohv', 1) == ['tee']
+    assert cn.similar_rows_matrix(['kohv', 'leib'], 2).tolist() == [['tee', 'sai'], ['sai', 'tee']]
+    assert cn.similar_columns('värske', 1) == ['pehme']
+    assert cn.similar_columns_matrix(['kange'], 1).tolist() == [['tugev']]
+    assert cn.similar_rows_for_list(['kohv', 'tee'], 2) == ['sai', 'leib']
+
+
+def test_mmap_loading(tmp_path, monkeypatch):
+    import numpy as np
+    from estnltk.collocation_net import base_collocation_net
+    saved_tables = []
+    save_mmap_tables = base_collocation_net.save_mmap_tables
+    monkeypatch.setattr(base_collocation_net, 'save_mmap_tables',
+                        lambda path, output_path=None: saved_tables.append(output_path) or
+                                                       save_mmap_tables(path, output_path))
+    base_path = tmp_path / 'resources'
+    tables_path = tmp_path / 'cache'
+    _create_collocation_net_data(base_path)
+    data_files = sorted((base_path / 'data' / 'test_collocations').iterdir())
+    cn = BaseCollocationNet(collocation_type='test_collocations', base_path=str(base_path))
+    # Without mmap_tables_path, the data directory is not modified and mmap is not used
+    with pytest.warns(UserWarning, match='Tables for memory mapping are missing'):
+        assert not BaseCollocationNet(collocation_type='test_collocations', base_path=str(base_path), mmap=True).mmap
+    assert saved_tables == []
+    mmap_cn = BaseCollocationNet(collocation_type='test_collocations', base_path=str(base_path), mmap=True,
+                                 mmap_tables_path=str(tables_path))
+    assert mmap_cn.mmap
+    assert isinstance(mmap_cn.row_dist, np.memmap)
+    assert isinstance(mmap_cn.column_dist_probs, np.memmap)
+    assert (tables_path / 'test_collocations' / 'rows_str.npy').exists()
+    assert sorted((base_path / 'data' / 'test_collocations').iterdir()) == data_files
+    # Tables are created only once
+    assert len(saved_tables) == 1
+    assert BaseCollocationNet(collocation_type='test_collocations', base_path=str(base_path), mmap=True,
+                              mmap_tables_path=str(tables_path)).mmap
+    assert len(saved_tables) == 1
+    # Tables that were saved into the data directory explicitly are used without mmap_tables_path
+    save_mmap_tables(str(base_path / 'data' / 'test_collocations'))
+    assert BaseCollocationNet(collocation_type='test_collocations', base_path=str(base_path), mmap=True).mmap
+
+    assert mmap_cn.rows.tolist() == cn.rows.tolist()
+    assert mmap_cn.row_index('leib') == 2
+    assert mmap_cn.topic('kohv') == ['kohv', 'tee']
+    assert mmap_cn.columns_used_with('leib', 2) == cn.columns_used_with('leib', 2)
+    assert mmap_cn.predict_column_probabilities('kohv', number_of_columns=3) == \
+           cn.predict_column_probabilities('kohv', number_of_columns=3)
+    # Words are returned as plain strings
+    for word, _ in mmap_cn.predict_column_probabilities('kohv', number_of_columns=3) + \
+                   mmap_cn.predict_row_probabilities('kange', number_of_rows=3):
+        assert type(word) is str
+    for words, _ in mmap_cn.predict_topic_for_several_rows(['kohv', 'sai'], 2, 2):
+        assert all(type(word) is str for word in words)
+    assert mmap_cn.predict_topic_for_several_rows(['kohv', 'sai'], 2, 2) == \
+           cn.predict_topic_for_several_rows(['kohv', 'sai'], 2, 2)
+    assert mmap_cn.characterisation('sai', 2, 2) == cn.characterisation('sai', 2, 2)
+    assert mmap_cn.usable_phrase('sai', 'värske')
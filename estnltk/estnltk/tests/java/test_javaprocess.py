@@ -0,0 +1,139 @@
+import sys
+import subprocess
+import threading
+
+import pytest
+
+from estnltk.java.javaprocess import JavaProcess
+from estnltk.java.javaprocess import JavaProcessPool
+from estnltk.java.javaprocess import _STARTED_JAVA_PROCESSES
+
+# A stand-in for a Java component: reads lines from stdin and writes
+# uppercased lines to stdout. Exits after reading the line 'EXIT'
+ECHO_SCRIPT = '''
+import sys
+for line in sys.stdin:
+    if line.strip() == 'EXIT':
+        break
+    sys.stdout.write(line.upper())
+    sys.stdout.flush()
+'''
+
+
+class EchoProcess(JavaProcess):
+    def __init__(self, max_lines_in_flight=100):
+        super().__init__('echo.jar', check_java=False, lazy_initialize=True,
+                         max_lines_in_flight=max_lines_in_flight)
+
+    def initialize_java_subprocess(self):
+        self._process = subprocess.Popen([sys.executable, '-c', ECHO_SCRIPT],
+                                         stdin=subprocess.PIPE,
+                                         stdout=subprocess.PIPE,
+                                         stderr=subprocess.PIPE)
+        _STARTED_JAVA_PROCESSES.append( self._process )
+
+
+class EchoProcessPool(JavaProcessPool):
+    def __init__(self, workers):
+        super().__init__('echo.jar', check_java=False, lazy_initialize=True, workers=workers)
+
+    def _make_worker(self, runnable_jar, jar_path, args, max_lines_in_flight):
+        return EchoProcess(max_lines_in_flight=max_lines_in_flight)
+
+
+def test_process_lines():
+    process = EchoProcess(max_lines_in_flight=10)
+    # Lazy initialization
+    assert process.process_lines([]) == []
+    assert process._process is None
+    lines = ['rida {} {}'.format(i, 'ä'*(i % 50)) for i in range(5000)]
+    results = process.process_lines(lines)
+    assert results == [line.upper()+'\n' for line in lines]
+    # Line by line and batch processing can be mixed
+    assert process.process_line('üks') == 'ÜKS\n'
+    assert process.process_lines(iter(['kaks', 'kolm'])) == ['KAKS\n', 'KOLM\n']
+    process._process.terminate()
+    process._process.communicate()
+    # The process cannot be used after it has been terminated
+    with pytest.raises(AssertionError):
+        process.process_lines(['neli'])
+    with pytest.raises(ValueError):
+        EchoProcess(max_lines_in_flight=0)
+
+
+def test_process_lines_fails_if_process_exits():
+    process = EchoProcess(max_lines_in_flight=5)
+    lines = ['rida {}'.format(i) for i in range(20)] + ['EXIT'] + ['rida {}'.format(i) for i in range(20)]
+    with pytest.raises(Exception) as e:
+        process.process_lines(lines)
+    process._process.wait()
+    assert process._process.poll() is not None
+
+
+def test_java_process_pool():
+    pool = EchoProcessPool(workers=3)
+    assert pool.workers == 3
+    assert not pool.is_initialized
+    # Workers are started lazily: a single line goes to a single worker
+    assert pool.process_line('üks') == 'ÜKS\n'
+    assert [worker.is_initialized for worker in pool._workers] == [True, False, False]
+    # Lines are split across workers, results are in the input order
+    lines = ['rida {}'.format(i) for i in range(1000)]
+    assert pool.process_lines(lines) == [line.upper()+'\n' for line in lines]
+    assert all(worker.is_alive() for worker in pool._workers)
+    assert pool.process_lines(lines[:2]) == ['RIDA 0\n', 'RIDA 1\n']
+    # A crashed worker is restarted
+    crashed_process = pool._workers[1]._process
+    crashed_process.kill()
+    crashed_process.wait()
+    assert pool.process_lines(lines) == [line.upper()+'\n' for line in lines]
+    assert pool._workers[1]._process is not crashed_process
+    assert all(worker.is_alive() for worker in pool._workers)
+    # The crashed process is not kept among started processes
+    assert crashed_process not in _STARTED_JAVA_PROCESSES
+    assert pool._workers[1]._process in _STARTED_JAVA_PROCESSES
+    # If a worker fails on the same lines after the restart, the error is raised
+    with pytest.raises(Exception):
+        pool.process_lines(lines[:10] + ['EXIT'] + lines[10:])
+    assert pool.process_lines(lines) == [line.upper()+'\n' for line in lines]
+    # After the termination, the pool cannot be used
+    pool.terminate_java_subprocess()
+    assert not pool.is_alive()
+    assert not any(worker._process in _STARTED_JAVA_PROCESSES for worker in pool._workers)
+    with pytest.raises(AssertionError):
+        pool.process_lines(lines)
+    with pytest.raises(ValueError):
+        EchoProcessPool(workers=0)
+
+
+def test_java_process_pool_terminate_before_use():
+    # Terminating a pool that has not been used does nothing (as in JavaProcess)
+    pool = EchoProcessPool(workers=2)
+    pool.terminate_java_subprocess()
+    assert pool.process_lines(['üks', 'kaks']) == ['ÜKS\n', 'KAKS\n']
+    pool.terminate_java_subprocess()
+    with pytest.raises(AssertionError):
+        pool.process_line('kolm')
+
+
+def test_java_process_pool_concurrent_callers():
+    # Multiple threads use the same pool at once: each worker processes 
+    # only one chunk at a time, so results of threads are not mixed
+    pool = EchoProcessPool(workers=2)
+    results = {}
+    def process(caller):
+        caller_results = []
+        for i in range(20):
+            lines = ['kutsuja {} rida {} {}'.format(caller, i, j) for j in range(1 + (i * 7) % 50)]
+            caller_results.append( pool.process_lines(lines) == [line.upper()+'\n' for line in lines] )
+            line = 'kutsuja {} üksik rida {}'.format(caller, i)
+            caller_results.append( pool.process_line(line) == line.upper()+'\n' )
+        results[caller] = caller_results
+    threads = [threading.Thread(target=process, args=(caller,)) for caller in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(results.keys()) == list(range(6))
+    assert all(all(caller_results) for caller_results in results.values())
+    pool.terminate_java_subprocess()
@@ -684,6 +684,140 @@ def test_pre_and_postdisambiguation_different_input_structures():
         cb_disambiguator.postdisambiguate( [text] )
 
 
+def test_streaming_pre_and_postdisambiguation():
+    #
+    #  Tests that document by document pre- and post-disambiguation with 
+    #  statistics collected from separate shards of the corpus gives the 
+    #  same results as the pre- and post-disambiguation of the whole corpus
+    #
+    import pickle
+    from estnltk.taggers.standard.morph_analysis.cb_disambiguator import ProperNameStatistics
+    from estnltk.taggers.standard.morph_analysis.cb_disambiguator import LemmaStatistics
+    cb_disambiguator = CorpusBasedMorphDisambiguator()
+    vm_disambiguator = VabamorfDisambiguator()
+    def create_corpus():
+        corpus = [[Text('Perekonnanimi oli Nõmm.'), 
+                   Text('Kuidas seda hääldada: Nõmmil või Nõmmel?'),
+                   Text('Ott tahab võita ka Kuldgloobust ja kulda.')], 
+                  [Text('Kuidas see Otil õnnestub, ei tea. Aga Ott lubas pingutada kulla nimel.'), 
+                   Text('Võib-olla tuleks siiski teha Kuldgloobuse eesti variant.'),
+                   Text('Saagi koju vedanud, saatis ta sõna põhja: omi sõnu me ei söö!'),
+                   Text('Saak missugune, kulla ja karra tõime koju, tallesid samuti.')]]
+        for docs in corpus:
+            for doc in docs:
+                doc.tag_layer(['compound_tokens', 'words', 'sentences'])
+                morf_analyzer.tag(doc)
+        return corpus
+    # Disambiguate the whole corpus at once
+    corpus_a = create_corpus()
+    cb_disambiguator.predisambiguate( corpus_a )
+    for docs in corpus_a:
+        for doc in docs:
+            vm_disambiguator.retag( doc )
+    cb_disambiguator.postdisambiguate( corpus_a )
+    # Disambiguate document by document; collect statistics separately 
+    # from each shard (sub collection), and merge pickled statistics
+    def merge_shards(shard_statistics, statistics):
+        for shard_stats in shard_statistics:
+            statistics.merge( pickle.loads(pickle.dumps(shard_stats)) )
+        return statistics
+    corpus_b = create_corpus()
+    shard_statistics = [ProperNameStatistics() for docs in corpus_b]
+    for shard_id, docs in enumerate(corpus_b):
+        for doc in docs:
+            cb_disambiguator.collect_proper_name_statistics(doc, 1, shard_statistics[shard_id])
+    for step in range(1, 4):
+        statistics = merge_shards(shard_statistics, ProperNameStatistics())
+        shard_statistics = [ProperNameStatistics() for docs in corpus_b]
+        for shard_id, docs in enumerate(corpus_b):
+            for doc in docs:
+                cb_disambiguator.predisambiguate_document(doc, step, statistics)
+                if step < 3:
+                    cb_disambiguator.collect_proper_name_statistics(doc, step+1, shard_statistics[shard_id])
+    for docs in corpus_b:
+        for doc in docs:
+            vm_disambiguator.retag( doc )
+    collection_statistics = [LemmaStatistics() for docs in corpus_b]
+    for shard_id, docs in enumerate(corpus_b):
+        for doc in docs:
+            cb_disambiguator.collect_lemma_statistics(doc, collection_statistics[shard_id])
+    shard_statistics = [LemmaStatistics() for docs in corpus_b]
+    for shard_id, docs in enumerate(corpus_b):
+        for doc in docs:
+            cb_disambiguator.postdisambiguate_document(doc, collection_statistics[shard_id])
+            cb_disambiguator.collect_lemma_statistics(doc, shard_statistics[shard_id], remove_duplicates=False)
+    statistics = merge_shards(shard_statistics, LemmaStatistics())
+    for docs in corpus_b:
+        for doc in docs:
+            cb_disambiguator.postdisambiguate_document(doc, statistics)
+            assert '_hidden_morph_analysis' not in doc.layers
+    assert collect_2nd_level_analyses( corpus_b, sort_analyses=False ) == \
+           collect_2nd_level_analyses( corpus_a, sort_analyses=False )
+    assert collect_2nd_level_analyses( corpus_b ) != collect_2nd_level_analyses( create_corpus() )
+    with pytest.raises(ValueError):
+        cb_disambiguator.collect_proper_name_statistics(corpus_b[0][0], 4)
+
+
+def test_parallel_and_saved_lemma_statistics(tmp_path):
+    #
+    #  Tests that lemma statistics built in worker processes (over shards 
+    #  of documents) are equal to the statistics built sequentially, and 
+    #  that statistics saved into a file can be reused for disambiguation
+    #
+    from estnltk.taggers.standard.morph_analysis.cb_disambiguator import LemmaStatistics
+    from estnltk.taggers.standard.morph_analysis.cb_disambiguator import ProperNameStatistics
+    cb_disambiguator = CorpusBasedMorphDisambiguator()
+    vm_disambiguator = VabamorfDisambiguator()
+    def create_corpus():
+        docs = [Text('Perekonnanimi oli Nõmm.'), 
+                Text('Kuidas seda hääldada: Nõmmil või Nõmmel?'),
+                Text('Ott tahab võita ka Kuldgloobust ja kulda.'),
+                Text('Kuidas see Otil õnnestub, ei tea. Aga Ott lubas pingutada kulla nimel.'), 
+                Text('Saagi koju vedanud, saatis ta sõna põhja: omi sõnu me ei söö!'),
+                Text('Saak missugune, kulla ja karra tõime koju, tallesid samuti.')]
+        for doc in docs:
+            doc.tag_layer(['compound_tokens', 'words', 'sentences'])
+            morf_analyzer.tag(doc)
+            vm_disambiguator.retag(doc)
+        return docs
+    # Build statistics sequentially and in worker processes
+    docs_a = create_corpus()
+    statistics_a = cb_disambiguator.build_lemma_statistics(docs_a, workers=1)
+    docs_b = create_corpus()
+    statistics_b = cb_disambiguator.build_lemma_statistics(docs_b, workers=2, shard_size=4)
+    assert statistics_b.lemma_frequencies == statistics_a.lemma_frequencies
+    assert statistics_b.ambiguous_lemmas == statistics_a.ambiguous_lemmas
+    assert statistics_b.ambiguous_lemma_frequencies() == statistics_a.ambiguous_lemma_frequencies()
+    # Save and load statistics
+    statistics_file = str(tmp_path / 'lemma_statistics.json')
+    statistics_b.save(statistics_file)
+    loaded_statistics = LemmaStatistics.load(statistics_file)
+    assert loaded_statistics.to_dict() == statistics_a.to_dict()
+    # Disambiguate with the loaded statistics
+    for doc in docs_a:
+        cb_disambiguator.postdisambiguate_document(doc, statistics_a)
+    for doc in docs_b:
+        cb_disambiguator.postdisambiguate_document(doc, loaded_statistics, remove_duplicates=True)
+    assert collect_analyses( docs_b, sort_analyses=False ) == collect_analyses( docs_a, sort_analyses=False )
+    # Parallel postdisambiguate gives the same results as the sequential one
+    corpus_a = [create_corpus()[:3], create_corpus()[3:]]
+    cb_disambiguator.postdisambiguate( corpus_a )
+    corpus_b = [create_corpus()[:3], create_corpus()[3:]]
+    cb_disambiguator.postdisambiguate( corpus_b, workers=2, shard_size=2 )
+    assert collect_2nd_level_analyses( corpus_b, sort_analyses=False ) == \
+           collect_2nd_level_analyses( corpus_a, sort_analyses=False )
+    # Save and load proper name statistics
+    pn_statistics = ProperNameStatistics()
+    for doc in create_corpus():
+        cb_disambiguator.collect_proper_name_statistics(doc, 2, pn_statistics)
+    pn_statistics.save(statistics_file)
+    loaded_pn_statistics = ProperNameStatistics.load(statistics_file)
+    assert loaded_pn_statistics.to_dict() == pn_statistics.to_dict()
+    assert loaded_pn_statistics.not_proper_names() == pn_statistics.not_proper_names()
+    with pytest.raises(ValueError):
+        cb_disambiguator.build_lemma_statistics(docs_a, workers=0)
+
+
 def test_cb_disambiguator_on_unknown_words():
     #
     #  Tests CorpusBasedMorphDisambiguator works (==does not fail) on texts
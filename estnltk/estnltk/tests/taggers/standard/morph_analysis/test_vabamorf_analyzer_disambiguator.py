@@ -283,6 +283,76 @@ def test_morph_analyzer_with_multiple_normalized_forms():
 
 
 
+# ----------------------------------
+#   Test 
+#      morphological analyser
+#      with the cache of word 
+#      analyses
+# ----------------------------------
+
+def test_morph_analyzer_with_analysis_cache():
+    text_str = 'Kass nägi kassi. Kass nägi ka koera, aga koer ei näinud kassi. Xyzabc nägi kassi.'
+    analyzer = VabamorfAnalyzer()
+    cached_analyzer = VabamorfAnalyzer(cache_size=100)
+    assert analyzer.analysis_cache is None
+    text1 = Text(text_str).tag_layer(['words', 'sentences'])
+    analyzer.tag(text1)
+    text2 = Text(text_str).tag_layer(['words', 'sentences'])
+    cached_analyzer.tag(text2)
+    # Results are the same with and without the cache
+    assert layer_to_dict(text1['morph_analysis']) == layer_to_dict(text2['morph_analysis'])
+    cache = cached_analyzer.analysis_cache
+    assert len(cache) == 12
+    assert cache.misses == 12
+    assert cache.hits == 7
+    # Analyse the same text again: all words are taken from the cache
+    text3 = Text(text_str).tag_layer(['words', 'sentences'])
+    cached_analyzer.tag(text3)
+    assert layer_to_dict(text1['morph_analysis']) == layer_to_dict(text3['morph_analysis'])
+    assert cache.misses == 12
+    assert cache.hits == 26
+    # Changing the results does not change the cache
+    text3['morph_analysis'][0].annotations[0].root_tokens.append('x')
+    text4 = Text(text_str).tag_layer(['words', 'sentences'])
+    cached_analyzer.tag(text4)
+    assert layer_to_dict(text1['morph_analysis']) == layer_to_dict(text4['morph_analysis'])
+
+
+
+# ----------------------------------
+#   Test 
+#      morphological analyser
+#      analysing multiple sentences
+#      with a single call
+# ----------------------------------
+
+def test_morph_analyzer_with_batch_sentences(monkeypatch):
+    import estnltk.taggers.standard.morph_analysis.morf as morf
+    text_str = 'Kass nägi kassi. Kass nägi ka koera, aga koer ei näinud kassi. Xyzabc nägi kassi.'
+    text1 = Text(text_str).tag_layer(['words', 'sentences'])
+    VabamorfAnalyzer().tag(text1)
+    batch_analyzer = VabamorfAnalyzer(batch_sentences=True)
+    calls = []
+    original_analyse_words = VabamorfAnalyzer._analyse_words
+    def _analyse_words(self, sentence_words, analysis_kwargs):
+        calls.append(len(sentence_words))
+        return original_analyse_words(self, sentence_words, analysis_kwargs)
+    monkeypatch.setattr(VabamorfAnalyzer, '_analyse_words', _analyse_words)
+    text2 = Text(text_str).tag_layer(['words', 'sentences'])
+    batch_analyzer.tag(text2)
+    # All sentences are analysed with one call
+    assert calls == [19]
+    assert layer_to_dict(text1['morph_analysis']) == layer_to_dict(text2['morph_analysis'])
+    # Words are split into multiple calls according to the limit
+    monkeypatch.setattr(morf, 'VM_ANALYSIS_MAX_WORDS', 8)
+    calls.clear()
+    text3 = Text(text_str).tag_layer(['words', 'sentences'])
+    batch_analyzer.tag(text3)
+    assert calls == [8, 8, 3]
+    assert layer_to_dict(text1['morph_analysis']) == layer_to_dict(text3['morph_analysis'])
+
+
+
 # ----------------------------------
 #   Test 
 #      morphological disambiguator
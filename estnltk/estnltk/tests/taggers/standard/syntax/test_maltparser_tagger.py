@@ -163,6 +163,60 @@ def test_maltparser_tagger_default_model():
 
 
 
+@pytest.mark.skipif(not check_if_conllu_is_available(),
+                    reason="package conllu is required for this test")
+def test_maltparser_tagger_persistent_process():
+    # Tests that the long-lived MaltParser process gives the same results as launching MaltParser for each text
+    conll_morph_tagger = ConllMorphTagger( no_visl=True,  morph_extended_layer='morph_analysis' )
+    texts = []
+    for raw_text in ['Autojuhi lapitekk pälvis linna koduleheküljel palju tähelepanu. Ilus suur karvane kass nurrus.',
+                     'Ilus suur karvane kass nurrus punasel diivanil.', '']:
+        text = Text(raw_text).tag_layer('morph_analysis')
+        conll_morph_tagger.tag(text)
+        texts.append(text)
+    tagger = MaltParserTagger()
+    assert not tagger.persistent
+    expected_layers = [tagger.make_layer(text) for text in texts]
+    with MaltParserTagger( persistent=True ) as persistent_tagger:
+        assert persistent_tagger.persistent
+        for text, expected_layer in zip(texts, expected_layers):
+            persistent_tagger.tag( text )
+            assert text.maltparser_syntax == expected_layer
+    # After exiting the context, the process cannot be used
+    with pytest.raises(AssertionError):
+        persistent_tagger.make_layer(texts[0])
+
+
+def test_maltparser_process_parse_conll():
+    # Tests MaltParserProcess' protocol with a stand-in for MaltParser, 
+    # which reads sentences until empty lines, and outputs the words 
+    # of a sentence in the reversed order (followed by an empty line)
+    import sys
+    import subprocess
+    from estnltk.taggers.standard.syntax.maltparser_tagger.maltparser import MaltParserProcess
+    class FakeMaltParserProcess(MaltParserProcess):
+        def initialize_java_subprocess(self):
+            script = ("import sys\n"
+                      "words = []\n"
+                      "for line in sys.stdin:\n"
+                      "    if line.strip():\n"
+                      "        words.append(line)\n"
+                      "    elif words:\n"
+                      "        sys.stdout.write(''.join(reversed(words))+'\\n')\n"
+                      "        sys.stdout.flush()\n"
+                      "        words = []\n")
+            self._process = subprocess.Popen([sys.executable, '-c', script],
+                                             stdin=subprocess.PIPE,
+                                             stdout=subprocess.PIPE,
+                                             stderr=subprocess.PIPE)
+    process = FakeMaltParserProcess('maltparser_dir', 'maltparser.jar', 'model')
+    input_string = '1\tTere\t\n2\tmaailm\t\n\n\n1\tKass\t\n\n1\tJah\t\n2\t!\t\n\n'
+    assert process.parse_conll(input_string) == \
+        ['2\tmaailm', '1\tTere', '', '1\tKass', '', '2\t!', '1\tJah', '']
+    assert process.parse_conll('\n') == []
+    process.terminate_java_subprocess()
+
+
 @pytest.mark.skipif(not check_if_conllu_is_available(),
                     reason="package conllu is required for this test")
 @pytest.mark.skipif(not check_if_vislcg_is_in_path('vislcg3'),
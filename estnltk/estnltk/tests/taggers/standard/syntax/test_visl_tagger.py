@@ -1,3 +1,7 @@
+import os
+import stat
+import sys
+
 import pytest
 
 from estnltk import Text
@@ -5,6 +9,7 @@ from estnltk.converters import dict_to_layer
 from estnltk.taggers import VislTagger
 
 from estnltk.taggers.standard.syntax.vislcg3_syntax import check_if_vislcg_is_in_path
+from estnltk.taggers.standard.syntax.vislcg3_syntax import VISLCG3Pipeline
 
 visl_dict = {
     'name': 'visl',
@@ -378,3 +383,70 @@ def test_visl_tagger():
     tagger = VislTagger()
     tagger.tag(text)
     assert dict_to_layer(visl_dict) == text.visl, text.visl.diff(dict_to_layer(visl_dict))
+
+
+# A stand-in for vislcg3: appends the name of the rule file to each cohort
+# line, and follows the FLUSH stream command (output, then flush)
+FAKE_VISLCG3 = """#!{python}
+import os, sys
+rule = os.path.basename(sys.argv[sys.argv.index('-g') + 1])
+if '-I' in sys.argv:
+    stream = open(sys.argv[sys.argv.index('-I') + 1], encoding='utf-8')
+else:
+    stream = open(sys.stdin.fileno(), encoding='utf-8')
+out = open(sys.stdout.fileno(), mode='w', encoding='utf-8')
+for line in stream:
+    line = line.rstrip('\\n')
+    if line.startswith('\\t'):
+        line += ' ' + rule
+    out.write(line + '\\n')
+    if line == '<STREAMCMD:FLUSH>':
+        out.flush()
+out.flush()
+"""
+
+
+def test_vislcg3_pipeline_persistent(tmp_path):
+    fake_vislcg3 = tmp_path / 'fake_vislcg3'
+    fake_vislcg3.write_text(FAKE_VISLCG3.format(python=sys.executable), encoding='utf-8')
+    os.chmod(str(fake_vislcg3), os.stat(str(fake_vislcg3)).st_mode | stat.S_IEXEC)
+    inputs = [['"<s>"', '"<Ilus>"', '\t"ilus" L0 A pos sg nom', '"</s>"'],
+              ['"<s>"', '"<Kass>"', '\t"kass" L0 S com sg nom', '"<õues>"', '\t"õu" L0 S com sg in', '"</s>"'],
+              []]
+    per_call_pipeline = VISLCG3Pipeline(vislcg_cmd=str(fake_vislcg3))
+    expected = [per_call_pipeline.process_lines(lines, remove_info=False) for lines in inputs]
+    assert expected[1].split('\n')[2] == '\t"kass" L0 S com sg nom clo_ub.rle morfyhe_ub.rle ' + \
+                                         'PhVerbs_ub.rle pindsyn_ub.rle strukt_ub.rle'
+    with VISLCG3Pipeline(vislcg_cmd=str(fake_vislcg3), persistent=True) as pipeline:
+        for lines, expected_result in zip(inputs * 2, expected * 2):
+            assert pipeline.process_lines(lines, remove_info=False) == expected_result
+        processes = pipeline._processes
+        assert len(processes) == 5
+    assert pipeline._processes is None
+    assert all(process.returncode == 0 for process in processes)
+    # After closing, processes are restarted upon the next call
+    assert pipeline.process_lines(inputs[0], remove_info=False) == expected[0]
+    pipeline.close()
+
+
+def test_visl_tagger_persistent_pipeline(tmp_path, monkeypatch):
+    # Tests that the persistent pipeline gives the same results as launching 
+    # vislcg3 for each document, when several documents are tagged in a row
+    fake_vislcg3 = tmp_path / 'vislcg3'
+    fake_vislcg3.write_text(FAKE_VISLCG3.format(python=sys.executable), encoding='utf-8')
+    os.chmod(str(fake_vislcg3), os.stat(str(fake_vislcg3)).st_mode | stat.S_IEXEC)
+    monkeypatch.setenv('PATH', str(tmp_path) + os.pathsep + os.environ.get('PATH', ''))
+    raw_texts = ['Ilus suur karvane kass nurrus punasel diivanil.',
+                 'Juba tahab saada pagariks! Ise alles tee esimesel poolel , vaevu kolmekümnekolmene .',
+                 'Tere!',
+                 'Autojuhi lapitekk pälvis linna koduleheküljel palju tähelepanu. Kass nurrus.']
+    texts = [Text(raw_text).tag_layer('morph_extended') for raw_text in raw_texts]
+    tagger = VislTagger()
+    assert not tagger._vislcg3_pipeline.persistent
+    expected_layers = [tagger.make_layer(text) for text in texts]
+    with VislTagger(persistent_pipeline=True) as persistent_tagger:
+        assert persistent_tagger._vislcg3_pipeline.persistent
+        for text, expected_layer in zip(texts * 2, expected_layers * 2):
+            layer = persistent_tagger.make_layer(text)
+            assert layer == expected_layer, layer.diff(expected_layer)
+    assert persistent_tagger._vislcg3_pipeline._processes is None
@@ -462,6 +462,34 @@ def test_core_timex_tagger_context_tear_down():
     assert tagger2._java_process._process.poll() is not None
 
 
+def test_core_timex_tagger_tag_texts():
+    # Tests that tagging texts in one batch gives the same results as tagging texts one by one
+    raw_texts = ['Potsataja ütles eile, et vaatavad nüüd Genaga viie aasta plaanid uuesti üle.',
+                 'Testimise tekst.',
+                 'Järgmisel nädalal tuleb 2. detsembril uus koosolek, kell 14.00.']
+    texts_a = []
+    texts_b = []
+    for raw_text in raw_texts:
+        for texts in [texts_a, texts_b]:
+            text = Text( raw_text )
+            text.meta['dct'] = '2014-11-22'
+            text.tag_layer(['words', 'sentences', 'morph_analysis'])
+            texts.append( text )
+    with CoreTimexTagger() as tagger:
+        for text in texts_a:
+            tagger.tag( text )
+        assert tagger.tag_texts( texts_b ) == texts_b
+        # Missing input layer: the same error as in tag()
+        text = Text( raw_texts[1] ).tag_layer(['words', 'sentences'])
+        with pytest.raises(ValueError) as tag_error:
+            tagger.tag( text )
+        with pytest.raises(ValueError) as tag_texts_error:
+            tagger.tag_texts( [text] )
+        assert tag_texts_error.value.args[0] == tag_error.value.args[0] == "missing input layer: 'morph_analysis'"
+    for text_a, text_b in zip(texts_a, texts_b):
+        assert text_a['timexes'] == text_b['timexes']
+
+
 #########################################################
 #    Preprocessing for TimexTagger
 #########################################################
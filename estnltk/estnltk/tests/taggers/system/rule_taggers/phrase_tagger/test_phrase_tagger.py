@@ -27,4 +27,19 @@ def test_tagger():
 
     tester = TaggerTester(tagger, input_file, target_file)
     tester.load()
-    tester.run_tests()
\ No newline at end of file
+    tester.run_tests()
+
+def test_phrase_trie():
+    from estnltk.taggers.system.rule_taggers.helper_methods.phrase_trie import PhraseTrie
+
+    trie = PhraseTrie([('a',), ('a', 'b'), ('a', 'b', 'c'), ('b', 'c'), ('x', 'c'), ('c', 'd')])
+    # ambiguous values: the second position has values 'b' and 'x'
+    value_sets = [{'a'}, {'b', 'x'}, {'c'}, {'a'}]
+    assert sorted(trie.find_all(value_sets)) == [(0, 1, ('a',)),
+                                                 (0, 2, ('a', 'b')),
+                                                 (0, 3, ('a', 'b', 'c')),
+                                                 (1, 3, ('b', 'c')),
+                                                 (1, 3, ('x', 'c')),
+                                                 (3, 4, ('a',))]
+    assert trie.find_all([]) == []
+    assert PhraseTrie().find_all(value_sets) == []
@@ -17,4 +17,45 @@ def test_tagger():
 
     tester = TaggerTester(tokenization_hints_tagger, input_file, target_file)
     tester.load()
-    tester.run_tests()
\ No newline at end of file
+    tester.run_tests()
+
+def test_tagger_with_combined_matching():
+    vocabulary_file = abs_path('tests/taggers/system/rule_taggers/regex_tagger/regex_vocabulary.csv')
+    ruleset = Ruleset()
+    ruleset.load(file_name=vocabulary_file, key_column='_regex_pattern_')
+    tokenization_hints_tagger = RegexTagger(ruleset=ruleset,
+                                            output_layer='tokenization_hints',
+                                            output_attributes=['normalized', '_priority_'],
+                                            overlapped=False,
+                                            combined_matching=True
+                                            )
+    input_file = abs_path('tests/taggers/system/rule_taggers/regex_tagger/regex_tagger_input.json')
+    target_file = abs_path('tests/taggers/system/rule_taggers/regex_tagger/regex_tagger_target.json')
+
+    tester = TaggerTester(tokenization_hints_tagger, input_file, target_file)
+    tester.load()
+    tester.run_tests()
+
+
+def test_combined_regex_matcher():
+    import regex
+    from estnltk.taggers.system.rule_taggers.helper_methods.combined_regex_matcher import CombinedRegexMatcher
+
+    patterns = [regex.compile(r'\d+'),
+                regex.compile(r'(\d+)\s*(kg|km)'),
+                regex.compile(r'[A-ZÕÄÖÜ]\w+'),
+                regex.compile(r'(?P<year>\d{4})\.?\s*a'),
+                regex.compile(r'(\w)\1'),
+                regex.compile(r'x*'),
+                regex.compile(r'''\d  # digit
+                                  \.''', regex.VERBOSE),
+                regex.compile(r'(?i)tallinn'),
+                regex.compile(r'\d+')]
+    text = 'Tallinnas oli 2019. a 12 kg lund ja 3.5 km teed, tallinn ja Tartu 1000kg.'
+    for overlapped in [False, True]:
+        for max_alternatives in [1, 2, 100]:
+            matcher = CombinedRegexMatcher(patterns, max_alternatives=max_alternatives)
+            result = matcher.finditer_all(text, overlapped=overlapped)
+            for pattern, matches in zip(patterns, result):
+                expected = [(m.span(), m.groups()) for m in pattern.finditer(text, overlapped=overlapped)]
+                assert [(m.span(), m.groups()) for m in matches] == expected
@@ -97,3 +97,46 @@ def test_span_tagger_output_attributes():
         #  ValueError: ("the annotation has unexpected or missing attributes 
         #  {'attrib_a', 'attrib_b'}!=set()", "in the 'SpanTagger'")
         span_tagger.tag(text)
+
+
+def test_span_tagger_dynamic_rules():
+    from estnltk.taggers.system.rule_taggers import AmbiguousRuleset, DynamicExtractionRule
+    text = Text('Suur ja väike.')
+    text.add_layer( \
+        dict_to_layer( \
+            {'ambiguous': True,
+             'attributes': ('normalized_form',),
+             'enveloping': None,
+             'meta': {},
+             'name': 'words',
+             'parent': None,
+             'secondary_attributes': (),
+             'serialisation_module': None,
+             'spans': [{'annotations': [{'normalized_form': None}], 'base_span': (0, 4)},
+                       {'annotations': [{'normalized_form': None}], 'base_span': (5, 7)},
+                       {'annotations': [{'normalized_form': None}], 'base_span': (8, 13)},
+                       {'annotations': [{'normalized_form': None}], 'base_span': (13, 14)}]}
+        )
+    )
+    ruleset = AmbiguousRuleset()
+    ruleset.add_rules([StaticExtractionRule(pattern='SUUR', attributes={'value': 'static'}),
+                       # a dynamic rule of a different group keeps the static rule of the same pattern
+                       DynamicExtractionRule(pattern='Suur', group=1,
+                                             decorator=lambda text, span, annotation: {'value': 'dynamic'}),
+                       # a dynamic rule without a static counterpart
+                       DynamicExtractionRule(pattern='VÄIKE',
+                                             decorator=lambda text, span, annotation: {'value': span.start})])
+    span_tagger = SpanTagger(input_layer='words',
+                             output_layer='test_spans',
+                             input_attribute='text',
+                             output_attributes=['value'],
+                             ignore_case=True,
+                             ruleset=ruleset)
+    span_tagger.tag(text)
+    assert [(span.text, list(span.value)) for span in text['test_spans']] == \
+           [('Suur', ['static', 'dynamic']), ('väike', [8])]
+    # Duplicate dynamic rules are not allowed
+    ruleset.add_rules([DynamicExtractionRule(pattern='väike', decorator=lambda text, span, annotation: {})])
+    with pytest.raises(AttributeError):
+        SpanTagger(input_layer='words', output_layer='test_spans', input_attribute='text',
+                   output_attributes=['value'], ignore_case=True, ruleset=ruleset)
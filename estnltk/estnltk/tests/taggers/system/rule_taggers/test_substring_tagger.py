@@ -5,6 +5,8 @@ from estnltk.taggers.system.rule_taggers import SubstringTagger
 
 from estnltk import Text, Layer
 
+import os
+import stat
 import pytest
 
 def layer_to_dict(layer: Layer):
@@ -220,4 +222,72 @@ def test_minimal_and_maximal_matching():
         {'start': 8, 'end': 10, 'text': 'ef'},
         {'start': 9, 'end': 10, 'text': 'f'}]
 
-    assert layer_to_dict(text.terms) == expected_outcome, "All matches does not work"
\ No newline at end of file
+    assert layer_to_dict(text.terms) == expected_outcome, "All matches does not work"
+
+
+def test_automaton_cache(tmp_path):
+    rules = Ruleset([
+        StaticExtractionRule('first', {'value': 1}),
+        StaticExtractionRule('last', {'value': 2}),
+        DynamicExtractionRule('second', lambda text, span, annotation: {'value': 3})
+    ])
+    text = Text('First seconds and lastd')
+    cache_dir = str(tmp_path / 'automata')
+    expander_calls = []
+
+    def counting_expander(pattern):
+        expander_calls.append(pattern)
+        return [pattern, pattern + 'd']
+
+    tagger = SubstringTagger(rules, output_attributes=['value'], ignore_case=True,
+                             expander=counting_expander, automaton_cache=cache_dir)
+    expected_output = layer_to_dict(tagger.make_layer(text))
+    assert expected_output == [
+        {'start': 0, 'end': 5, 'text': 'First', 'value': 1},
+        {'start': 6, 'end': 12, 'text': 'second', 'value': 3},
+        {'start': 18, 'end': 23, 'text': 'lastd', 'value': 2}]
+    assert len(expander_calls) == 2
+    assert len(list((tmp_path / 'automata').iterdir())) == 1
+
+    # The second tagger loads the automaton and the rules from the cache
+    expander_calls.clear()
+    tagger = SubstringTagger(rules, output_attributes=['value'], ignore_case=True,
+                             expander=counting_expander, automaton_cache=cache_dir)
+    assert expander_calls == []
+    assert layer_to_dict(tagger.make_layer(text)) == expected_output
+
+    # Different settings use a different cache file
+    tagger = SubstringTagger(rules, output_attributes=['value'], ignore_case=False,
+                             expander=counting_expander, automaton_cache=cache_dir)
+    assert len(list((tmp_path / 'automata').iterdir())) == 2
+    assert layer_to_dict(tagger.make_layer(text)) == [
+        {'start': 6, 'end': 12, 'text': 'second', 'value': 3},
+        {'start': 18, 'end': 23, 'text': 'lastd', 'value': 2}]
+
+
+def test_automaton_cache_key():
+    from estnltk.taggers.system.rule_taggers.taggers.substring_tagger import _automaton_cache_key
+    rules_1 = Ruleset([StaticExtractionRule('first', {'value': 1, 'tags': {'b': [1, 2], 'a': None}})])
+    rules_2 = Ruleset([StaticExtractionRule('first', {'tags': {'a': None, 'b': [1, 2]}, 'value': 1})])
+    rules_3 = Ruleset([StaticExtractionRule('first', {'value': 1, 'tags': {'b': (1, 2), 'a': None}})])
+    # The key depends on the content of the rules, not on the order of dict items
+    assert _automaton_cache_key(rules_1, True, None) == _automaton_cache_key(rules_2, True, None)
+    assert _automaton_cache_key(rules_1, True, None) != _automaton_cache_key(rules_3, True, None)
+    assert _automaton_cache_key(rules_1, True, None) != _automaton_cache_key(rules_1, False, None)
+    # Rules with arbitrary objects as attribute values are not cached
+    rules_4 = Ruleset([StaticExtractionRule('first', {'value': object()})])
+    assert _automaton_cache_key(rules_4, True, None) is None
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="file permissions are only checked on POSIX systems")
+def test_automaton_cache_in_shared_directory(tmp_path):
+    rules = Ruleset([StaticExtractionRule('first', {'value': 1})])
+    cache_dir = tmp_path / 'automata'
+    SubstringTagger(rules, output_attributes=['value'], automaton_cache=str(cache_dir))
+    assert len(list(cache_dir.iterdir())) == 1
+    assert stat.S_IMODE(cache_dir.stat().st_mode) == 0o700
+    # Cache files in a directory that is writable by others are not loaded
+    cache_dir.chmod(0o777)
+    with pytest.warns(UserWarning, match='Ignoring automaton cache file'):
+        tagger = SubstringTagger(rules, output_attributes=['value'], automaton_cache=str(cache_dir))
+    assert layer_to_dict(tagger.make_layer(Text('first'))) == [{'start': 0, 'end': 5, 'text': 'first', 'value': 1}]
@@ -36,3 +36,108 @@ def test_getitem_word_and_pos():
                     reason="Wordnet's resources have not been downloaded. Use estnltk.download('wordnet') to get the missing resources.")
 def test_getitem_word_and_int():
     assert wn['king', 1] == Synset(wn, [9954, 'king', 'estwn-et-9954-n', 'n', 1, 'king'])
+
+
+def _create_wordnet_db(wn_dir):
+    # Creates a tiny wordnet database with the same schema as the real one
+    import sqlite3
+    wn_dir.mkdir()
+    entries = [(1, 'olend', 'estwn-et-1-n', 'n', 1, 'olend', 1),
+               (2, 'loom', 'estwn-et-2-n', 'n', 1, 'loom', 1),
+               (2, 'loom', 'estwn-et-2-n', 'n', 1, 'elajas', 0),
+               (3, 'koer', 'estwn-et-3-n', 'n', 1, 'koer', 1),
+               (4, 'koer', 'estwn-et-4-n', 'n', 2, 'koer', 1),
+               (5, 'haukuma', 'estwn-et-5-v', 'v', 1, 'haukuma', 1),
+               (6, 'kass', 'estwn-et-6-n', 'n', 1, 'kass', 1)]
+    # (start_vertex, end_vertex, relation): start_vertex is a relation of end_vertex
+    relations = [(1, 2, 'hypernym'), (2, 1, 'hyponym'), (2, 3, 'hypernym'), (3, 2, 'hyponym'),
+                 (2, 6, 'hypernym'), (6, 2, 'hyponym'), (5, 3, 'involved'), (2, 3, 'holonym')]
+    with sqlite3.connect(str(wn_dir / 'wordnet_entry.db')) as conn:
+        conn.execute('CREATE TABLE wordnet_entry (id INT, synset_name TEXT, estwn_id TEXT, pos TEXT, '
+                     'sense INT, literal TEXT, is_name INT)')
+        conn.executemany('INSERT INTO wordnet_entry VALUES (?,?,?,?,?,?,?)', entries)
+    with sqlite3.connect(str(wn_dir / 'wordnet_relation.db')) as conn:
+        conn.execute('CREATE TABLE wordnet_relation (start_vertex INT, end_vertex INT, relation TEXT)')
+        conn.executemany('INSERT INTO wordnet_relation VALUES (?,?,?)', relations)
+    with sqlite3.connect(str(wn_dir / 'wordnet_example.db')) as conn:
+        conn.execute('CREATE TABLE wordnet_example (synset_name TEXT, example TEXT)')
+        conn.executemany('INSERT INTO wordnet_example VALUES (?,?)', [('koer', 'Koer haugub.'),
+                                                                      ('koer', 'Suur koer.')])
+    with sqlite3.connect(str(wn_dir / 'wordnet_definition.db')) as conn:
+        conn.execute('CREATE TABLE wordnet_definition (synset_name TEXT, definition TEXT)')
+        conn.executemany('INSERT INTO wordnet_definition VALUES (?,?)', [('loom', 'elusolend')])
+
+
+def test_in_memory_wordnet(tmp_path):
+    wn_dir = tmp_path / 'estwn-et-0.0.1'
+    _create_wordnet_db(wn_dir)
+    sqlite_wn = Wordnet(local_dir=str(wn_dir))
+    memory_wn = Wordnet(local_dir=str(wn_dir), in_memory=True)
+    assert memory_wn.conn is None
+
+    def describe(synsets):
+        return [(s.id, s.name, s.estwn_id, s.pos, s.sense, s.literal) for s in synsets]
+
+    for wn in [sqlite_wn, memory_wn]:
+        assert describe(wn['koer']) == [(3, 'koer.n.01', 'estwn-et-3-n', 'n', 1, 'koer'),
+                                        (4, 'koer.n.02', 'estwn-et-4-n', 'n', 2, 'koer')]
+        assert describe(wn['elajas', 'n']) == [(2, 'loom.n.01', 'estwn-et-2-n', 'n', 1, 'loom')]
+        assert wn['elajas', 'v'] == []
+        assert wn['koer', 2].name == 'koer.n.02'
+        assert wn['koer', 3] == []
+        assert wn['puudub'] == []
+        assert [s.name for s in wn.synsets_with_pos('n')] == ['olend.n.01', 'loom.n.01', 'koer.n.01',
+                                                              'koer.n.02', 'kass.n.01']
+        assert wn.get_synset_by_name('kass.n.01').id == 6
+        koer = wn['koer'][0]
+        assert [s.name for s in koer.hypernyms] == ['loom.n.01']
+        assert [(s.name, r) for s, r in koer.get_related_synset()] == [('loom.n.01', 'hypernym'),
+                                                                       ('loom.n.01', 'holonym'),
+                                                                       ('haukuma.v.01', 'involved')]
+        assert [s.name for s in wn['loom'][0].hyponyms] == ['koer.n.01', 'kass.n.01']
+        assert koer.root_hypernyms().name == 'olend.n.01'
+        assert koer.examples == ['Koer haugub.', 'Suur koer.']
+        assert koer.definition is None
+        assert wn['loom'][0].definition == 'elusolend'
+        assert wn['loom'][0].lemmas == ['loom', 'elajas']
+        assert wn._min_depth(koer) == 2
+        assert wn.path_similarity(koer, wn['kass'][0]) == 1 / 3
+        assert wn.wup_similarity(koer, wn['kass'][0]) == 0.5
+        assert sorted(wn.all_relation_types()) == ['holonym', 'hypernym', 'hyponym', 'involved']
+        assert len(list(wn)) == 5
+
+
+def test_shared_wordnet(tmp_path):
+    from estnltk.wordnet import shared_wordnet
+    wn_dir = tmp_path / 'estwn-et-0.0.1'
+    _create_wordnet_db(wn_dir)
+    wn = shared_wordnet(local_dir=str(wn_dir))
+    assert wn.in_memory
+    assert shared_wordnet(local_dir=str(wn_dir)) is wn
+
+
+def test_pairwise_similarity(tmp_path):
+    import math
+    wn_dir = tmp_path / 'estwn-et-0.0.1'
+    _create_wordnet_db(wn_dir)
+    for wn in [Wordnet(local_dir=str(wn_dir)), Wordnet(local_dir=str(wn_dir), in_memory=True)]:
+        synsets = list(wn.iloc.values())
+        koer, kass = wn['koer'][0], wn['kass'][0]
+        assert [s.name for s in wn.lowest_common_hypernyms(koer, kass)] == ['loom.n.01']
+        assert wn.lowest_common_hypernyms(koer, wn['koer'][1]) is None
+        assert [wn._min_depth(s) for s in synsets] == [0, 1, 2, 0, 0, 2]
+        for metric, similarity in [('path', wn.path_similarity),
+                                   ('lch', wn.lch_similarity),
+                                   ('wup', wn.wup_similarity)]:
+            matrix = wn.pairwise_similarity(synsets, metric=metric)
+            assert matrix.shape == (len(synsets), len(synsets))
+            for i, start_synset in enumerate(synsets):
+                for j, target_synset in enumerate(synsets):
+                    expected = similarity(start_synset, target_synset)
+                    if expected is None:
+                        assert math.isnan(matrix[i, j])
+                    else:
+                        assert matrix[i, j] == expected
+        assert wn.pairwise_similarity([koer], [kass, koer], metric='wup').tolist() == [[0.5, 0.5]]
+        with pytest.raises(ValueError):
+            wn.pairwise_similarity(synsets, metric='unknown')
@@ -108,6 +108,7 @@ class Text( BaseText ):
     methods = {
         '_repr_html_',
         'add_layer',
+        'add_serialised_layer',
         'analyse',
         'layer_attributes',
         'pop_layer',
@@ -149,7 +150,9 @@ class Text( BaseText ):
     Note 2: if you want to use Python's multiprocessing, you 
     should make a separate LayerResolver for each process/job, 
     otherwise you'll likely run into errors. tag_layer method 
-    can take resolver as a parameter.
+    can take resolver as a parameter. Alternatively, use function 
+    tag_layers_parallel from estnltk.default_resolver, which 
+    creates a separate resolver for each worker process.
     """
 
     def tag_layer(self, layer_names: Union[str, Sequence[str]]=None, resolver=None) -> 'Text':
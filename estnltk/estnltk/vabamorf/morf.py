@@ -31,6 +31,7 @@ from . import vabamorf as vm
 import os
 import re
 import operator
+from collections import OrderedDict
 from functools import reduce
 
 # path listings
@@ -104,6 +105,75 @@ def get_vm_lexicon_files( vm_lexicon_dir, dict_path=DICT_ROOT_PATH ):
     return (et_file, et3_file)
 
 
+# =============================================================================
+#   Cache of word analyses
+# =============================================================================
+
+class AnalysisCache(object):
+    """Bounded LRU cache of (postprocessed) morphological analyses of word forms.
+
+    Morphological analysis without disambiguation is context-free: analyses 
+    of a word form do not depend on the surrounding words. So, analyses of 
+    frequent word forms can be cached and reused, which allows to skip the 
+    (relatively costly) call to Vabamorf and the postprocessing of results. 
+    Cache keys consist of the word form and the analysis parameters (guess, 
+    propername, compound, phonetic, stem). 
+    
+    The cache can be passed to Vabamorf.analyze(). 
+    Note: a cache should only be used with one Vabamorf instance (lexicon). 
+
+    Attributes
+    ----------
+    maxsize: int
+        Maximum number of word forms stored in the cache.
+    hits: int
+        Number of word analyses found from the cache.
+    misses: int
+        Number of word analyses missing from the cache.
+    """
+
+    def __init__(self, maxsize=100000):
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError('(!) maxsize should be a positive integer, not {!r}'.format(maxsize))
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._analyses = OrderedDict()
+
+    def get(self, key):
+        """Returns a copy of cached analyses of the given (word, parameters) key, or None."""
+        analyses = self._analyses.get(key)
+        if analyses is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._analyses.move_to_end(key)
+        # Copy dictionaries: callers are allowed to modify the results
+        return [dict(analysis, root_tokens=list(analysis['root_tokens'])) for analysis in analyses]
+
+    def put(self, key, analyses):
+        """Stores a copy of analyses of the given (word, parameters) key."""
+        self._analyses[key] = \
+            [dict(analysis, root_tokens=list(analysis['root_tokens'])) for analysis in analyses]
+        self._analyses.move_to_end(key)
+        if len(self._analyses) > self.maxsize:
+            self._analyses.popitem(last=False)
+
+    def clear(self):
+        """Removes all analyses from the cache and resets the counters."""
+        self._analyses.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._analyses)
+
+    def __repr__(self):
+        return '{}(maxsize={}, size={}, hits={}, misses={})'.format(self.__class__.__name__, 
+                                                                    self.maxsize, len(self), 
+                                                                    self.hits, self.misses)
+
+
 # =============================================================================
 #   Vabamorf class
 # =============================================================================
@@ -167,7 +237,8 @@ class Vabamorf(object):
         self._morf = vm.Vabamorf(convert(lex_path), convert(disamb_lex_path))
 
     def analyze(self, words, disambiguate: bool=True, guess: bool=True, propername: bool=True,
-                      compound: bool=True, phonetic: bool=False, stem: bool=False, **kwargs):
+                      compound: bool=True, phonetic: bool=False, stem: bool=False, 
+                      cache: AnalysisCache=None, **kwargs):
         """Perform morphological analysis and disambiguation of given text.
 
         Parameters
@@ -195,6 +266,12 @@ class Vabamorf(object):
             gets root='läk' (with ending='s' and no lemma). 
             Note that with stem-based analysis, there will be no 
             lemmas in the output.
+        cache: AnalysisCache (default: None)
+            Cache of word analyses. If provided and disambiguate=False,
+            then analyses of words are looked up from the cache, and 
+            only words missing from the cache are analysed with Vabamorf.
+            (Disambiguation depends on the context, so the cache is not 
+            used if disambiguate=True.)
 
         Returns
         -------
@@ -205,6 +282,10 @@ class Vabamorf(object):
         if isinstance(words, str):
             words = words.split()
 
+        if cache is not None and not disambiguate:
+            return self._analyze_with_cache(words, cache, guess=guess, propername=propername, 
+                                            compound=compound, phonetic=phonetic, stem=stem)
+
         # convert words to native strings
         words = [convert(w) for w in words]
 
@@ -231,6 +312,36 @@ class Vabamorf(object):
         return [postprocess_result(mr, preserve_phonetic, preserve_compound, \
                                        remove_lemma=remove_lemma) for mr in morfresults]
 
+    def _analyze_with_cache(self, words, cache, guess, propername, compound, phonetic, stem):
+        """Analyses words without disambiguation, using the cache of word analyses."""
+        params = (guess, propername, compound, phonetic, stem)
+        results = [None] * len(words)
+        missing_words = OrderedDict()  # word -> indexes of the word in the input
+        for i, word in enumerate(words):
+            if word in missing_words:
+                # Repeated word: will be copied from the first analysis
+                missing_words[word].append(i)
+                cache.hits += 1
+                continue
+            analyses = cache.get((word,) + params)
+            if analyses is None:
+                missing_words[word] = [i]
+            else:
+                results[i] = {'text': word, 'analysis': analyses}
+        if missing_words:
+            # Analyse all missing (distinct) words with a single call
+            analysed = self.analyze(list(missing_words.keys()), disambiguate=False, guess=guess, 
+                                    propername=propername, compound=compound, phonetic=phonetic, 
+                                    stem=stem)
+            for (word, indexes), result in zip(missing_words.items(), analysed):
+                cache.put((word,) + params, result['analysis'])
+                results[indexes[0]] = result
+                for i in indexes[1:]:
+                    results[i] = {'text': result['text'], 
+                                  'analysis': [dict(analysis, root_tokens=list(analysis['root_tokens'])) 
+                                               for analysis in result['analysis']]}
+        return results
+
     def disambiguate(self, words, compound: bool=True, phonetic: bool=False, stem: bool=False, 
                            **kwargs):
         """Disambiguate previously analyzed words.
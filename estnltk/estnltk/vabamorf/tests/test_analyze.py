@@ -258,6 +258,45 @@ class DisambiguationTest(unittest.TestCase):
             self.assertLessEqual(yes, no)
 
 
+class AnalysisCacheTest(unittest.TestCase):
+
+    def test_analysis_with_cache(self):
+        from estnltk.vabamorf.morf import Vabamorf, AnalysisCache
+        words = SAMPLE_TEXT.split()
+        cache = AnalysisCache(maxsize=1000)
+        expected = Vabamorf.instance().analyze(words, disambiguate=False)
+        result = Vabamorf.instance().analyze(words, disambiguate=False, cache=cache)
+        self.assertListEqual(expected, result)
+        self.assertEqual(len(cache), len(set(words)))
+        self.assertEqual(cache.misses, len(set(words)))
+        self.assertEqual(cache.hits, len(words) - len(set(words)))
+        result = Vabamorf.instance().analyze(words, disambiguate=False, cache=cache)
+        self.assertListEqual(expected, result)
+        self.assertEqual(cache.hits, 2 * len(words) - len(set(words)))
+        # analysis parameters are part of the cache key
+        expected = Vabamorf.instance().analyze(words, disambiguate=False, guess=False, phonetic=True)
+        result = Vabamorf.instance().analyze(words, disambiguate=False, guess=False, phonetic=True, cache=cache)
+        self.assertListEqual(expected, result)
+        self.assertEqual(len(cache), 2 * len(set(words)))
+        # cache is not used in disambiguation
+        Vabamorf.instance().analyze(words, disambiguate=True, cache=cache)
+        self.assertEqual(cache.hits + cache.misses, 3 * len(words))
+
+    def test_cache_size_limit(self):
+        from estnltk.vabamorf.morf import Vabamorf, AnalysisCache
+        cache = AnalysisCache(maxsize=2)
+        Vabamorf.instance().analyze(['kass', 'koer', 'kass', 'hiir'], disambiguate=False, cache=cache)
+        self.assertEqual(len(cache), 2)
+        Vabamorf.instance().analyze(['kass'], disambiguate=False, cache=cache)
+        self.assertEqual(cache.misses, 4)
+        Vabamorf.instance().analyze(['hiir'], disambiguate=False, cache=cache)
+        self.assertEqual(cache.hits, 2)
+        cache.clear()
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+        with self.assertRaises(ValueError):
+            AnalysisCache(maxsize=0)
+
+
 class NameGroupingTest(unittest.TestCase):
     """vabamorf used to concatenate cases like "New York" etc as
     a single token in previous versions, which was a unexpected feature.
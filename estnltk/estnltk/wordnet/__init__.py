@@ -1,2 +1,3 @@
 from estnltk.wordnet.wordnet import Wordnet
+from estnltk.wordnet.wordnet import shared_wordnet
 from estnltk.wordnet.synset import Synset
@@ -24,9 +24,8 @@ class Synset:
         if isinstance(synset_info, int):
             self.wordnet = wordnet
             self.id = synset_info
-            self.wordnet.cur.execute \
-                ("SELECT estwn_id, pos, sense, synset_name, literal FROM wordnet_entry WHERE id = ? AND is_name = 1", (synset_info,))
-            self.estwn_id, self.pos, self.sense, self.synset_name, self.literal = self.wordnet.cur.fetchone()
+            _, self.synset_name, self.estwn_id, self.pos, self.sense, self.literal = \
+                self.wordnet._synset_entry(synset_info)
             self.name = '{}.{}.{}'.format(self.literal, self.pos, "%02d"%self.sense)
         elif len(synset_info) == 6:
             self.wordnet = wordnet
@@ -53,24 +52,17 @@ class Synset:
 
         if self.wordnet is None:
             return []
-        if self.wordnet._relation_graph is None:
-            self.wordnet.relation_graph
 
-        graph = self.wordnet.relation_graph
-
-        if not graph.has_node(self.id):
-            return []
-
-        relations = graph.in_edges(self.id, data=True)
+        relations = self.wordnet._incoming_synset_relations(self.id)
         related_synsets = []
 
         if relation is None:
             for r in relations:
                 ss = self.wordnet.iloc[r[0]]
-                related_synsets.append((ss, r[2]['relation']))
+                related_synsets.append((ss, r[1]))
             return related_synsets
         if relation:
-            with_relation = [r[0] for r in relations if r[2]['relation'] == relation]
+            with_relation = [r[0] for r in relations if r[1] == relation]
             for r in with_relation:
                 ss = self.wordnet.iloc[r]
                 related_synsets.append(ss)
@@ -231,12 +223,7 @@ class Synset:
         Definition of the synset as a new-line separated concatenated string from all its variants' definitions.
 
         """
-        self.wordnet.cur.execute("SELECT definition FROM wordnet_definition WHERE synset_name = ?", (self.synset_name,))
-        result = self.wordnet.cur.fetchone()
-        if result is not None:
-            return result[0]
-        else:
-            return None
+        return self.wordnet._synset_definition(self.synset_name)
 
     @property
     def examples(self) -> list:
@@ -248,8 +235,7 @@ class Synset:
         List of its variants' examples.
 
         """
-        self.wordnet.cur.execute("SELECT example FROM wordnet_example WHERE synset_name = ?", (self.synset_name,))
-        return [row[0] for row in self.wordnet.cur.fetchall()]
+        return self.wordnet._synset_examples(self.synset_name)
 
     @property
     def lemmas(self) -> list:
@@ -261,8 +247,7 @@ class Synset:
         List of its variations' literals as Lemma objects.
 
         """
-        self.wordnet.cur.execute('''SELECT literal FROM wordnet_entry WHERE id = {} ''' .format(self.id))
-        return [row[0] for row in self.wordnet.cur.fetchall()]
+        return self.wordnet._synset_lemmas(self.id)
 
     def __str__(self):
         return "Synset('{}')".format(self.name)
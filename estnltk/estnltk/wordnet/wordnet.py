@@ -6,6 +6,7 @@ import warnings
 from typing import Union, List
 
 import networkx as nx
+import numpy as np
 
 from estnltk import get_resource_paths
 from estnltk.wordnet.synset import Synset
@@ -14,6 +15,10 @@ from estnltk.wordnet.synset import Synset
 MAX_TAXONOMY_DEPTHS = {'a': 2, 'n': 13, 'r': 0, 'v': 10}
 
 
+# In-memory Wordnets shared by all callers of shared_wordnet
+_SHARED_WORDNETS = dict()
+
+
 class WordnetException(Exception):
     pass
 
@@ -37,7 +42,8 @@ class Wordnet:
     Imports wordnet data from sqlite database. 
     '''
 
-    def __init__(self, version: str=None, local_dir: str=None, load_graph: bool = False) -> None:
+    def __init__(self, version: str=None, local_dir: str=None, load_graph: bool = False,
+                 in_memory: bool = False) -> None:
         '''
         Initializes Estonian Wordnet.
         
@@ -63,12 +69,33 @@ class Wordnet:
             Building graphs takes time, and so lazy initialization is used: normally, 
             graphs will be built on demand. 
             Default: False
+        in_memory: bool
+            If True, then entries, relations, definitions and examples are loaded from the 
+            database into in-memory indexes upon initialization, and the database connection 
+            is closed. Afterwards, all lookups are dictionary lookups. The loaded Wordnet is 
+            only read, so it can be created before forking worker processes and shared by 
+            the workers. See also the function shared_wordnet. 
+            Default: False
         '''
         self.conn = None
         self.cur = None
         self._synsets_dict = dict()
         self._relation_graph = None
         self._hyponym_graph = None
+        # Hypernymy tables used in similarity calculations (built on demand)
+        self._hypernym_parents = None   # synset id -> list of hypernym ids
+        self._hypernym_depths = None    # synset id -> minimum depth from a root
+        self._hypernym_ancestors = None # synset id -> frozenset of transitive hypernym ids
+        self.in_memory = in_memory
+        # In-memory indexes (only used if in_memory=True)
+        self._entries = None            # synset id -> (id, synset_name, estwn_id, pos, sense, literal)
+        self._literal_index = None      # literal -> list of (synset id, pos)
+        self._pos_index = None          # pos -> list of synset ids
+        self._synset_literals = None    # synset id -> list of literals
+        self._incoming_relations = None # end vertex -> list of (start vertex, relation)
+        self._relation_rows = None      # list of (start vertex, end vertex, relation)
+        self._definitions = None        # synset name -> definition
+        self._examples = None           # synset name -> list of examples
 
         wn_dir = None
         if isinstance(version, str):
@@ -131,12 +158,133 @@ class Wordnet:
         except Exception as e:
             raise WordnetException("Unexpected error: {}: {}".format(type(e), e))
 
+        if in_memory:
+            try:
+                self._load_indexes()
+            except sqlite3.OperationalError as e:
+                raise WordnetException("Invalid wordnet file: sqlite error: {}".format(e))
+            finally:
+                self.conn.close()
+                self.conn = None
+                self.cur = None
+
         self.iloc
 
         if load_graph:
             self.relation_graph
             self.hyponym_graph
 
+    def _load_indexes(self) -> None:
+        """
+        Loads entries, relations, definitions and examples from the database into in-memory indexes.
+        Notes
+        -----
+          Internal method. Do not call directly.
+        """
+        entries = dict()
+        literal_index = dict()
+        pos_index = dict()
+        synset_literals = dict()
+        self.cur.execute("SELECT id, synset_name, estwn_id, pos, sense, literal, is_name FROM wordnet_entry")
+        for row in self.cur.fetchall():
+            synset_id, pos, literal = row[0], row[3], row[5]
+            literal_index.setdefault(literal, []).append((synset_id, pos))
+            synset_literals.setdefault(synset_id, []).append(literal)
+            if row[6] == 1:
+                entries[synset_id] = row[:6]
+                pos_index.setdefault(pos, []).append(synset_id)
+
+        # Incoming relations are grouped by start vertices in the same way as
+        # MultiDiGraph.in_edges groups them (i.e. in order of the first occurrence)
+        grouped_relations = dict()
+        self.cur.execute("SELECT start_vertex, end_vertex, relation FROM wordnet_relation")
+        relation_rows = self.cur.fetchall()
+        for start_vertex, end_vertex, relation in relation_rows:
+            grouped_relations.setdefault(end_vertex, dict()).setdefault(start_vertex, []).append(relation)
+        incoming_relations = dict()
+        for end_vertex, start_vertices in grouped_relations.items():
+            incoming_relations[end_vertex] = [(start_vertex, relation)
+                                              for start_vertex, relations in start_vertices.items()
+                                              for relation in relations]
+
+        definitions = dict()
+        self.cur.execute("SELECT synset_name, definition FROM wordnet_definition")
+        for synset_name, definition in self.cur.fetchall():
+            definitions.setdefault(synset_name, definition)
+
+        examples = dict()
+        self.cur.execute("SELECT synset_name, example FROM wordnet_example")
+        for synset_name, example in self.cur.fetchall():
+            examples.setdefault(synset_name, []).append(example)
+
+        self._entries = entries
+        self._literal_index = literal_index
+        self._pos_index = pos_index
+        self._synset_literals = synset_literals
+        self._incoming_relations = incoming_relations
+        self._relation_rows = relation_rows
+        self._definitions = definitions
+        self._examples = examples
+
+    def _synset_entry(self, synset_id: int) -> tuple:
+        """
+        Returns the entry (id, synset_name, estwn_id, pos, sense, literal) of the synset.
+        Notes
+        -----
+          Internal method. Do not call directly.
+        """
+        if self.in_memory:
+            entry = self._entries.get(synset_id)
+        else:
+            self.cur.execute(
+                "SELECT id, synset_name, estwn_id, pos, sense, literal FROM wordnet_entry WHERE id = ? AND is_name = 1",
+                (synset_id,))
+            entry = self.cur.fetchone()
+        if entry is None:
+            raise WordnetException("Unknown synset id: {!r}".format(synset_id))
+        return entry
+
+    def _incoming_synset_relations(self, synset_id: int) -> List[tuple]:
+        """
+        Returns (start vertex, relation) pairs of all relations ending at the synset.
+        Notes
+        -----
+          Internal method. Do not call directly.
+        """
+        if self.in_memory:
+            return self._incoming_relations.get(synset_id, [])
+        if self._relation_graph is None:
+            self.relation_graph
+        graph = self._relation_graph
+        if not graph.has_node(synset_id):
+            return []
+        return [(r[0], r[2]['relation']) for r in graph.in_edges(synset_id, data=True)]
+
+    def _synset_definition(self, synset_name: str) -> Union[str, None]:
+        if self.in_memory:
+            return self._definitions.get(synset_name)
+        self.cur.execute("SELECT definition FROM wordnet_definition WHERE synset_name = ?", (synset_name,))
+        result = self.cur.fetchone()
+        return result[0] if result is not None else None
+
+    def _synset_examples(self, synset_name: str) -> List[str]:
+        if self.in_memory:
+            return list(self._examples.get(synset_name, []))
+        self.cur.execute("SELECT example FROM wordnet_example WHERE synset_name = ?", (synset_name,))
+        return [row[0] for row in self.cur.fetchall()]
+
+    def _synset_lemmas(self, synset_id: int) -> List[str]:
+        if self.in_memory:
+            return list(self._synset_literals.get(synset_id, []))
+        self.cur.execute("SELECT literal FROM wordnet_entry WHERE id = ?", (synset_id,))
+        return [row[0] for row in self.cur.fetchall()]
+
+    def _relations(self) -> List[tuple]:
+        if self.in_memory:
+            return self._relation_rows
+        self.cur.execute("SELECT start_vertex, end_vertex, relation FROM wordnet_relation")
+        return self.cur.fetchall()
+
     def __iter__(self):
         return WordnetIterator(self)
 
@@ -151,9 +299,12 @@ class Wordnet:
         Dictionary of all synsets if it has been created beforehand, None otherwise.
         """
         if len(self._synsets_dict) == 0:
-            self.cur.execute(
-                "SELECT id, synset_name, estwn_id, pos, sense, literal FROM wordnet_entry WHERE is_name = 1")
-            synset_entries = self.cur.fetchall()
+            if self.in_memory:
+                synset_entries = self._entries.values()
+            else:
+                self.cur.execute(
+                    "SELECT id, synset_name, estwn_id, pos, sense, literal FROM wordnet_entry WHERE is_name = 1")
+                synset_entries = self.cur.fetchall()
             for row in synset_entries:
                 self._synsets_dict[row[0]] = Synset(self, row)
         else:
@@ -170,8 +321,7 @@ class Wordnet:
         Networkx graph if it has been created beforehand, None otherwise.
         """
         if self._relation_graph is None:
-            self.cur.execute("SELECT start_vertex, end_vertex, relation FROM wordnet_relation")
-            wn_relations = self.cur.fetchall()
+            wn_relations = self._relations()
             self._relation_graph = nx.MultiDiGraph()
             for i, r in enumerate(wn_relations):
                 self._relation_graph.add_edge(r[0], r[1], relation=r[2])
@@ -190,8 +340,7 @@ class Wordnet:
         Networkx graph if it has been created beforehand, None otherwise.
         """
         if self._hyponym_graph is None:
-            self.cur.execute("SELECT start_vertex, end_vertex, relation FROM wordnet_relation")
-            wn_relations = self.cur.fetchall()
+            wn_relations = self._relations()
             self._hyponym_graph = nx.Graph()
             for i, r in enumerate(wn_relations):
                 if r[2] == 'hyponym' or r[2] == 'hypernym':
@@ -219,6 +368,8 @@ class Wordnet:
         List of synsets which contain lemma and pos if provided if key is string or second element of key is pos.
         None, if no match was found.
         """
+        if self.in_memory:
+            return self._getitem_in_memory(key)
         if isinstance(key, tuple) and len(key) == 2:
             if isinstance(key[1], int):
                 synset_name, id = key
@@ -236,6 +387,18 @@ class Wordnet:
             return [Synset(self, entry[0]) for entry in synsets]
         return
 
+    def _getitem_in_memory(self, key: Union[tuple, str]) -> Union[Synset, list]:
+        """Implementation of __getitem__ based on in-memory indexes."""
+        if isinstance(key, tuple) and len(key) == 2:
+            lemma, pos_or_index = key
+            entries = self._literal_index.get(lemma, [])
+            if isinstance(pos_or_index, int):
+                if pos_or_index <= len(entries) and pos_or_index - 1 >= 0:
+                    return Synset(self, entries[pos_or_index - 1][0])
+                return []
+            return [Synset(self, synset_id) for synset_id, pos in entries if pos == pos_or_index]
+        return [Synset(self, synset_id) for synset_id, _ in self._literal_index.get(key, [])]
+
     def synsets_with_pos(self, pos: str):
         """Return all the synsets which have the provided pos.
 
@@ -253,10 +416,13 @@ class Wordnet:
         ------
         Synset objects with specified part-of-speech tag.
         """
-        self.cur.execute(
-            "SELECT id, synset_name, estwn_id, pos, sense, literal FROM wordnet_entry WHERE pos = ? AND is_name = 1",
-            (pos,))
-        synset_entries = self.cur.fetchall()
+        if self.in_memory:
+            synset_entries = [self._entries[synset_id] for synset_id in self._pos_index.get(pos, [])]
+        else:
+            self.cur.execute(
+                "SELECT id, synset_name, estwn_id, pos, sense, literal FROM wordnet_entry WHERE pos = ? AND is_name = 1",
+                (pos,))
+            synset_entries = self.cur.fetchall()
 
         for row in synset_entries:
             yield Synset(self, row)
@@ -286,6 +452,84 @@ class Wordnet:
                     return synset
         return None
 
+    def _build_hypernym_tables(self) -> None:
+        """
+        Builds tables of hypernyms and minimum depths of synsets. Depths of all synsets are 
+        computed at once with a breadth-first search starting from the roots of the hypernymy 
+        hierarchy. Transitive hypernyms (ancestors) are computed on demand and cached in 
+        self._hypernym_ancestors.
+        Notes
+        -----
+          Internal method. Do not call directly.
+        """
+        parents = dict()
+        children = dict()
+        for start_vertex, end_vertex, relation in self._relations():
+            if relation == 'hypernym':
+                # start_vertex is a hypernym of end_vertex
+                parents.setdefault(end_vertex, []).append(start_vertex)
+                children.setdefault(start_vertex, []).append(end_vertex)
+        depths = {synset_id: 0 for synset_id in children if synset_id not in parents}
+        level = list(depths)
+        depth = 0
+        while level:
+            depth += 1
+            next_level = []
+            for synset_id in level:
+                for child in children.get(synset_id, []):
+                    if child not in depths:
+                        depths[child] = depth
+                        next_level.append(child)
+            level = next_level
+        self._hypernym_parents = parents
+        self._hypernym_depths = depths
+        self._hypernym_ancestors = dict()
+
+    def _hypernym_depth(self, synset_id: int) -> Union[int, None]:
+        """
+        Returns the minimum depth of the synset from a root of the hypernymy hierarchy, 
+        or None if the synset cannot be reached from a root (i.e. it is on a cycle).
+        Notes
+        -----
+          Internal method. Do not call directly.
+        """
+        if self._hypernym_depths is None:
+            self._build_hypernym_tables()
+        depth = self._hypernym_depths.get(synset_id)
+        if depth is None and synset_id not in self._hypernym_parents:
+            # synset without hypernyms and hyponyms
+            return 0
+        return depth
+
+    def _hypernym_ancestor_ids(self, synset_id: int) -> frozenset:
+        """
+        Returns ids of all the hypernyms of the synset (transitively). 
+        Notes
+        -----
+          Internal method. Do not call directly.
+        """
+        if self._hypernym_ancestors is None:
+            self._build_hypernym_tables()
+        ancestors = self._hypernym_ancestors.get(synset_id)
+        if ancestors is None:
+            parents = self._hypernym_parents
+            computed = self._hypernym_ancestors
+            result = set()
+            stack = list(parents.get(synset_id, []))
+            while stack:
+                parent = stack.pop()
+                if parent in result:
+                    continue
+                result.add(parent)
+                parent_ancestors = computed.get(parent)
+                if parent_ancestors is not None:
+                    result |= parent_ancestors
+                else:
+                    stack.extend(parents.get(parent, []))
+            ancestors = frozenset(result)
+            computed[synset_id] = ancestors
+        return ancestors
+
     def _min_depth(self, synset) -> int:
         """Finds minimum path length from the root.
         Notes
@@ -298,19 +542,10 @@ class Wordnet:
         Minimum path length from the root.
         """
 
-        if self._relation_graph is None:
-            self.relation_graph
-
         if type(synset) is not int:
             synset = synset.id
 
-        min_depth = 0
-        relations = self.relation_graph.in_edges(synset, data=True)
-        hypernyms = [r[0] for r in relations if r[2]['relation'] == 'hypernym']
-        if hypernyms:
-            min_depth = 1 + min(self._min_depth(h) for h in hypernyms)
-
-        return min_depth
+        return self._hypernym_depth(synset)
 
     def _recursive_hypernyms(self, synset, hypernyms):
         """Finds all the hypernyms of the synset transitively.
@@ -327,12 +562,24 @@ class Wordnet:
         Returns the input set.
         """
 
-        hypernyms |= set(synset.hypernyms)
-
-        for s in synset.hypernyms:
-            hypernyms |= self._recursive_hypernyms(s, hypernyms)
+        hypernyms |= set(self.iloc[i] for i in self._hypernym_ancestor_ids(synset.id))
         return hypernyms
 
+    def _lowest_common_hypernym_ids(self, start_id: int, target_id: int) -> List[int]:
+        common_hypernyms = self._hypernym_ancestor_ids(start_id) & self._hypernym_ancestor_ids(target_id)
+        max_depth = None
+        lowest = []
+        for hypernym in sorted(common_hypernyms):
+            depth = self._hypernym_depth(hypernym)
+            if depth is None:
+                continue
+            if max_depth is None or depth > max_depth:
+                max_depth = depth
+                lowest = [hypernym]
+            elif depth == max_depth:
+                lowest.append(hypernym)
+        return lowest
+
     def lowest_common_hypernyms(self, start_synset: Synset, target_synset: Synset) -> Union[list, None]:
         """Returns the common hypernyms of the synset and the target synset, which are furthest from the closest roots.
 
@@ -348,19 +595,9 @@ class Wordnet:
         Common synsets which are the furthest from the closest roots.
 
         """
-        self_hypernyms = self._recursive_hypernyms(start_synset, set())
-        other_hypernyms = self._recursive_hypernyms(target_synset, set())
-        common_hypernyms = self_hypernyms.intersection(other_hypernyms)
-
-        annot_common_hypernyms = [(hypernym, self._min_depth(hypernym)) for hypernym in common_hypernyms]
-
-        annot_common_hypernyms.sort(key=lambda annot_hypernym: annot_hypernym[1], reverse=True)
-
-        max_depth = annot_common_hypernyms[0][1] if len(annot_common_hypernyms) > 0 else None
-
-        if max_depth != None:
-            return [annot_common_hypernym[0] for annot_common_hypernym in annot_common_hypernyms if
-                    annot_common_hypernym[1] == max_depth]
+        lowest = self._lowest_common_hypernym_ids(start_synset.id, target_synset.id)
+        if lowest:
+            return [self.iloc[hypernym] for hypernym in lowest]
         return None
 
     def path_similarity(self, start_synset: Synset, target_synset: Synset) -> Union[float, None]:
@@ -419,6 +656,16 @@ class Wordnet:
         except:
             return None
 
+    def _wup_similarity_ids(self, start_id: int, target_id: int) -> Union[float, None]:
+        lowest = self._lowest_common_hypernym_ids(start_id, target_id)
+        lcs_depth = self._hypernym_depth(lowest[0]) if lowest else None
+        self_depth = self._hypernym_depth(start_id)
+        other_depth = self._hypernym_depth(target_id)
+        if lcs_depth is None or self_depth is None or other_depth is None:
+            return None
+
+        return (2.0 * lcs_depth) / (self_depth + other_depth)
+
     def wup_similarity(self, start_synset: Synset, target_synset: Synset) -> Union[float, None]:
         """Calculates Wu and Palmer's similarity between the two synsets.
 
@@ -438,14 +685,70 @@ class Wordnet:
 
         """
 
-        lchs = self.lowest_common_hypernyms(start_synset, target_synset)
-        lcs_depth = self._min_depth(lchs[0]) if lchs and len(lchs) else None
-        self_depth = self._min_depth(start_synset)
-        other_depth = self._min_depth(target_synset)
-        if lcs_depth is None or self_depth is None or other_depth is None:
-            return None
+        return self._wup_similarity_ids(start_synset.id, target_synset.id)
 
-        return (2.0 * lcs_depth) / (self_depth + other_depth)
+    def pairwise_similarity(self, synsets_a: List[Synset], synsets_b: List[Synset] = None,
+                            metric: str = 'path') -> np.ndarray:
+        """Calculates similarities between all pairs of synsets from two lists.
+
+        Notes
+        -----
+          For path and lch similarities, shortest path lengths from each distinct synset of 
+          synsets_a are found with a single breadth-first search in the hyponym graph instead 
+          of searching a path for each pair separately. Wu and Palmer's similarity uses the 
+          cached depths and hypernyms of synsets.
+
+        Parameters
+        ----------
+          synsets_a : list of Synsets
+        Synsets corresponding to the rows of the result.
+          synsets_b : list of Synsets
+        Synsets corresponding to the columns of the result. If not provided, then synsets_a 
+        is used.
+          metric : str
+        Similarity to be calculated: 'path' (path_similarity), 'lch' (lch_similarity) or 
+        'wup' (wup_similarity).
+        Default: 'path'
+
+        Returns
+        -------
+          numpy.ndarray
+        Matrix of shape (len(synsets_a), len(synsets_b)), where the element [i, j] is the 
+        similarity between synsets_a[i] and synsets_b[j]. Similarities which are undefined 
+        (i.e. the corresponding method returns None) are NaN.
+
+        """
+        if metric not in ('path', 'lch', 'wup'):
+            raise ValueError("Unknown similarity metric {!r}. Possible metrics are: 'path', 'lch' and 'wup'.".format(metric))
+        if synsets_b is None:
+            synsets_b = synsets_a
+        result = np.full((len(synsets_a), len(synsets_b)), np.nan, dtype=float)
+        computed_rows = dict()
+        for i, start_synset in enumerate(synsets_a):
+            if start_synset.id in computed_rows:
+                result[i] = result[computed_rows[start_synset.id]]
+                continue
+            computed_rows[start_synset.id] = i
+            if metric == 'wup':
+                for j, target_synset in enumerate(synsets_b):
+                    similarity = self._wup_similarity_ids(start_synset.id, target_synset.id)
+                    if similarity is not None:
+                        result[i, j] = similarity
+                continue
+            if self._hyponym_graph is None:
+                self.hyponym_graph
+            if not self._hyponym_graph.has_node(start_synset.id):
+                continue
+            distances = nx.single_source_shortest_path_length(self._hyponym_graph, start_synset.id)
+            for j, target_synset in enumerate(synsets_b):
+                distance = distances.get(target_synset.id)
+                if distance is None:
+                    continue
+                if metric == 'path':
+                    result[i, j] = 1.0 / (distance + 1)
+                elif start_synset.pos == target_synset.pos and MAX_TAXONOMY_DEPTHS.get(start_synset.pos):
+                    result[i, j] = -math.log((distance + 1) / (2.0 * MAX_TAXONOMY_DEPTHS[start_synset.pos]))
+        return result
 
     def all_relation_types(self) -> List[str]:
         """
@@ -455,6 +758,8 @@ class Wordnet:
         -------
         A list of strings: relation types used in this Wordnet.
         """
+        if self.in_memory:
+            return list(dict.fromkeys(r[2] for r in self._relation_rows))
         self.cur.execute("SELECT DISTINCT relation FROM wordnet_relation")
         wn_all_relation_types = self.cur.fetchall()
         return [r[0] for r in wn_all_relation_types]
@@ -467,3 +772,18 @@ class Wordnet:
 
     def _html_repr(self):
         return "Wordnet version {}".format(self.version)
+
+
+def shared_wordnet(version: str=None, local_dir: str=None) -> Wordnet:
+    """
+    Returns an in-memory Wordnet (see Wordnet's parameter in_memory) that is shared 
+    by all callers with the same version and local_dir. The Wordnet is loaded on 
+    the first call. 
+    
+    When the Wordnet is loaded in the parent process before forking worker processes, 
+    the workers use the same loaded data without reloading it. 
+    """
+    key = (version, local_dir)
+    if key not in _SHARED_WORDNETS:
+        _SHARED_WORDNETS[key] = Wordnet(version=version, local_dir=local_dir, in_memory=True)
+    return _SHARED_WORDNETS[key]
@@ -11,6 +11,7 @@ from estnltk_core.layer.span import Span
 from estnltk_core.layer.enveloping_span import EnvelopingSpan
 from estnltk_core.layer.span_list import SpanList
 from estnltk_core.layer.layer import Layer
+from estnltk_core.layer.columnar_layer import ColumnarLayer
 from estnltk_core.layer.relation_layer import RelationLayer
 from estnltk_core.layer.relation_layer import Relation
 
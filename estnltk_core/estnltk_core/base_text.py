@@ -2,10 +2,11 @@ import html
 import pandas
 
 from copy import copy, deepcopy
-from typing import List, Sequence, Set, Union, Any, Mapping
+from typing import Callable, List, Sequence, Set, Union, Any, Mapping
 
 from estnltk_core.layer.base_layer import BaseLayer
 from estnltk_core.layer.relation_layer import RelationLayer
+from estnltk_core.layer.lazy_layer_dict import LazyLayerDict
 from estnltk_core.layer_operations.layer_dependencies import find_layer_dependencies
 
 class BaseText:
@@ -231,6 +232,40 @@ class BaseText:
         else:
             raise AssertionError('BaseLayer or RelationLayer expected, got {!r}'.format(type(layer)))
 
+    def add_serialised_layer(self, layer_dict: dict, dict_to_layer: Callable = None, relation_layer: bool = False):
+        """
+        Adds a layer in the serialised form (layer dict) to the text object.
+
+        The layer is deserialised on the first access via `text[layer_name]`
+        (or via any other method that needs the layer object), so that loading
+        a text with many layers costs proportionally to the layers actually used.
+        `dict_to_layer` is the function used for deserialisation: it takes layer
+        dict and the text object as arguments and returns the layer. By default,
+        `dict_to_layer` from `estnltk_core.converters` is used.
+        Set relation_layer=True if layer_dict is a relation layer.
+
+        The same conditions as in add_layer(...) apply to the added layer. However,
+        the consistency of layer_dict is not checked before the deserialisation.
+        """
+        if dict_to_layer is None:
+            from estnltk_core.converters.layer_dict_converter import dict_to_layer
+        name = layer_dict['name']
+        assert name not in self._layers, \
+            'this {} object already has a span layer with name {!r}'.format(self.__class__.__name__, name)
+        assert name not in self._relation_layers, \
+            'this {} object already has a relation layer with name {!r}'.format(self.__class__.__name__, name)
+        if not relation_layer and layer_dict.get('parent'):
+            assert layer_dict['parent'] in self._layers, 'Cant add a layer "{layer}" before adding its parent "{parent}"'.format(
+                parent=layer_dict['parent'], layer=name)
+        if layer_dict.get('enveloping'):
+            assert layer_dict['enveloping'] in self._layers, "can't add an enveloping layer before adding the layer it envelops"
+        slot = '_relation_layers' if relation_layer else '_layers'
+        layers = getattr(self, slot)
+        if not isinstance(layers, LazyLayerDict):
+            layers = LazyLayerDict(self, layers)
+            object.__setattr__(self, slot, layers)
+        layers.add_serialised_layer(name, layer_dict, dict_to_layer)
+
 
     def pop_layer(self, name: str, cascading: bool = True, default=Ellipsis) -> Union[BaseLayer, 'Layer', RelationLayer, Any]:
         """
@@ -16,6 +16,14 @@ OUTPUT_CONFIG = {
     'attr_val_repr_types' : (str, int, float, bool, list, tuple, set, dict),
 }
 
+# Configuration parameters of layer's data structures
+LAYER_CONFIG = {
+    # Whether new layers should store spans in SortedSpanList (a sorted 
+    # container with O(log n) insertion/removal, requires sortedcontainers)
+    # instead of SpanList (Python list with O(n) insertion/removal)
+    'sorted_span_list' : False,
+}
+
 
 def _create_attr_val_repr( seq_attribute_values: Sequence[Tuple[str, Any]] ) -> str:
     """Creates a concise string representation of annotations' attributes and values. 
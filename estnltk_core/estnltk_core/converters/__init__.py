@@ -24,4 +24,12 @@ from .json_exporter import layers_to_json
 from .json_importer import json_to_annotation
 from .json_importer import json_to_text
 from .json_importer import json_to_layer
-from .json_importer import json_to_layers
\ No newline at end of file
+from .json_importer import json_to_layers
+from .jsonl_converter import write_texts_to_jsonl
+from .jsonl_converter import iter_texts_from_jsonl
+
+from .binary_exporter import text_to_binary
+from .binary_exporter import layer_to_binary
+
+from .binary_importer import binary_to_text
+from .binary_importer import binary_to_layer
@@ -0,0 +1,125 @@
+#
+#  Binary compact format of Text objects and layers.
+#
+#  Binary data consists of:
+#
+#    * MAGIC bytes and the format version (1 byte);
+#    * length of the header (4 bytes) and the header: UTF-8 encoded JSON
+#      object containing the text, metadata, and layers' metadata and
+#      attribute value dictionaries;
+#    * integer arrays: typecode (1 byte), number of items (4 bytes) and
+#      items in the little-endian byte order. Arrays contain the columns
+#      of the compact serialisation (see compact_serialisation.py): delta-
+#      encoded positions, sizes of enveloped spans, annotation counts and
+#      attribute value codes. Header refers to arrays by their indexes.
+#      Each array uses the smallest typecode fitting its values.
+#
+#  Span layers with the default serialisation (and compact_v0 layers)
+#  are stored in the columnar form. Layers with other serialisation
+#  modules and relation layers are stored in the header as layer
+#  dictionaries.
+#
+from typing import Union
+from array import array
+import struct
+import json
+import sys
+
+from estnltk_core.common import load_text_class
+from estnltk_core.converters import compact_serialisation
+from estnltk_core.converters import layer_dict_converter
+
+MAGIC = b'ESTNLTK\x00'
+FORMAT_VERSION = 1
+
+# Serialisation modules of layers which are stored in the columnar form
+COLUMNAR_SERIALISATION_MODULES = (None, compact_serialisation.__version__)
+
+_TYPECODE_RANGES = [('b', -2**7, 2**7 - 1),
+                    ('h', -2**15, 2**15 - 1),
+                    ('i', -2**31, 2**31 - 1),
+                    ('q', -2**63, 2**63 - 1)]
+
+
+def _pack_array(values: list) -> bytes:
+    typecode = 'q'
+    if values:
+        min_value = min(values)
+        max_value = max(values)
+        for typecode, low, high in _TYPECODE_RANGES:
+            if low <= min_value and max_value <= high:
+                break
+    packed = array(typecode, values)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return typecode.encode('ascii') + struct.pack('<I', len(packed)) + packed.tobytes()
+
+
+def _layer_to_entry(layer, arrays: list) -> dict:
+    if layer.serialisation_module not in COLUMNAR_SERIALISATION_MODULES:
+        return {'columnar': False, 'layer': layer_dict_converter.layer_to_dict(layer)}
+    columns = compact_serialisation.layer_to_columns(layer)
+
+    def add_array(values):
+        arrays.append(_pack_array(values))
+        return len(arrays) - 1
+
+    annotation_counts = columns['annotation_counts']
+    return {'columnar': True,
+            'name': layer.name,
+            'attributes': layer.attributes,
+            'secondary_attributes': layer.secondary_attributes,
+            'parent': layer.parent,
+            'enveloping': layer.enveloping,
+            'ambiguous': layer.ambiguous,
+            'serialisation_module': layer.serialisation_module,
+            'meta': layer.meta,
+            'span_level': columns['span_level'],
+            'span_count': columns['span_count'],
+            'envelope_sizes': add_array(columns['envelope_sizes']),
+            'positions': add_array(columns['positions']),
+            'annotation_counts': None if annotation_counts is None else add_array(annotation_counts),
+            'values': columns['values'],
+            'codes': {attr: add_array(codes) for attr, codes in columns['codes'].items()}}
+
+
+def _to_binary(header: dict, arrays: list) -> bytes:
+    header = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    return b''.join([MAGIC, struct.pack('<BI', FORMAT_VERSION, len(header)), header, *arrays])
+
+
+def _write(binary: bytes, file: str = None):
+    if file is None:
+        return binary
+    with open(file, 'wb') as out_f:
+        out_f.write(binary)
+
+
+def text_to_binary(text: Union['BaseText', 'Text'], file: str = None):
+    """Exports Text or BaseText object to the binary compact format.
+    If file is None, returns bytes,
+    otherwise writes bytes to the file and returns None.
+
+    The binary format is considerably smaller and faster to
+    load than JSON, and the import restores exactly the same
+    Text object as json_to_text(text_to_json(text)).
+    """
+    assert isinstance(text, load_text_class()), type(text)
+    arrays = []
+    header = {'text': text.text,
+              'meta': text.meta,
+              'layers': [_layer_to_entry(layer, arrays) for layer in
+                         text.sorted_layers(span_layers=True, relation_layers=False)],
+              'relation_layers': [layer_dict_converter.layer_to_dict(layer) for layer in
+                                  text.sorted_layers(span_layers=False, relation_layers=True)]}
+    return _write(_to_binary(header, arrays), file)
+
+
+def layer_to_binary(layer: 'Layer', file: str = None):
+    """Exports a span Layer object to the binary compact format.
+    If file is None, returns bytes,
+    otherwise writes bytes to the file and returns None.
+    """
+    arrays = []
+    header = _layer_to_entry(layer, arrays)
+    return _write(_to_binary(header, arrays), file)
@@ -0,0 +1,99 @@
+from typing import Container, Union
+from array import array
+import struct
+import json
+import sys
+
+from estnltk_core.common import create_text_object
+from estnltk_core.converters import compact_serialisation
+from estnltk_core.converters import layer_dict_converter
+from estnltk_core.converters.binary_exporter import MAGIC, FORMAT_VERSION
+
+
+def _read(binary: bytes = None, file: str = None) -> bytes:
+    if file:
+        with open(file, 'rb') as in_f:
+            return in_f.read()
+    if binary is not None:
+        return binary
+    raise TypeError("either 'binary' or 'file' argument needed")
+
+
+def _parse_binary(binary: bytes):
+    """Returns the header and integer arrays of the binary data."""
+    if binary[:len(MAGIC)] != MAGIC:
+        raise ValueError('(!) Unexpected binary data: not in the estnltk binary format')
+    offset = len(MAGIC)
+    version, header_length = struct.unpack_from('<BI', binary, offset)
+    if version != FORMAT_VERSION:
+        raise ValueError('(!) Unsupported binary format version: {}'.format(version))
+    offset += struct.calcsize('<BI')
+    header = json.loads(binary[offset:offset + header_length].decode('utf-8'))
+    offset += header_length
+    arrays = []
+    while offset < len(binary):
+        typecode = chr(binary[offset])
+        length, = struct.unpack_from('<I', binary, offset + 1)
+        offset += 5
+        values = array(typecode)
+        end = offset + length * values.itemsize
+        values.frombytes(binary[offset:end])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        arrays.append(values)
+        offset = end
+    return header, arrays
+
+
+def _entry_to_layer(entry: dict, arrays: list, text: Union['BaseText', 'Text']):
+    if not entry['columnar']:
+        return layer_dict_converter.dict_to_layer(entry['layer'], text)
+    layer_dict = dict(entry)
+    for key in ['envelope_sizes', 'positions']:
+        layer_dict[key] = arrays[entry[key]]
+    if entry['annotation_counts'] is not None:
+        layer_dict['annotation_counts'] = arrays[entry['annotation_counts']]
+    layer_dict['codes'] = {attr: arrays[i] for attr, i in entry['codes'].items()}
+    return compact_serialisation.columns_to_layer(layer_dict, text,
+                                                  serialisation_module=entry['serialisation_module'])
+
+
+def binary_to_text(binary: bytes = None, file: str = None, layers: Container = None) -> Union['BaseText', 'Text']:
+    """Imports Text or BaseText object from the binary compact format.
+    If file is None, then loads the Text from `binary`,
+    otherwise, loads the Text from the binary format file.
+    If `layers` is given, only the listed layers are restored.
+    """
+    header, arrays = _parse_binary(_read(binary, file))
+    text = create_text_object(header['text'])
+    text.meta = header['meta']
+    layer_objects = {}
+    for entry in header['layers']:
+        name = entry['name'] if entry['columnar'] else entry['layer']['name']
+        if layers is None or name in layers:
+            layer = _entry_to_layer(entry, arrays, text)
+            if not entry['columnar'] and entry['layer']['serialisation_module'] == 'legacy_v0':
+                # Hack for legacy serialization
+                # (in legacy, dict_to_layer relies on previously added layers)
+                text.add_layer(layer)
+            else:
+                layer_objects[layer.name] = layer
+    for layer_dict in header['relation_layers']:
+        if layers is None or layer_dict['name'] in layers:
+            layer = layer_dict_converter.dict_to_layer(layer_dict, text)
+            layer_objects[layer.name] = layer
+    # Add layers in the topological order
+    for layer in text.__class__.topological_sort(layer_objects):
+        text.add_layer(layer)
+    return text
+
+
+def binary_to_layer(text: Union['BaseText', 'Text'], binary: bytes = None, file: str = None):
+    """Imports a span Layer object from the binary compact format.
+    The `text` parameter must be a text object associated
+    with the layer.
+    If file is None, then loads the layer from `binary`,
+    otherwise, loads the layer from the binary format file.
+    """
+    header, arrays = _parse_binary(_read(binary, file))
+    return _entry_to_layer(header, arrays, text)
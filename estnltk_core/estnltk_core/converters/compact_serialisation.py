@@ -0,0 +1,176 @@
+#
+#  Compact (columnar) serialisation of span layers.
+#
+#  Instead of a list of span dictionaries, a layer is stored as a few
+#  flat integer lists:
+#
+#    * 'positions' -- start and end positions of all (elementary) text
+#      positions of the layer, delta-encoded: each position is stored as
+#      a difference from the previous position;
+#    * 'envelope_sizes' -- sizes of enveloped base spans (only for
+#      enveloping layers), listed in the depth-first order;
+#    * 'annotation_counts' -- numbers of annotations of spans (None, if
+#      every span has exactly one annotation, see 'span_count');
+#    * 'codes' -- for each attribute, indexes of attribute values in the
+#      dictionary of distinct values of the attribute ('values'). Code -1
+#      marks an annotation which does not have the attribute.
+#
+#  Delta-encoded positions and dictionary codes are small integers, which
+#  makes the format considerably more compact than the default layer
+#  dictionary, especially for layers with repetitive attribute values.
+#  The same columns are also used by the binary format (see
+#  binary_exporter.py and binary_importer.py).
+#
+from typing import Union
+from itertools import accumulate
+import json
+
+from estnltk_core.layer.base_span import ElementaryBaseSpan, EnvelopingBaseSpan
+from estnltk_core.layer.layer import Layer
+
+__version__ = 'compact_v0'
+
+# Types of attribute values that are immutable and can be shared by annotations
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def _flatten_base_span(raw, level: int, envelope_sizes: list, positions: list):
+    if level == 0:
+        positions.extend(raw)
+    else:
+        envelope_sizes.append(len(raw))
+        for sub_raw in raw:
+            _flatten_base_span(sub_raw, level - 1, envelope_sizes, positions)
+
+
+def _restore_base_span(level: int, envelope_sizes, positions):
+    if level == 0:
+        return ElementaryBaseSpan(next(positions), next(positions))
+    return EnvelopingBaseSpan([_restore_base_span(level - 1, envelope_sizes, positions)
+                               for _ in range(next(envelope_sizes))])
+
+
+def _value_key(value):
+    # Distinguishes values which are equal, but serialised differently (1, 1.0 and True)
+    if isinstance(value, _SCALAR_TYPES):
+        return value.__class__, value
+    return None, json.dumps(value, ensure_ascii=False)
+
+
+def layer_to_columns(layer: Layer) -> dict:
+    """Converts spans and annotations of the layer into compact columns.
+       Returns a dictionary with keys 'span_level', 'span_count', 'envelope_sizes',
+       'positions', 'annotation_counts', 'values' and 'codes'.
+    """
+    span_level = layer[0].base_span.level if len(layer) > 0 else 0
+    envelope_sizes = []
+    positions = []
+    annotation_counts = []
+    keys = {}
+    values = {}
+    codes = {}
+    annotation_index = 0
+    for span in layer:
+        base_span = span.base_span
+        if base_span.level != span_level:
+            raise ValueError('(!) Cannot convert layer {!r}: base spans have different levels: {} and {}'.format(
+                             layer.name, span_level, base_span.level))
+        if span_level == 0:
+            positions.append(base_span.start)
+            positions.append(base_span.end)
+        else:
+            _flatten_base_span(base_span.raw(), span_level, envelope_sizes, positions)
+        annotations = span.annotations
+        annotation_counts.append(len(annotations))
+        for annotation in annotations:
+            for attr, value in annotation.__dict__.items():
+                if attr not in codes:
+                    keys[attr] = {}
+                    values[attr] = []
+                    # annotations preceding the first occurrence of the attribute
+                    codes[attr] = [-1] * annotation_index
+                attr_keys = keys[attr]
+                key = _value_key(value)
+                code = attr_keys.get(key)
+                if code is None:
+                    code = attr_keys[key] = len(attr_keys)
+                    values[attr].append(value)
+                codes[attr].append(code)
+            annotation_index += 1
+            for attr_codes in codes.values():
+                if len(attr_codes) < annotation_index:
+                    # the annotation does not have the attribute
+                    attr_codes.append(-1)
+    return {'span_level': span_level,
+            'span_count': len(annotation_counts),
+            'envelope_sizes': envelope_sizes,
+            'positions': [b - a for a, b in zip([0] + positions, positions)],
+            'annotation_counts': annotation_counts if any(c != 1 for c in annotation_counts) else None,
+            'values': values,
+            'codes': codes}
+
+
+def columns_to_layer(layer_dict: dict, text: Union['BaseText', 'Text'], serialisation_module=__version__) -> Layer:
+    """Creates a layer from the dictionary containing layer's metadata and
+       compact columns (as returned by the function `layer_to_columns`).
+    """
+    layer = Layer(name=layer_dict['name'],
+                  attributes=layer_dict['attributes'],
+                  secondary_attributes=layer_dict.get('secondary_attributes', ()),
+                  text_object=text,
+                  parent=layer_dict['parent'],
+                  enveloping=layer_dict['enveloping'],
+                  ambiguous=layer_dict['ambiguous'],
+                  serialisation_module=serialisation_module
+                  )
+    layer.meta.update(layer_dict['meta'])
+
+    span_level = layer_dict['span_level']
+    envelope_sizes = iter(layer_dict['envelope_sizes'])
+    positions = iter(accumulate(layer_dict['positions']))
+    columns = []
+    for attr, attr_codes in layer_dict['codes'].items():
+        attr_values = layer_dict['values'][attr]
+        # mutable values are copied for each annotation
+        copied_values = {i: json.dumps(value, ensure_ascii=False) for i, value in enumerate(attr_values)
+                         if not isinstance(value, _SCALAR_TYPES)}
+        columns.append((attr, attr_codes, attr_values, copied_values))
+
+    annotation_counts = layer_dict['annotation_counts']
+    if annotation_counts is None:
+        annotation_counts = [1] * layer_dict['span_count']
+    annotation_index = 0
+    for annotation_count in annotation_counts:
+        base_span = _restore_base_span(span_level, envelope_sizes, positions)
+        for _ in range(annotation_count):
+            annotation = {}
+            for attr, attr_codes, attr_values, copied_values in columns:
+                code = attr_codes[annotation_index]
+                if code == -1:
+                    continue
+                if code in copied_values:
+                    annotation[attr] = json.loads(copied_values[code])
+                else:
+                    annotation[attr] = attr_values[code]
+            layer.add_annotation(base_span, annotation)
+            annotation_index += 1
+    return layer
+
+
+def layer_to_dict(layer: Layer) -> dict:
+    layer_dict = {
+        'name': layer.name,
+        'attributes': layer.attributes,
+        'secondary_attributes': layer.secondary_attributes,
+        'parent': layer.parent,
+        'enveloping': layer.enveloping,
+        'ambiguous': layer.ambiguous,
+        'serialisation_module': __version__,
+        'meta': layer.meta,
+    }
+    layer_dict.update(layer_to_columns(layer))
+    return layer_dict
+
+
+def dict_to_layer(layer_dict: dict, text: Union['BaseText', 'Text']) -> Layer:
+    return columns_to_layer(layer_dict, text, serialisation_module=__version__)
@@ -9,9 +9,44 @@ def dict_to_annotation(span, annotation_dict: dict):
     return Annotation(span, **annotation_dict)
 
 
-def dict_to_text(text_dict: dict, layers: Container = None) -> Union['BaseText', 'Text']:
+def _sorted_layer_dicts(layer_dicts: list) -> list:
+    # Sorts layer dicts in the same order as BaseText.topological_sort sorts layers
+    layer_dicts = sorted(layer_dicts, key=lambda d: d['name'])
+    layer_names = set(d['name'] for d in layer_dicts)
+    sorted_dicts = []
+    sorted_names = set()
+    while layer_dicts:
+        for layer_dict in layer_dicts:
+            dependencies = [layer_dict.get('parent'), layer_dict.get('enveloping')]
+            if all(d is None or d in sorted_names or d not in layer_names for d in dependencies):
+                break
+        else:
+            # malformed data: cyclic dependencies
+            layer_dict = layer_dicts[0]
+        sorted_dicts.append(layer_dict)
+        sorted_names.add(layer_dict['name'])
+        layer_dicts.remove(layer_dict)
+    return sorted_dicts
+
+
+def dict_to_text(text_dict: dict, layers: Container = None, lazy: bool = False) -> Union['BaseText', 'Text']:
+    """Restores Text or BaseText object from the dictionary.
+    If `layers` is given, only the listed layers are restored.
+    If lazy=True, layers are added to the Text in the serialised form,
+    and each layer is deserialised on the first access (see
+    BaseText.add_serialised_layer). This is useful if only a few of
+    the layers of the text are actually used.
+    """
     text = create_text_object( text_dict['text'] )
     text.meta = text_dict['meta']
+    if lazy and not any(layer_dict['serialisation_module'] == 'legacy_v0' for layer_dict in text_dict['layers']):
+        for layer_dict in _sorted_layer_dicts(text_dict['layers']):
+            if layers is None or layer_dict['name'] in layers:
+                text.add_serialised_layer(layer_dict, layer_dict_converter.dict_to_layer)
+        for layer_dict in _sorted_layer_dicts(text_dict.get('relation_layers', [])):
+            if layers is None or layer_dict['name'] in layers:
+                text.add_serialised_layer(layer_dict, layer_dict_converter.dict_to_layer, relation_layer=True)
+        return text
     # Restore all layer objects
     layer_objects = {}
     # span layers
@@ -7,7 +7,8 @@ from . import dict_to_layer
 from . import dict_to_text
 
 
-def json_to_text(json_text: str = None, file: str = None, file_encoding: str = 'utf-8') -> Union['BaseText', 'Text']:
+def json_to_text(json_text: str = None, file: str = None, file_encoding: str = 'utf-8',
+                 lazy: bool = False) -> Union['BaseText', 'Text']:
     """Imports Text or BaseText object from json.
     If file is None, then loads corresponding dictionary 
     from json_text, otherwise, loads the dictionary from 
@@ -21,6 +22,9 @@ def json_to_text(json_text: str = None, file: str = None, file_encoding: str = '
     UnicodeEncodeError, so the parameter file_encoding
     (default: 'utf-8') must be used to reinforce the 
     encoding.
+
+    If lazy=True, layers are deserialised only on the first 
+    access, e.g. text['words'] (see dict_to_text).
     """
     if file:
         with open(file, 'r', encoding=file_encoding) as in_f:
@@ -29,7 +33,7 @@ def json_to_text(json_text: str = None, file: str = None, file_encoding: str = '
         text_dict = json.loads(json_text)
     else:
         raise TypeError("either 'text_json' or 'file' argument needed")
-    return dict_to_text(text_dict)
+    return dict_to_text(text_dict, lazy=lazy)
 
 
 def json_to_layer(texts: Union[list, 'BaseText', 'Text'], json_str: str = None, file: str = None, file_encoding: str = 'utf-8'):
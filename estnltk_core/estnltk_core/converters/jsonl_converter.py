@@ -0,0 +1,95 @@
+#
+#  Streaming import and export of Text objects in the JSON lines format:
+#  each line of a file contains a single Text object in JSON format (as
+#  produced by text_to_json). Files can be optionally compressed with
+#  gzip or zstd (requires the zstandard package).
+#
+from typing import Container, Iterable, Iterator, Union
+import gzip
+import json
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from estnltk_core.converters.dict_exporter import text_to_dict
+from estnltk_core.converters.dict_importer import dict_to_text
+
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.gzip': 'gzip', '.zst': 'zstd', '.zstd': 'zstd'}
+
+
+def _open_jsonl(path: str, mode: str, compression: str, file_encoding: str):
+    if compression == 'infer':
+        compression = None
+        for extension, extension_compression in COMPRESSION_EXTENSIONS.items():
+            if path.lower().endswith(extension):
+                compression = extension_compression
+    if compression is None:
+        return open(path, mode, encoding=file_encoding)
+    if compression == 'gzip':
+        return gzip.open(path, mode + 't', encoding=file_encoding)
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ImportError('(!) zstd compression requires zstandard package. '+\
+                              'Please install it via "pip install zstandard".')
+        return zstandard.open(path, mode + 't', encoding=file_encoding)
+    raise ValueError("(!) Unexpected compression {!r}. Supported values: 'infer', 'gzip', 'zstd', None".format(
+                     compression))
+
+
+def _required_layers(text_dict: dict, layers: Container) -> set:
+    """Returns names of the given layers and all the layers they depend on."""
+    dependencies = {}
+    for layer_dict in text_dict['layers'] + text_dict.get('relation_layers', []):
+        dependencies[layer_dict['name']] = [layer_dict.get('parent'), layer_dict.get('enveloping')]
+    required = set()
+    stack = [layer for layer in dependencies if layer in layers]
+    while stack:
+        layer = stack.pop()
+        if layer is not None and layer not in required and layer in dependencies:
+            required.add(layer)
+            stack.extend(dependencies[layer])
+    return required
+
+
+def write_texts_to_jsonl(path: str, texts: Iterable[Union['BaseText', 'Text']], compression: str = 'infer',
+                         file_encoding: str = 'utf-8', append: bool = False) -> int:
+    """Writes Text or BaseText objects to a JSON lines file, one Text per line.
+
+    Texts are written one at a time, so `texts` can be a generator that
+    produces a corpus larger than the available memory.
+    If compression is 'infer' (default), the compression is determined by
+    the file extension: '.gz' -- gzip, '.zst' -- zstd, otherwise the file is
+    not compressed. Other options: 'gzip', 'zstd' or None (no compression).
+    If `append` is set, texts are appended to the existing file.
+
+    Returns the number of written texts.
+    """
+    count = 0
+    with _open_jsonl(path, 'a' if append else 'w', compression, file_encoding) as out_f:
+        for text in texts:
+            out_f.write(json.dumps(text_to_dict(text), ensure_ascii=False))
+            out_f.write('\n')
+            count += 1
+    return count
+
+
+def iter_texts_from_jsonl(path: str, layers: Container = None, compression: str = 'infer',
+                          file_encoding: str = 'utf-8', lazy: bool = False) -> Iterator[Union['BaseText', 'Text']]:
+    """Iterates over Text or BaseText objects of a JSON lines file.
+
+    The file is read one line at a time, so only a single document is in
+    the memory at once. Empty lines are skipped.
+    If `layers` is given, then only the listed layers and the layers they
+    depend on are restored; other layers are not converted to Layer objects.
+    If lazy=True, layers are deserialised only on the first access.
+    For `compression` options, see `write_texts_to_jsonl`.
+    """
+    with _open_jsonl(path, 'r', compression, file_encoding) as in_f:
+        for line in in_f:
+            if not line.strip():
+                continue
+            text_dict = json.loads(line)
+            yield dict_to_text(text_dict, layers=None if layers is None else _required_layers(text_dict, layers),
+                               lazy=lazy)
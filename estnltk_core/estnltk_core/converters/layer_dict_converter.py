@@ -3,12 +3,16 @@ from estnltk_core.converters.default_serialisation import dict_to_layer as defau
 from estnltk_core.converters.serialisation_registry import SERIALISATION_REGISTRY
 import estnltk_core.converters.relation_layer_serialisation_v0 as relations_serialisation_v0
 import estnltk_core.converters.relation_layer_serialisation_v1 as relations_serialisation_v1
+import estnltk_core.converters.compact_serialisation as compact_serialisation
 
 # Update global serialization registry: add default relations_serialisation
 if relations_serialisation_v0.__version__ not in SERIALISATION_REGISTRY:
     SERIALISATION_REGISTRY[relations_serialisation_v0.__version__] = relations_serialisation_v0
 if relations_serialisation_v1.__version__ not in SERIALISATION_REGISTRY:
     SERIALISATION_REGISTRY[relations_serialisation_v1.__version__] = relations_serialisation_v1
+# Add compact (columnar) serialisation of span layers
+if compact_serialisation.__version__ not in SERIALISATION_REGISTRY:
+    SERIALISATION_REGISTRY[compact_serialisation.__version__] = compact_serialisation
 
 
 def layer_to_dict(layer):
@@ -1,6 +1,7 @@
 import pandas
 
-from typing import Union, List
+from collections.abc import Sequence
+from typing import Union, List, Any
 
 from estnltk_core.layer.attribute_list.immutable_list import ImmutableList
 from estnltk_core.layer.to_html import to_str
@@ -93,7 +94,7 @@ class AmbiguousAttributeTupleList:
         if index_type not in ['layers', 'spans', 'annotations']:
             raise ValueError( ('Unexpected index_type parameter {!r}: should be either "layers" (indexed by layers), '+\
                                '"spans" (indexed by spans) or "annotations" (indexed by annotations).').format(index_type))
-        if isinstance(span_or_spanlist, (list, tuple)) and index_type == 'annotations':
+        if isinstance(span_or_spanlist, Sequence) and index_type == 'annotations':
             raise TypeError('Unexpected index_type="annotations" for a list of spans. '+\
                             'This index_type can only be used with a single Span.')
         # Unify attribute names
@@ -137,7 +138,7 @@ class AmbiguousAttributeTupleList:
         # Unpack attributes & values:        
         amb_attr_tuple_list = []
         if index_type == 'layers':
-            assert isinstance(span_or_spanlist, (list, tuple))
+            assert isinstance(span_or_spanlist, Sequence)
             # Unpack layers
             for layer in span_or_spanlist:
                 # Unpack spans of a layer
@@ -149,13 +150,13 @@ class AmbiguousAttributeTupleList:
                 assert isinstance(attr_values, AmbiguousAttributeTupleList)
                 amb_attr_tuple_list.append( [[attr_values]] )
         elif index_type == 'spans':
-            assert isinstance(span_or_spanlist, (list, tuple))
+            assert isinstance(span_or_spanlist, Sequence)
             # Unpack spans of spanlist
             amb_attr_tuple_list = \
                 (( (get_attribute_values(a, attribute_names, span_index_attributes)) for a in sp.annotations) for sp in span_or_spanlist)
         else:
             # Unpack annotations of a span
-            assert not isinstance(span_or_spanlist, (list, tuple))
+            assert not isinstance(span_or_spanlist, Sequence)
             amb_attr_tuple_list = \
                 ((( [get_attribute_values(a, attribute_names, span_index_attributes)] ) for a in span_or_spanlist.annotations))
             
@@ -169,6 +170,28 @@ class AmbiguousAttributeTupleList:
             self.attribute_names = tuple(attribute_names)
         self.index_type = index_type
 
+    @classmethod
+    def from_values(cls, amb_attr_tuple_list:List[List[List[Any]]], 
+                         attribute_names:List[str], 
+                         index_type:str='spans'):
+        """ Creates a new immutable list directly from (already extracted) attribute values.
+            
+            `amb_attr_tuple_list` must have the same structure that is normally 
+            extracted from spans: a list of spans, where each span is a list of 
+            annotations, and each annotation is a list of values of `attribute_names`.
+            This is used by storage backends (e.g. ColumnarLayer) that can produce 
+            attribute values without materializing Span and Annotation objects.
+        """
+        if index_type not in ['layers', 'spans', 'annotations']:
+            raise ValueError( ('Unexpected index_type parameter {!r}: should be either "layers" (indexed by layers), '+\
+                               '"spans" (indexed by spans) or "annotations" (indexed by annotations).').format(index_type))
+        result = cls.__new__(cls)
+        result.amb_attr_tuple_list = ImmutableList(ImmutableList(ImmutableList(v) for v in value_tuples)
+                                                   for value_tuples in amb_attr_tuple_list)
+        result.attribute_names = tuple(attribute_names)
+        result.index_type = index_type
+        return result
+
     def __getitem__(self, item):
         if isinstance(item, slice):
             return ImmutableList(self.amb_attr_tuple_list[item])
@@ -11,6 +11,7 @@ from packaging.version import parse as parse_version
 
 from estnltk_core import BaseSpan, ElementaryBaseSpan, EnvelopingBaseSpan
 from estnltk_core import Span, EnvelopingSpan, Annotation, SpanList
+from estnltk_core.layer.span_list import create_span_list
 from estnltk_core.layer import AmbiguousAttributeTupleList, AmbiguousAttributeList, AttributeTupleList, AttributeList
 
 
@@ -140,7 +141,7 @@ class BaseLayer:
         self.parent = parent
         self.enveloping = enveloping
 
-        self._span_list = SpanList()
+        self._span_list = create_span_list()
 
         self.ambiguous = ambiguous
 
@@ -692,6 +693,46 @@ class BaseLayer:
         self.add_span(span)
         return annotation
 
+    def spans_within(self, start: int, end: int) -> List[Span]:
+        """Returns spans of this layer that are located inside the 
+           text region [start, end), that is, all spans for which 
+           start <= span.start and span.end <= end holds.
+           Spans are returned in the order of the layer.
+        """
+        return self._span_list.spans_within(start, end)
+
+    def spans_overlapping(self, start: int, end: int) -> List[Span]:
+        """Returns spans of this layer that overlap with the text 
+           region [start, end), that is, all spans for which 
+           span.start < end and start < span.end holds.
+           Spans are returned in the order of the layer.
+        """
+        return self._span_list.spans_overlapping(start, end)
+
+    def spans_enclosing(self, start: int, end: int) -> List[Span]:
+        """Returns spans of this layer that enclose the text region 
+           [start, end), that is, all spans for which 
+           span.start <= start and end <= span.end holds.
+           Spans are returned in the order of the layer.
+        """
+        return self._span_list.spans_enclosing(start, end)
+
+    def enclosing_span(self, start: int, end: int) -> Optional[Span]:
+        """Returns the smallest span of this layer that encloses the 
+           text region [start, end), or None if there is no such span. 
+           If there are several smallest enclosing spans (e.g. in case 
+           of an enveloping layer), returns the first one of them.
+           
+           Useful for finding the sentence (or any other enveloping 
+           unit) that contains a word: 
+               sentences_layer.enclosing_span(word.start, word.end)
+        """
+        result = None
+        for span in self._span_list.spans_enclosing(start, end):
+            if result is None or span.end - span.start < result.end - result.start:
+                result = span
+        return result
+
     def remove_span(self, span):
         """Removes given span from the layer.
         """
@@ -701,7 +742,7 @@ class BaseLayer:
         """Removes all spans (and annotations) from this layer.
            Note: Clearing preserves the span level of the layer.
         """
-        self._span_list = SpanList(span_level=self.span_level)
+        self._span_list = create_span_list(span_level=self.span_level)
 
     def check_span_consistency(self) -> Optional[str]:
         """Checks for layer's span consistency.
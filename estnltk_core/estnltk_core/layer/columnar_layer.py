@@ -0,0 +1,499 @@
+#
+#   ColumnarLayer -- a memory-efficient, array-backed storage mode for span layers.
+#
+#   In a regular Layer, each span is a Span object holding a list of Annotation
+#   objects, and each Annotation has its own attribute dictionary. ColumnarLayer
+#   stores the same information in columns instead:
+#
+#   * start and end positions of spans are stored in typed arrays;
+#   * annotations of spans are stored consecutively, and span i owns annotations
+#     in the range annotation_offsets[i] .. annotation_offsets[i+1];
+#   * values of each attribute are interned (each distinct value is stored only
+#     once) and the column itself is a typed array of value codes;
+#
+#   Span and Annotation objects are created lazily, only when they are accessed,
+#   and they are views: changing attribute values of a view does not change the
+#   layer. Use add_annotation / remove_span for making changes, or convert the
+#   layer back to a regular Layer via ColumnarLayer.to_layer().
+#
+from array import array
+from typing import Any, Dict, List, Sequence, Union
+import collections
+
+import numpy as np
+
+from estnltk_core import BaseSpan, ElementaryBaseSpan, EnvelopingBaseSpan
+from estnltk_core import Span, Annotation
+from estnltk_core.layer.span_list import SpanList
+from estnltk_core.layer.interval_index import IntervalIndex
+from estnltk_core.layer.layer import Layer
+from estnltk_core.layer.base_layer import to_base_span
+from estnltk_core.layer import AmbiguousAttributeTupleList, AmbiguousAttributeList
+from estnltk_core.layer import AttributeTupleList, AttributeList
+
+# Type code of integer arrays used for storing positions, offsets and value codes
+ARRAY_TYPECODE = 'q'
+# Numpy dtype corresponding to ARRAY_TYPECODE
+ARRAY_DTYPE = np.int64
+
+
+class ColumnarSpanList(SpanList):
+    """
+    Array-backed container of elementary spans sorted by (start, end) indexes.
+
+    Provides the SpanList interface, but instead of Span objects, stores
+    span positions and annotation values in columns (typed arrays). Span
+    objects are created on demand as views to the data.
+    """
+
+    def __init__(self, layer: 'ColumnarLayer'):
+        self._layer = layer
+        self._span_level = 0
+        # Positions of spans
+        self._starts = array(ARRAY_TYPECODE)
+        self._ends = array(ARRAY_TYPECODE)
+        # Annotations of span i: _annotation_offsets[i] .. _annotation_offsets[i+1]
+        self._annotation_offsets = array(ARRAY_TYPECODE, [0])
+        # Optional[IntervalIndex] (built lazily in range queries)
+        self._interval_index = None
+        # Attribute columns: value codes of each annotation
+        self._codes = {}        # Dict[str, array]
+        # Distinct values of each attribute (indexed by value code)
+        self._vocabularies = {} # Dict[str, List[Any]]
+        # Mappings from (hashable) values to value codes
+        self._value_codes = {}  # Dict[str, Dict[Any, int]]
+        for attribute in layer.attributes:
+            self._column(attribute)
+
+    def __copy__(self):
+        result = self.__class__(self._layer)
+        result._starts = array(ARRAY_TYPECODE, self._starts)
+        result._ends = array(ARRAY_TYPECODE, self._ends)
+        result._annotation_offsets = array(ARRAY_TYPECODE, self._annotation_offsets)
+        result._codes = {attr: array(ARRAY_TYPECODE, codes) for attr, codes in self._codes.items()}
+        result._vocabularies = {attr: list(vocabulary) for attr, vocabulary in self._vocabularies.items()}
+        result._value_codes = {attr: dict(value_codes) for attr, value_codes in self._value_codes.items()}
+        return result
+
+    # ====================================
+    #   Encoding and decoding values
+    # ====================================
+
+    def _column(self, attribute: str) -> array:
+        """Returns value codes of the attribute. Creates the column if it is missing."""
+        codes = self._codes.get(attribute)
+        if codes is None:
+            self._vocabularies[attribute] = []
+            self._value_codes[attribute] = {}
+            codes = array(ARRAY_TYPECODE)
+            if self.annotation_count > 0:
+                # Backfill: all existing annotations get the default value
+                default_code = self._encode(attribute, self._layer.default_values.get(attribute))
+                codes = array(ARRAY_TYPECODE, [default_code]) * self.annotation_count
+            self._codes[attribute] = codes
+        return codes
+
+    def _encode(self, attribute: str, value: Any) -> int:
+        """Returns the code of the value in the vocabulary of the attribute.
+           Hashable values are interned; unhashable values (e.g. lists)
+           are appended to the vocabulary without interning."""
+        vocabulary = self._vocabularies[attribute]
+        try:
+            # Include type in the key, so that e.g. 1, 1.0 and True
+            # are not interned as one value
+            key = (type(value), value)
+            code = self._value_codes[attribute].get(key)
+        except TypeError:
+            key = None
+            code = None
+        if code is None:
+            code = len(vocabulary)
+            vocabulary.append(value)
+            if key is not None:
+                self._value_codes[attribute][key] = code
+        return code
+
+    def _decode(self, attribute: str, code: int) -> Any:
+        return self._vocabularies[attribute][code]
+
+    def _decode_column(self, attribute: str) -> List[Any]:
+        """Returns values of the attribute over all annotations (decodes the whole column at once)."""
+        vocabulary = self._vocabularies[attribute]
+        # Fill element by element: values can be sequences themselves
+        values = np.empty(len(vocabulary), dtype=object)
+        for code, value in enumerate(vocabulary):
+            values[code] = value
+        return values[np.frombuffer(self._column(attribute), dtype=ARRAY_DTYPE)].tolist()
+
+    def _insert_annotations(self, position: int, annotations: Sequence[Dict[str, Any]]):
+        """Inserts value codes of the given annotations into all columns, starting from the given position."""
+        attributes = set(self._layer.attributes) | set(self._codes.keys())
+        for attribute in attributes:
+            codes = self._column(attribute)
+            new_codes = [self._encode(attribute, annotation.get(attribute, self._layer.default_values.get(attribute)))
+                         for annotation in annotations]
+            codes[position:position] = array(ARRAY_TYPECODE, new_codes)
+
+    def _shift_offsets(self, from_index: int, delta: int):
+        # Update the array in place through a numpy view of its buffer.
+        # Note: the view must not outlive this call, because an array
+        # that exports its buffer cannot be resized
+        offsets = np.frombuffer(self._annotation_offsets, dtype=ARRAY_DTYPE)
+        offsets[from_index:] += delta
+
+    # ====================================
+    #   Locating spans
+    # ====================================
+
+    def _bisect(self, start: int, end: int) -> int:
+        """Returns the leftmost index where span (start, end) can be inserted, keeping spans sorted."""
+        starts, ends = self._starts, self._ends
+        lo, hi = 0, len(starts)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if (starts[mid], ends[mid]) < (start, end):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _find(self, base_span: BaseSpan) -> int:
+        """Returns the index of the given base span, or -1 if the base span is missing."""
+        if not isinstance(base_span, ElementaryBaseSpan):
+            return -1
+        i = self._bisect(base_span.start, base_span.end)
+        if i < len(self._starts) and self._starts[i] == base_span.start and self._ends[i] == base_span.end:
+            return i
+        return -1
+
+    def _spans_version(self) -> int:
+        # Columns can only be changed via methods of ColumnarSpanList,
+        # and all the methods call _changed()
+        return 0
+
+    def _build_interval_index(self) -> IntervalIndex:
+        return IntervalIndex(self._starts, self._ends)
+
+    def _span_view(self, index: int) -> Span:
+        """Creates a Span object (along with its Annotation objects) corresponding to the span at the given index."""
+        span = Span(base_span=ElementaryBaseSpan(self._starts[index], self._ends[index]), layer=self._layer)
+        attributes = self._layer.attributes
+        for i in range(self._annotation_offsets[index], self._annotation_offsets[index + 1]):
+            attribute_dict = {attr: self._decode(attr, self._codes[attr][i]) if attr in self._codes else
+                                    self._layer.default_values.get(attr) for attr in attributes}
+            span._annotations.append(Annotation(span, attribute_dict))
+        return span
+
+    # ====================================
+    #   SpanList interface
+    # ====================================
+
+    def add_span(self, span: Span):
+        if not isinstance(span.base_span, ElementaryBaseSpan):
+            raise TypeError(('(!) ColumnarSpanList supports only elementary spans, '+\
+                             'not {!r}').format(span.base_span))
+        base_span = span.base_span
+        i = self._bisect(base_span.start, base_span.end)
+        assert self._find(base_span) == -1
+        self._starts.insert(i, base_span.start)
+        self._ends.insert(i, base_span.end)
+        self._changed()
+        annotations = [annotation.__dict__ for annotation in span.annotations]
+        position = self._annotation_offsets[i]
+        self._insert_annotations(position, annotations)
+        self._annotation_offsets.insert(i + 1, position)
+        self._shift_offsets(i + 1, len(annotations))
+
+    def add_annotation_to_span(self, index: int, annotation: Dict[str, Any]) -> int:
+        """Appends annotation to the span at the given index. Returns index of the new annotation in the span."""
+        position = self._annotation_offsets[index + 1]
+        self._insert_annotations(position, [annotation])
+        self._shift_offsets(index + 1, 1)
+        return position - self._annotation_offsets[index]
+
+    def get(self, span: BaseSpan):
+        i = self._find(span)
+        if i > -1:
+            return self._span_view(i)
+
+    def remove_span(self, span):
+        i = self._find(span.base_span)
+        if i == -1:
+            raise KeyError(span.base_span)
+        start, end = self._annotation_offsets[i], self._annotation_offsets[i + 1]
+        for codes in self._codes.values():
+            del codes[start:end]
+        del self._starts[i]
+        del self._ends[i]
+        self._changed()
+        del self._annotation_offsets[i + 1]
+        self._shift_offsets(i + 1, start - end)
+
+    @property
+    def spans(self):
+        """Returns this ColumnarSpanList: a lazy sequence of span views."""
+        return self
+
+    @property
+    def annotation_count(self) -> int:
+        return self._annotation_offsets[-1]
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __contains__(self, item: Any) -> bool:
+        if isinstance(item, BaseSpan):
+            return self._find(item) > -1
+        if isinstance(item, Span):
+            i = self._find(item.base_span)
+            return i > -1 and self._span_view(i) == item
+        return False
+
+    def index(self, x, *args) -> int:
+        i = self._find(x.base_span) if isinstance(x, Span) else -1
+        if i == -1:
+            raise ValueError('{!r} is not in {}'.format(x, self.__class__.__name__))
+        return i
+
+    def __setitem__(self, key: int, value: Span):
+        self.remove_span(self[key])
+        self.add_span(value)
+
+    def __getitem__(self, idx) -> Union[Span, List[Span]]:
+        if isinstance(idx, slice):
+            return [self._span_view(i) for i in range(len(self))[idx]]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError('span index out of range')
+        return self._span_view(idx)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._span_view(i)
+
+    def __str__(self):
+        return 'CSL[{spans}]'.format(spans=',\n'.join(str(i) for i in self))
+
+
+class ColumnarLayer(Layer):
+    """Layer that stores its spans and annotations in columnar, array-backed storage.
+
+       ColumnarLayer has the same interface as Layer, but it keeps start/end positions
+       of spans and annotation values in typed arrays, interning attribute values per
+       column. This avoids creating millions of small Python objects for large layers
+       (e.g. morph_analysis of a long document). Span and Annotation objects are created
+       lazily as views when spans are accessed.
+
+       Limitations:
+       * only non-enveloping layers (layers made of elementary spans) are supported;
+       * spans and annotations obtained from the layer are views: modifying them does
+         not modify the layer. Use add_annotation() and remove_span() for changes, or
+         convert the layer into a regular Layer with to_layer();
+
+       Example:
+
+           >>> columnar = ColumnarLayer.from_layer( text['morph_analysis'] )
+           >>> columnar['lemma']   # attribute values are read from columns
+           >>> columnar.starts     # span start positions as an array
+    """
+
+    def __init__(self,
+                 name: str,
+                 attributes: Sequence[str] = (),
+                 secondary_attributes: Sequence[str] = (),
+                 text_object: Union['BaseText','Text']=None,
+                 parent: str = None,
+                 enveloping: str = None,
+                 ambiguous: bool = False,
+                 default_values: dict = None,
+                 serialisation_module=None
+                 ) -> None:
+        if enveloping is not None:
+            raise ValueError('(!) ColumnarLayer does not support enveloping layers.')
+        super().__init__(name=name,
+                         attributes=attributes,
+                         secondary_attributes=secondary_attributes,
+                         text_object=text_object,
+                         parent=parent,
+                         enveloping=enveloping,
+                         ambiguous=ambiguous,
+                         default_values=default_values,
+                         serialisation_module=serialisation_module)
+        self._span_list = ColumnarSpanList(self)
+
+    @classmethod
+    def from_layer(cls, layer: 'BaseLayer') -> 'ColumnarLayer':
+        """Creates a new ColumnarLayer with the same configuration and content as the given layer.
+           Note: the new layer is not attached to the Text object (but its text_object is set).
+        """
+        result = cls(name=layer.name,
+                     attributes=layer.attributes,
+                     secondary_attributes=layer.secondary_attributes,
+                     text_object=layer.text_object,
+                     parent=layer.parent,
+                     enveloping=layer.enveloping,
+                     ambiguous=layer.ambiguous,
+                     default_values=layer.default_values,
+                     serialisation_module=layer.serialisation_module)
+        result.meta = dict(layer.meta)
+        span_list = result._span_list
+        starts, ends = span_list._starts, span_list._ends
+        offsets = span_list._annotation_offsets
+        annotations = []
+        for span in layer:
+            # spans of the source layer are already sorted,
+            # so we can simply append to the columns
+            starts.append(span.start)
+            ends.append(span.end)
+            annotations.extend(annotation.__dict__ for annotation in span.annotations)
+            offsets.append(len(annotations))
+        span_list._insert_annotations(0, annotations)
+        span_list._changed()
+        return result
+
+    def to_layer(self) -> Layer:
+        """Converts this ColumnarLayer into a regular Layer (with Span and Annotation objects)."""
+        layer = Layer(name=self.name,
+                      attributes=self.attributes,
+                      secondary_attributes=self.secondary_attributes,
+                      text_object=self.text_object,
+                      parent=self.parent,
+                      enveloping=self.enveloping,
+                      ambiguous=self.ambiguous,
+                      default_values=self.default_values,
+                      serialisation_module=self.serialisation_module)
+        layer.meta = dict(self.meta)
+        for span in self:
+            for annotation in span.annotations:
+                layer.add_annotation(span.base_span, annotation.__dict__)
+        return layer
+
+    def __copy__(self):
+        result = super().__copy__()
+        if isinstance(result._span_list, ColumnarSpanList):
+            result._span_list._layer = result
+        return result
+
+    @property
+    def spans(self):
+        """Returns the list of spans of this layer, sorted by
+           start indexes.
+
+           Note: in ColumnarLayer, the spans are views that are
+           created on each call. Modifying these spans does not
+           change the layer.
+        """
+        return list(self._span_list)
+
+    @property
+    def _is_columnar(self) -> bool:
+        # Snapshot layers created via slicing (e.g. layer[0:5]) are
+        # backed by a regular SpanList of span views
+        return isinstance(self._span_list, ColumnarSpanList)
+
+    @property
+    def starts(self) -> memoryview:
+        """Start positions of spans (read-only view to the array)."""
+        if not self._is_columnar:
+            return memoryview(array(ARRAY_TYPECODE, [span.start for span in self])).toreadonly()
+        return memoryview(self._span_list._starts).toreadonly()
+
+    @property
+    def ends(self) -> memoryview:
+        """End positions of spans (read-only view to the array)."""
+        if not self._is_columnar:
+            return memoryview(array(ARRAY_TYPECODE, [span.end for span in self])).toreadonly()
+        return memoryview(self._span_list._ends).toreadonly()
+
+    @property
+    def annotation_offsets(self) -> memoryview:
+        """Offsets of annotations: annotations of the span i are located at
+           annotation_offsets[i] .. annotation_offsets[i+1] in attribute columns.
+           (read-only view to the array)
+        """
+        if not self._is_columnar:
+            offsets = [0]
+            for span in self:
+                offsets.append(offsets[-1] + len(span.annotations))
+            return memoryview(array(ARRAY_TYPECODE, offsets)).toreadonly()
+        return memoryview(self._span_list._annotation_offsets).toreadonly()
+
+    def column(self, attribute: str) -> List[Any]:
+        """Returns a flat list of values of the attribute over all annotations of the layer.
+           Use annotation_offsets to find out which values belong to which span.
+        """
+        if attribute not in self.attributes:
+            raise KeyError(attribute)
+        if not self._is_columnar:
+            return [annotation[attribute] for span in self for annotation in span.annotations]
+        return self._span_list._decode_column(attribute)
+
+    def add_annotation(self, base_span, attribute_dict: Dict[str, Any]={}, **attribute_kwargs) -> Annotation:
+        if not self._is_columnar:
+            return super().add_annotation(base_span, attribute_dict, **attribute_kwargs)
+        base_span = to_base_span(base_span)
+        if isinstance(base_span, EnvelopingBaseSpan):
+            raise TypeError('Cannot add {!r} to non-enveloping layer. Elementary span is required.'.format(base_span))
+        if not isinstance(attribute_dict, dict):
+            raise ValueError('(!) attribute_dict should be an instance of dict, not {}'.format(type(attribute_dict)))
+        attributes = {**self.default_values, \
+                      **{k: v for k, v in attribute_dict.items() if k in self.attributes}, \
+                      **{k: v for k, v in attribute_kwargs.items() if k in self.attributes}}
+        span_list = self._span_list
+        i = span_list._find(base_span)
+        if i > -1:
+            if not self.ambiguous:
+                raise ValueError('the layer is not ambiguous and already contains this span')
+            span = span_list._span_view(i)
+            for annotation in span.annotations:
+                if annotation == Annotation(span, attributes):
+                    # Do not add duplicate annotations
+                    return None
+            annotation_index = span_list.add_annotation_to_span(i, attributes)
+            return span_list._span_view(i).annotations[annotation_index]
+        span = Span(base_span=base_span, layer=self)
+        span.add_annotation(Annotation(span, attributes))
+        self.add_span(span)
+        return span_list._span_view(span_list._find(base_span)).annotations[0]
+
+    def clear_spans(self):
+        """Removes all spans (and annotations) from this layer."""
+        self._span_list = ColumnarSpanList(self)
+
+    def attribute_values(self, attributes, index_attributes=[]):
+        """Returns a matrix-like data structure containing all annotations of this layer with the selected attributes.
+
+           Values of regular attributes are read directly from columns, without materializing spans.
+           For details about the parameters and results, see BaseLayer.attribute_values().
+        """
+        if not self._is_columnar or index_attributes or not isinstance(attributes, (str, list, tuple)):
+            return super().attribute_values(attributes, index_attributes=index_attributes)
+        attribute_names = [attributes] if isinstance(attributes, str) else list(attributes)
+        if len(attribute_names) == 0 or any(attr not in self.attributes for attr in attribute_names):
+            # Let the BaseLayer handle errors and special attributes (e.g. 'text')
+            return super().attribute_values(attributes, index_attributes=index_attributes)
+        span_list = self._span_list
+        # Annotation value tuples in the column order, and
+        # values of span i are the slice rows[offsets[i]:offsets[i+1]]
+        rows = list(zip(*[span_list._decode_column(attr) for attr in attribute_names]))
+        offsets = span_list._annotation_offsets
+        values = [rows[start:end] for start, end in zip(offsets, offsets[1:])]
+        if self.ambiguous:
+            result_class = AmbiguousAttributeList if isinstance(attributes, str) else AmbiguousAttributeTupleList
+        else:
+            result_class = AttributeList if isinstance(attributes, str) else AttributeTupleList
+        return result_class.from_values(values, attribute_names)
+
+    def count_values(self, attribute: str) -> collections.Counter:
+        """Counts attribute values and returns frequency table (collections.Counter).
+           Note: you can also use 'text' as the attribute name to count corresponding
+           surface text strings.
+        """
+        if not self._is_columnar or attribute not in self.attributes:
+            return super().count_values(attribute)
+        span_list = self._span_list
+        result = collections.Counter()
+        for code, count in collections.Counter(span_list._column(attribute)).items():
+            result[span_list._decode(attribute, code)] += count
+        return result
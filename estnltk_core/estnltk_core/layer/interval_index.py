@@ -0,0 +1,99 @@
+import bisect
+from typing import Callable, List, Sequence
+
+
+class IntervalIndex:
+    """
+    IntervalIndex is a static index of text intervals (spans) for
+    answering positional queries: which spans are located within
+    a text region, which spans overlap with a region, and which
+    spans enclose a region.
+
+    Intervals are ordered by start positions, and the index is an
+    implicit (array-based) interval tree on top of that order: each
+    node of a complete binary tree covers a range of intervals and
+    holds the minimum and the maximum end position in the range.
+    A query first finds the range of candidate intervals by their
+    start positions (binary search), and then descends the tree,
+    skipping nodes whose end positions cannot satisfy the query.
+    Thus, a query takes O((k+1) log n) time, where k is the number
+    of intervals found. Long intervals (e.g. a paragraph preceding
+    the queried region) do not slow down the search.
+
+    Queries return indexes of intervals in the input sequences (in
+    increasing order), so the same index can be used by all SpanList
+    implementations. Intervals are usually given in the order of
+    spans of a layer (sorted by start positions), but any order is
+    accepted. The index is not updated on changes of the layer:
+    SpanList builds it lazily and discards it after the spans have
+    been changed.
+    """
+
+    __slots__ = ['_starts', '_order', '_size', '_min_ends', '_max_ends']
+
+    def __init__(self, starts: Sequence[int], ends: Sequence[int]):
+        assert len(starts) == len(ends)
+        n = len(starts)
+        # _order[i] -- index (in the input) of the i-th interval by start,
+        # or None, if the intervals are already ordered by start
+        if all(starts[i - 1] <= starts[i] for i in range(1, n)):
+            self._order = None
+        else:
+            self._order = sorted(range(n), key=lambda i: (starts[i], ends[i]))
+            starts = [starts[i] for i in self._order]
+            ends = [ends[i] for i in self._order]
+        self._starts = list(starts)
+        # Tree nodes are numbered from 1 (the root); children of
+        # the node i are 2*i and 2*i+1; leaves are size .. size+n-1
+        size = 1
+        while size < n:
+            size *= 2
+        self._size = size
+        self._min_ends = [float('inf')] * (2 * size)
+        self._max_ends = [float('-inf')] * (2 * size)
+        self._min_ends[size:size + n] = ends
+        self._max_ends[size:size + n] = ends
+        for node in range(size - 1, 0, -1):
+            self._min_ends[node] = min(self._min_ends[2 * node], self._min_ends[2 * node + 1])
+            self._max_ends[node] = max(self._max_ends[2 * node], self._max_ends[2 * node + 1])
+
+    def _search(self, lo: int, hi: int, node_ends: List[int], accept: Callable[[int], bool]) -> List[int]:
+        """Returns input indexes of intervals in the range lo .. hi-1 (in the order
+           by start) whose end positions are accepted. Subtrees are skipped if
+           their minimum (or maximum) end position in node_ends is not accepted.
+        """
+        result = []
+        size = self._size
+        stack = [(1, 0, size)]
+        while stack:
+            node, node_lo, node_hi = stack.pop()
+            if node_hi <= lo or hi <= node_lo or not accept(node_ends[node]):
+                continue
+            if node >= size:
+                result.append(node - size)
+            else:
+                middle = (node_lo + node_hi) // 2
+                stack.append((2 * node + 1, middle, node_hi))
+                stack.append((2 * node, node_lo, middle))
+        if self._order is not None:
+            result = sorted(self._order[i] for i in result)
+        return result
+
+    def within(self, start: int, end: int) -> List[int]:
+        """Returns indexes of intervals for which start <= interval.start and interval.end <= end."""
+        lo = bisect.bisect_left(self._starts, start)
+        hi = bisect.bisect_right(self._starts, end)
+        return self._search(lo, hi, self._min_ends, lambda node_end: node_end <= end)
+
+    def overlapping(self, start: int, end: int) -> List[int]:
+        """Returns indexes of intervals for which interval.start < end and start < interval.end."""
+        hi = bisect.bisect_left(self._starts, end)
+        return self._search(0, hi, self._max_ends, lambda node_end: node_end > start)
+
+    def enclosing(self, start: int, end: int) -> List[int]:
+        """Returns indexes of intervals for which interval.start <= start and end <= interval.end."""
+        hi = bisect.bisect_right(self._starts, start)
+        return self._search(0, hi, self._max_ends, lambda node_end: node_end >= end)
+
+    def __len__(self) -> int:
+        return len(self._starts)
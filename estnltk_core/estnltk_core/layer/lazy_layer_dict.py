@@ -0,0 +1,64 @@
+from collections.abc import MutableMapping
+from typing import Callable, Union
+
+
+class SerialisedLayer:
+    """
+    A layer in the serialised form: layer dict and the function for converting it to a layer.
+    """
+    __slots__ = ['layer_dict', 'dict_to_layer']
+
+    def __init__(self, layer_dict: dict, dict_to_layer: Callable):
+        self.layer_dict = layer_dict
+        self.dict_to_layer = dict_to_layer
+
+
+class LazyLayerDict(MutableMapping):
+    """
+    LazyLayerDict maps layer names to layers of a text object, holding some of
+    the layers in the serialised form. A serialised layer is deserialised on
+    the first access, and the resulting layer replaces the serialised form.
+
+    Text objects use LazyLayerDict instead of a regular dict only if layers
+    have been added in the serialised form (see BaseText.add_serialised_layer).
+    Operations that do not need layer objects (e.g. checking if a layer
+    exists, listing layer names) do not trigger the deserialisation.
+    """
+    __slots__ = ['_text_object', '_items']
+
+    def __init__(self, text_object: Union['BaseText', 'Text'], layers: dict = None):
+        self._text_object = text_object
+        self._items = dict(layers) if layers is not None else {}
+
+    def add_serialised_layer(self, name: str, layer_dict: dict, dict_to_layer: Callable):
+        self._items[name] = SerialisedLayer(layer_dict, dict_to_layer)
+
+    def is_deserialised(self, name: str) -> bool:
+        return not isinstance(self._items[name], SerialisedLayer)
+
+    def __getitem__(self, name: str):
+        value = self._items[name]
+        if isinstance(value, SerialisedLayer):
+            value = value.dict_to_layer(value.layer_dict, self._text_object)
+            self._items[name] = value
+        return value
+
+    def __setitem__(self, name: str, layer):
+        self._items[name] = layer
+
+    def __delitem__(self, name: str):
+        del self._items[name]
+
+    def __contains__(self, name) -> bool:
+        return name in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__,
+                               ', '.join('{}{}'.format(name, '' if self.is_deserialised(name) else ' (serialised)')
+                                         for name in self._items))
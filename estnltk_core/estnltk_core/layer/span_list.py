@@ -1,22 +1,82 @@
 import bisect
+import functools
 from collections.abc import Sequence
 from typing import Union, Any, Hashable, List
 
 from estnltk_core import BaseSpan, Span
+from estnltk_core.common import LAYER_CONFIG
+from estnltk_core.layer.interval_index import IntervalIndex
+
+try:
+    from sortedcontainers import SortedKeyList
+except ImportError:
+    SortedKeyList = None
+
+
+def _count_changes(method):
+    """Wraps a method that changes a container, so that each call increments
+       the change counter (attribute `version`) of the container."""
+    @functools.wraps(method)
+    def counting_method(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+    return counting_method
+
+
+class _ChangeCountingList(list):
+    """List of spans that counts changes made to it. Used by SpanList for
+       detecting changes that were made directly to the list of spans."""
+
+    # Class level default: unpickling appends spans before
+    # the instance attributes are restored
+    version = 0
+
+    def __init__(self, spans=()):
+        self.version = 0
+        super().__init__(spans)
+
+
+for _method in ['append', 'extend', 'insert', 'pop', 'remove', 'clear', 'sort', 'reverse',
+                '__setitem__', '__delitem__', '__iadd__', '__imul__']:
+    setattr(_ChangeCountingList, _method, _count_changes(getattr(list, _method)))
+
+
+if SortedKeyList is not None:
+    class _ChangeCountingSortedKeyList(SortedKeyList):
+        """SortedKeyList of spans that counts changes made to it. Used by
+           SortedSpanList for detecting changes that were made directly
+           to the container of spans."""
+
+        def __init__(self, spans=(), key=None):
+            self.version = 0
+            super().__init__(spans, key=key)
+
+    for _method in ['add', 'update', 'clear', 'discard', 'remove', 'pop',
+                    '__delitem__', '__iadd__', '__imul__']:
+        setattr(_ChangeCountingSortedKeyList, _method,
+                _count_changes(getattr(SortedKeyList, _method)))
 
 
 class SpanList(Sequence):
     """
     SpanList is a container of Spans sorted by start indexes.
-    
+
     Note: all spans in SpanList must have the same (base
     span) level, but SpanList itself does not validate that span
-    levels match. It is the responsibility of a programmer 
-    to assure that the spanlist is populated with equal-level 
+    levels match. It is the responsibility of a programmer
+    to assure that the spanlist is populated with equal-level
     spans (for more about span levels, see the docstring of
     BaseSpan from estnltk_core).
-    
-    # TODO replace with SortedDict ??
+
+    SpanList stores spans in a Python list. For a container
+    with O(log n) insertion and removal of spans, see
+    SortedSpanList.
+
+    Positional queries (spans_within, spans_overlapping and
+    spans_enclosing) are answered via IntervalIndex, which is
+    built lazily on the first query and rebuilt after the spans
+    have been changed (either via methods of SpanList, or
+    directly in the list of spans).
     """
 
     def __init__(self, span_level=None):
@@ -27,13 +87,42 @@ class SpanList(Sequence):
         # List[Span]
         self.spans = []
 
+    @property
+    def spans(self):
+        return self._spans
+
+    @spans.setter
+    def spans(self, spans):
+        self._spans = _ChangeCountingList(spans)
+        self._changed()
+
+    def __setstate__(self, state):
+        state = dict(state)
+        # SpanList-s pickled with older versions store
+        # spans as a plain list under the key 'spans'
+        spans = state.pop('spans', None)
+        self.__dict__.update(state)
+        if spans is not None:
+            self.spans = spans
+        elif '_interval_index' not in state:
+            self._changed()
+
+    def _changed(self):
+        # Spans were changed: discard the interval index
+        self._interval_index = None
+
+    def _spans_version(self) -> int:
+        """Returns the number of changes made to the container of spans."""
+        return self._spans.version
+
     def add_span(self, span):
         assert span.base_span not in self._base_span_to_span
         bisect.insort(self.spans, span)
         self._base_span_to_span[span.base_span] = span
+        self._changed()
         if self._span_level is None:
-            # Level of the first span is the level 
-            # of this spanlist. Once the level is 
+            # Level of the first span is the level
+            # of this spanlist. Once the level is
             # set, it should not be changed
             self._span_level = span.base_span.level
 
@@ -42,7 +131,52 @@ class SpanList(Sequence):
 
     def remove_span(self, span):
         del self._base_span_to_span[span.base_span]
-        self.spans.remove(span)
+        self._changed()
+        # Locate the span via binary search instead of
+        # comparing it against all spans of the list
+        spans = self.spans
+        i = bisect.bisect_left(spans, span)
+        while i < len(spans) and spans[i].base_span == span.base_span:
+            if spans[i] is span:
+                del spans[i]
+                return
+            i += 1
+        spans.remove(span)
+
+    @property
+    def interval_index(self) -> IntervalIndex:
+        """Returns IntervalIndex of the spans. The index is built on
+           the first call and rebuilt after the spans have changed.
+        """
+        # Note: the version check catches changes that were made
+        # to the list of spans directly (bypassing _changed())
+        version = self._spans_version()
+        if self._interval_index is None or self._interval_index_version != version:
+            self._interval_index = self._build_interval_index()
+            self._interval_index_version = version
+        return self._interval_index
+
+    def _build_interval_index(self) -> IntervalIndex:
+        spans = self.spans
+        return IntervalIndex([span.start for span in spans], [span.end for span in spans])
+
+    def spans_within(self, start: int, end: int) -> List[Span]:
+        """Returns spans that are located inside the text region [start, end),
+           that is, spans with start <= span.start and span.end <= end.
+        """
+        return [self[i] for i in self.interval_index.within(start, end)]
+
+    def spans_overlapping(self, start: int, end: int) -> List[Span]:
+        """Returns spans that overlap with the text region [start, end),
+           that is, spans with span.start < end and start < span.end.
+        """
+        return [self[i] for i in self.interval_index.overlapping(start, end)]
+
+    def spans_enclosing(self, start: int, end: int) -> List[Span]:
+        """Returns spans that enclose the text region [start, end),
+           that is, spans with span.start <= start and end <= span.end.
+        """
+        return [self[i] for i in self.interval_index.enclosing(start, end)]
 
     @property
     def text(self):
@@ -68,15 +202,96 @@ class SpanList(Sequence):
     def __setitem__(self, key: int, value: Span):
         self.spans[key] = value
         self._base_span_to_span[value.base_span] = value
+        self._changed()
 
     def __getitem__(self, idx) -> Union[Span, List[Span]]:
         return self.spans[idx]
 
+    def __iter__(self):
+        return iter(self.spans)
+
     def __eq__(self, other: Any) -> bool:
-        return isinstance(other, SpanList) and self.spans == other.spans
+        # Compare span by span, so that SpanList-s with
+        # different storage backends can also be compared
+        return isinstance(other, SpanList) and len(self) == len(other) and \
+               all(span == other_span for span, other_span in zip(self, other))
 
     def __str__(self):
         return 'SL[{spans}]'.format(spans=',\n'.join(str(i) for i in self.spans))
 
     def __repr__(self):
         return str(self)
+
+
+def _span_sort_key(span: Span):
+    # Same ordering as in BaseSpan.__lt__, but spans can
+    # also be searched by their start positions only
+    return (span.start, span.end, span.base_span.raw())
+
+
+class SortedSpanList(SpanList):
+    """
+    SortedSpanList is a container of Spans sorted by start indexes,
+    which uses a sorted container (sortedcontainers.SortedKeyList)
+    for storing spans. Adding and removing a span takes O(log n)
+    time, instead of O(n) time required by SpanList.
+
+    Note: spans of SortedSpanList can only be added / removed with
+    methods add_span / remove_span; sorted container does not allow
+    to insert spans to arbitrary positions.
+
+    Requires package sortedcontainers.
+    """
+
+    def __init__(self, span_level=None):
+        if SortedKeyList is None:
+            raise ImportError('(!) SortedSpanList requires sortedcontainers package. '+\
+                              'Please install it via "pip install sortedcontainers".')
+        super().__init__(span_level=span_level)
+
+    @property
+    def spans(self):
+        return self._spans
+
+    @spans.setter
+    def spans(self, spans):
+        self._spans = _ChangeCountingSortedKeyList(spans, key=_span_sort_key)
+        self._changed()
+
+    def add_span(self, span):
+        assert span.base_span not in self._base_span_to_span
+        self.spans.add(span)
+        self._base_span_to_span[span.base_span] = span
+        self._changed()
+        if self._span_level is None:
+            # Level of the first span is the level
+            # of this spanlist. Once the level is
+            # set, it should not be changed
+            self._span_level = span.base_span.level
+
+    def remove_span(self, span):
+        del self._base_span_to_span[span.base_span]
+        self.spans.remove(span)
+        self._changed()
+
+    def index(self, x, *args) -> int:
+        return self.spans.index(x, *args)
+
+    def __setitem__(self, key: int, value: Span):
+        old_span = self.spans[key]
+        if old_span.base_span != value.base_span:
+            del self._base_span_to_span[old_span.base_span]
+        del self.spans[key]
+        self.spans.add(value)
+        self._base_span_to_span[value.base_span] = value
+        self._changed()
+
+
+def create_span_list(span_level=None) -> SpanList:
+    """Creates a new empty container of spans for a layer.
+       If LAYER_CONFIG['sorted_span_list'] is set, returns
+       SortedSpanList, otherwise returns SpanList.
+    """
+    if LAYER_CONFIG.get('sorted_span_list', False):
+        return SortedSpanList(span_level=span_level)
+    return SpanList(span_level=span_level)
@@ -53,9 +53,10 @@ def iterate_intersecting_spans(spanlist: Union[List[Span], SpanList],
                 if yield_overlapped and not (following_nested or this_nested):
                     # If there is no nesting, there must be an overlap
                     yield span, following_span
-            elif span.end < following_span.start:
+            elif span.end <= following_span.start:
                 # Under the assumption that the list is sorted,
-                # there is no need to look further
+                # none of the following spans can intersect the
+                # span, so there is no need to look further
                 break
 
 
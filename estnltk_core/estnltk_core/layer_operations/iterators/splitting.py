@@ -9,6 +9,13 @@ from estnltk_core.layer_operations.iterators.splitting_discontinuous import spli
 from estnltk_core.layer_operations.layer_dependencies import find_layer_dependencies
 
 
+def _section_candidate_spans(layer, start: int, end: int, trim_overlapping: bool):
+    """Returns spans of the layer that can be kept in the section [start, end)."""
+    if trim_overlapping:
+        return layer.spans_overlapping(start, end)
+    return layer.spans_within(start, end)
+
+
 def extract_sections(text: Union['Text', 'BaseText'],
                      sections: Iterable,
                      layers_to_keep: Sequence = None,
@@ -83,7 +90,7 @@ def extract_sections(text: Union['Text', 'BaseText'],
                 if ambiguous:
                     raise NotImplementedError('ambiguous enveloping layer: '+ layer_name)
                 else:
-                    for span in layer.spans:
+                    for span in _section_candidate_spans(layer, start, end, trim_overlapping):
                         span_start = span.start
                         span_end = span.end
                         if trim_overlapping:
@@ -113,7 +120,7 @@ def extract_sections(text: Union['Text', 'BaseText'],
                         new_annotation = new_layer.add_annotation(spans, **attributes)
                         map_spans[(span.base_span, span.layer.name)] = new_annotation.span
             else:
-                for span in layer:
+                for span in _section_candidate_spans(layer, start, end, trim_overlapping):
                     span_start = span.start
                     span_end = span.end
                     if trim_overlapping:
@@ -1,4 +1,6 @@
-from typing import List, Union, Sequence
+from typing import List, Union, Sequence, Iterable, Iterator, Callable
+
+import multiprocessing
 
 from estnltk_core.taggers import Tagger, Retagger
 from estnltk_core.taggers_registry import TaggersRegistry
@@ -146,3 +148,134 @@ class LayerResolver:
             return ('<h4>{}</h4>'.format(self.__class__.__name__))+'\n<br>'+\
                     default_layers_str+'\n</br>'+self._taggers._repr_html_()
 
+
+# Worker process state of tag_layers_parallel: 
+# the resolver and the layers to be tagged
+_worker_resolver = None
+_worker_layers = None
+
+
+def _make_tagging_resolver(resolver_factory: Callable[[], LayerResolver], 
+                           layers: Union[str, Sequence[str], None]):
+    '''Creates a resolver with resolver_factory, and returns the resolver 
+       along with the list of layers to be tagged.'''
+    resolver = resolver_factory()
+    if not isinstance(resolver, LayerResolver):
+        raise TypeError( ('(!) resolver_factory should return an instance of LayerResolver, '+\
+                          'but it returned {}').format(type(resolver)) )
+    if layers is None:
+        layers = resolver.default_layers
+    elif isinstance(layers, str):
+        layers = [layers]
+    return resolver, list(layers)
+
+
+def _tag_text(resolver: LayerResolver, layers: List[str], 
+              text: Union['BaseText', 'Text']) -> Union['BaseText', 'Text']:
+    for layer_name in layers:
+        resolver.apply(text, layer_name)
+    return text
+
+
+def _init_parallel_tagging_worker(resolver_factory: Callable[[], LayerResolver], 
+                                  layers: Union[str, Sequence[str], None]) -> None:
+    '''Creates the resolver of the worker process. Called once per worker.'''
+    global _worker_resolver, _worker_layers
+    _worker_resolver, _worker_layers = _make_tagging_resolver(resolver_factory, layers)
+
+
+def _tag_text_in_worker(text: Union['BaseText', 'Text']) -> Union['BaseText', 'Text']:
+    return _tag_text(_worker_resolver, _worker_layers, text)
+
+
+def _iterate_tagged_texts(texts: Iterable[Union['BaseText', 'Text']],
+                          layers: Union[str, Sequence[str], None],
+                          resolver_factory: Callable[[], LayerResolver],
+                          workers: int,
+                          chunksize: int,
+                          mp_context: str) -> Iterator[Union['BaseText', 'Text']]:
+    if workers == 1:
+        # Tag in the calling process (useful for debugging). The resolver 
+        # is local to this iterator, so iterators do not interfere
+        resolver, layers = _make_tagging_resolver(resolver_factory, layers)
+        for text in texts:
+            yield _tag_text(resolver, layers, text)
+        return
+    context = multiprocessing.get_context(mp_context)
+    with context.Pool(processes=workers, 
+                      initializer=_init_parallel_tagging_worker, 
+                      initargs=(resolver_factory, layers)) as pool:
+        # imap streams texts through the pool and preserves their order
+        yield from pool.imap(_tag_text_in_worker, texts, chunksize=chunksize)
+
+
+def tag_layers_parallel(texts: Iterable[Union['BaseText', 'Text']],
+                        layers: Union[str, Sequence[str]] = None,
+                        resolver_factory: Callable[[], LayerResolver] = None,
+                        workers: int = None,
+                        chunksize: int = 1,
+                        lazy: bool = False,
+                        mp_context: str = None) -> Union[List[Union['BaseText', 'Text']], Iterator[Union['BaseText', 'Text']]]:
+    '''Tags given layers (along with their prerequisite layers) on multiple 
+       Text objects in parallel, using a pool of worker processes. 
+       Returns tagged Text objects in the same order as they were in the input.
+       
+       Each worker process creates its own LayerResolver by calling 
+       resolver_factory once upon the start of the process. Thus, 
+       resolver_factory must be picklable: a module level function 
+       (e.g. make_resolver from estnltk.default_resolver) or a 
+       functools.partial of such function. Note that a LayerResolver 
+       cannot be passed to the workers directly, because resolvers 
+       (and their taggers) cannot be copied. 
+       
+       Texts are pickled for sending to the workers and back, so 
+       the returned Text objects are copies of the input Text objects, 
+       and the input Text objects remain unchanged (unless workers == 1). 
+       
+       Parameters
+       ----------
+       texts: Iterable[Union['BaseText', 'Text']]
+           Text objects to be tagged. Can be a generator: texts are 
+           streamed through the pool, so all the texts do not need 
+           to be in memory at the same time (if lazy=True). 
+       layers: Union[str, Sequence[str]] (default: None)
+           Names of the layers to be tagged. If not specified, tags 
+           default_layers of the resolver. 
+       resolver_factory: Callable[[], LayerResolver]
+           Picklable function that creates a new LayerResolver. 
+       workers: int (default: None)
+           Number of worker processes. If not specified, uses 
+           os.cpu_count() processes. If workers == 1, then texts 
+           are tagged in the calling process without a pool.
+       chunksize: int (default: 1)
+           Number of texts sent to a worker process at once. Larger 
+           chunks reduce the communication overhead in case of short 
+           texts. 
+       lazy: bool (default: False)
+           If True, returns an iterator yielding tagged texts as soon 
+           as they become available. Otherwise, returns a list of all 
+           tagged texts. 
+       mp_context: str (default: None)
+           Start method of the worker processes ('fork', 'spawn' or 
+           'forkserver'). If not specified, uses the default start 
+           method of the platform. 
+       
+       Returns
+       ----------
+       Union[List[Union['BaseText', 'Text']], Iterator[Union['BaseText', 'Text']]]
+           Tagged Text objects (in the input order).
+    '''
+    if isinstance(resolver_factory, LayerResolver):
+        raise TypeError( '(!) LayerResolver cannot be passed to the worker processes directly. '+\
+                         'Please pass a function that creates the resolver instead.' )
+    if resolver_factory is None or not callable(resolver_factory):
+        raise TypeError( ('(!) resolver_factory should be a (picklable) function returning '+\
+                          'a new LayerResolver, but got {!r}').format(resolver_factory) )
+    if workers is not None and workers < 1:
+        raise ValueError('(!) Number of workers should be a positive integer, not {!r}'.format(workers))
+    if chunksize < 1:
+        raise ValueError('(!) chunksize should be a positive integer, not {!r}'.format(chunksize))
+    tagged_texts = _iterate_tagged_texts(texts, layers, resolver_factory, workers, chunksize, mp_context)
+    if lazy:
+        return tagged_texts
+    return list(tagged_texts)
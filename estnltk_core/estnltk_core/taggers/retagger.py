@@ -299,11 +299,18 @@ class Retagger(Tagger):
                                                  self.output_layer,
                                                  list(layers.keys()))
         if self.check_output_consistency:
-            # Validate changed layer: check span consistency
-            error_msg = target_layers[self.output_layer].check_span_consistency()
-            if error_msg is not None:
-                # TODO: should we use ValueErrors (here and elsewere) instead of AssertionError ?
-                raise AssertionError( error_msg )
+            self._check_output_consistency(target_layers[self.output_layer])
+
+    def _check_output_consistency(self, layer: Layer) -> None:
+        """Validates the changed layer: checks span consistency. 
+           Retaggers that change layers of multiple texts at once should 
+           apply this check (if check_output_consistency is set) on each 
+           changed layer.
+        """
+        error_msg = layer.check_span_consistency()
+        if error_msg is not None:
+            # TODO: should we use ValueErrors (here and elsewere) instead of AssertionError ?
+            raise AssertionError( error_msg )
 
     def retag(self, text: Union['BaseText', 'Text'], status: dict = None ) -> Union['BaseText', 'Text']:
         """
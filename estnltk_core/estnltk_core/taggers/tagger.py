@@ -308,6 +308,15 @@ class Tagger(metaclass=TaggerChecker):
             e.args += ('in the {!r}'.format(self.__class__.__name__),)
             raise
 
+        self._check_output_layer(text, layer)
+
+        return layer
+
+    def _check_output_layer(self, text: Union['BaseText', 'Text'], layer: Layer) -> None:
+        """Checks that the layer returned by _make_layer is a valid output layer of this 
+           tagger for the given text. Taggers that create layers for multiple texts at once 
+           should apply this check on each created layer.
+        """
         assert isinstance(layer, Layer), '{}._make_layer did not return a Layer object, but {!r}'.format(
                                            self.__class__.__name__, type(layer))
         assert layer.text_object is text, '{}._make_layer returned a layer with incorrect Text object'.format(
@@ -320,8 +329,6 @@ class Tagger(metaclass=TaggerChecker):
             '{}._make_layer returned a layer with incorrect name: {} != {}'.format(
                     self.__class__.__name__, layer.name, self.output_layer)
 
-        return layer
-
     def tag(self, text: Union['BaseText', 'Text'], status: dict = None) -> Union['BaseText', 'Text']:
         """Annotates Text object with this tagger.
 
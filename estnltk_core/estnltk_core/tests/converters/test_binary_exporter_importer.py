@@ -0,0 +1,130 @@
+import pytest
+
+from estnltk_core import Layer, RelationLayer
+from estnltk_core.converters import text_to_json, json_to_text
+from estnltk_core.converters import text_to_binary, binary_to_text
+from estnltk_core.converters import layer_to_binary, binary_to_layer
+from estnltk_core.converters import layer_to_dict, dict_to_layer
+from estnltk_core.converters.serialisation_registry import SERIALISATION_REGISTRY
+
+from estnltk_core.common import load_text_class
+
+
+def _create_test_text():
+    Text = load_text_class()
+    text = Text('Tere, kallis maailm! Kuidas läheb?')
+    text.meta['source'] = 'test'
+    words = Layer('words', attributes=['normalized_form', 'tags'], text_object=text, ambiguous=True)
+    for i, (start, end) in enumerate([(0, 4), (4, 5), (6, 12), (13, 19), (19, 20), (21, 27), (28, 33), (33, 34)]):
+        words.add_annotation((start, end), normalized_form=None, tags=['W', i % 2])
+        if i == 2:
+            # values which are equal in Python, but differ in JSON
+            words.add_annotation((start, end), normalized_form=1, tags=[True])
+            words.add_annotation((start, end), normalized_form=1.0, tags=['W', 0])
+    text.add_layer(words)
+    sentences = Layer('sentences', attributes=['type'], text_object=text, enveloping='words')
+    sentences.add_annotation(words[0:5], type='exclamation')
+    sentences.add_annotation(words[5:8], type='question')
+    sentences.meta['tagger'] = 'manual'
+    text.add_layer(sentences)
+    paragraphs = Layer('paragraphs', text_object=text, enveloping='sentences')
+    paragraphs.add_annotation(sentences[0:2])
+    text.add_layer(paragraphs)
+    lemmas = Layer('lemmas', attributes=['lemma'], text_object=text, parent='words', ambiguous=True)
+    for word in words:
+        lemmas.add_annotation(word.base_span, lemma=word.text.lower())
+    text.add_layer(lemmas)
+    relations = RelationLayer('coreference', span_names=['mention', 'entity'], text_object=text)
+    relations.add_annotation(mention=(21, 27), entity=(6, 12))
+    text.add_layer(relations)
+    return text
+
+
+def test_binary_export_import_text_obj():
+    Text = load_text_class()
+    text = Text('')
+    assert binary_to_text(text_to_binary(text)) == text
+
+    text = _create_test_text()
+    # tuples become lists, as in the JSON format
+    text['words'].add_annotation((0, 4), normalized_form='tere', tags=('W', 0))
+    binary = text_to_binary(text)
+    assert isinstance(binary, bytes)
+    text_import = binary_to_text(binary)
+    # The same result as with the JSON format
+    assert text_import == json_to_text(text_to_json(text))
+    assert text_to_json(text_import) == text_to_json(text)
+    assert isinstance(text_import['words'][2].annotations[1]['normalized_form'], int)
+    assert text_import['words'][2].annotations[2]['normalized_form'] == 1.0
+    assert isinstance(text_import['words'][2].annotations[2]['normalized_form'], float)
+    assert text_import['words'][2].annotations[1]['tags'] == [True]
+    # Mutable attribute values are not shared
+    text_import['words'][0].annotations[0]['tags'].append('X')
+    assert text_import['words'][2].annotations[0]['tags'] == ['W', 0]
+    assert text_import['words'][0].annotations[1]['tags'] == ['W', 0]
+    assert len(binary) < len(text_to_json(text).encode('utf-8'))
+
+    # Import selected layers
+    text_import = binary_to_text(binary, layers=['words', 'sentences'])
+    assert text_import.layers == {'words', 'sentences'}
+    assert text_import['sentences'] == text['sentences']
+
+
+def test_binary_export_import_file(tmp_path):
+    text = _create_test_text()
+    file = str(tmp_path / 'text.bin')
+    assert text_to_binary(text, file=file) is None
+    assert binary_to_text(file=file) == text
+
+    layer_file = str(tmp_path / 'layer.bin')
+    assert layer_to_binary(text['sentences'], file=layer_file) is None
+    assert binary_to_layer(text, file=layer_file) == text['sentences']
+
+    with pytest.raises(TypeError):
+        binary_to_text()
+    with pytest.raises(ValueError):
+        binary_to_text(b'{"text": ""}')
+    # empty binary data is not a missing argument
+    with pytest.raises(ValueError):
+        binary_to_text(b'')
+
+
+def test_binary_export_import_layer():
+    text = _create_test_text()
+    for layer_name in ['words', 'sentences', 'paragraphs', 'lemmas']:
+        layer = text[layer_name]
+        layer_import = binary_to_layer(text, layer_to_binary(layer))
+        assert layer_import == layer
+        assert layer_import.serialisation_module is None
+        assert layer_import.meta == layer.meta
+
+
+def test_compact_serialisation_module():
+    assert 'compact_v0' in SERIALISATION_REGISTRY
+    text = _create_test_text()
+    words = text['words']
+    words.serialisation_module = 'compact_v0'
+    layer_dict = layer_to_dict(words)
+    assert layer_dict['serialisation_module'] == 'compact_v0'
+    assert layer_dict['positions'] == [0, 4, 0, 1, 1, 6, 1, 6, 0, 1, 1, 6, 1, 5, 0, 1]
+    assert layer_dict['annotation_counts'] == [1, 1, 3, 1, 1, 1, 1, 1]
+    assert layer_dict['values']['normalized_form'] == [None, 1, 1.0]
+    assert layer_dict['codes']['normalized_form'] == [0, 0, 0, 1, 2, 0, 0, 0, 0, 0]
+    layer_import = dict_to_layer(layer_dict, text)
+    assert layer_import == words
+    assert layer_import.serialisation_module == 'compact_v0'
+
+    # Layers with compact_v0 serialisation also survive JSON and binary formats
+    assert json_to_text(text_to_json(text))['words'].serialisation_module == 'compact_v0'
+    text_import = binary_to_text(text_to_binary(text))
+    assert text_import == text
+    assert text_import['words'].serialisation_module == 'compact_v0'
+
+    # Enveloping layer
+    text['sentences'].serialisation_module = 'compact_v0'
+    sentences_dict = layer_to_dict(text['sentences'])
+    assert sentences_dict['span_level'] == 1
+    assert sentences_dict['envelope_sizes'] == [5, 3]
+    assert sentences_dict['annotation_counts'] is None
+    assert sentences_dict['values'] == {'type': ['exclamation', 'question']}
+    assert dict_to_layer(sentences_dict, text) == text['sentences']
@@ -1,6 +1,10 @@
 import pytest
+import json
+from copy import deepcopy
 
-from estnltk_core import Span, Layer, ElementaryBaseSpan
+from estnltk_core import Span, Layer, RelationLayer, ElementaryBaseSpan
+from estnltk_core.layer.lazy_layer_dict import LazyLayerDict
+from estnltk_core.converters import dict_to_text
 from estnltk_core.converters import text_to_json, json_to_text, dict_to_layer
 from estnltk_core.converters import layer_to_json, json_to_layer
 from estnltk_core.converters import annotation_to_json, json_to_annotation
@@ -1473,3 +1477,47 @@ def test_json_export_import_annotation_obj():
 
     a = json_to_annotation(span, annotation_to_json(annotation))
     assert a == annotation
+
+
+def test_json_import_text_obj_lazy():
+    text = new_text(5)
+    relation_layer = RelationLayer('relations', span_names=['a', 'b'], text_object=text)
+    relation_layer.add_annotation(a=(0, 4), b=(5, 10))
+    text.add_layer(relation_layer)
+    json_text = text_to_json(text)
+
+    text_import = json_to_text(json_text, lazy=True)
+    assert isinstance(text_import._layers, LazyLayerDict)
+    assert text_import.layers == text.layers
+    assert text_import.relation_layers == {'relations'}
+    # No layer has been deserialised yet
+    assert not any(text_import._layers.is_deserialised(name) for name in text_import.layers)
+    assert not text_import._relation_layers.is_deserialised('relations')
+    # Layer is deserialised on the first access
+    layer = text_import['layer_1']
+    assert layer == text['layer_1']
+    assert layer.text_object is text_import
+    assert text_import['layer_1'] is layer
+    assert text_import._layers.is_deserialised('layer_1')
+    assert not text_import._layers.is_deserialised('layer_0')
+    # Layers are in the same order as in the eager import
+    assert list(text_import._layers) == list(json_to_text(json_text)._layers)
+
+    # Adding and removing layers
+    new_layer = Layer('new_layer', parent='layer_0', text_object=text_import)
+    text_import.add_layer(new_layer)
+    assert text_import['new_layer'] is new_layer
+    text_import.pop_layer('layer_5')
+    assert 'layer_5' not in text_import.layers
+    text_import.pop_layer('new_layer')
+
+    # All layers are deserialised for comparison and copying
+    text.pop_layer('layer_5')
+    assert text_import == text
+    assert deepcopy(text_import) == text
+    assert isinstance(deepcopy(text_import)._layers, dict)
+
+    # Only the selected layers
+    text_import = dict_to_text(json.loads(json_text), layers=['layer_0', 'layer_1'], lazy=True)
+    assert text_import.layers == {'layer_0', 'layer_1'}
+    assert text_import['layer_1'] == text['layer_1']
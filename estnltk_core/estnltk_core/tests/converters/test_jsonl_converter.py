@@ -0,0 +1,76 @@
+import pytest
+
+from estnltk_core import Layer
+from estnltk_core.converters import write_texts_to_jsonl, iter_texts_from_jsonl
+from estnltk_core.converters.jsonl_converter import zstandard
+
+from estnltk_core.common import load_text_class
+
+
+def _create_test_texts():
+    Text = load_text_class()
+    texts = []
+    for i, string in enumerate(['Tere, maailm!', 'Kuidas läheb?', '']):
+        text = Text(string)
+        text.meta['id'] = i
+        words = Layer('words', attributes=['normalized_form'], text_object=text)
+        for start, end in [(0, 4), (4, 5), (6, 12), (12, 13)][:len(string.split()) * 2]:
+            words.add_annotation((start, end), normalized_form=None)
+        text.add_layer(words)
+        sentences = Layer('sentences', text_object=text, enveloping='words')
+        if len(words) > 0:
+            sentences.add_annotation(words)
+        text.add_layer(sentences)
+        lemmas = Layer('lemmas', attributes=['lemma'], text_object=text, parent='words')
+        for word in words:
+            lemmas.add_annotation(word.base_span, lemma=word.text.lower())
+        text.add_layer(lemmas)
+        texts.append(text)
+    return texts
+
+
+@pytest.mark.parametrize('file_name', ['texts.jsonl', 'texts.jsonl.gz'])
+def test_jsonl_write_and_iterate(tmp_path, file_name):
+    texts = _create_test_texts()
+    file = str(tmp_path / file_name)
+    # Texts can be given as a generator
+    assert write_texts_to_jsonl(file, (text for text in texts)) == 3
+    assert list(iter_texts_from_jsonl(file)) == texts
+
+    # Append to the existing file
+    assert write_texts_to_jsonl(file, texts[:1], append=True) == 1
+    assert [text.meta['id'] for text in iter_texts_from_jsonl(file)] == [0, 1, 2, 0]
+
+
+def test_jsonl_compression_option(tmp_path):
+    texts = _create_test_texts()
+    file = str(tmp_path / 'texts.dat')
+    write_texts_to_jsonl(file, texts, compression='gzip')
+    with open(file, 'rb') as in_f:
+        assert in_f.read(2) == b'\x1f\x8b'
+    assert list(iter_texts_from_jsonl(file, compression='gzip')) == texts
+    with pytest.raises(ValueError):
+        write_texts_to_jsonl(file, texts, compression='bz2')
+
+
+@pytest.mark.skipif(zstandard is None, reason="package zstandard is required for this test")
+def test_jsonl_zstd_compression(tmp_path):
+    texts = _create_test_texts()
+    file = str(tmp_path / 'texts.jsonl.zst')
+    write_texts_to_jsonl(file, texts)
+    assert list(iter_texts_from_jsonl(file)) == texts
+
+
+def test_jsonl_layer_filtering(tmp_path):
+    texts = _create_test_texts()
+    file = str(tmp_path / 'texts.jsonl')
+    write_texts_to_jsonl(file, texts)
+    # Layers that are required by the selected layers are also restored
+    for text, text_import in zip(texts, iter_texts_from_jsonl(file, layers=['sentences'])):
+        assert text_import.layers == {'words', 'sentences'}
+        assert text_import['sentences'] == text['sentences']
+        assert text_import.meta == text.meta
+    for text_import in iter_texts_from_jsonl(file, layers=['lemmas']):
+        assert text_import.layers == {'words', 'lemmas'}
+    for text_import in iter_texts_from_jsonl(file, layers=[]):
+        assert text_import.layers == set()
@@ -0,0 +1,155 @@
+import pytest
+
+from copy import copy, deepcopy
+
+from estnltk_core import Layer, ColumnarLayer
+from estnltk_core import ElementaryBaseSpan
+from estnltk_core.layer import AmbiguousAttributeList
+from estnltk_core.layer import AmbiguousAttributeTupleList
+from estnltk_core.layer import AttributeList
+from estnltk_core.converters import layer_to_dict
+
+from estnltk_core.common import load_text_class
+
+
+def _create_test_layers():
+    Text = load_text_class()
+    text = Text('Tere, kallis maailm!')
+    layer = Layer('layer', attributes=['lemma', 'pos'], text_object=text, ambiguous=True)
+    layer.add_annotation((0, 4), lemma='tere', pos='I')
+    layer.add_annotation((4, 5), lemma=',', pos='Z')
+    layer.add_annotation((6, 12), lemma='kallis', pos='A')
+    layer.add_annotation((6, 12), lemma='kallis', pos='S')
+    layer.add_annotation((13, 19), lemma='maailm', pos='S')
+    layer.add_annotation((19, 20), lemma='!', pos='Z')
+    return text, layer
+
+
+def test_columnar_layer_from_layer_and_back():
+    text, layer = _create_test_layers()
+    columnar = ColumnarLayer.from_layer(layer)
+    assert len(columnar) == len(layer)
+    assert list(columnar.starts) == [0, 4, 6, 13, 19]
+    assert list(columnar.ends) == [4, 5, 12, 19, 20]
+    assert list(columnar.annotation_offsets) == [0, 1, 2, 4, 5, 6]
+    assert columnar.column('pos') == ['I', 'Z', 'A', 'S', 'S', 'Z']
+    # values are interned per column
+    assert columnar._span_list._vocabularies['pos'] == ['I', 'Z', 'A', 'S']
+    # layers are equal in content
+    assert layer.diff(columnar) is None
+    assert columnar.diff(layer) is None
+    assert columnar.to_layer() == layer
+    assert type(columnar.to_layer()) is Layer
+    # serialisation does not depend on the storage
+    assert layer_to_dict(columnar) == layer_to_dict(layer)
+    with pytest.raises(ValueError):
+        ColumnarLayer('test', enveloping='layer')
+
+
+def test_columnar_layer_span_views():
+    text, layer = _create_test_layers()
+    columnar = ColumnarLayer.from_layer(layer)
+    span = columnar[2]
+    assert span.layer is columnar
+    assert span.text == 'kallis'
+    assert span.base_span == ElementaryBaseSpan(6, 12)
+    assert span == layer[2]
+    assert len(span.annotations) == 2
+    assert span.annotations[1]['pos'] == 'S'
+    assert columnar[-1].text == '!'
+    assert [s.text for s in columnar[1:3]] == [',', 'kallis']
+    assert [s.text for s in columnar] == ['Tere', ',', 'kallis', 'maailm', '!']
+    assert columnar.get(ElementaryBaseSpan(13, 19)) == layer[3]
+    assert columnar.get(ElementaryBaseSpan(13, 18)) is None
+    assert ElementaryBaseSpan(4, 5) in columnar._span_list
+    assert layer[1] in columnar._span_list
+    with pytest.raises(IndexError):
+        columnar[5]
+    # slicing creates a snapshot layer
+    assert [s.text for s in columnar[1:3]] == [',', 'kallis']
+    assert columnar[[0, 2]]['lemma'] == layer[[0, 2]]['lemma']
+
+
+def test_columnar_layer_attribute_values():
+    text, layer = _create_test_layers()
+    columnar = ColumnarLayer.from_layer(layer)
+    assert isinstance(columnar['lemma'], AmbiguousAttributeList)
+    assert columnar['lemma'] == layer['lemma']
+    assert columnar.lemma == layer.lemma
+    assert isinstance(columnar['lemma', 'pos'], AmbiguousAttributeTupleList)
+    assert columnar['lemma', 'pos'] == layer['lemma', 'pos']
+    assert columnar[['pos']] == layer[['pos']]
+    assert columnar.attribute_values('pos', index_attributes=['text']) == \
+           layer.attribute_values('pos', index_attributes=['text'])
+    assert columnar.count_values('pos') == layer.count_values('pos')
+    assert columnar.count_values('text') == layer.count_values('text')
+
+    unambiguous = Layer('unambiguous', attributes=['value'])
+    unambiguous.add_annotation((0, 2), value=1)
+    unambiguous.add_annotation((3, 5), value=True)
+    unambiguous.add_annotation((6, 8), value=1.0)
+    columnar = ColumnarLayer.from_layer(unambiguous)
+    assert isinstance(columnar['value'], AttributeList)
+    assert columnar['value'] == unambiguous['value']
+    # values with different types are not interned as one value
+    assert [type(v) for v in columnar['value']] == [int, bool, float]
+
+
+def test_columnar_layer_add_and_remove():
+    text, layer = _create_test_layers()
+    columnar = ColumnarLayer('layer', attributes=['lemma', 'pos'], text_object=text, ambiguous=True)
+    # add annotations in an arbitrary order
+    for span in reversed(layer):
+        for annotation in span.annotations:
+            columnar.add_annotation(span.base_span, dict(annotation))
+    assert columnar.diff(layer) is None
+    assert columnar.check_span_consistency() is None
+
+    # duplicate annotations are not added to ambiguous layers
+    assert columnar.add_annotation((0, 4), lemma='tere', pos='I') is None
+    annotation = columnar.add_annotation((0, 4), lemma='tere', pos='S')
+    assert dict(annotation) == {'lemma': 'tere', 'pos': 'S'}
+    assert list(columnar[0]['pos']) == ['I', 'S']
+    assert list(columnar.annotation_offsets) == [0, 2, 3, 5, 6, 7]
+
+    columnar.remove_span(columnar[2])
+    assert [s.text for s in columnar] == ['Tere', ',', 'maailm', '!']
+    assert columnar.column('pos') == ['I', 'S', 'Z', 'S', 'Z']
+    del columnar[0]
+    assert columnar.column('lemma') == [',', 'maailm', '!']
+    assert list(columnar.annotation_offsets) == [0, 1, 2, 3]
+
+    unambiguous = ColumnarLayer('unambiguous', attributes=['value'], default_values={'value': 0})
+    unambiguous.add_annotation((0, 2))
+    with pytest.raises(ValueError):
+        unambiguous.add_annotation((0, 2), value=1)
+    assert unambiguous.column('value') == [0]
+
+    columnar.clear_spans()
+    assert len(columnar) == 0
+    assert isinstance(columnar._span_list, type(unambiguous._span_list))
+
+
+def test_columnar_layer_copy():
+    text, layer = _create_test_layers()
+    columnar = ColumnarLayer.from_layer(layer)
+    columnar_copy = copy(columnar)
+    assert columnar_copy.diff(columnar) is None
+    assert columnar_copy[0].layer is columnar_copy
+    columnar_copy.remove_span(columnar_copy[0])
+    assert len(columnar_copy) == 4
+    assert len(columnar) == 5
+
+    columnar_deepcopy = deepcopy(columnar)
+    assert isinstance(columnar_deepcopy, ColumnarLayer)
+    assert columnar_deepcopy.diff(columnar) is None
+    assert columnar_deepcopy.text_object is not columnar.text_object
+
+
+def test_columnar_layer_in_text():
+    text, layer = _create_test_layers()
+    columnar = ColumnarLayer.from_layer(layer)
+    columnar.text_object = None
+    text.add_layer(columnar)
+    assert text['layer'] is columnar
+    assert text['layer'][0].text == 'Tere'
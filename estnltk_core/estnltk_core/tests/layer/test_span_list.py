@@ -0,0 +1,185 @@
+import pytest
+
+from estnltk_core import Layer, ColumnarLayer
+from estnltk_core import ElementaryBaseSpan
+from estnltk_core.common import LAYER_CONFIG
+from estnltk_core.layer.span_list import SpanList, SortedSpanList
+
+from estnltk_core.common import load_text_class
+
+from importlib.util import find_spec
+
+def check_if_sortedcontainers_is_available():
+    return find_spec("sortedcontainers") is not None
+
+
+def _create_test_layer():
+    # Text: 'Tere, kallis maailm!'
+    layer = Layer('test_layer', attributes=['attr'])
+    for start, end in [(13, 19), (0, 4), (6, 12), (0, 12), (4, 5), (19, 20), (6, 20)]:
+        layer.add_annotation((start, end), attr='{}-{}'.format(start, end))
+    return layer
+
+
+@pytest.fixture
+def sorted_span_list_config():
+    LAYER_CONFIG['sorted_span_list'] = True
+    yield
+    LAYER_CONFIG['sorted_span_list'] = False
+
+
+def test_span_list_range_queries():
+    layer = _create_test_layer()
+    assert isinstance(layer._span_list, SpanList)
+    assert not isinstance(layer._span_list, SortedSpanList)
+    assert [(s.start, s.end) for s in layer.spans_within(0, 12)] == [(0, 4), (0, 12), (4, 5), (6, 12)]
+    assert [(s.start, s.end) for s in layer.spans_within(5, 20)] == [(6, 12), (6, 20), (13, 19), (19, 20)]
+    assert [(s.start, s.end) for s in layer.spans_within(1, 3)] == []
+    assert [(s.start, s.end) for s in layer.spans_overlapping(1, 3)] == [(0, 4), (0, 12)]
+    assert [(s.start, s.end) for s in layer.spans_overlapping(12, 13)] == [(6, 20)]
+    assert [(s.start, s.end) for s in layer.spans_overlapping(18, 25)] == [(6, 20), (13, 19), (19, 20)]
+    assert [(s.start, s.end) for s in layer.spans_overlapping(20, 25)] == []
+    # Range queries also work on snapshot layers
+    snapshot = layer[1:4]
+    assert [(s.start, s.end) for s in snapshot.spans_overlapping(10, 11)] == [(0, 12), (6, 12)]
+
+
+def test_span_list_remove_span():
+    layer = _create_test_layer()
+    layer.remove_span(layer[2])
+    assert [(s.start, s.end) for s in layer] == [(0, 4), (0, 12), (6, 12), (6, 20), (13, 19), (19, 20)]
+    del layer[-1]
+    assert layer.get(ElementaryBaseSpan(19, 20)) is None
+    assert layer.check_span_consistency() is None
+
+
+@pytest.mark.skipif(not check_if_sortedcontainers_is_available(),
+                    reason="package sortedcontainers is required for this test")
+def test_sorted_span_list(sorted_span_list_config):
+    layer = _create_test_layer()
+    assert isinstance(layer._span_list, SortedSpanList)
+    assert [(s.start, s.end) for s in layer] == [(0, 4), (0, 12), (4, 5), (6, 12), (6, 20), (13, 19), (19, 20)]
+    assert layer.check_span_consistency() is None
+    assert layer == _create_test_layer()
+    assert [(s.start, s.end) for s in layer.spans_within(0, 12)] == [(0, 4), (0, 12), (4, 5), (6, 12)]
+    assert [(s.start, s.end) for s in layer.spans_overlapping(18, 25)] == [(6, 20), (13, 19), (19, 20)]
+    assert layer[ElementaryBaseSpan(6, 12)].attr == '6-12'
+    assert layer.index(layer[3]) == 3
+    assert list(layer[1:3].attr) == ['0-12', '4-5']
+    layer.remove_span(layer[2])
+    del layer[0]
+    assert [(s.start, s.end) for s in layer] == [(0, 12), (6, 12), (6, 20), (13, 19), (19, 20)]
+    layer.clear_spans()
+    assert isinstance(layer._span_list, SortedSpanList)
+    assert len(layer) == 0
+
+    # compare with regular SpanList
+    LAYER_CONFIG['sorted_span_list'] = False
+    assert _create_test_layer().diff(layer) is not None
+    layer = _create_test_layer()
+    LAYER_CONFIG['sorted_span_list'] = True
+    assert layer == _create_test_layer()
+
+
+def test_columnar_layer_range_queries():
+    columnar = ColumnarLayer.from_layer(_create_test_layer())
+    assert [(s.start, s.end) for s in columnar.spans_within(0, 12)] == [(0, 4), (0, 12), (4, 5), (6, 12)]
+    assert [(s.start, s.end) for s in columnar.spans_overlapping(1, 3)] == [(0, 4), (0, 12)]
+    assert [(s.start, s.end) for s in columnar.spans_overlapping(18, 25)] == [(6, 20), (13, 19), (19, 20)]
+    assert [(s.start, s.end) for s in columnar.spans_enclosing(7, 10)] == [(0, 12), (6, 12), (6, 20)]
+    columnar.remove_span(columnar[1])
+    assert [(s.start, s.end) for s in columnar.spans_enclosing(7, 10)] == [(6, 12), (6, 20)]
+    assert columnar.enclosing_span(7, 10).attr == '6-12'
+
+
+def test_span_list_enclosing_queries():
+    layer = _create_test_layer()
+    assert [(s.start, s.end) for s in layer.spans_enclosing(7, 10)] == [(0, 12), (6, 12), (6, 20)]
+    assert [(s.start, s.end) for s in layer.spans_enclosing(13, 20)] == [(6, 20)]
+    assert [(s.start, s.end) for s in layer.spans_enclosing(0, 20)] == []
+    assert (layer.enclosing_span(7, 10).start, layer.enclosing_span(7, 10).end) == (6, 12)
+    assert layer.enclosing_span(4, 5).attr == '4-5'
+    assert layer.enclosing_span(0, 20) is None
+    # enclosing spans of an enveloping layer
+    Text = load_text_class()
+    text = Text('Tere, kallis maailm! Kuidas läheb?')
+    words = Layer('words', text_object=text)
+    for start, end in [(0, 4), (4, 5), (6, 12), (13, 19), (19, 20), (21, 27), (28, 33), (33, 34)]:
+        words.add_annotation((start, end))
+    text.add_layer(words)
+    sentences = Layer('sentences', text_object=text, enveloping='words')
+    sentences.add_annotation(words[0:5])
+    sentences.add_annotation(words[5:8])
+    text.add_layer(sentences)
+    assert sentences.enclosing_span(6, 12).text == ['Tere', ',', 'kallis', 'maailm', '!']
+    assert sentences.enclosing_span(28, 33).text == ['Kuidas', 'läheb', '?']
+    assert sentences.enclosing_span(19, 21) is None
+    assert [w.text for w in words.spans_within(sentences[1].start, sentences[1].end)] == ['Kuidas', 'läheb', '?']
+
+
+def test_span_list_interval_index_invalidation():
+    layer = _create_test_layer()
+    index = layer._span_list.interval_index
+    assert layer._span_list.interval_index is index
+    assert len(layer.spans_within(20, 30)) == 0
+    layer.add_annotation((21, 25), attr='21-25')
+    assert layer._span_list.interval_index is not index
+    assert [(s.start, s.end) for s in layer.spans_within(20, 30)] == [(21, 25)]
+    layer.remove_span(layer[-1])
+    assert len(layer.spans_within(20, 30)) == 0
+    assert [(s.start, s.end) for s in layer.spans_overlapping(0, 1)] == [(0, 4), (0, 12)]
+    layer[0] = layer[0]
+    assert [(s.start, s.end) for s in layer.spans_overlapping(0, 1)] == [(0, 4), (0, 12)]
+    # index is rebuilt after spans were changed directly (even if the number of spans remains the same)
+    layer.spans.append(layer.spans.pop(0))
+    assert [(s.start, s.end) for s in layer.spans_overlapping(0, 1)] == [(0, 12), (0, 4)]
+    assert [(s.start, s.end) for s in layer.spans_within(0, 5)] == [(4, 5), (0, 4)]
+    layer.spans[0] = layer.spans[1]
+    assert [(s.start, s.end) for s in layer.spans_overlapping(0, 1)] == [(0, 4)]
+    layer.clear_spans()
+    assert layer.spans_overlapping(0, 100) == []
+    assert layer.enclosing_span(0, 1) is None
+
+
+def test_interval_index_with_long_intervals():
+    from estnltk_core.layer.interval_index import IntervalIndex
+    # a long interval (e.g. a paragraph) before many short intervals
+    starts = [0] + list(range(1, 1001))
+    ends = [1000] + list(range(2, 1002))
+    index = IntervalIndex(starts, ends)
+    assert index.overlapping(500, 502) == [0, 500, 501]
+    assert index.enclosing(500, 501) == [0, 500]
+    assert index.enclosing(999, 1001) == []
+    assert index.within(500, 503) == [500, 501, 502]
+    assert index.within(0, 1000) == list(range(0, 1000))
+    # results are the same as with a linear scan
+    for (start, end) in [(0, 0), (3, 7), (999, 1002), (1001, 1005)]:
+        assert index.overlapping(start, end) == \
+               [i for i in range(len(starts)) if starts[i] < end and start < ends[i]]
+        assert index.enclosing(start, end) == \
+               [i for i in range(len(starts)) if starts[i] <= start and end <= ends[i]]
+        assert index.within(start, end) == \
+               [i for i in range(len(starts)) if start <= starts[i] and ends[i] <= end]
+    assert IntervalIndex([], []).overlapping(0, 10) == []
+
+
+def test_unpickle_span_list_of_older_version():
+    import pickle
+    text = load_text_class()('Tere, kallis maailm!')
+    layer = _create_test_layer()
+    text.add_layer(layer)
+    assert len(layer.spans_within(0, 12)) == 4
+    # SpanList-s of older versions stored spans as a plain list under the key 'spans'
+    span_list_state = layer._span_list.__dict__
+    spans = list(span_list_state.pop('_spans'))
+    del span_list_state['_interval_index']
+    del span_list_state['_interval_index_version']
+    span_list_state['spans'] = spans
+    assert set(span_list_state.keys()) == {'_base_span_to_span', '_span_level', 'spans'}
+    text_2 = pickle.loads(pickle.dumps(text))
+    layer_2 = text_2['test_layer']
+    assert [(s.start, s.end) for s in layer_2] == [(s.start, s.end) for s in spans]
+    assert [(s.start, s.end) for s in layer_2.spans_within(0, 12)] == [(0, 4), (0, 12), (4, 5), (6, 12)]
+    layer_2.add_annotation((15, 17), attr='15-17')
+    assert [(s.start, s.end) for s in layer_2.spans_overlapping(14, 16)] == [(6, 20), (13, 19), (15, 17)]
+    assert layer_2.check_span_consistency() is None
@@ -12,6 +12,8 @@ from estnltk_core.layer_resolver import LayerResolver
 from estnltk_core.common import create_text_object
 
 
+import os
+import re
 import pytest
 
 class StubTagger(Tagger):
@@ -568,3 +570,78 @@ def test_redefine_resolver_with_new_taggers():
                                 'normalized_words', 'morph_analysis'}
     assert set(text.relation_layers) == {'coreference'}
 
+
+
+class StubWhitespaceTokensTagger(Tagger):
+    """A stub tagger splitting text into tokens by whitespace.
+    """
+    conf_param = []
+
+    def __init__(self, output_layer='tokens', input_layers=()):
+        self.output_layer = output_layer
+        self.input_layers = input_layers
+        self.output_attributes = ['pid']
+
+    def _make_layer(self, text: Union['BaseText', 'Text'], layers, status=None) -> Layer:
+        layer = Layer(self.output_layer, self.output_attributes, text_object=text)
+        for m in re.finditer(r'\S+', text.text):
+            layer.add_annotation((m.start(), m.end()), pid=os.getpid())
+        return layer
+
+
+def make_stub_resolver():
+    taggers = TaggersRegistry([ TaggerLoader( 'tokens', [], 
+                                              'estnltk_core.tests.taggers.test_layer_resolver.StubWhitespaceTokensTagger' ),
+                                TaggerLoader( 'words', ['tokens'], 
+                                              stubtagger_import_path, 
+                                              {'output_layer': 'words', 'input_layers': ['tokens']} ),
+                              ])
+    return LayerResolver(taggers, default_layers=['tokens'])
+
+
+def test_tag_layers_parallel():
+    from estnltk_core import layer_resolver
+    from estnltk_core.layer_resolver import tag_layers_parallel
+    texts = [create_text_object(' '.join(['sõna'] * i)) for i in range(1, 21)]
+    # Default layers
+    tagged = tag_layers_parallel(texts, resolver_factory=make_stub_resolver, workers=2, chunksize=3)
+    assert [len(text['tokens']) for text in tagged] == list(range(1, 21))
+    assert all(set(text.layers) == {'tokens'} for text in tagged)
+    assert os.getpid() not in {pid for text in tagged for pid in text['tokens'].pid}
+    # Input texts remain unchanged
+    assert all(len(text.layers) == 0 for text in texts)
+    # Lazy tagging of a stream of texts
+    tagged = tag_layers_parallel((text for text in texts), 'words', resolver_factory=make_stub_resolver,
+                                 workers=2, lazy=True)
+    assert not isinstance(tagged, list)
+    tagged = list(tagged)
+    assert [text.text for text in tagged] == [text.text for text in texts]
+    assert all(set(text.layers) == {'tokens', 'words'} for text in tagged)
+    # Tagging in the calling process
+    tagged = tag_layers_parallel(texts[:2], ['tokens'], resolver_factory=make_stub_resolver, workers=1)
+    assert tagged[1] is texts[1]
+    assert list(tagged[1]['tokens'].pid) == [os.getpid(), os.getpid()]
+    # Worker state is not kept in the calling process
+    assert layer_resolver._worker_resolver is None
+    assert layer_resolver._worker_layers is None
+    # Resolvers cannot be sent to the workers
+    with pytest.raises(TypeError):
+        tag_layers_parallel(texts, resolver_factory=make_stub_resolver())
+    with pytest.raises(ValueError):
+        tag_layers_parallel(texts, resolver_factory=make_stub_resolver, workers=0)
+
+
+def test_tag_layers_parallel_interleaved_iterators_in_calling_process():
+    from estnltk_core.layer_resolver import tag_layers_parallel
+    texts_1 = [create_text_object(' '.join(['sõna'] * i)) for i in range(1, 6)]
+    texts_2 = [create_text_object(' '.join(['lause'] * i)) for i in range(1, 6)]
+    tagged_1 = tag_layers_parallel(texts_1, 'tokens', resolver_factory=make_stub_resolver, workers=1, lazy=True)
+    tagged_2 = tag_layers_parallel(texts_2, 'words', resolver_factory=make_stub_resolver, workers=1, lazy=True)
+    # Iterators tagging in the calling process do not interfere with each other
+    assert next(tagged_1) is texts_1[0]
+    assert next(tagged_2) is texts_2[0]
+    assert next(tagged_1) is texts_1[1]
+    tagged_1.close()
+    assert list(tagged_2) == texts_2[1:]
+    assert all(set(text.layers) == {'tokens', 'words'} for text in texts_2)
+    assert [set(text.layers) for text in texts_1] == [{'tokens'}] * 2 + [set()] * 3
@@ -15,7 +15,7 @@ import torch
 import collections
 import warnings
 
-from typing import MutableMapping, List, Optional
+from typing import MutableMapping, List, Optional, Sequence
 
 from transformers import AutoConfig, AutoTokenizer, AutoModelForTokenClassification
 
@@ -52,6 +52,7 @@ class BertMorphTagger(Retagger):
         token_level: bool = False,
         split_pos_form: bool = True,
         disambiguate: bool = False,
+        batch_size: int = 16,
         **kwargs
     ):
         """
@@ -77,6 +78,9 @@ class BertMorphTagger(Retagger):
                 Defaults to False. If set, then BertMorphTagger can be used to disambiguate an existing Vabamorf-based 
                 morph analysis layer by calling <code>BertMorphTagger.retag(text_obj)</code>. Note that the input 
                 <code>text_obj</code> must already have <code>output_layer<code> which will be disambiguated. 
+            batch_size (int): Number of sentence chunks processed by the model at once. Defaults to 16. 
+                Chunks are grouped by their length (in BERT tokens) and padded into mini-batches. Use 
+                <code>tag_texts(...)</code> to form batches across multiple texts. 
 
         Raises:
             Exception: Raises when BertMorphTagger's resources have not been downloaded.
@@ -85,7 +89,7 @@ class BertMorphTagger(Retagger):
         # Configuration parameters
         self.conf_param = ('model_location', 'get_top_n_predictions', 'bert_tokenizer', 'bert_morph_tagging', 'id2label', \
                            'token_level', 'split_pos_form', 'disambiguate', 'sentences_layer', 'words_layer', 'output_layer', \
-                           'input_layers', 'output_attributes', '_bert_tokens_rewriter')
+                           'input_layers', 'output_attributes', 'batch_size', '_bert_tokens_rewriter')
 
         if model_location is None:
             # Try to get the resources path for bert_morph_tagger. Attempt to download, if missing
@@ -111,6 +115,10 @@ class BertMorphTagger(Retagger):
         config_dict = AutoConfig.from_pretrained(self.model_location).to_dict()
         self.id2label, _ = config_dict["id2label"], config_dict["label2id"]
 
+        if batch_size < 1:
+            raise ValueError( f'(!) batch_size must be a positive integer, not {batch_size!r}.' )
+        self.batch_size = batch_size
+
         # Set input and output layers
         self.split_pos_form = split_pos_form
         self.disambiguate = disambiguate
@@ -172,40 +180,81 @@ class BertMorphTagger(Retagger):
         Returns:
             List[dict]: Each token's top N predictions with their probabilities.
         """
-        # Tokenize the input string
-        tokens, batch_encoding = self._tokenize_with_bert(input_str)
-        token_indexes = torch.tensor([batch_encoding['input_ids']])
-
-        # Check if the length exceeds the model's maximum sequence length
-        max_seq_length = self.bert_tokenizer.model_max_length
-        if token_indexes.size(1) > max_seq_length:
-            raise ValueError(f"Input length exceeds the model's max_seq_length of {max_seq_length} tokens")
-
-        # Get predictions
-        with torch.no_grad():
-            output = self.bert_morph_tagging(token_indexes)
-
-        # Get top N predictions
-        top_n_predictions = []
-        logits = output.logits.squeeze()  # Shape: [sequence_length, num_labels]
-        probs = torch.softmax(logits, dim=-1)  # Convert logits to probabilities
+        return self._get_bert_morph_tagging_label_predictions_batch([input_str], get_top_n_predictions)[0]
 
-        for i, token_data in enumerate(tokens):
-            token_probs = probs[i]  # Probabilities for the current token
-            top_n_indices = torch.topk(token_probs, get_top_n_predictions).indices  # Top N label indices
-            top_n_labels = [self.id2label[idx.item()] for idx in top_n_indices]  # Convert indices to labels
-            top_n_probs = [round(token_probs[idx].item(), 5) for idx in top_n_indices]  # Get probabilities for top N labels
+    def _get_bert_morph_tagging_label_predictions_batch(self, 
+                                                        input_strs:List[str], 
+                                                        get_top_n_predictions:int = 1):
+        """
+        Applies Bert on the given input strings in mini-batches and returns Bert's tokens,
+        token indexes, and top N predicted labels for each token of each input string. \n
+        Input strings are sorted by their length (in Bert's tokens) and grouped into 
+        batches of <code>self.batch_size</code> strings, so that padding is minimal. 
+        Padded positions are masked out with an attention mask. 
+        Labels will be converted to Vabamorf's annotations type if <code>self.split_pos_form</code> is True.
 
-            top_n_predictions.append({
-                'token': token_data,
-                'predictions': [{'label': label, 'probability': prob} for label, prob in zip(top_n_labels, top_n_probs)]
-            })
+        Args:
+            input_strs (List[str]): The input strings to be processed.
+            top_n (int): Number of top predictions to return for each token.
 
-        # Convert BERT labels to Vabamorf's form and POS
-        if self.split_pos_form:
-            top_n_predictions = convert_bert_labels_to_vabamorf(top_n_predictions)
+        Returns:
+            List[List[dict]]: For each input string (in the input order), each token's top N 
+            predictions with their probabilities.
+        """
+        # Tokenize the input strings
+        tokenized = [self._tokenize_with_bert(input_str) for input_str in input_strs]
 
-        return top_n_predictions
+        # Check if the length exceeds the model's maximum sequence length
+        max_seq_length = self.bert_tokenizer.model_max_length
+        for tokens, batch_encoding in tokenized:
+            if len(batch_encoding['input_ids']) > max_seq_length:
+                raise ValueError(f"Input length exceeds the model's max_seq_length of {max_seq_length} tokens")
+
+        pad_token_id = self.bert_tokenizer.pad_token_id
+        if pad_token_id is None:
+            pad_token_id = 0
+        device = next(self.bert_morph_tagging.parameters()).device
+
+        # Group inputs of similar lengths into batches
+        order = sorted(range(len(tokenized)), key=lambda i: len(tokenized[i][1]['input_ids']))
+        all_predictions = [None] * len(tokenized)
+        for batch_start in range(0, len(order), self.batch_size):
+            batch_indexes = order[batch_start:batch_start + self.batch_size]
+            batch_input_ids = [tokenized[i][1]['input_ids'] for i in batch_indexes]
+            max_length = max(len(input_ids) for input_ids in batch_input_ids)
+            token_indexes = torch.full((len(batch_input_ids), max_length), pad_token_id, dtype=torch.long)
+            attention_mask = torch.zeros((len(batch_input_ids), max_length), dtype=torch.long)
+            for j, input_ids in enumerate(batch_input_ids):
+                token_indexes[j, :len(input_ids)] = torch.tensor(input_ids, dtype=torch.long)
+                attention_mask[j, :len(input_ids)] = 1
+
+            # Get predictions
+            with torch.no_grad():
+                output = self.bert_morph_tagging(token_indexes.to(device), 
+                                                 attention_mask=attention_mask.to(device))
+
+            # Get top N predictions
+            probs = torch.softmax(output.logits, dim=-1)  # Shape: [batch_size, sequence_length, num_labels]
+            top_n = torch.topk(probs, get_top_n_predictions, dim=-1)
+            top_n_indices = top_n.indices.tolist()
+            top_n_probs = top_n.values.tolist()
+
+            for j, i in enumerate(batch_indexes):
+                top_n_predictions = []
+                # Padded positions are after the last token, so they are skipped
+                for k, token_data in enumerate(tokenized[i][0]):
+                    top_n_predictions.append({
+                        'token': token_data,
+                        'predictions': [{'label': self.id2label[idx], 'probability': round(prob, 5)} 
+                                        for idx, prob in zip(top_n_indices[j][k], top_n_probs[j][k])]
+                    })
+
+                # Convert BERT labels to Vabamorf's form and POS
+                if self.split_pos_form:
+                    top_n_predictions = convert_bert_labels_to_vabamorf(top_n_predictions)
+                all_predictions[i] = top_n_predictions
+
+        return all_predictions
 
     def _tokenize_with_bert(self, 
                             text:str, 
@@ -255,70 +304,149 @@ class BertMorphTagger(Retagger):
         Returns:
             Layer: The morphological layer containing annotations for each token.
         """
-        sentences_layer = layers[ self.sentences_layer ]
-        words_layer = layers[ self.words_layer ]
-        morph_layer = Layer(name=self.output_layer, 
-                        attributes=self.output_attributes, 
-                        text_object=text, 
-                        parent=self.words_layer, 
-                        ambiguous=True)
-
-        for k, sentence in enumerate( sentences_layer ):
-            sent_start = sentence.start
-            sent_text  = sentence.enclosing_text
-            # Apply batch processing: split larger input sentence into smaller chunks and process chunk by chunk
-            sent_chunks, sent_chunk_indexes = _split_sentence_into_smaller_chunks(sent_text)
-            for sent_chunk, (chunk_start, chunk_end) in zip(sent_chunks, sent_chunk_indexes):
-                # Get predictions for the sentence
-                top_n_predictions = self._get_bert_morph_tagging_label_predictions(sent_chunk, self.get_top_n_predictions)
-
-                # Collect token level annotations (a label for each token)
-                for token_data in top_n_predictions:
-                    start, end  = token_data['token'][0], token_data['token'][1]
-                    bert_tokens = token_data['token'][2]
-                    if start is None or end is None:
-                        continue  # Ignore sentence start and end tokens (<s>, </s>)
-                    all_labels = [pred['label'] for pred in token_data['predictions']]
-                    all_probabilities = [pred['probability'] for pred in token_data['predictions']]
-                    token_span = (sent_start + chunk_start + start, sent_start + chunk_start + end)
-                    for label, prob in zip(all_labels, all_probabilities):
-                        if self.split_pos_form:
-                            annotation = {
-                                'bert_tokens': bert_tokens,
-                                'form': label[0],
-                                'partofspeech': label[1],
-                                'probability': prob
-                            }
-                        else:
-                            annotation = {
-                                'bert_tokens': bert_tokens,
-                                'morph_label': label,
-                                'probability': prob
-                            }
-                        morph_layer.add_annotation(token_span, **annotation)
+        return self._make_layers([text], [layers])[0]
+
+    def _make_layers(self, texts: List[Text], all_layers: List[MutableMapping[str, Layer]]) -> List[Layer]:
+        """
+        Generates morphological layers for multiple texts. 
+        
+        Sentences of all the texts are split into chunks, and the chunks are processed 
+        by the model in mini-batches (see <code>_get_bert_morph_tagging_label_predictions_batch</code>). 
+        Predictions are then aligned with the tokens of each text, and (unless 
+        <code>token_level</code> is set) aggregated into words.
+
+        Args:
+            texts (List[Text]): The input text objects to be processed.
+            all_layers (List[MutableMapping[str, Layer]]): Input layers of each text.
+
+        Returns:
+            List[Layer]: The morphological layer of each text.
+        """
+        # Collect sentence chunks: (text index, start of the chunk in the text, chunk)
+        chunks = []
+        for text_id, layers in enumerate(all_layers):
+            for sentence in layers[ self.sentences_layer ]:
+                sent_start = sentence.start
+                sent_text  = sentence.enclosing_text
+                # Split larger input sentence into smaller chunks
+                sent_chunks, sent_chunk_indexes = _split_sentence_into_smaller_chunks(sent_text)
+                for sent_chunk, (chunk_start, chunk_end) in zip(sent_chunks, sent_chunk_indexes):
+                    chunks.append( (text_id, sent_start + chunk_start, sent_chunk) )
+
+        # Get predictions for all the chunks
+        all_predictions = self._get_bert_morph_tagging_label_predictions_batch([chunk for (_, _, chunk) in chunks], 
+                                                                               self.get_top_n_predictions)
+
+        morph_layers = [Layer(name=self.output_layer, 
+                              attributes=self.output_attributes, 
+                              text_object=text, 
+                              parent=self.words_layer, 
+                              ambiguous=True) for text in texts]
+
+        for (text_id, chunk_offset, _), top_n_predictions in zip(chunks, all_predictions):
+            morph_layer = morph_layers[text_id]
+            # Collect token level annotations (a label for each token)
+            for token_data in top_n_predictions:
+                start, end  = token_data['token'][0], token_data['token'][1]
+                bert_tokens = token_data['token'][2]
+                if start is None or end is None:
+                    continue  # Ignore sentence start and end tokens (<s>, </s>)
+                all_labels = [pred['label'] for pred in token_data['predictions']]
+                all_probabilities = [pred['probability'] for pred in token_data['predictions']]
+                token_span = (chunk_offset + start, chunk_offset + end)
+                for label, prob in zip(all_labels, all_probabilities):
+                    if self.split_pos_form:
+                        annotation = {
+                            'bert_tokens': bert_tokens,
+                            'form': label[0],
+                            'partofspeech': label[1],
+                            'probability': prob
+                        }
+                    else:
+                        annotation = {
+                            'bert_tokens': bert_tokens,
+                            'morph_label': label,
+                            'probability': prob
+                        }
+                    morph_layer.add_annotation(token_span, **annotation)
 
         # Add annotations
         if self.token_level:
             # Return token level annotations
-            return morph_layer
-
-        else:
-            # Aggregate tokens back into words/phrases
-            # Use BertTokens2WordsRewriter to convert BERT tokens to words
-            # Rewrite to align BERT tokens with words
+            return morph_layers
+
+        # Aggregate tokens back into words/phrases
+        # Use BertTokens2WordsRewriter to convert BERT tokens to words
+        # Rewrite to align BERT tokens with words
+        word_layers = []
+        for text, layers, morph_layer in zip(texts, all_layers, morph_layers):
+            words_layer = layers[ self.words_layer ]
             morph_layer = self._bert_tokens_rewriter.make_layer(text, layers={morph_layer.name: morph_layer})
+            assert len(morph_layer) == len(words_layer), \
+            f"Failed to rewrite '{morph_layer.name}' layer tokens to '{words_layer.name}' layer words: {len(morph_layer)} != {len(words_layer)}"
+            word_layers.append(morph_layer)
+
+        return word_layers
 
-        assert len(morph_layer) == len(words_layer), \
-        f"Failed to rewrite '{morph_layer.name}' layer tokens to '{words_layer.name}' layer words: {len(morph_layer)} != {len(words_layer)}"
+    def tag_texts(self, texts: Sequence[Text]) -> List[Text]:
+        """
+        Tags (or, if <code>disambiguate</code> is True, disambiguates) the morphological layer 
+        on multiple texts, and returns the texts.
+
+        Unlike calling tag(...) or retag(...) on each text separately, processes sentences 
+        of all the texts together: sentences are grouped into mini-batches of 
+        <code>batch_size</code> across text boundaries. Texts must have the input layers 
+        of the tagger (otherwise, the same error is raised as in tag(...) or retag(...)). 
+        Created (or changed) layers are validated in the same way as in tag(...) or retag(...).
 
-        return morph_layer
+        Args:
+            texts (Sequence[Text]): The input text objects to be processed.
 
+        Returns:
+            List[Text]: The input texts.
+        """
+        texts = list(texts)
+        all_layers = []
+        for text in texts:
+            if self.disambiguate:
+                # As in retag(...): the layer to be disambiguated must exist
+                assert self.output_layer in text.layers, \
+                       "output_layer {!r} missing from layers {}".format(self.output_layer,
+                                                                         sorted(text.layers))
+            elif self.output_layer in text.layers:
+                raise ValueError('(!) The layer {!r} already exists in the text.'.format(self.output_layer))
+            for layer in self.input_layers:
+                if layer not in text.layers:
+                    # As in tag(...)
+                    raise ValueError('missing input layer: {!r}'.format(layer))
+            all_layers.append( {layer: text[layer] for layer in self.input_layers} )
+        if self.disambiguate:
+            for layers in all_layers:
+                self._validate_disambiguation_input(layers)
+        morph_layers = self._make_layers(texts, all_layers)
+        for text, layers, morph_layer in zip(texts, all_layers, morph_layers):
+            # Apply the same output checks as tag(...) or retag(...)
+            if self.disambiguate:
+                self._disambiguate_layer(layers[self.output_layer], morph_layer)
+                if self.check_output_consistency:
+                    self._check_output_consistency(layers[self.output_layer])
+            else:
+                self._check_output_layer(text, morph_layer)
+                text.add_layer( morph_layer )
+        return texts
 
     def _change_layer(self, text, layers, status=None):
+        self._validate_disambiguation_input(layers)
+        # Create disambiguation layer
+        disamb_layer = self._make_layer(text, layers, status)
+        # Disambiguate input_morph_analysis_layer
+        self._disambiguate_layer(layers[self.output_layer], disamb_layer)
+
+    def _validate_disambiguation_input(self, layers):
         # Validate configuration
         if not self.split_pos_form:
             raise Exception( ('(!) Cannot use BertMorphTagger as a disambiguator if '+\
-                              'split_pos_form is set False.').format(attr, morph_layer.name) )
+                              'split_pos_form is set False.') )
         if self.token_level:
             raise Exception( ('(!) Cannot use BertMorphTagger as a disambiguator if '+\
                               'token_level==True.') )
@@ -328,9 +456,8 @@ class BertMorphTagger(Retagger):
             if attr not in morph_layer.attributes:
                 raise Exception( ('(!) Missing attribute {!r} in output_layer {!r}.'+\
                                   '').format(attr, morph_layer.name) )
-        # Create disambiguation layer
-        disamb_layer = self._make_layer(text, layers, status)
-        # Disambiguate input_morph_analysis_layer
+
+    def _disambiguate_layer(self, morph_layer, disamb_layer):
         assert len(morph_layer) == len(disamb_layer)
         for original_word, disamb_word in zip(morph_layer, disamb_layer):
             disamb_pos  = disamb_word.annotations[0]['partofspeech']
@@ -215,3 +215,173 @@ def test_bert_morph_disambiguator_out_of_the_box():
          {'word': 'alla', 'partofspeech': 'D', 'form': ''}, 
          {'word': '!', 'partofspeech': 'Z', 'form': ''}]
 
+
+
+@pytest.mark.skipif(not check_if_transformers_is_available(),
+                    reason="package tranformers is required for this test")
+@pytest.mark.skipif(not check_if_pytorch_is_available(),
+                    reason="package pytorch is required for this test")
+@pytest.mark.skipif(BERTMORPH_V1_PATH is None and BERTMORPH_V2_PATH is None,
+                    reason="BertMorphTagger's model location not known. "+\
+                           "Use estnltk.download('bert_morph_tagging') to get the missing resources.")
+def test_bert_morph_tagger_batches():
+    # Test that mini-batched tagging (within and across texts) gives the same results as tagging sentence by sentence
+    from estnltk_neural.taggers import BertMorphTagger
+    model_path = BERTMORPH_V2_PATH if BERTMORPH_V2_PATH is not None else BERTMORPH_V1_PATH
+    raw_texts = ['A. H. Tammsaare oli eesti kirjanik, esseist, kultuurifilosoof ja tõlkija. '+\
+                 'Üksnes autorihüvitis oli 12 431 krooni. ', 
+                 'Lae äpp kohe alla!', 
+                 '', 
+                 'Ilus suur karvane kass nurrus punasel diivanil. Kass nurrus. '+\
+                 'Kui sa tahad Eestis kõrgema hariduse omandada, siis sa pead sisseastumisel sooritama eksami.']
+    sentence_tagger = BertMorphTagger(model_location=model_path, get_top_n_predictions=2, batch_size=1)
+    expected = []
+    for raw_text in raw_texts:
+        text = Text(raw_text).tag_layer(['words', 'sentences'])
+        sentence_tagger.tag(text)
+        expected.append( _extract_word_partofspeech_and_form(text[sentence_tagger.output_layer], 
+                                                             add_probs=True, round_probs=True) )
+    batch_tagger = BertMorphTagger(model_location=model_path, get_top_n_predictions=2, batch_size=3)
+    texts = [Text(raw_text).tag_layer(['words', 'sentences']) for raw_text in raw_texts]
+    assert batch_tagger.tag_texts(texts) == texts
+    results = [_extract_word_partofspeech_and_form(text[batch_tagger.output_layer], add_probs=True, round_probs=True) 
+               for text in texts]
+    assert results == expected
+
+
+@pytest.mark.skipif(not check_if_transformers_is_available(),
+                    reason="package tranformers is required for this test")
+@pytest.mark.skipif(not check_if_pytorch_is_available(),
+                    reason="package pytorch is required for this test")
+@pytest.mark.skipif(BERTMORPH_V1_PATH is None and BERTMORPH_V2_PATH is None,
+                    reason="BertMorphTagger's model location not known. "+\
+                           "Use estnltk.download('bert_morph_tagging') to get the missing resources.")
+def test_bert_morph_disambiguator_batches():
+    # Test that mini-batched disambiguation across texts gives the same results as retagging each text
+    from estnltk.taggers import VabamorfAnalyzer
+    from estnltk_neural.taggers import BertMorphTagger
+    model_path = BERTMORPH_V2_PATH if BERTMORPH_V2_PATH is not None else BERTMORPH_V1_PATH
+    vm_analyser = VabamorfAnalyzer()
+    raw_texts = ['Lae äpp kohe alla!', 
+                 '', 
+                 'Ilus suur karvane kass nurrus punasel diivanil. Kass nurrus. '+\
+                 'Kui sa tahad Eestis kõrgema hariduse omandada, siis sa pead sisseastumisel sooritama eksami.', 
+                 'Palk oli väike. Palgi all oli kass.']
+    def make_texts():
+        texts = [Text(raw_text).tag_layer(['words', 'sentences']) for raw_text in raw_texts]
+        for text in texts:
+            vm_analyser.tag( text )
+        return texts
+    sentence_disambiguator = BertMorphTagger(model_location=model_path, output_layer=vm_analyser.output_layer, 
+                                             disambiguate=True, batch_size=1)
+    expected = []
+    for text in make_texts():
+        sentence_disambiguator.retag(text)
+        expected.append( _extract_word_partofspeech_and_form(text[vm_analyser.output_layer]) )
+    batch_disambiguator = BertMorphTagger(model_location=model_path, output_layer=vm_analyser.output_layer, 
+                                          disambiguate=True, batch_size=3)
+    texts = make_texts()
+    assert batch_disambiguator.tag_texts(texts) == texts
+    results = [_extract_word_partofspeech_and_form(text[vm_analyser.output_layer]) for text in texts]
+    assert results == expected
+
+
+@pytest.mark.skipif(not check_if_transformers_is_available(),
+                    reason="package tranformers is required for this test")
+@pytest.mark.skipif(not check_if_pytorch_is_available(),
+                    reason="package pytorch is required for this test")
+@pytest.mark.skipif(BERTMORPH_V1_PATH is None and BERTMORPH_V2_PATH is None,
+                    reason="BertMorphTagger's model location not known. "+\
+                           "Use estnltk.download('bert_morph_tagging') to get the missing resources.")
+def test_bert_morph_tagger_batches_missing_layers():
+    # Test that tag_texts raises the same errors as tag and retag if a layer is missing
+    from estnltk_neural.taggers import BertMorphTagger
+    model_path = BERTMORPH_V2_PATH if BERTMORPH_V2_PATH is not None else BERTMORPH_V1_PATH
+    tagger = BertMorphTagger(model_location=model_path)
+    texts = [Text('Lae äpp kohe alla!').tag_layer(['words', 'sentences']), Text('Kass nurrus.').tag_layer(['words'])]
+    with pytest.raises(ValueError) as tag_error:
+        tagger.tag( texts[1] )
+    with pytest.raises(ValueError) as tag_texts_error:
+        tagger.tag_texts( texts )
+    assert tag_texts_error.value.args[0] == tag_error.value.args[0] == "missing input layer: 'sentences'"
+    assert tagger.output_layer not in texts[0].layers
+    disambiguator = BertMorphTagger(model_location=model_path, output_layer='morph_analysis', disambiguate=True)
+    with pytest.raises(AssertionError) as retag_error:
+        disambiguator.retag( texts[0] )
+    with pytest.raises(AssertionError) as tag_texts_error:
+        disambiguator.tag_texts( texts )
+    assert "output_layer 'morph_analysis' missing from layers" in str(retag_error.value)
+    assert "output_layer 'morph_analysis' missing from layers" in str(tag_texts_error.value)
+
+
+@pytest.fixture
+def tiny_bert_morph_model(tmp_path):
+    # Creates a tiny randomly initialized BERT model with Vabamorf-style labels. 
+    # Allows to compare batched and per-text tagging without downloading resources
+    import torch
+    from transformers import BertConfig, BertForTokenClassification, BertTokenizerFast
+    chars = sorted(set('ABCDEFGHIJKLMNOPQRSTUVWXYZÕÄÖÜabcdefghijklmnopqrstuvwxyzõäöüšž0123456789.,!?-'))
+    vocab = ['[PAD]', '[UNK]', '[CLS]', '[SEP]', '[MASK]'] + chars + ['##'+c for c in chars]
+    vocab_file = tmp_path / 'vocab.txt'
+    vocab_file.write_text('\n'.join(vocab)+'\n', encoding='utf-8')
+    tokenizer = BertTokenizerFast(vocab_file=str(vocab_file), do_lower_case=False, model_max_length=128)
+    labels = ['sg n_S', 'sg g_S', 'pl n_S', 'sg n_A', 'b_V', 's_V', 'da_V', 'sg n_P', 'D', 'J', 'Z', 'K']
+    # Large initializer_range avoids (near) ties between label probabilities
+    config = BertConfig(vocab_size=len(vocab), hidden_size=32, num_hidden_layers=1, num_attention_heads=2, 
+                        intermediate_size=32, max_position_embeddings=128, initializer_range=0.5, 
+                        id2label=dict(enumerate(labels)), label2id={l:i for (i, l) in enumerate(labels)})
+    torch.manual_seed(1)
+    model = BertForTokenClassification(config)
+    model_dir = tmp_path / 'tiny_bert_morph'
+    tokenizer.save_pretrained(str(model_dir))
+    model.save_pretrained(str(model_dir))
+    return str(model_dir)
+
+
+@pytest.mark.skipif(not check_if_transformers_is_available(),
+                    reason="package tranformers is required for this test")
+@pytest.mark.skipif(not check_if_pytorch_is_available(),
+                    reason="package pytorch is required for this test")
+def test_bert_morph_tagger_batches_with_tiny_model(tiny_bert_morph_model):
+    # Test that tag_texts gives the same results as tag / retag on each text (does not need downloaded models)
+    from estnltk.taggers import VabamorfAnalyzer
+    from estnltk_neural.taggers import BertMorphTagger
+    raw_texts = ['Lae äpp kohe alla!', 
+                 '', 
+                 'Ilus suur karvane kass nurrus punasel diivanil. Kass nurrus. '+\
+                 'Kui sa tahad Eestis kõrgema hariduse omandada, siis sa pead sisseastumisel sooritama eksami.', 
+                 'Palk oli väike. Palgi all oli kass.']
+    # Case 1: tagging
+    tagger = BertMorphTagger(model_location=tiny_bert_morph_model, get_top_n_predictions=2, batch_size=1)
+    expected = []
+    for raw_text in raw_texts:
+        text = Text(raw_text).tag_layer(['words', 'sentences'])
+        tagger.tag(text)
+        expected.append( _extract_word_partofspeech_and_form(text[tagger.output_layer], add_probs=True) )
+    batch_tagger = BertMorphTagger(model_location=tiny_bert_morph_model, get_top_n_predictions=2, batch_size=3)
+    texts = [Text(raw_text).tag_layer(['words', 'sentences']) for raw_text in raw_texts]
+    assert batch_tagger.tag_texts(texts) == texts
+    for text, expected_annotations in zip(texts, expected):
+        annotations = _extract_word_partofspeech_and_form(text[batch_tagger.output_layer], add_probs=True)
+        assert [{k:v for (k,v) in a.items() if k != 'probability'} for a in annotations] == \
+               [{k:v for (k,v) in a.items() if k != 'probability'} for a in expected_annotations]
+        assert [a['probability'] for a in annotations] == \
+               pytest.approx([a['probability'] for a in expected_annotations], abs=1e-4)
+    # Case 2: disambiguation
+    vm_analyser = VabamorfAnalyzer()
+    def make_texts():
+        texts = [Text(raw_text).tag_layer(['words', 'sentences']) for raw_text in raw_texts]
+        for text in texts:
+            vm_analyser.tag( text )
+        return texts
+    disambiguator = BertMorphTagger(model_location=tiny_bert_morph_model, output_layer=vm_analyser.output_layer, 
+                                    disambiguate=True, batch_size=1)
+    expected = []
+    for text in make_texts():
+        disambiguator.retag(text)
+        expected.append( _extract_word_partofspeech_and_form(text[vm_analyser.output_layer]) )
+    batch_disambiguator = BertMorphTagger(model_location=tiny_bert_morph_model, output_layer=vm_analyser.output_layer, 
+                                          disambiguate=True, batch_size=3)
+    texts = make_texts()
+    assert batch_disambiguator.tag_texts(texts) == texts
+    assert [_extract_word_partofspeech_and_form(text[vm_analyser.output_layer]) for text in texts] == expected